@@ -0,0 +1,36 @@
+"""Add assessment question bank
+
+Revision ID: 3c7a9e1b5d20
+Revises: 8d1f4a6c2e93
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7a9e1b5d20'
+down_revision = '8d1f4a6c2e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('assessment_questions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('skill_area', sa.String(length=100), nullable=False),
+    sa.Column('difficulty', sa.String(length=20), nullable=False),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('times_served', sa.Integer(), nullable=False),
+    sa.Column('times_answered', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('last_served_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('skill_area', 'difficulty', 'question', name='unique_assessment_question')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('assessment_questions')
@@ -0,0 +1,27 @@
+"""Add conversation summary to users
+
+Revision ID: 5b8e2f1c9a47
+Revises: d730fa484c15
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2f1c9a47'
+down_revision = 'd730fa484c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rolling summary of conversations older than the recent history window
+    op.add_column('users', sa.Column('conversation_summary', sa.Text(), nullable=True))
+    op.add_column('users', sa.Column('summarized_through', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'summarized_through')
+    op.drop_column('users', 'conversation_summary')
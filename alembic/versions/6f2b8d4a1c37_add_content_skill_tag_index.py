@@ -0,0 +1,48 @@
+"""Add content skill tag index
+
+Revision ID: 6f2b8d4a1c37
+Revises: 3c7a9e1b5d20
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2b8d4a1c37'
+down_revision = '3c7a9e1b5d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('content_skill_tags',
+    sa.Column('skill_tag', sa.String(length=100), nullable=False),
+    sa.Column('content_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['content_id'], ['content_recommendations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('skill_tag', 'content_id')
+    )
+    op.create_index('idx_content_skill_tags_content_id', 'content_skill_tags', ['content_id'], unique=False)
+
+    # Index the tags of content cached before this table existed
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, skill_tags FROM content_recommendations")).fetchall()
+    tag_rows = []
+    for content_id, skill_tags in rows:
+        if isinstance(skill_tags, str):
+            skill_tags = json.loads(skill_tags)
+        tags = {" ".join(str(tag).lower().split())[:100] for tag in skill_tags or []}
+        tag_rows.extend({"skill_tag": tag, "content_id": content_id} for tag in tags if tag)
+    if tag_rows:
+        connection.execute(
+            sa.text("INSERT INTO content_skill_tags (skill_tag, content_id) VALUES (:skill_tag, :content_id)"),
+            tag_rows
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_content_skill_tags_content_id', table_name='content_skill_tags')
+    op.drop_table('content_skill_tags')
@@ -0,0 +1,27 @@
+"""Add conversation history index
+
+Revision ID: 8d1f4a6c2e93
+Revises: 5b8e2f1c9a47
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d1f4a6c2e93'
+down_revision = '5b8e2f1c9a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves history pages newest first per user; id orders turns saved in the same instant
+    op.create_index(
+        'idx_conversations_user_id_timestamp', 'conversations', ['user_id', 'timestamp', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conversations_user_id_timestamp', table_name='conversations')
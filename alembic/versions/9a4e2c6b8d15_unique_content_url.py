@@ -0,0 +1,41 @@
+"""Make cached content unique by url
+
+Revision ID: 9a4e2c6b8d15
+Revises: 6f2b8d4a1c37
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4e2c6b8d15'
+down_revision = '6f2b8d4a1c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the most recently verified row of each url and drop the other copies
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, url FROM content_recommendations ORDER BY url, last_verified DESC, created_at DESC"
+    )).fetchall()
+    seen = set()
+    duplicates = []
+    for content_id, url in rows:
+        if url in seen:
+            duplicates.append(content_id)
+        seen.add(url)
+    for start in range(0, len(duplicates), 500):
+        ids = sa.bindparam("ids", expanding=True)
+        chunk = {"ids": duplicates[start:start + 500]}
+        connection.execute(sa.text("DELETE FROM content_skill_tags WHERE content_id IN :ids").bindparams(ids), chunk)
+        connection.execute(sa.text("DELETE FROM content_recommendations WHERE id IN :ids").bindparams(ids), chunk)
+
+    op.create_index('idx_content_recommendations_url', 'content_recommendations', ['url'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_content_recommendations_url', table_name='content_recommendations')
@@ -0,0 +1,104 @@
+"""Partition conversations by month
+
+Revision ID: b7c3e9f1a2d4
+Revises: 9a4e2c6b8d15
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e9f1a2d4'
+down_revision = '9a4e2c6b8d15'
+branch_labels = None
+depends_on = None
+
+# Months after the current one that get a partition up front
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, user_id, message, response, timestamp, message_type, context_data"
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        # SQLite keeps a plain table; retention finds old turns through this index
+        op.create_index('idx_conversations_timestamp', 'conversations', ['timestamp', 'id'], unique=False)
+        return
+
+    op.execute("ALTER TABLE conversations RENAME TO conversations_unpartitioned")
+    op.execute("ALTER TABLE conversations_unpartitioned RENAME CONSTRAINT conversations_pkey TO conversations_unpartitioned_pkey")
+    op.execute("ALTER INDEX idx_conversations_user_id_timestamp RENAME TO idx_conversations_unpartitioned_user_id_timestamp")
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE conversations (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id),
+            message TEXT NOT NULL,
+            response TEXT NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            message_type VARCHAR(50),
+            context_data JSON,
+            CONSTRAINT conversations_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.create_index('idx_conversations_user_id_timestamp', 'conversations', ['user_id', 'timestamp', 'id'], unique=False)
+    op.create_index('idx_conversations_timestamp', 'conversations', ['timestamp', 'id'], unique=False)
+    op.execute("CREATE TABLE conversations_default PARTITION OF conversations DEFAULT")
+
+    # One partition per month from the oldest turn through the months ahead
+    oldest = connection.execute(sa.text("SELECT MIN(timestamp) FROM conversations_unpartitioned")).scalar()
+    now = datetime.now(timezone.utc)
+    month = (oldest or now).astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE conversations_p{month:%Y%m} PARTITION OF conversations "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute(
+        f"INSERT INTO conversations ({COLUMNS}) "
+        f"SELECT id, user_id, message, response, COALESCE(timestamp, now()), message_type, context_data "
+        f"FROM conversations_unpartitioned"
+    )
+    op.execute("DROP TABLE conversations_unpartitioned")
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        op.drop_index('idx_conversations_timestamp', table_name='conversations')
+        return
+
+    op.execute("ALTER TABLE conversations RENAME TO conversations_partitioned")
+    op.execute("ALTER TABLE conversations_partitioned RENAME CONSTRAINT conversations_pkey TO conversations_partitioned_pkey")
+    op.execute("ALTER INDEX idx_conversations_user_id_timestamp RENAME TO idx_conversations_partitioned_user_id_timestamp")
+    op.execute("ALTER INDEX idx_conversations_timestamp RENAME TO idx_conversations_partitioned_timestamp")
+
+    op.create_table('conversations',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('message_type', sa.String(length=50), nullable=True),
+    sa.Column('context_data', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_conversations_user_id_timestamp', 'conversations', ['user_id', 'timestamp', 'id'], unique=False)
+    op.execute(f"INSERT INTO conversations ({COLUMNS}) SELECT {COLUMNS} FROM conversations_partitioned")
+    op.execute("DROP TABLE conversations_partitioned")
@@ -13,13 +13,21 @@ from typing import Dict, Any
 
 from ..config import get_settings
 from ..database.connection import db_manager
+from ..database.redis_client import close_redis_clients
+from ..services.conversation_archive import ConversationArchiver
+from ..services.conversation_writer import get_conversation_writer
+from ..services.gemini_executor import shutdown_gemini_executor
+from ..services.jobs import get_job_runner
+from ..services.model_registry import get_model_registry
+from ..services.question_bank import get_question_bank
 from .middleware import RateLimitMiddleware, LoggingMiddleware, AuthenticationMiddleware, InputSanitizationMiddleware
-from .endpoints import conversation_router, user_router, assessment_router, learning_router
+from .endpoints import conversation_router, user_router, assessment_router, learning_router, jobs_router
 from .endpoints.auth import router as auth_router
 from .endpoints.privacy import router as privacy_router
-from .websocket import websocket_router
+from .websocket import websocket_router, connection_manager
 from .exceptions import setup_exception_handlers
 from .metrics import metrics_endpoint
+from .dependencies import cleanup_dependencies
 
 
 logger = logging.getLogger(__name__)
@@ -34,11 +42,40 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await db_manager.initialize()
     
+    # On PostgreSQL new turns go to monthly partitions; make sure the coming months have one
+    try:
+        await ConversationArchiver().create_partitions()
+    except Exception as e:
+        logger.warning(f"Could not create conversation partitions: {e}")
+    
+    # Build Gemini models up front so the first chat request does not pay for it
+    try:
+        get_model_registry().warmup()
+    except Exception as e:
+        logger.warning(f"Gemini model warmup failed, models will be built on first use: {e}")
+    
+    # Assessment questions are served from memory, so load the bank before the first request
+    try:
+        await get_question_bank().load()
+    except Exception as e:
+        logger.warning(f"Could not load the assessment question bank, using built-in questions: {e}")
+    
+    # Users with an open WebSocket are told when their background jobs finish
+    get_job_runner().add_listener(connection_manager.send_job_finished)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down EdAgent API server...")
+    # Let running jobs finish before the services they use are closed
+    await get_job_runner().close()
+    # Save queued conversation turns while the database is still open
+    await get_conversation_writer().close()
+    await get_question_bank().close()
+    await cleanup_dependencies()
+    shutdown_gemini_executor()
     await db_manager.close()
+    await close_redis_clients()
 
 
 def create_app() -> FastAPI:
@@ -100,6 +137,10 @@ def create_app() -> FastAPI:
             }
             health_status["status"] = "degraded"
         
+        # Connection counts for the primary and each read pool
+        from ..database.connection import get_database_info
+        health_status["services"]["database"]["connections"] = await get_database_info()
+        
         # Check AI service
         try:
             ai_service = AIService()
@@ -202,6 +243,12 @@ def setup_routers(app: FastAPI) -> None:
         tags=["Learning Paths"]
     )
     
+    app.include_router(
+        jobs_router,
+        prefix="/api/v1/jobs",
+        tags=["Jobs"]
+    )
+    
     app.include_router(
         privacy_router,
         prefix="/api/v1/privacy",
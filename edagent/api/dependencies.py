@@ -167,6 +167,9 @@ async def cleanup_dependencies():
     global _ai_service, _content_recommender, _auth_service
     
     # Close any resources that need cleanup
+    if _conversation_manager:
+        await _conversation_manager.close()
+    
     if _user_context_manager:
         # Close database connections if needed
         pass
@@ -4,11 +4,13 @@ Conversation endpoints for EdAgent API
 
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
 from fastapi.responses import JSONResponse
 
 from ...services.conversation_manager import ConversationManager
 from ...services.user_context_manager import UserContextManager
+from ...services.deadlines import deadline_scope
+from ...services.user_lanes import UserLaneFullError
 from ..schemas import (
     ConversationRequest,
     ConversationResponseSchema,
@@ -16,7 +18,7 @@ from ..schemas import (
     MessageSchema,
     BaseResponse
 )
-from ..exceptions import ConversationError, UserNotFoundError
+from ..exceptions import ConversationError, TooManyMessagesError, UserNotFoundError
 from ...config import get_settings
 
 
@@ -46,11 +48,12 @@ async def send_message(
         if not user_context:
             raise UserNotFoundError(request.user_id)
         
-        # Handle the message
-        response = await conversation_manager.handle_message(
-            user_id=request.user_id,
-            message=request.message
-        )
+        # Handle the message within the AI response deadline
+        with deadline_scope(get_settings().ai_request_deadline_seconds):
+            response = await conversation_manager.handle_message(
+                user_id=request.user_id,
+                message=request.message
+            )
         
         # Convert to schema
         return ConversationResponseSchema(
@@ -77,6 +80,8 @@ async def send_message(
         
     except UserNotFoundError:
         raise
+    except UserLaneFullError as e:
+        raise TooManyMessagesError(e.user_id, e.queued)
     except Exception as e:
         logger.error(f"Error handling message: {str(e)}")
         raise ConversationError(
@@ -88,17 +93,30 @@ async def send_message(
 @router.get("/{user_id}/history", response_model=ConversationHistoryResponse)
 async def get_conversation_history(
     user_id: str,
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="Maximum number of messages to retrieve"),
-    offset: int = Query(0, ge=0, description="Number of messages to skip"),
+    before: Optional[str] = Query(None, description="older_cursor of a previous page, to scroll back"),
+    after: Optional[str] = Query(None, description="newer_cursor of a previous page, to get newer messages"),
+    offset: Optional[int] = Query(
+        None, ge=0, deprecated=True,
+        description="Number of messages to skip. Deprecated: page with before/after instead"
+    ),
     conversation_manager: ConversationManager = Depends(get_conversation_manager),
     user_context_manager: UserContextManager = Depends(get_user_context_manager)
 ):
     """
-    Get conversation history for a user
+    Get conversation history for a user, most recent first
     
     - **user_id**: Unique identifier for the user
-    - **limit**: Maximum number of messages to retrieve (1-100)
-    - **offset**: Number of messages to skip for pagination
+    - **limit**: Maximum number of messages to retrieve (1-100); pages hold
+      whole turns of two messages, so limit must be even unless offset is given
+    - **before**: Cursor for the page before this one (older messages)
+    - **after**: Cursor for messages newer than a page
+    - **offset**: Deprecated. Number of messages to skip; still honoured,
+      but every skipped message is read again. Cannot be combined with
+      before or after
+    
+    total_count is the number of messages in the user's whole history.
     """
     try:
         # Verify user exists
@@ -106,12 +124,19 @@ async def get_conversation_history(
         if not user_context:
             raise UserNotFoundError(user_id)
         
-        # Get conversation history
-        messages = await conversation_manager.get_conversation_history(user_id)
-        
-        # Apply pagination
-        total_count = len(messages)
-        paginated_messages = messages[offset:offset + limit]
+        if offset is not None:
+            if before or after:
+                raise ConversationError(message="offset cannot be combined with before or after")
+            response.headers["Deprecation"] = "true"
+            page = await conversation_manager.get_conversation_offset_page(user_id, limit, offset)
+            page.update(older_cursor=None, newer_cursor=None)
+        else:
+            # Get one page of conversation history
+            try:
+                page = await conversation_manager.get_conversation_page(user_id, limit, before=before, after=after)
+            except ValueError as e:
+                raise ConversationError(message="Invalid history page request", details={"error": str(e)})
+        paginated_messages = page["messages"]
         
         # Convert to schema
         message_schemas = [
@@ -127,11 +152,13 @@ async def get_conversation_history(
         
         return ConversationHistoryResponse(
             messages=message_schemas,
-            total_count=total_count,
+            total_count=page["total_count"],
+            older_cursor=page["older_cursor"],
+            newer_cursor=page["newer_cursor"],
             message="Conversation history retrieved successfully"
         )
         
-    except UserNotFoundError:
+    except (UserNotFoundError, ConversationError):
         raise
     except Exception as e:
         logger.error(f"Error retrieving conversation history: {str(e)}")
@@ -141,6 +168,67 @@ async def get_conversation_history(
         )
 
 
+@router.get("/{user_id}/history/archive", response_model=ConversationHistoryResponse)
+async def get_archived_conversation_history(
+    user_id: str,
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of messages to retrieve"),
+    before: Optional[str] = Query(None, description="older_cursor of a previous archived page, to scroll back"),
+    conversation_manager: ConversationManager = Depends(get_conversation_manager),
+    user_context_manager: UserContextManager = Depends(get_user_context_manager)
+):
+    """
+    Get a user's archived conversation history, most recent first
+    
+    Conversations older than the retention period are moved out of the
+    database into the archive; this reads them back. Call it once the
+    history endpoint has no older_cursor left.
+    
+    - **user_id**: Unique identifier for the user
+    - **limit**: Maximum number of messages to retrieve (1-100); pages hold
+      whole turns of two messages, so limit must be even
+    - **before**: Cursor for the archived page before this one (older messages)
+    
+    total_count is the number of archived messages.
+    """
+    try:
+        # Verify user exists
+        user_context = await user_context_manager.get_user_context(user_id)
+        if not user_context:
+            raise UserNotFoundError(user_id)
+        
+        try:
+            page = await conversation_manager.get_archived_conversation_page(user_id, limit, before=before)
+        except ValueError as e:
+            raise ConversationError(message="Invalid history page request", details={"error": str(e)})
+        
+        message_schemas = [
+            MessageSchema(
+                id=msg.id,
+                content=msg.content,
+                message_type=msg.message_type,
+                timestamp=msg.timestamp,
+                metadata=msg.metadata
+            )
+            for msg in page["messages"]
+        ]
+        
+        return ConversationHistoryResponse(
+            messages=message_schemas,
+            total_count=page["total_count"],
+            older_cursor=page["older_cursor"],
+            message="Archived conversation history retrieved successfully"
+        )
+    
+    except (UserNotFoundError, ConversationError):
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving archived conversation history: {str(e)}")
+        raise ConversationError(
+            message="Failed to retrieve archived conversation history",
+            details={"error": str(e)}
+        )
+
+
 @router.delete("/{user_id}/history", response_model=BaseResponse)
 async def clear_conversation_history(
     user_id: str,
@@ -0,0 +1,53 @@
+"""
+Background job endpoints for EdAgent API
+"""
+
+import logging
+from fastapi import APIRouter, Depends
+
+from ...services.jobs import Job, JobRunner, get_job_runner
+from ..schemas import JobResponse
+from ..exceptions import JobNotFoundError
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+JOBS_PREFIX = "/api/v1/jobs"
+
+
+def job_status_url(job_id: str) -> str:
+    """URL clients poll for a job's status"""
+    return f"{JOBS_PREFIX}/{job_id}"
+
+
+def job_to_response(job: Job) -> JobResponse:
+    """Convert a job to its API response"""
+    return JobResponse(
+        message=f"Job {job.status.value}",
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status.value,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+        status_url=job_status_url(job.id)
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    job_runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Get the status of a background job, and its result once it succeeded
+
+    - **job_id**: Job ID returned when the job was submitted
+    """
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise JobNotFoundError(job_id)
+    return job_to_response(job)
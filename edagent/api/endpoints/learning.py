@@ -4,12 +4,13 @@ Learning path endpoints for EdAgent API
 
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
 from fastapi.responses import JSONResponse
 
 from ...services.conversation_manager import ConversationManager
 from ...services.user_context_manager import UserContextManager
 from ...services.learning_path_generator import EnhancedLearningPathGenerator
+from ...services.jobs import JobQueueFullError, JobRunner, get_job_runner
 from ..schemas import (
     CreateLearningPathRequest,
     UpdateMilestoneStatusRequest,
@@ -17,11 +18,12 @@ from ..schemas import (
     LearningPathListResponse,
     MilestoneSchema,
     ResourceSchema,
-    BaseResponse
+    BaseResponse,
+    JobResponse
 )
-from ..exceptions import LearningPathError, UserNotFoundError
+from ..exceptions import LearningPathError, UserNotFoundError, TooManyJobsError
 from ...models.learning import LearningPath, Milestone
-from ...config import get_settings
+from .jobs import job_status_url, job_to_response
 
 
 logger = logging.getLogger(__name__)
@@ -31,14 +33,21 @@ router = APIRouter()
 from ..dependencies import get_conversation_manager, get_user_context_manager, get_learning_path_generator
 
 
-@router.post("/paths", response_model=LearningPathSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/paths", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_learning_path(
     request: CreateLearningPathRequest,
+    response: Response,
     conversation_manager: ConversationManager = Depends(get_conversation_manager),
-    user_context_manager: UserContextManager = Depends(get_user_context_manager)
+    user_context_manager: UserContextManager = Depends(get_user_context_manager),
+    job_runner: JobRunner = Depends(get_job_runner)
 ):
     """
-    Create a new learning path for a user
+    Start generating a new learning path for a user
+    
+    Generation runs in the background. The response is the queued job;
+    poll its status_url (also in the Location header) until it succeeds,
+    when its result is the learning path. Users with an open WebSocket
+    also get a job_finished message.
     
     - **user_id**: Unique identifier for the user
     - **goal**: Learning or career goal description
@@ -50,15 +59,19 @@ async def create_learning_path(
         if not user_context:
             raise UserNotFoundError(request.user_id)
         
-        # Generate learning path
-        learning_path = await conversation_manager.generate_learning_path(
-            user_id=request.user_id,
-            goal=request.goal
-        )
+        async def generate():
+            learning_path = await conversation_manager.generate_learning_path(
+                user_id=request.user_id,
+                goal=request.goal
+            )
+            return _convert_learning_path_to_schema(learning_path).model_dump(mode="json")
         
-        # Convert to schema
-        return _convert_learning_path_to_schema(learning_path)
+        job = await job_runner.submit("learning_path", request.user_id, generate)
+        response.headers["Location"] = job_status_url(job.id)
+        return job_to_response(job)
         
+    except JobQueueFullError as e:
+        raise TooManyJobsError(e.queued)
     except UserNotFoundError:
         raise
     except Exception as e:
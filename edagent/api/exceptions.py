@@ -79,6 +79,39 @@ class AIServiceError(EdAgentAPIException):
         )
 
 
+class TooManyMessagesError(EdAgentAPIException):
+    """Exception raised when a user sends messages faster than they are handled"""
+    
+    def __init__(self, user_id: str, queued: int):
+        super().__init__(
+            message="Too many messages waiting to be handled; please wait for a reply",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details={"user_id": user_id, "queued": queued}
+        )
+
+
+class JobNotFoundError(EdAgentAPIException):
+    """Exception raised when a background job is not found or has expired"""
+    
+    def __init__(self, job_id: str):
+        super().__init__(
+            message=f"Job with ID '{job_id}' not found",
+            status_code=status.HTTP_404_NOT_FOUND,
+            details={"job_id": job_id}
+        )
+
+
+class TooManyJobsError(EdAgentAPIException):
+    """Exception raised when the background job queue is full"""
+    
+    def __init__(self, queued: int):
+        super().__init__(
+            message="Too many jobs are waiting to run; please try again shortly",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"queued": queued}
+        )
+
+
 def setup_exception_handlers(app: FastAPI) -> None:
     """Setup exception handlers for the FastAPI app"""
     
@@ -35,6 +35,192 @@ gemini_api_calls_total = Counter(
     ['model', 'status']
 )
 
+gemini_cache_hits_total = Counter(
+    'gemini_cache_hits_total',
+    'Total Gemini response cache hits',
+    ['model']
+)
+
+gemini_cache_misses_total = Counter(
+    'gemini_cache_misses_total',
+    'Total Gemini response cache misses',
+    ['model']
+)
+
+gemini_requests_coalesced_total = Counter(
+    'gemini_requests_coalesced_total',
+    'Total Gemini requests served by joining an identical in-flight call',
+    ['model']
+)
+
+gemini_rate_limit_wait_seconds = Histogram(
+    'gemini_rate_limit_wait_seconds',
+    'Time Gemini requests spent waiting for rate limit tokens or a concurrency slot',
+    ['model', 'stage'],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+gemini_requests_in_flight = Gauge(
+    'gemini_requests_in_flight',
+    'Number of Gemini requests currently in flight',
+    ['model']
+)
+
+gemini_executor_queue_depth = Gauge(
+    'gemini_executor_queue_depth',
+    'Number of Gemini calls waiting for a worker thread',
+    ['model']
+)
+
+gemini_executor_saturation = Gauge(
+    'gemini_executor_saturation',
+    'Fraction of Gemini worker threads busy with calls for a model',
+    ['model']
+)
+
+gemini_call_timeouts_total = Counter(
+    'gemini_call_timeouts_total',
+    'Total Gemini calls abandoned after exceeding their timeout',
+    ['model']
+)
+
+gemini_hedged_requests_total = Counter(
+    'gemini_hedged_requests_total',
+    'Total Gemini requests that sent a hedged second attempt',
+    ['model', 'winner']
+)
+
+gemini_model_fallbacks_total = Counter(
+    'gemini_model_fallbacks_total',
+    'Total Gemini requests moved to a faster model to meet their deadline',
+    ['from_model', 'to_model']
+)
+
+gemini_prompt_tokens = Histogram(
+    'gemini_prompt_tokens',
+    'Prompt tokens sent to Gemini per call',
+    ['operation', 'model'],
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+
+gemini_response_tokens = Histogram(
+    'gemini_response_tokens',
+    'Response tokens returned by Gemini per call',
+    ['operation', 'model'],
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000)
+)
+
+prompt_section_tokens = Histogram(
+    'prompt_section_tokens',
+    'Estimated tokens per prompt section after budget trimming',
+    ['prompt_type', 'section'],
+    buckets=(0, 50, 100, 250, 500, 1000, 2000, 4000)
+)
+
+prompt_tokens_trimmed_total = Counter(
+    'prompt_tokens_trimmed_total',
+    'Estimated tokens trimmed from prompt sections to fit the budget',
+    ['prompt_type', 'section']
+)
+
+conversation_summary_updates_total = Counter(
+    'conversation_summary_updates_total',
+    'Background conversation summary refreshes',
+    ['status']
+)
+
+conversation_writes_total = Counter(
+    'conversation_writes_total',
+    'Conversation turns processed by the write-behind queue',
+    ['status']
+)
+
+conversation_write_retries_total = Counter(
+    'conversation_write_retries_total',
+    'Retried conversation batch inserts'
+)
+
+conversation_write_batch_size = Histogram(
+    'conversation_write_batch_size',
+    'Conversation turns per batch insert',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+conversation_write_queue_depth = Gauge(
+    'conversation_write_queue_depth',
+    'Conversation turns waiting to be saved'
+)
+
+conversation_lane_messages_total = Counter(
+    'conversation_lane_messages_total',
+    'User messages entering per-user lanes by outcome (processed, coalesced, rejected)',
+    ['outcome']
+)
+
+conversation_lane_wait_seconds = Histogram(
+    'conversation_lane_wait_seconds',
+    'Time a message waited for the same user\'s earlier messages to finish',
+    buckets=(0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+assessment_question_lookups_total = Counter(
+    'assessment_question_lookups_total',
+    'Adaptive assessment question lookups by outcome (hit: served from the question bank, miss: generated live)',
+    ['outcome']
+)
+
+background_jobs_total = Counter(
+    'background_jobs_total',
+    'Background jobs by kind and status (queued, succeeded, failed, rejected)',
+    ['kind', 'status']
+)
+
+background_job_duration_seconds = Histogram(
+    'background_job_duration_seconds',
+    'Time background jobs ran, from start to success or failure',
+    ['kind'],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+
+background_job_queue_depth = Gauge(
+    'background_job_queue_depth',
+    'Background jobs waiting for a worker'
+)
+
+database_sessions_total = Counter(
+    'database_sessions_total',
+    'Database sessions opened by pool (primary, reader, replica-N)',
+    ['pool']
+)
+
+conversations_archived_total = Counter(
+    'conversations_archived_total',
+    'Conversation turns moved to the archive, by how they left the database (partition, rows)',
+    ['method']
+)
+
+user_context_cache_hits_total = Counter(
+    'user_context_cache_hits_total',
+    'Total user context cache hits'
+)
+
+user_context_cache_misses_total = Counter(
+    'user_context_cache_misses_total',
+    'Total user context cache misses'
+)
+
+user_context_cache_entry_age_seconds = Histogram(
+    'user_context_cache_entry_age_seconds',
+    'Age of user contexts served from the cache, i.e. worst-case staleness',
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+)
+
+user_context_cache_invalidations_total = Counter(
+    'user_context_cache_invalidations_total',
+    'Total user context cache invalidations after writes',
+    ['reason']
+)
+
 gemini_api_errors_total = Counter(
     'gemini_api_errors_total',
     'Total Gemini API errors',
@@ -125,6 +311,138 @@ def track_gemini_api_call(model: str, success: bool, error_type: str = None):
         gemini_api_errors_total.labels(error_type=error_type).inc()
 
 
+def track_gemini_cache_lookup(model: str, hit: bool):
+    """Track Gemini response cache hit/miss metrics"""
+    if hit:
+        gemini_cache_hits_total.labels(model=model).inc()
+    else:
+        gemini_cache_misses_total.labels(model=model).inc()
+
+
+def track_gemini_request_coalesced(model: str):
+    """Track a Gemini request coalesced into an in-flight call"""
+    gemini_requests_coalesced_total.labels(model=model).inc()
+
+
+def track_gemini_rate_limit_wait(model: str, stage: str, seconds: float):
+    """Track time spent waiting in the Gemini rate limiter"""
+    gemini_rate_limit_wait_seconds.labels(model=model, stage=stage).observe(seconds)
+
+
+def update_gemini_in_flight(model: str, count: int):
+    """Update in-flight Gemini requests gauge"""
+    gemini_requests_in_flight.labels(model=model).set(count)
+
+
+def update_gemini_executor_usage(model: str, queued: int, saturation: float):
+    """Update Gemini executor queue depth and saturation gauges"""
+    gemini_executor_queue_depth.labels(model=model).set(queued)
+    gemini_executor_saturation.labels(model=model).set(saturation)
+
+
+def track_gemini_call_timeout(model: str):
+    """Track a Gemini call that exceeded its timeout"""
+    gemini_call_timeouts_total.labels(model=model).inc()
+
+
+def track_gemini_hedged_request(model: str, hedge_won: bool):
+    """Track a hedged Gemini request and which attempt answered first"""
+    winner = "hedge" if hedge_won else "primary"
+    gemini_hedged_requests_total.labels(model=model, winner=winner).inc()
+
+
+def track_gemini_model_fallback(from_model: str, to_model: str):
+    """Track a deadline-driven Gemini model fallback"""
+    gemini_model_fallbacks_total.labels(from_model=from_model, to_model=to_model).inc()
+
+
+def track_gemini_token_usage(operation: str, model: str, prompt_tokens: int, response_tokens: int):
+    """Track prompt and response token counts for a Gemini call"""
+    gemini_prompt_tokens.labels(operation=operation, model=model).observe(prompt_tokens)
+    gemini_response_tokens.labels(operation=operation, model=model).observe(response_tokens)
+
+
+def track_prompt_section_tokens(prompt_type: str, section: str, tokens: int, trimmed_tokens: int):
+    """Track the size of a prompt section and how much was trimmed from it"""
+    prompt_section_tokens.labels(prompt_type=prompt_type, section=section).observe(tokens)
+    if trimmed_tokens > 0:
+        prompt_tokens_trimmed_total.labels(prompt_type=prompt_type, section=section).inc(trimmed_tokens)
+
+
+def track_conversation_summary_update(status: str):
+    """Track a background conversation summary refresh"""
+    conversation_summary_updates_total.labels(status=status).inc()
+
+
+def track_conversation_writes(status: str, count: int = 1):
+    """Track conversation turns saved or dead-lettered by the write-behind queue"""
+    conversation_writes_total.labels(status=status).inc(count)
+
+
+def track_conversation_write_batch(size: int, retries: int):
+    """Track a conversation batch insert and how often it was retried"""
+    conversation_write_batch_size.observe(size)
+    if retries > 0:
+        conversation_write_retries_total.inc(retries)
+
+
+def update_conversation_write_queue_depth(depth: int):
+    """Update the conversation write-behind queue depth gauge"""
+    conversation_write_queue_depth.set(depth)
+
+
+def track_conversation_lane_message(outcome: str):
+    """Track a user message entering its per-user lane"""
+    conversation_lane_messages_total.labels(outcome=outcome).inc()
+
+
+def track_conversation_lane_wait(seconds: float):
+    """Track how long a message waited behind the user's earlier messages"""
+    conversation_lane_wait_seconds.observe(seconds)
+
+
+def track_assessment_question_lookup(outcome: str):
+    """Track an adaptive assessment question lookup in the question bank"""
+    assessment_question_lookups_total.labels(outcome=outcome).inc()
+
+
+def track_background_job(kind: str, status: str, duration: float = None):
+    """Track a background job changing status and, once it ran, how long it took"""
+    background_jobs_total.labels(kind=kind, status=status).inc()
+    if duration is not None:
+        background_job_duration_seconds.labels(kind=kind).observe(duration)
+
+
+def update_background_job_queue_depth(depth: int):
+    """Update the background job queue depth gauge"""
+    background_job_queue_depth.set(depth)
+
+
+def track_database_session(pool: str):
+    """Track a database session opened on a connection pool"""
+    database_sessions_total.labels(pool=pool).inc()
+
+
+def track_conversations_archived(method: str, count: int):
+    """Track conversation turns archived by dropping a partition or deleting rows"""
+    conversations_archived_total.labels(method=method).inc(count)
+
+
+def track_user_context_cache_lookup(hit: bool, age_seconds: float = None):
+    """Track user context cache hit/miss metrics and the age of served entries"""
+    if hit:
+        user_context_cache_hits_total.inc()
+        if age_seconds is not None:
+            user_context_cache_entry_age_seconds.observe(age_seconds)
+    else:
+        user_context_cache_misses_total.inc()
+
+
+def track_user_context_cache_invalidation(reason: str):
+    """Track a user context cache invalidation"""
+    user_context_cache_invalidations_total.labels(reason=reason).inc()
+
+
 def track_database_error():
     """Track database connection errors"""
     database_connection_errors_total.inc()
@@ -296,6 +296,8 @@ class ConversationHistoryResponse(BaseResponse):
     """Response schema for conversation history"""
     messages: List[MessageSchema]
     total_count: int
+    older_cursor: Optional[str] = None
+    newer_cursor: Optional[str] = None
 
 
 class UserProfileResponse(BaseResponse):
@@ -313,20 +315,44 @@ class LearningPathListResponse(BaseResponse):
     """Response schema for learning path list"""
     learning_paths: List[LearningPathSchema]
     total_count: int
+
+
+class JobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobResponse(BaseResponse):
+    """Response schema for a background job; result is set once it succeeded"""
+    job_id: str
+    kind: str
+    status: JobStatusEnum
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    status_url: str
 # WebSocket Message Schemas
 class WebSocketMessageType(str, Enum):
     CONNECTION_ESTABLISHED = "connection_established"
     AI_RESPONSE = "ai_response"
+    AI_RESPONSE_CHUNK = "ai_response_chunk"
+    AI_RESPONSE_END = "ai_response_end"
     TYPING_INDICATOR = "typing_indicator"
     ERROR = "error"
     BROADCAST = "broadcast"
     DISCONNECTION = "disconnection"
+    JOB_FINISHED = "job_finished"
 
 
 class WebSocketIncomingMessage(BaseModel):
     """Schema for incoming WebSocket messages from client"""
     message: str = Field(..., min_length=1, max_length=2000, description="User message content")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Optional message metadata")
+    stream: bool = Field(False, description="Stream the AI response as incremental chunks")
 
 
 class WebSocketOutgoingMessage(BaseModel):
@@ -348,6 +374,18 @@ class WebSocketAIResponse(WebSocketOutgoingMessage):
     follow_up_questions: Optional[List[str]] = Field(None, description="Follow-up questions")
 
 
+class WebSocketAIResponseChunk(WebSocketOutgoingMessage):
+    """Schema for incremental AI response chunks via WebSocket"""
+    type: Literal[WebSocketMessageType.AI_RESPONSE_CHUNK] = WebSocketMessageType.AI_RESPONSE_CHUNK
+    message: str = Field(..., description="Response text chunk")
+    chunk_index: int = Field(..., ge=0, description="Position of the chunk in the stream")
+
+
+class WebSocketAIResponseEnd(WebSocketAIResponse):
+    """Schema for the final message of a streamed AI response"""
+    type: Literal[WebSocketMessageType.AI_RESPONSE_END] = WebSocketMessageType.AI_RESPONSE_END
+
+
 class WebSocketTypingIndicator(WebSocketOutgoingMessage):
     """Schema for typing indicator messages"""
     type: Literal[WebSocketMessageType.TYPING_INDICATOR] = WebSocketMessageType.TYPING_INDICATOR
@@ -4,7 +4,7 @@ WebSocket endpoints and connection management for real-time chat
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import asyncio
 from fastapi import WebSocket, WebSocketDisconnect, Depends, HTTPException, status
@@ -12,8 +12,13 @@ from fastapi.routing import APIRouter
 
 from ..services.conversation_manager import ConversationManager
 from ..services.user_context_manager import UserContextManager
+from ..services.deadlines import deadline_scope
+from ..services.jobs import Job
+from ..services.user_lanes import UserLaneFullError
+from ..config import get_settings
 from ..models.conversation import ConversationResponse, MessageType
 from .dependencies import get_conversation_manager, get_user_context_manager
+from .endpoints.jobs import job_status_url
 from .exceptions import ConversationError, UserNotFoundError
 from .schemas import (
     WebSocketConnectionStatus, BroadcastRequest, BroadcastResponse,
@@ -116,6 +121,15 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         })
     
+    async def send_response_chunk(self, user_id: str, chunk: str, chunk_index: int) -> bool:
+        """Send an incremental AI response chunk to user"""
+        return await self.send_message(user_id, {
+            "type": WebSocketMessageType.AI_RESPONSE_CHUNK,
+            "message": chunk,
+            "chunk_index": chunk_index,
+            "timestamp": datetime.now().isoformat()
+        })
+    
     async def send_error(self, user_id: str, error_message: str, error_code: str = "general_error") -> bool:
         """Send error message to user"""
         return await self.send_message(user_id, {
@@ -125,6 +139,19 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         })
     
+    async def send_job_finished(self, job: Job) -> bool:
+        """Tell a connected user that one of their background jobs finished"""
+        if not self.is_connected(job.user_id):
+            return False
+        return await self.send_message(job.user_id, {
+            "type": WebSocketMessageType.JOB_FINISHED,
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status.value,
+            "status_url": job_status_url(job.id),
+            "timestamp": datetime.now().isoformat()
+        })
+    
     def get_active_users(self) -> List[str]:
         """Get list of currently connected user IDs"""
         return list(self.active_connections.keys())
@@ -145,6 +172,69 @@ connection_manager = ConnectionManager()
 websocket_router = APIRouter()
 
 
+async def _handle_incoming_message(
+    conversation_manager: ConversationManager, 
+    user_id: str, 
+    message: str, 
+    stream: bool
+) -> Tuple[ConversationResponse, WebSocketMessageType]:
+    """
+    Process a chat message, forwarding response chunks when streaming is requested
+    
+    Turns the typing indicator off once the user starts seeing the answer: at
+    the first chunk when streaming, otherwise when the response is ready.
+    """
+    if not stream:
+        response = await conversation_manager.handle_message(user_id, message)
+        await connection_manager.send_typing_indicator(user_id, False)
+        return response, WebSocketMessageType.AI_RESPONSE
+    
+    # Forward chunks as they are generated, then send the final response
+    chunk_index = 0
+    
+    async def send_chunk(chunk: str) -> None:
+        nonlocal chunk_index
+        if chunk_index == 0:
+            await connection_manager.send_typing_indicator(user_id, False)
+        await connection_manager.send_response_chunk(user_id, chunk, chunk_index)
+        chunk_index += 1
+    
+    response = await conversation_manager.handle_message_stream(user_id, message, send_chunk)
+    if chunk_index == 0:
+        await connection_manager.send_typing_indicator(user_id, False)
+    return response, WebSocketMessageType.AI_RESPONSE_END
+
+
+def _build_response_payload(
+    response: ConversationResponse, 
+    message_type: WebSocketMessageType = WebSocketMessageType.AI_RESPONSE
+) -> Dict[str, Any]:
+    """Format a conversation response as a WebSocket message"""
+    response_data = {
+        "type": message_type,
+        "message": response.message,
+        "response_type": response.response_type,
+        "confidence_score": response.confidence_score,
+        "timestamp": datetime.now().isoformat(),
+        "metadata": response.metadata or {}
+    }
+    
+    # Add optional fields if present
+    if response.suggested_actions:
+        response_data["suggested_actions"] = response.suggested_actions
+    
+    if response.content_recommendations:
+        response_data["content_recommendations"] = [
+            rec if isinstance(rec, dict) else rec.to_dict() 
+            for rec in response.content_recommendations
+        ]
+    
+    if response.follow_up_questions:
+        response_data["follow_up_questions"] = response.follow_up_questions
+    
+    return response_data
+
+
 @websocket_router.websocket("/ws/{user_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -201,37 +291,23 @@ async def websocket_endpoint(
                 await connection_manager.send_typing_indicator(user_id, True)
                 
                 try:
-                    # Process message through conversation manager
-                    response = await conversation_manager.handle_message(user_id, message_content)
-                    
-                    # Stop typing indicator
-                    await connection_manager.send_typing_indicator(user_id, False)
+                    with deadline_scope(get_settings().ai_request_deadline_seconds):
+                        response, message_type = await _handle_incoming_message(
+                            conversation_manager, user_id, message_content, bool(data.get("stream"))
+                        )
                     
                     # Format and send response
-                    response_data = {
-                        "type": WebSocketMessageType.AI_RESPONSE,
-                        "message": response.message,
-                        "response_type": response.response_type,
-                        "confidence_score": response.confidence_score,
-                        "timestamp": datetime.now().isoformat(),
-                        "metadata": response.metadata or {}
-                    }
-                    
-                    # Add optional fields if present
-                    if response.suggested_actions:
-                        response_data["suggested_actions"] = response.suggested_actions
-                    
-                    if response.content_recommendations:
-                        response_data["content_recommendations"] = [
-                            rec if isinstance(rec, dict) else rec.to_dict() 
-                            for rec in response.content_recommendations
-                        ]
-                    
-                    if response.follow_up_questions:
-                        response_data["follow_up_questions"] = response.follow_up_questions
-                    
+                    response_data = _build_response_payload(response, message_type)
                     await connection_manager.send_message(user_id, response_data)
                     
+                except UserLaneFullError:
+                    await connection_manager.send_typing_indicator(user_id, False)
+                    await connection_manager.send_error(
+                        user_id,
+                        "You have several messages waiting for a reply. Please wait before sending more.",
+                        "too_many_messages"
+                    )
+                
                 except ConversationError as e:
                     await connection_manager.send_typing_indicator(user_id, False)
                     await connection_manager.send_error(
@@ -3,8 +3,8 @@ Application settings and configuration management
 """
 
 import os
-from typing import Optional, Literal
-from pydantic import Field, validator
+from typing import List, Optional, Literal
+from pydantic import AliasChoices, Field, validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -24,6 +24,18 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
     
+    # Read replicas for read-only sessions (comma-separated URLs); reads follow a write to the primary for a while
+    database_replica_urls: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    database_read_your_writes_seconds: float = Field(default=5.0, env="DATABASE_READ_YOUR_WRITES_SECONDS")
+    
+    # SQLite file databases: WAL journal, one writer connection and a pool of read connections
+    sqlite_wal_enabled: bool = Field(default=True, env="SQLITE_WAL_ENABLED")
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_reader_pool_size: int = Field(default=4, env="SQLITE_READER_POOL_SIZE")
+    sqlite_busy_timeout_seconds: float = Field(default=30.0, env="SQLITE_BUSY_TIMEOUT_SECONDS")
+    sqlite_cache_size_mb: int = Field(default=64, env="SQLITE_CACHE_SIZE_MB")
+    sqlite_mmap_size_mb: int = Field(default=256, env="SQLITE_MMAP_SIZE_MB")
+    
     # AI Service Configuration
     gemini_model_chat: str = Field(default="gemini-1.5-flash", env="GEMINI_MODEL_CHAT")
     gemini_model_reasoning: str = Field(default="gemini-1.5-pro", env="GEMINI_MODEL_REASONING")
@@ -31,10 +43,125 @@ class Settings(BaseSettings):
     gemini_temperature_reasoning: float = Field(default=0.3, env="GEMINI_TEMPERATURE_REASONING")
     gemini_max_tokens_response: int = Field(default=1000, env="GEMINI_MAX_TOKENS_RESPONSE")
     gemini_max_tokens_learning_path: int = Field(default=2000, env="GEMINI_MAX_TOKENS_LEARNING_PATH")
+    gemini_request_timeout_seconds: float = Field(
+        default=30.0,
+        validation_alias=AliasChoices("GEMINI_REQUEST_TIMEOUT", "gemini_request_timeout_seconds")
+    )
+    gemini_executor_max_workers: int = Field(
+        default=16,
+        validation_alias=AliasChoices("GEMINI_EXECUTOR_WORKERS", "gemini_executor_max_workers")
+    )
+    ai_service_backend: Literal["gemini", "fake"] = Field(default="gemini", env="AI_SERVICE_BACKEND")
+    ai_request_deadline_seconds: float = Field(
+        default=15.0,
+        validation_alias=AliasChoices("AI_REQUEST_DEADLINE", "ai_request_deadline_seconds")
+    )
+    gemini_reasoning_min_budget_seconds: float = Field(
+        default=8.0,
+        validation_alias=AliasChoices("GEMINI_REASONING_MIN_BUDGET", "gemini_reasoning_min_budget_seconds")
+    )
+    gemini_hedging_enabled: bool = Field(default=False, env="GEMINI_HEDGING_ENABLED")
+    gemini_hedge_delay_seconds: float = Field(
+        default=2.0,  # until p95 is known
+        validation_alias=AliasChoices("GEMINI_HEDGE_DELAY", "gemini_hedge_delay_seconds")
+    )
     
+    # Prompt token budgets (estimated tokens)
+    prompt_max_tokens: int = Field(default=6000, env="PROMPT_MAX_TOKENS")
+    prompt_system_tokens: int = Field(default=1500, env="PROMPT_SYSTEM_TOKENS")
+    prompt_profile_tokens: int = Field(default=600, env="PROMPT_PROFILE_TOKENS")
+    prompt_history_tokens: int = Field(default=2000, env="PROMPT_HISTORY_TOKENS")
+    prompt_user_message_tokens: int = Field(default=1500, env="PROMPT_USER_MESSAGE_TOKENS")
+    prompt_summary_tokens: int = Field(default=400, env="PROMPT_SUMMARY_TOKENS")
+    
+    # Rolling conversation summary, refreshed in the background every N turns
+    conversation_summary_enabled: bool = Field(default=True, env="CONVERSATION_SUMMARY_ENABLED")
+    conversation_summary_interval_turns: int = Field(default=10, env="CONVERSATION_SUMMARY_INTERVAL_TURNS")
+    conversation_summary_max_turns: int = Field(default=50, env="CONVERSATION_SUMMARY_MAX_TURNS")
+
+    # Conversation flow state (assessments, learning path creation)
+    conversation_state_backend: Literal["memory", "redis"] = Field(default="memory", env="CONVERSATION_STATE_BACKEND")
+    conversation_state_ttl_seconds: int = Field(default=3600, env="CONVERSATION_STATE_TTL_SECONDS")
+    conversation_state_max_entries: int = Field(default=10000, env="CONVERSATION_STATE_MAX_ENTRIES")
+
+    # Intents checked first win when a message matches several (comma-separated)
+    intent_priority: str = Field(
+        default="assessment,learning_path,content_recommendation,resume_analysis,interview_preparation",
+        env="INTENT_PRIORITY"
+    )
+
+    # Per-user lanes: a user's messages are handled one at a time, in order
+    user_lane_enabled: bool = Field(default=True, env="USER_LANE_ENABLED")
+    user_lane_max_queued: int = Field(default=4, env="USER_LANE_MAX_QUEUED")
+    user_lane_coalesce_duplicates: bool = Field(default=False, env="USER_LANE_COALESCE_DUPLICATES")
+
+    # Assessment question bank: follow-up questions served from memory, Gemini only for new skill areas
+    question_bank_enabled: bool = Field(default=True, env="QUESTION_BANK_ENABLED")
+    question_bank_flush_every: int = Field(default=50, env="QUESTION_BANK_FLUSH_EVERY")
+    question_bank_questions_per_difficulty: int = Field(default=8, env="QUESTION_BANK_QUESTIONS_PER_DIFFICULTY")
+
+    # Background jobs: long generations answer 202 Accepted and run on in-app workers
+    job_store_backend: Literal["memory", "redis"] = Field(default="memory", env="JOB_STORE_BACKEND")
+    job_workers: int = Field(default=4, env="JOB_WORKERS")
+    job_queue_size: int = Field(default=100, env="JOB_QUEUE_SIZE")
+    job_timeout_seconds: float = Field(default=300.0, env="JOB_TIMEOUT_SECONDS")
+    job_ttl_seconds: int = Field(default=3600, env="JOB_TTL_SECONDS")
+    job_max_entries: int = Field(default=10000, env="JOB_MAX_ENTRIES")
+
+    # Conversation write-behind: turns are saved in batches off the request path
+    conversation_write_behind_enabled: bool = Field(default=True, env="CONVERSATION_WRITE_BEHIND_ENABLED")
+    conversation_write_queue_size: int = Field(default=1000, env="CONVERSATION_WRITE_QUEUE_SIZE")
+    conversation_write_batch_size: int = Field(default=50, env="CONVERSATION_WRITE_BATCH_SIZE")
+    conversation_write_flush_interval_seconds: float = Field(default=0.2, env="CONVERSATION_WRITE_FLUSH_INTERVAL_SECONDS")
+    conversation_write_max_retries: int = Field(default=3, env="CONVERSATION_WRITE_MAX_RETRIES")
+    conversation_write_retry_backoff_seconds: float = Field(default=0.5, env="CONVERSATION_WRITE_RETRY_BACKOFF_SECONDS")
+
+    # Conversation retention: old turns move from the database to compressed archive files
+    conversation_retention_days: int = Field(default=90, env="CONVERSATION_RETENTION_DAYS")
+    conversation_archive_dir: str = Field(default="archive/conversations", env="CONVERSATION_ARCHIVE_DIR")
+    conversation_archive_chunk_size: int = Field(default=5000, env="CONVERSATION_ARCHIVE_CHUNK_SIZE")
+    conversation_partition_months_ahead: int = Field(default=3, env="CONVERSATION_PARTITION_MONTHS_AHEAD")
+
+    # Offline Gemini stand-in (AI_SERVICE_BACKEND=fake), for load testing and benchmarks
+    fake_ai_latency_median_ms: float = Field(default=800.0, env="FAKE_AI_LATENCY_MEDIAN_MS")
+    fake_ai_latency_p95_ms: float = Field(default=2500.0, env="FAKE_AI_LATENCY_P95_MS")
+    fake_ai_error_rate: float = Field(default=0.0, env="FAKE_AI_ERROR_RATE")
+    fake_ai_rate_limit_rate: float = Field(default=0.0, env="FAKE_AI_RATE_LIMIT_RATE")
+    fake_ai_seed: Optional[int] = Field(default=None, env="FAKE_AI_SEED")
+
+    # AI Response Cache Configuration
+    ai_cache_enabled: bool = Field(default=True, env="AI_CACHE_ENABLED")
+    ai_cache_backend: Literal["memory", "redis"] = Field(default="memory", env="AI_CACHE_BACKEND")
+    ai_cache_max_entries: int = Field(default=1000, env="AI_CACHE_MAX_ENTRIES")
+    ai_cache_ttl_chat_seconds: int = Field(
+        default=900,  # 15 minutes
+        validation_alias=AliasChoices("AI_CACHE_TTL_CHAT", "ai_cache_ttl_chat_seconds")
+    )
+    ai_cache_ttl_reasoning_seconds: int = Field(
+        default=86400,  # 24 hours
+        validation_alias=AliasChoices("AI_CACHE_TTL_REASONING", "ai_cache_ttl_reasoning_seconds")
+    )
+
+    # User context cache, in front of the database
+    user_context_cache_enabled: bool = Field(default=True, env="USER_CONTEXT_CACHE_ENABLED")
+    user_context_cache_backend: Literal["memory", "redis"] = Field(default="memory", env="USER_CONTEXT_CACHE_BACKEND")
+    user_context_cache_ttl_seconds: int = Field(default=300, env="USER_CONTEXT_CACHE_TTL_SECONDS")
+    user_context_cache_max_entries: int = Field(default=10000, env="USER_CONTEXT_CACHE_MAX_ENTRIES")
+
     # Rate Limiting Configuration
-    rate_limit_requests_per_minute: int = Field(default=60, env="RATE_LIMIT_RPM")
-    rate_limit_burst_size: int = Field(default=10, env="RATE_LIMIT_BURST")
+    rate_limit_requests_per_minute: int = Field(
+        default=60,
+        validation_alias=AliasChoices("RATE_LIMIT_RPM", "rate_limit_requests_per_minute")
+    )
+    rate_limit_burst_size: int = Field(
+        default=10,
+        validation_alias=AliasChoices("RATE_LIMIT_BURST", "rate_limit_burst_size")
+    )
+    rate_limit_backend: Literal["memory", "redis"] = Field(default="memory", env="RATE_LIMIT_BACKEND")
+    gemini_max_concurrent_requests: int = Field(
+        default=8,  # per model
+        validation_alias=AliasChoices("GEMINI_MAX_CONCURRENCY", "gemini_max_concurrent_requests")
+    )
     
     # API Server Configuration
     api_host: str = Field(default="0.0.0.0", env="API_HOST")
@@ -48,6 +175,7 @@ class Settings(BaseSettings):
     # Content Recommendation Configuration
     youtube_max_results: int = Field(default=10, env="YOUTUBE_MAX_RESULTS")
     content_cache_ttl_seconds: int = Field(default=3600, env="CONTENT_CACHE_TTL")  # 1 hour
+    content_ingest_batch_size: int = Field(default=500, env="CONTENT_INGEST_BATCH_SIZE")
     
     # Environment Configuration
     environment: Literal["development", "staging", "production"] = Field(
@@ -99,6 +227,11 @@ class Settings(BaseSettings):
         """Check if running in production mode"""
         return self.environment == "production"
     
+    @property
+    def replica_urls(self) -> List[str]:
+        """Read replica URLs from DATABASE_REPLICA_URLS"""
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
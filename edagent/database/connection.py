@@ -2,73 +2,177 @@
 Database connection management and utilities
 """
 
+import itertools
 import logging
-from typing import AsyncGenerator, Optional
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, List, Optional
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import (
     AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
 )
 from sqlalchemy.pool import StaticPool
 from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 
 from ..config.settings import get_settings
 from .models import Base
+from ..utils.metrics import safe_track
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _Pool:
+    """An engine with its session factory, named in monitoring"""
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker
+    sessions: int = 0
+
+
 class DatabaseManager:
-    """Manages database connections and sessions"""
+    """
+    Manages database connections and sessions
+    
+    Writes go to the primary database. Read-only sessions go to the read
+    replicas in DATABASE_REPLICA_URLS in turn, or, without replicas, to a
+    pool of read connections on a SQLite file database. SQLite runs in WAL
+    mode with a single writer connection, as SQLite allows one writer at a
+    time, so reads run alongside the writer instead of queuing behind it.
+    
+    Reads made shortly after a write in the same request or task use the
+    primary, so they see the write even if the replicas lag behind.
+    """
     
     def __init__(self):
-        self._engine: Optional[AsyncEngine] = None
-        self._session_factory: Optional[async_sessionmaker] = None
+        self._primary: Optional[_Pool] = None
+        self._readers: List[_Pool] = []
+        self._reader_turns = itertools.count()
         self.settings = get_settings()
     
+    @property
+    def _engine(self) -> Optional[AsyncEngine]:
+        """Engine of the primary database"""
+        return self._primary.engine if self._primary else None
+    
     async def initialize(self) -> None:
-        """Initialize database engine and session factory"""
-        if self._engine is not None:
+        """Initialize database engines and session factories"""
+        if self._primary is not None:
             return
         
+        database_url = self.settings.database_url
+        replica_urls = self.settings.replica_urls
+        
         # Configure engine based on database URL
-        if self.settings.database_url.startswith("sqlite"):
-            # SQLite configuration
-            self._engine = create_async_engine(
-                self.settings.database_url.replace("sqlite://", "sqlite+aiosqlite://"),
-                echo=self.settings.api_debug,
-                poolclass=StaticPool,
-                connect_args={
-                    "check_same_thread": False,
-                    "timeout": 30
-                }
-            )
+        if database_url.startswith("sqlite"):
+            sqlite_url = database_url.replace("sqlite://", "sqlite+aiosqlite://")
+            if self.settings.sqlite_wal_enabled and not _is_sqlite_memory_url(sqlite_url):
+                engine = self._create_sqlite_engine(sqlite_url, pool_size=1, readonly=False)
+                if not replica_urls:
+                    self._readers.append(self._create_pool("reader", self._create_sqlite_engine(
+                        sqlite_url, pool_size=max(1, self.settings.sqlite_reader_pool_size), readonly=True
+                    )))
+            else:
+                # An in-memory database lives in one connection, so every session shares it
+                engine = create_async_engine(
+                    sqlite_url,
+                    echo=self.settings.api_debug,
+                    poolclass=StaticPool,
+                    connect_args={
+                        "check_same_thread": False,
+                        "timeout": self.settings.sqlite_busy_timeout_seconds
+                    }
+                )
+                _configure_sqlite_connections(engine, ["PRAGMA foreign_keys=ON"])
         else:
-            # PostgreSQL configuration
-            self._engine = create_async_engine(
-                self.settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
-                echo=self.settings.api_debug,
-                pool_size=self.settings.database_pool_size,
-                max_overflow=self.settings.database_max_overflow,
-                pool_pre_ping=True,
-                pool_recycle=3600  # Recycle connections every hour
+            engine = self._create_postgresql_engine(database_url)
+        
+        _track_writes(engine)
+        self._primary = self._create_pool("primary", engine)
+        
+        for index, url in enumerate(replica_urls, start=1):
+            if url.startswith("sqlite"):
+                replica_engine = self._create_sqlite_engine(
+                    url.replace("sqlite://", "sqlite+aiosqlite://"),
+                    pool_size=max(1, self.settings.sqlite_reader_pool_size),
+                    readonly=True
+                )
+            else:
+                replica_engine = self._create_postgresql_engine(url)
+            self._readers.append(self._create_pool(f"replica-{index}", replica_engine))
+            logger.info(f"Read replica {index} initialized with URL: {_mask_db_url(url)}")
+        
+        logger.info(f"Database engine initialized with URL: {_mask_db_url(database_url)}")
+    
+    def _create_pool(self, name: str, engine: AsyncEngine) -> _Pool:
+        """Wrap an engine with a session factory"""
+        return _Pool(
+            name=name,
+            engine=engine,
+            session_factory=async_sessionmaker(
+                bind=engine,
+                class_=AsyncSession,
+                expire_on_commit=False
             )
+        )
+    
+    def _create_postgresql_engine(self, url: str) -> AsyncEngine:
+        """Create a pooled PostgreSQL engine"""
+        return create_async_engine(
+            url.replace("postgresql://", "postgresql+asyncpg://"),
+            echo=self.settings.api_debug,
+            pool_size=self.settings.database_pool_size,
+            max_overflow=self.settings.database_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=3600  # Recycle connections every hour
+        )
+    
+    def _create_sqlite_engine(self, url: str, pool_size: int, readonly: bool) -> AsyncEngine:
+        """
+        Create a WAL-mode SQLite engine for the writer or the readers
         
-        # Enable foreign key constraints for SQLite
-        if self.settings.database_url.startswith("sqlite"):
-            @event.listens_for(Engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
-        
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
-            class_=AsyncSession,
-            expire_on_commit=False
+        Args:
+            url: aiosqlite database URL
+            pool_size: Number of connections
+            readonly: Whether connections refuse writes
+            
+        Returns:
+            Configured engine
+        """
+        busy_timeout = self.settings.sqlite_busy_timeout_seconds
+        engine = create_async_engine(
+            url,
+            echo=self.settings.api_debug,
+            pool_size=pool_size,
+            max_overflow=0,
+            # Waiting for a free connection is bounded like waiting for the SQLite lock
+            pool_timeout=busy_timeout,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": busy_timeout
+            }
         )
         
-        logger.info(f"Database engine initialized with URL: {self._mask_db_url()}")
+        pragmas = [
+            "PRAGMA foreign_keys=ON",
+            f"PRAGMA busy_timeout={int(busy_timeout * 1000)}",
+            "PRAGMA journal_mode=WAL",
+            f"PRAGMA synchronous={self.settings.sqlite_synchronous}",
+            f"PRAGMA cache_size=-{self.settings.sqlite_cache_size_mb * 1024}",
+            f"PRAGMA mmap_size={self.settings.sqlite_mmap_size_mb * 1024 * 1024}",
+            "PRAGMA temp_store=MEMORY"
+        ]
+        if readonly:
+            pragmas.append("PRAGMA query_only=ON")
+        
+        # The writer takes the write lock when its transaction begins, so a
+        # transaction that reads before writing waits out the busy timeout
+        # instead of failing when another process holds the lock. Readers
+        # begin explicitly so every query in a session sees one snapshot.
+        _configure_sqlite_connections(engine, pragmas, begin="BEGIN" if readonly else "BEGIN IMMEDIATE")
+        return engine
     
     async def create_tables(self) -> None:
         """Create all database tables"""
@@ -91,12 +195,27 @@ class DatabaseManager:
         logger.info("Database tables dropped successfully")
     
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get database session with automatic cleanup"""
-        if self._session_factory is None:
+    async def get_session(self, readonly: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get database session with automatic cleanup
+        
+        Args:
+            readonly: Use a read replica or read connection. The session must
+                not write. It sees what was committed before it started,
+                less any replication lag; after a recent write in the same
+                request it uses the primary instead. Without read pools the
+                primary is used.
+        """
+        if self._primary is None:
             await self.initialize()
         
-        async with self._session_factory() as session:
+        pool = self._primary
+        if readonly and self._readers and not _wrote_recently(self.settings.database_read_your_writes_seconds):
+            pool = self._readers[next(self._reader_turns) % len(self._readers)]
+        pool.sessions += 1
+        safe_track("track_database_session", pool.name)
+        
+        async with pool.session_factory() as session:
             try:
                 yield session
                 await session.commit()
@@ -106,27 +225,113 @@ class DatabaseManager:
             finally:
                 await session.close()
     
+    def pool_info(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get connection counts for the primary and each read pool
+        
+        Returns:
+            Dictionary of pool name to size, checked in, checked out,
+            overflow and sessions opened
+        """
+        info = {}
+        for pool in [self._primary, *self._readers] if self._primary else []:
+            connections = pool.engine.pool
+            info[pool.name] = {
+                "pool_size": getattr(connections, 'size', lambda: 0)(),
+                "checked_in": getattr(connections, 'checkedin', lambda: 0)(),
+                "checked_out": getattr(connections, 'checkedout', lambda: 0)(),
+                "overflow": getattr(connections, 'overflow', lambda: 0)(),
+                "sessions": pool.sessions
+            }
+        return info
+    
     async def close(self) -> None:
-        """Close database engine and cleanup connections"""
-        if self._engine is not None:
-            await self._engine.dispose()
-            self._engine = None
-            self._session_factory = None
+        """Close database engines and cleanup connections"""
+        if self._primary is not None:
+            for pool in [self._primary, *self._readers]:
+                await pool.engine.dispose()
+            self._primary = None
+            self._readers = []
             logger.info("Database connections closed")
+
+
+def _is_sqlite_memory_url(url: str) -> bool:
+    """Whether a SQLite URL names an in-memory database rather than a file"""
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def _mask_db_url(url: str) -> str:
+    """Mask sensitive information in database URL for logging"""
+    if "@" in url:
+        # Mask password in URL
+        parts = url.split("@")
+        if ":" in parts[0]:
+            user_pass = parts[0].split(":")
+            if len(user_pass) >= 3:  # protocol:user:pass
+                user_pass[2] = "***"
+                parts[0] = ":".join(user_pass)
+        return "@".join(parts)
+    return url
+
+
+# When the current request or task last wrote to the primary (monotonic seconds)
+_last_write: ContextVar[Optional[float]] = ContextVar("database_last_write", default=None)
+
+_WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def mark_recent_write() -> None:
+    """
+    Send the current request's reads to the primary for a while
+    
+    Writes through get_session() are noticed automatically; call this after
+    waiting for a write made elsewhere, e.g. by a background writer.
+    """
+    _last_write.set(time.monotonic())
+
+
+def _wrote_recently(window_seconds: float) -> bool:
+    last_write = _last_write.get()
+    return last_write is not None and time.monotonic() - last_write < window_seconds
+
+
+def _track_writes(engine: AsyncEngine) -> None:
+    """Note writes to the primary in the context of the request making them"""
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def note_write(conn, cursor, statement, parameters, context, executemany):
+        # Textual SQL has no compiled statement to ask, so look at the keyword
+        if (
+            context.isinsert or context.isupdate or context.isdelete
+            or statement.lstrip()[:7].upper().startswith(_WRITE_STATEMENTS)
+        ):
+            mark_recent_write()
+
+
+def _configure_sqlite_connections(engine: AsyncEngine, pragmas: List[str], begin: Optional[str] = None) -> None:
+    """
+    Run pragmas on each new connection of an engine
+    
+    Args:
+        engine: SQLite engine
+        pragmas: Statements run when a connection is opened
+        begin: Statement that starts transactions, replacing the driver's
+            implicit BEGIN
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        if begin:
+            # Turn off the driver's own transaction handling so the begin event decides
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
     
-    def _mask_db_url(self) -> str:
-        """Mask sensitive information in database URL for logging"""
-        url = self.settings.database_url
-        if "@" in url:
-            # Mask password in URL
-            parts = url.split("@")
-            if ":" in parts[0]:
-                user_pass = parts[0].split(":")
-                if len(user_pass) >= 3:  # protocol:user:pass
-                    user_pass[2] = "***"
-                    parts[0] = ":".join(user_pass)
-            return "@".join(parts)
-        return url
+    if begin:
+        @event.listens_for(engine.sync_engine, "begin")
+        def begin_transaction(conn):
+            conn.exec_driver_sql(begin)
 
 
 # Global database manager instance
@@ -177,20 +382,22 @@ async def get_database_info() -> dict:
     Get database information for monitoring
     
     Returns:
-        Dictionary with database information
+        Dictionary with the primary's connection counts and, under "pools",
+        the counts for the primary and every read pool
     """
     try:
         if db_manager._engine is None:
             return {"status": "not_initialized"}
         
-        pool = db_manager._engine.pool
+        pools = db_manager.pool_info()
         return {
             "status": "connected",
-            "pool_size": getattr(pool, 'size', lambda: 0)(),
-            "checked_in": getattr(pool, 'checkedin', lambda: 0)(),
-            "checked_out": getattr(pool, 'checkedout', lambda: 0)(),
-            "overflow": getattr(pool, 'overflow', lambda: 0)(),
+            "pool_size": pools["primary"]["pool_size"],
+            "checked_in": pools["primary"]["checked_in"],
+            "checked_out": pools["primary"]["checked_out"],
+            "overflow": pools["primary"]["overflow"],
+            "pools": pools
         }
     except Exception as e:
         logger.error(f"Failed to get database info: {e}")
-        return {"status": "error", "error": str(e)}
\ No newline at end of file
+        return {"status": "error", "error": str(e)}
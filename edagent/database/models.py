@@ -30,6 +30,8 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_active = Column(DateTime(timezone=True), onupdate=func.now())
     preferences = Column(JSON, default=dict)
+    conversation_summary = Column(Text, nullable=True)  # Rolling summary of older conversations
+    summarized_through = Column(DateTime(timezone=True), nullable=True)  # Newest conversation in the summary
     
     # Relationships
     skills = relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
@@ -76,6 +78,15 @@ class Conversation(Base):
     # Relationship
     user = relationship("User", back_populates="conversations")
     
+    # History is read newest first per user; id breaks timestamp ties for paging.
+    # Retention finds old turns by timestamp. On PostgreSQL the table is also
+    # partitioned by month on timestamp, with (id, timestamp) as its primary
+    # key (see database/partitions.py).
+    __table_args__ = (
+        Index('idx_conversations_user_id_timestamp', 'user_id', 'timestamp', 'id'),
+        Index('idx_conversations_timestamp', 'timestamp', 'id'),
+    )
+    
     def __repr__(self) -> str:
         return f"<Conversation(id={self.id}, user_id={self.user_id}, type={self.message_type})>"
 
@@ -140,10 +151,60 @@ class ContentRecommendation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_verified = Column(DateTime(timezone=True), server_default=func.now())
     
+    # skill_tags again, one row per tag, so tag search can use an index
+    tag_index = relationship("ContentSkillTag", back_populates="content", cascade="all, delete-orphan")
+    
+    # One row per URL, so crawls refresh content instead of duplicating it
+    __table_args__ = (
+        Index('idx_content_recommendations_url', 'url', unique=True),
+    )
+    
     def __repr__(self) -> str:
         return f"<ContentRecommendation(title={self.title}, platform={self.platform})>"
 
 
+class ContentSkillTag(Base):
+    """Index of cached content by normalized skill tag"""
+    __tablename__ = "content_skill_tags"
+    
+    skill_tag = Column(String(100), primary_key=True)  # lowercase, single-spaced
+    content_id = Column(
+        UUID(as_uuid=True), ForeignKey("content_recommendations.id", ondelete="CASCADE"), primary_key=True
+    )
+    
+    content = relationship("ContentRecommendation", back_populates="tag_index")
+    
+    # The primary key finds content by tag; this index finds a content item's tags
+    __table_args__ = (
+        Index('idx_content_skill_tags_content_id', 'content_id'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ContentSkillTag(skill_tag={self.skill_tag}, content_id={self.content_id})>"
+
+
+class AssessmentQuestion(Base):
+    """Pre-generated skill assessment questions and how often they are used"""
+    __tablename__ = "assessment_questions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    skill_area = Column(String(100), nullable=False)  # normalized, e.g. web_development
+    difficulty = Column(String(20), nullable=False)  # beginner, intermediate, advanced
+    question = Column(Text, nullable=False)
+    source = Column(String(20), nullable=False, default="batch")  # template, batch, live
+    times_served = Column(Integer, nullable=False, default=0)
+    times_answered = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_served_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint('skill_area', 'difficulty', 'question', name='unique_assessment_question'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AssessmentQuestion(skill_area={self.skill_area}, difficulty={self.difficulty})>"
+
+
 class UserSession(Base):
     """User session management"""
     __tablename__ = "user_sessions"
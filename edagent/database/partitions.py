@@ -0,0 +1,156 @@
+"""
+Monthly partitions of the conversations table
+
+On PostgreSQL the conversations table is range partitioned by month on
+timestamp (migration b7c3e9f1a2d4). Each month's turns live in their own
+table, conversations_pYYYYMM, and a default partition takes turns from
+months that have no partition yet. Retention archives and drops whole
+months instead of deleting rows from one ever-growing table.
+
+SQLite, and PostgreSQL databases created without the migration, keep a
+plain table: these functions then find no partitions and retention falls
+back to deleting old rows in chunks.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = "conversations"
+PARTITION_PREFIX = "conversations_p"
+
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month a moment falls in"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """The first of the month a number of months after (or before) a month start"""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+@dataclass(frozen=True)
+class MonthPartition:
+    """A partition holding one month of conversations"""
+    start: datetime
+
+    @property
+    def name(self) -> str:
+        return f"{PARTITION_PREFIX}{self.start:%Y%m}"
+
+    @property
+    def end(self) -> datetime:
+        return add_months(self.start, 1)
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    """Whether the conversations table is a partitioned PostgreSQL table"""
+    if session.bind.dialect.name != "postgresql":
+        return False
+    result = await session.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": PARTITIONED_TABLE}
+    )
+    return result.first() is not None
+
+
+async def list_partitions(session: AsyncSession) -> List[MonthPartition]:
+    """
+    List the monthly partitions of the conversations table
+
+    Args:
+        session: Database session
+
+    Returns:
+        Monthly partitions, oldest first; empty if the table is not partitioned
+    """
+    if not await is_partitioned(session):
+        return []
+
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARTITIONED_TABLE}
+    )
+    partitions = []
+    for (name,) in result.all():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions.append(MonthPartition(datetime(year, month, 1, tzinfo=timezone.utc)))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+async def create_partitions(
+    session: AsyncSession,
+    months_ahead: int,
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create the partitions for this month and the months ahead that are missing
+
+    A month whose turns already went to the default partition is skipped
+    (PostgreSQL refuses the partition); its turns stay in the default
+    partition until retention archives them.
+
+    Args:
+        session: Database session
+        months_ahead: Months after the current one to create partitions for
+        now: Current time (default: now)
+
+    Returns:
+        Names of the partitions created
+    """
+    if not await is_partitioned(session):
+        return []
+
+    existing = {partition.name for partition in await list_partitions(session)}
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(months_ahead + 1):
+        partition = MonthPartition(add_months(current, offset))
+        if partition.name in existing:
+            continue
+        try:
+            async with session.begin_nested():
+                await session.execute(text(
+                    f"CREATE TABLE {partition.name} PARTITION OF {PARTITIONED_TABLE} "
+                    f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+                ))
+            created.append(partition.name)
+        except Exception as e:
+            logger.warning(f"Could not create conversation partition {partition.name}: {e}")
+
+    if created:
+        logger.info(f"Created conversation partitions: {', '.join(created)}")
+    return created
+
+
+async def drop_partition(session: AsyncSession, partition: MonthPartition) -> None:
+    """
+    Detach a month's partition from the conversations table and drop it
+
+    Args:
+        session: Database session
+        partition: Partition whose turns have been archived
+    """
+    await session.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {partition.name}"))
+    await session.execute(text(f"DROP TABLE {partition.name}"))
+    logger.info(f"Dropped conversation partition {partition.name}")
@@ -0,0 +1,49 @@
+"""
+Shared Redis client management
+"""
+
+import logging
+from typing import Dict, Optional, Any
+
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Clients are cached per URL so every service shares one connection pool
+_redis_clients: Dict[str, Any] = {}
+
+
+def get_redis_client(redis_url: Optional[str] = None) -> Optional[Any]:
+    """
+    Get a shared asyncio Redis client
+
+    Args:
+        redis_url: Redis connection URL, defaults to settings.redis_url
+
+    Returns:
+        redis.asyncio.Redis instance or None if Redis is not configured
+    """
+    url = redis_url or get_settings().redis_url
+    if not url:
+        return None
+
+    client = _redis_clients.get(url)
+    if client is None:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(url, decode_responses=True)
+        _redis_clients[url] = client
+        logger.info("Redis client created")
+
+    return client
+
+
+async def close_redis_clients() -> None:
+    """Close all shared Redis clients"""
+    for url, client in list(_redis_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
+    _redis_clients.clear()
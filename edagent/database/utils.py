@@ -3,17 +3,41 @@ Database utility functions for common operations
 """
 
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
-from sqlalchemy import select, update, delete, func
+import uuid
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update, delete, func, insert, or_, any_, bindparam, String, Select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
-from .models import User, UserSkill, Conversation, LearningPath, Milestone, ContentRecommendation
+from .models import (
+    User, UserSkill, Conversation, LearningPath, Milestone, ContentRecommendation, ContentSkillTag,
+    AssessmentQuestion
+)
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_skill_tags(skill_tags: Sequence[str]) -> List[str]:
+    """
+    Normalize skill tags for the content tag index
+    
+    Args:
+        skill_tags: Tags as given, e.g. ["Python", " web  development", "python"]
+        
+    Returns:
+        Lowercase, single-spaced tags without blanks or duplicates, in order
+    """
+    normalized = []
+    for tag in skill_tags:
+        tag = " ".join(str(tag).lower().split())[:100]
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
 class DatabaseUtils:
     """Utility class for common database operations"""
     
@@ -70,27 +94,91 @@ class DatabaseUtils:
         return result.scalar_one_or_none()
     
     @staticmethod
-    async def get_user_by_id(session: AsyncSession, user_id) -> Optional[User]:
+    async def get_user_by_id(
+        session: AsyncSession,
+        user_id,
+        relationships: Sequence[str] = ()
+    ) -> Optional[User]:
         """
-        Get user by ID with all relationships loaded
+        Get user by ID
         
         Args:
             session: Database session
             user_id: User ID
+            relationships: Relationships to load with the user: "skills",
+                "conversations" and/or "learning_paths" (with milestones).
+                Anything not listed is left unloaded.
             
         Returns:
             User instance or None if not found
         """
+        loaders = {
+            "skills": selectinload(User.skills),
+            "conversations": selectinload(User.conversations),
+            "learning_paths": selectinload(User.learning_paths).selectinload(LearningPath.milestones)
+        }
+        unknown = set(relationships) - set(loaders)
+        if unknown:
+            raise ValueError(f"Unknown user relationships: {sorted(unknown)}")
+        
+        result = await session.execute(
+            select(User)
+            .options(*(loaders[name] for name in relationships))
+            .where(User.id == user_id)
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def load_user_context(
+        session: AsyncSession,
+        user_id,
+        recent_conversations: int = 5
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load only what is needed to build a user's conversation context
+        
+        Reads the profile columns, the user's skills and the most recent
+        conversations, limited in SQL, so the cost does not grow with the
+        length of the user's history.
+        
+        Args:
+            session: Database session
+            user_id: User ID
+            recent_conversations: Number of most recent conversations to load
+            
+        Returns:
+            Dictionary with the "user" (profile columns and skills loaded) and
+            its "recent_conversations" as (message, response, timestamp) rows,
+            oldest first; None if the user is not found
+        """
         result = await session.execute(
             select(User)
             .options(
-                selectinload(User.skills),
-                selectinload(User.conversations),
-                selectinload(User.learning_paths).selectinload(LearningPath.milestones)
+                load_only(
+                    User.id, User.preferences, User.created_at, User.last_active,
+                    User.conversation_summary
+                ),
+                selectinload(User.skills).load_only(
+                    UserSkill.skill_name, UserSkill.level, UserSkill.confidence_score, UserSkill.updated_at
+                )
             )
             .where(User.id == user_id)
         )
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        
+        conversations = []
+        if recent_conversations > 0:
+            result = await session.execute(
+                select(Conversation.message, Conversation.response, Conversation.timestamp)
+                .where(Conversation.user_id == user_id)
+                .order_by(Conversation.timestamp.desc())
+                .limit(recent_conversations)
+            )
+            conversations = list(reversed(result.all()))
+        
+        return {"user": user, "recent_conversations": conversations}
     
     @staticmethod
     async def update_user_preferences(
@@ -221,31 +309,136 @@ class DatabaseUtils:
         logger.info(f"Added conversation entry for user {user_id}, type: {message_type}")
         return conversation
     
+    @staticmethod
+    async def add_conversations(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert conversation entries in one multi-row statement
+        
+        Args:
+            session: Database session
+            rows: Column values per conversation; id and timestamp are set by
+                the caller so that turns keep the order they happened in
+        """
+        if not rows:
+            return
+        await session.execute(insert(Conversation), rows)
+        logger.debug(f"Inserted {len(rows)} conversation entries")
+    
     @staticmethod
     async def get_conversation_history(
         session: AsyncSession,
         user_id,
         limit: int = 50,
-        message_type: Optional[str] = None
+        message_type: Optional[str] = None,
+        before: Optional[Tuple[datetime, Any]] = None,
+        after: Optional[Tuple[datetime, Any]] = None
     ) -> List[Conversation]:
         """
-        Get conversation history for a user
+        Get a page of conversation history for a user
+        
+        Pages are found by seeking the (user_id, timestamp, id) index from
+        the (timestamp, id) key of a conversation, so every page costs the
+        same however far back it is.
         
         Args:
             session: Database session
             user_id: User ID
             limit: Maximum number of conversations to return
             message_type: Filter by message type (optional)
+            before: Only return conversations older than this (timestamp, id) key
+            after: Only return conversations newer than this (timestamp, id) key;
+                the ones right after it when both are given
             
         Returns:
-            List of Conversation instances
+            List of Conversation instances, newest first
         """
         query = select(Conversation).where(Conversation.user_id == user_id)
         
         if message_type:
             query = query.where(Conversation.message_type == message_type)
         
-        query = query.order_by(Conversation.timestamp.desc()).limit(limit)
+        # The plain timestamp bound lets the database seek the index; the
+        # second condition only breaks ties within that timestamp
+        if before is not None:
+            timestamp, conversation_id = before
+            query = query.where(
+                Conversation.timestamp <= timestamp,
+                or_(Conversation.timestamp < timestamp, Conversation.id < conversation_id)
+            )
+        
+        if after is not None:
+            timestamp, conversation_id = after
+            query = query.where(
+                Conversation.timestamp >= timestamp,
+                or_(Conversation.timestamp > timestamp, Conversation.id > conversation_id)
+            )
+            # Take the conversations adjacent to the key, then return them newest first
+            query = query.order_by(Conversation.timestamp.asc(), Conversation.id.asc()).limit(limit)
+            result = await session.execute(query)
+            return list(reversed(result.scalars().all()))
+        
+        query = query.order_by(Conversation.timestamp.desc(), Conversation.id.desc()).limit(limit)
+        
+        result = await session.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def count_conversations(session: AsyncSession, user_id) -> int:
+        """
+        Count a user's conversations
+        
+        Args:
+            session: Database session
+            user_id: User ID
+            
+        Returns:
+            Number of conversations (turns) the user has
+        """
+        # Answered from the (user_id, timestamp, id) index without reading rows
+        result = await session.execute(
+            select(func.count()).select_from(Conversation).where(Conversation.user_id == user_id)
+        )
+        return result.scalar_one()
+    
+    @staticmethod
+    async def get_conversations_since(
+        session: AsyncSession,
+        user_id,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+        exclude_newest: int = 0
+    ) -> List[Conversation]:
+        """
+        Get the oldest conversations newer than a timestamp
+        
+        Args:
+            session: Database session
+            user_id: User ID
+            since: Only return conversations after this time (all if None)
+            limit: Maximum number of conversations to return
+            exclude_newest: Leave out the user's N most recent conversations
+        
+        Returns:
+            List of Conversation instances, oldest first
+        """
+        query = select(Conversation).where(Conversation.user_id == user_id)
+        
+        if since is not None:
+            query = query.where(Conversation.timestamp > since)
+        
+        if exclude_newest > 0:
+            # NULL when the user has fewer conversations, which matches nothing
+            cutoff = (
+                select(Conversation.timestamp)
+                .where(Conversation.user_id == user_id)
+                .order_by(Conversation.timestamp.desc())
+                .offset(exclude_newest - 1)
+                .limit(1)
+                .scalar_subquery()
+            )
+            query = query.where(Conversation.timestamp < cutoff)
+        
+        query = query.order_by(Conversation.timestamp.asc()).limit(limit)
         
         result = await session.execute(query)
         return result.scalars().all()
@@ -397,52 +590,187 @@ class DatabaseUtils:
             difficulty_level: Difficulty level
             
         Returns:
-            ContentRecommendation instance
+            ContentRecommendation instance, the existing one if the URL was cached before
         """
-        content = ContentRecommendation(
-            title=title,
-            url=url,
-            platform=platform,
-            content_type=content_type,
-            duration_minutes=duration_minutes,
-            rating=rating,
-            is_free=is_free,
-            skill_tags=skill_tags or [],
-            difficulty_level=difficulty_level
+        result = await session.execute(
+            select(ContentRecommendation)
+            .options(selectinload(ContentRecommendation.tag_index))
+            .where(ContentRecommendation.url == url)
         )
-        session.add(content)
+        content = result.scalar_one_or_none()
+        if content is None:
+            content = ContentRecommendation(url=url)
+            session.add(content)
+        else:
+            content.last_verified = datetime.utcnow()
+        
+        content.title = title
+        content.platform = platform
+        content.content_type = content_type
+        content.duration_minutes = duration_minutes
+        content.rating = rating
+        content.is_free = is_free
+        content.skill_tags = skill_tags or []
+        content.difficulty_level = difficulty_level
+        content.tag_index = [ContentSkillTag(skill_tag=tag) for tag in normalize_skill_tags(skill_tags or [])]
         logger.info(f"Cached content recommendation: {title} from {platform}")
         return content
     
+    @staticmethod
+    async def upsert_content_recommendations(
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+        verified_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Insert or refresh cached content in one statement, matched by URL
+        
+        Content already cached under a URL keeps its id and created_at; its
+        other columns are overwritten, last_verified is set to verified_at and
+        its skill tag index rows are replaced.
+        
+        Args:
+            session: Database session
+            rows: Column values per content item (title, url, platform, content_type,
+                duration_minutes, rating, is_free, skill_tags, difficulty_level)
+            verified_at: When the content was verified (default: now)
+            
+        Returns:
+            Number of content items inserted or refreshed
+        """
+        # A URL may appear only once per statement; the last copy wins
+        by_url = {row["url"]: row for row in rows}
+        if not by_url:
+            return 0
+        
+        verified_at = verified_at or datetime.utcnow()
+        values = [
+            {
+                "id": uuid.uuid5(uuid.NAMESPACE_URL, url),
+                "title": row["title"],
+                "url": url,
+                "platform": row["platform"],
+                "content_type": row["content_type"],
+                "duration_minutes": row.get("duration_minutes"),
+                "rating": row.get("rating"),
+                "is_free": row.get("is_free", True),
+                "skill_tags": row.get("skill_tags") or [],
+                "difficulty_level": row.get("difficulty_level"),
+                "last_verified": verified_at
+            }
+            for url, row in by_url.items()
+        ]
+        
+        # Executed with the rows as parameters, so the statement is compiled once
+        # and sent in pages of rows rather than once per row
+        table = ContentRecommendation.__table__
+        if session.bind.dialect.name == "postgresql":
+            stmt = postgresql_insert(table)
+        else:
+            stmt = sqlite_insert(table)
+        refreshed = {
+            column: stmt.excluded[column]
+            for column in values[0]
+            if column not in ("id", "url")
+        }
+        stmt = stmt.on_conflict_do_update(index_elements=["url"], set_=refreshed).returning(table.c.id, table.c.url)
+        ids = {url: content_id for content_id, url in (await session.execute(stmt, values)).all()}
+        
+        # Re-index the tags, which may have changed since the content was last crawled
+        await session.execute(delete(ContentSkillTag).where(ContentSkillTag.content_id.in_(ids.values())))
+        tag_rows = [
+            {"skill_tag": tag, "content_id": ids[row["url"]]}
+            for row in values
+            for tag in normalize_skill_tags(row["skill_tags"])
+        ]
+        if tag_rows:
+            await session.execute(insert(ContentSkillTag), tag_rows)
+        
+        logger.debug(f"Upserted {len(ids)} content recommendations")
+        return len(ids)
+    
     @staticmethod
     async def search_cached_content(
         session: AsyncSession,
         skill_tags: List[str],
         content_type: Optional[str] = None,
         is_free: Optional[bool] = None,
-        limit: int = 10
+        limit: int = 10,
+        match_all: bool = False
     ) -> List[ContentRecommendation]:
         """
         Search cached content recommendations
         
+        Content matching more of the skill tags ranks first, then higher
+        rated content. Tags are compared case-insensitively.
+        
         Args:
             session: Database session
             skill_tags: List of skill tags to search for
             content_type: Filter by content type
             is_free: Filter by free/paid content
             limit: Maximum number of results
+            match_all: Only return content tagged with every skill tag
             
         Returns:
             List of ContentRecommendation instances
         """
+        query = DatabaseUtils.build_content_search_query(
+            session.get_bind().dialect.name, skill_tags, content_type, is_free, limit, match_all
+        )
+        result = await session.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    def build_content_search_query(
+        dialect_name: str,
+        skill_tags: List[str],
+        content_type: Optional[str] = None,
+        is_free: Optional[bool] = None,
+        limit: int = 10,
+        match_all: bool = False
+    ) -> Select:
+        """
+        Build the cached content search, ranked in SQL
+        
+        Tags are looked up in the content_skill_tags primary key and counted
+        per content item, so only matching content is read. PostgreSQL gets
+        the tags as one array parameter and sorts unrated content last with
+        NULLS LAST; SQLite gets one parameter per tag and an IS NULL sort key.
+        
+        Args:
+            dialect_name: Name of the SQL dialect, e.g. "postgresql" or "sqlite"
+            skill_tags: List of skill tags to search for
+            content_type: Filter by content type
+            is_free: Filter by free/paid content
+            limit: Maximum number of results
+            match_all: Only return content tagged with every skill tag
+            
+        Returns:
+            Select statement for ContentRecommendation rows
+        """
         query = select(ContentRecommendation)
+        tags = normalize_skill_tags(skill_tags)
         
-        # Filter by skill tags (PostgreSQL JSON contains, SQLite fallback)
-        if skill_tags:
-            # This works for PostgreSQL with JSON column
-            # For SQLite, we'd need a different approach
-            for tag in skill_tags:
-                query = query.where(ContentRecommendation.skill_tags.contains([tag]))
+        if tags:
+            if dialect_name == "postgresql":
+                tag_filter = ContentSkillTag.skill_tag == any_(bindparam("skill_tags", tags, type_=ARRAY(String)))
+            else:
+                tag_filter = ContentSkillTag.skill_tag.in_(tags)
+            
+            matches = (
+                select(ContentSkillTag.content_id, func.count().label("matched_tags"))
+                .where(tag_filter)
+                .group_by(ContentSkillTag.content_id)
+            )
+            if match_all:
+                matches = matches.having(func.count() == len(tags))
+            matches = matches.subquery()
+            
+            query = (
+                query.join(matches, matches.c.content_id == ContentRecommendation.id)
+                .order_by(matches.c.matched_tags.desc())
+            )
         
         if content_type:
             query = query.where(ContentRecommendation.content_type == content_type)
@@ -450,34 +778,174 @@ class DatabaseUtils:
         if is_free is not None:
             query = query.where(ContentRecommendation.is_free == is_free)
         
-        query = query.order_by(ContentRecommendation.rating.desc()).limit(limit)
+        if dialect_name == "postgresql":
+            query = query.order_by(ContentRecommendation.rating.desc().nulls_last())
+        else:
+            query = query.order_by(ContentRecommendation.rating.is_(None), ContentRecommendation.rating.desc())
         
-        result = await session.execute(query)
+        return query.order_by(ContentRecommendation.id).limit(limit)
+    
+    @staticmethod
+    async def get_assessment_questions(session: AsyncSession) -> List[AssessmentQuestion]:
+        """
+        Get every banked assessment question
+        
+        Args:
+            session: Database session
+            
+        Returns:
+            List of assessment questions with their usage counts
+        """
+        result = await session.execute(select(AssessmentQuestion))
         return result.scalars().all()
     
     @staticmethod
-    async def cleanup_old_conversations(
+    async def add_assessment_questions(session: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert assessment questions that are not banked yet
+        
+        Args:
+            session: Database session
+            rows: Column values per question, including id
+            
+        Returns:
+            Number of questions inserted
+        """
+        if not rows:
+            return 0
+        
+        # Another worker may have banked the same question meanwhile
+        existing = await session.execute(
+            select(AssessmentQuestion.skill_area, AssessmentQuestion.difficulty, AssessmentQuestion.question)
+            .where(AssessmentQuestion.skill_area.in_({row["skill_area"] for row in rows}))
+        )
+        known = set(existing.all())
+        new_rows = [
+            row for row in rows
+            if (row["skill_area"], row["difficulty"], row["question"]) not in known
+        ]
+        if new_rows:
+            await session.execute(insert(AssessmentQuestion), new_rows)
+        logger.debug(f"Inserted {len(new_rows)} assessment questions")
+        return len(new_rows)
+    
+    @staticmethod
+    async def record_assessment_question_usage(
         session: AsyncSession,
-        days_to_keep: int = 30
-    ) -> int:
+        usage: Dict[Any, Tuple[int, int]],
+        served_at: Optional[datetime] = None
+    ) -> None:
         """
-        Clean up old conversation records
+        Add to the usage counts of assessment questions
+        
+        Counts are incremented in the database rather than overwritten, so
+        workers serving the same questions do not lose each other's counts.
         
         Args:
             session: Database session
-            days_to_keep: Number of days to keep conversations
+            usage: (times served, times answered) to add per question id
+            served_at: When the questions were last served
+        """
+        served_at = served_at or datetime.utcnow()
+        for question_id, (served, answered) in usage.items():
+            values = {
+                "times_served": AssessmentQuestion.times_served + served,
+                "times_answered": AssessmentQuestion.times_answered + answered
+            }
+            if served:
+                values["last_served_at"] = served_at
+            await session.execute(
+                update(AssessmentQuestion)
+                .where(AssessmentQuestion.id == question_id)
+                .values(**values)
+            )
+    
+    @staticmethod
+    async def get_conversations_before(
+        session: AsyncSession,
+        cutoff: datetime,
+        limit: int,
+        since: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, Any]] = None
+    ) -> List[Conversation]:
+        """
+        Get the oldest conversations older than a cutoff, for all users
+        
+        Args:
+            session: Database session
+            cutoff: Only return conversations older than this
+            limit: Maximum number of conversations to return
+            since: Only return conversations from this time on
+            after: Only return conversations after this (timestamp, id) key
+            
+        Returns:
+            List of Conversation instances, oldest first
+        """
+        query = select(Conversation).where(Conversation.timestamp < cutoff)
+        if since is not None:
+            query = query.where(Conversation.timestamp >= since)
+        if after is not None:
+            timestamp, conversation_id = after
+            query = query.where(
+                Conversation.timestamp >= timestamp,
+                or_(Conversation.timestamp > timestamp, Conversation.id > conversation_id)
+            )
+        query = query.order_by(Conversation.timestamp.asc(), Conversation.id.asc()).limit(limit)
+        
+        result = await session.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def delete_conversations(session: AsyncSession, conversations: Sequence[Conversation]) -> int:
+        """
+        Delete conversations by id
+        
+        Args:
+            session: Database session
+            conversations: Conversations to delete
             
         Returns:
             Number of deleted records
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+        if not conversations:
+            return 0
         
+        # The timestamp bound lets PostgreSQL skip the partitions of later months
         result = await session.execute(
             delete(Conversation)
-            .where(Conversation.timestamp < cutoff_date)
+            .where(
+                Conversation.id.in_([conversation.id for conversation in conversations]),
+                Conversation.timestamp <= max(conversation.timestamp for conversation in conversations)
+            )
+            .execution_options(synchronize_session=False)
         )
+        return result.rowcount
+    
+    @staticmethod
+    async def cleanup_old_conversations(
+        session: AsyncSession,
+        days_to_keep: int = 30,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Delete the oldest batch of conversation records past retention
+        
+        At most batch_size records are deleted, so the transaction stays
+        short; call again in a new transaction until it returns 0. To keep
+        the records, archive them with ConversationArchiver instead.
+        
+        Args:
+            session: Database session
+            days_to_keep: Number of days to keep conversations
+            batch_size: Maximum number of records to delete
+            
+        Returns:
+            Number of deleted records
+        """
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
         
-        deleted_count = result.rowcount
+        conversations = await DatabaseUtils.get_conversations_before(session, cutoff_date, batch_size)
+        deleted_count = await DatabaseUtils.delete_conversations(session, conversations)
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old conversation records")
         
@@ -149,6 +149,7 @@ class UserContext:
     career_goals: List[str] = field(default_factory=list)
     learning_preferences: Optional[UserPreferences] = None
     conversation_history: List[str] = field(default_factory=list)  # Will be Message objects later
+    conversation_summary: Optional[str] = None  # Rolling summary of turns older than the history
     assessment_results: Optional[Dict[str, Any]] = None
     created_at: datetime = field(default_factory=datetime.now)
     last_active: datetime = field(default_factory=datetime.now)
@@ -209,6 +210,7 @@ class UserContext:
             "career_goals": self.career_goals,
             "learning_preferences": self.learning_preferences.to_dict() if self.learning_preferences else None,
             "conversation_history": self.conversation_history,
+            "conversation_summary": self.conversation_summary,
             "assessment_results": self.assessment_results,
             "created_at": self.created_at.isoformat(),
             "last_active": self.last_active.isoformat()
@@ -233,6 +235,7 @@ class UserContext:
             career_goals=data.get("career_goals", []),
             learning_preferences=preferences,
             conversation_history=data.get("conversation_history", []),
+            conversation_summary=data.get("conversation_summary"),
             assessment_results=data.get("assessment_results"),
             created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
             last_active=datetime.fromisoformat(data.get("last_active", datetime.now().isoformat()))
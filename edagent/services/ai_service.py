@@ -2,13 +2,11 @@
 Gemini AI service implementation for EdAgent
 """
 
-import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from tenacity import (
     retry, 
     stop_after_attempt, 
@@ -16,6 +14,7 @@ from tenacity import (
     retry_if_exception_type,
     before_sleep_log
 )
+from tenacity.stop import stop_base
 
 from ..interfaces.ai_interface import AIServiceInterface
 from ..models.user_context import UserContext, SkillLevel, SkillLevelEnum
@@ -23,11 +22,26 @@ from ..models.learning import SkillAssessment, LearningPath, Milestone, Difficul
 from ..config.settings import get_settings
 from .prompt_engineering import PromptBuilder
 from .response_processing import StructuredResponseHandler
+from .response_cache import create_response_cache
+from .request_coalescing import SingleFlight
+from .rate_limiter import create_rate_limiter
+from .gemini_executor import get_gemini_executor
+from .model_registry import get_model_registry
+from .deadlines import remaining_time
+from .hedging import LatencyTracker, run_hedged
+from .token_budget import PromptBudget, estimate_tokens
+from ..utils.metrics import safe_track
 
 
 logger = logging.getLogger(__name__)
 
 
+FALLBACK_CONVERSATION_RESPONSE = (
+    "I'm having trouble connecting right now, but I'm here to help with your career "
+    "and learning goals. Could you please try asking your question again?"
+)
+
+
 class GeminiAPIError(Exception):
     """Custom exception for Gemini API errors"""
     pass
@@ -43,18 +57,40 @@ class QuotaExceededError(GeminiAPIError):
     pass
 
 
+class DeadlineExceededError(GeminiAPIError):
+    """Exception raised when the request deadline leaves no time for a call"""
+    pass
+
+
+class stop_at_deadline(stop_base):
+    """
+    Stop retrying when the request deadline would pass before the next attempt
+    
+    Relies on tenacity 8.3+, which computes the wait before evaluating stop
+    conditions; older versions leave upcoming_sleep at 0 here.
+    """
+    
+    def __call__(self, retry_state) -> bool:
+        remaining = remaining_time()
+        if remaining is None:
+            return False
+        return remaining <= (getattr(retry_state, "upcoming_sleep", 0.0) or 0.0)
+
+
 class GeminiAIService(AIServiceInterface):
     """Gemini AI service implementation with rate limiting and retry logic"""
     
     def __init__(self):
         """Initialize the Gemini AI service"""
         self.settings = get_settings()
-        self.prompt_builder = PromptBuilder()
+        self.prompt_builder = PromptBuilder(PromptBudget.from_settings(self.settings))
         self.response_handler = StructuredResponseHandler()
+        self.response_cache = create_response_cache(self.settings)
+        self.request_coalescer = SingleFlight("gemini")
+        self.rate_limiter = create_rate_limiter(self.settings)
+        self.model_registry = get_model_registry()
+        self.latency_tracker = LatencyTracker()
         self._configure_gemini()
-        self._request_count = 0
-        self._last_request_time = datetime.now()
-        self._rate_limit_window = timedelta(minutes=1)
         
     def _configure_gemini(self) -> None:
         """Configure the Gemini API client"""
@@ -67,104 +103,211 @@ class GeminiAIService(AIServiceInterface):
     
     def _get_model(self, model_type: str = "chat") -> genai.GenerativeModel:
         """Get the appropriate Gemini model"""
-        if model_type == "reasoning":
-            model_name = self.settings.gemini_model_reasoning
-        else:
-            model_name = self.settings.gemini_model_chat
-        
-        # Configure safety settings to be less restrictive for educational content
-        safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-        }
-        
-        return genai.GenerativeModel(
-            model_name=model_name,
-            safety_settings=safety_settings
-        )
+        return self.model_registry.get_model(model_type)
     
     def _get_generation_config(self, model_type: str = "chat") -> Dict[str, Any]:
         """Get generation configuration for the model"""
-        if model_type == "reasoning":
-            return {
-                "temperature": self.settings.gemini_temperature_reasoning,
-                "max_output_tokens": self.settings.gemini_max_tokens_learning_path,
-                "top_p": 0.8,
-                "top_k": 40
-            }
-        else:
-            return {
-                "temperature": self.settings.gemini_temperature_chat,
-                "max_output_tokens": self.settings.gemini_max_tokens_response,
-                "top_p": 0.9,
-                "top_k": 40
-            }
+        return self.model_registry.get_generation_config(model_type)
+    
+    async def _check_rate_limit(self, model_name: str = "unknown") -> None:
+        """Wait for a rate limit token before calling Gemini"""
+        await self.rate_limiter.acquire(model_name)
+    
+    def _get_model_type(self, model_name: str) -> str:
+        """Map a Gemini model name back to its model type"""
+        if str(model_name).endswith(self.settings.gemini_model_reasoning):
+            return "reasoning"
+        return "chat"
     
-    async def _check_rate_limit(self) -> None:
-        """Check and enforce rate limiting"""
-        current_time = datetime.now()
+    async def _make_api_call(self, model: genai.GenerativeModel, prompt: str, 
+                           generation_config: Dict[str, Any], operation: str = "unknown",
+                           cacheable: bool = True) -> str:
+        """
+        Make an API call to Gemini, deduplicating repeated and concurrent identical prompts
+        
+        Pass cacheable=False for prompts built from one user's context and
+        history: no other user can send the same prompt, so caching them only
+        fills the cache. Concurrent identical calls are still coalesced.
+        """
+        model = self._select_model_for_deadline(model)
+        model_name = getattr(model, "model_name", "unknown")
+        cache_key = self.response_cache.build_key(model_name, generation_config, prompt)
+        
+        if cacheable:
+            cached_response = await self.response_cache.get(cache_key, model_name)
+            if cached_response is not None:
+                logger.debug(f"Gemini response served from cache for model {model_name}")
+                return cached_response
         
-        # Reset counter if window has passed
-        if current_time - self._last_request_time > self._rate_limit_window:
-            self._request_count = 0
-            self._last_request_time = current_time
+        async def fetch_and_cache() -> str:
+            response_text = await self._call_gemini_hedged(model, prompt, generation_config, operation)
+            if cacheable:
+                await self.response_cache.set(cache_key, response_text, self._get_model_type(model_name))
+            return response_text
         
-        # Check if we've exceeded the rate limit
-        if self._request_count >= self.settings.rate_limit_requests_per_minute:
-            wait_time = self._rate_limit_window - (current_time - self._last_request_time)
-            if wait_time.total_seconds() > 0:
-                logger.warning(f"Rate limit exceeded, waiting {wait_time.total_seconds():.2f} seconds")
-                await asyncio.sleep(wait_time.total_seconds())
-                self._request_count = 0
-                self._last_request_time = datetime.now()
+        # Identical prompts already in flight share a single Gemini call
+        try:
+            return await self.request_coalescer.do(cache_key, fetch_and_cache, metric_label=str(model_name))
+        except TimeoutError:
+            # Either the call timed out or this request stopped waiting for a shared call
+            if remaining_time() == 0:
+                raise DeadlineExceededError("Request deadline exceeded waiting for Gemini") from None
+            raise
+    
+    def _select_model_for_deadline(self, model: genai.GenerativeModel) -> genai.GenerativeModel:
+        """Fall back from the reasoning model to the chat model when the deadline is too close"""
+        model_name = getattr(model, "model_name", "unknown")
+        if self._get_model_type(model_name) != "reasoning":
+            return model
         
-        self._request_count += 1
+        remaining = remaining_time()
+        if remaining is None or remaining >= self.settings.gemini_reasoning_min_budget_seconds:
+            return model
+        
+        fallback = self._get_model("chat")
+        logger.info(
+            f"{remaining:.1f}s left for request, using {self.settings.gemini_model_chat} "
+            f"instead of {self.settings.gemini_model_reasoning}"
+        )
+        safe_track("track_gemini_model_fallback", self.settings.gemini_model_reasoning, self.settings.gemini_model_chat)
+        return fallback
+    
+    def _call_timeout(self) -> float:
+        """Get the timeout for the next attempt, capped by the request deadline"""
+        timeout = self.settings.gemini_request_timeout_seconds
+        remaining = remaining_time()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceededError("Request deadline exceeded before calling Gemini")
+        return min(timeout, remaining)
+    
+    async def _call_gemini_hedged(self, model: genai.GenerativeModel, prompt: str,
+                                 generation_config: Dict[str, Any], operation: str = "unknown") -> str:
+        """Call Gemini, sending a second attempt if the first is slower than usual"""
+        if not self.settings.gemini_hedging_enabled:
+            return await self._call_gemini(model, prompt, generation_config, operation)
+        
+        model_name = str(getattr(model, "model_name", "unknown"))
+        hedge_delay = self.latency_tracker.percentile(model_name, 95) or self.settings.gemini_hedge_delay_seconds
+        remaining = remaining_time()
+        if remaining is not None and hedge_delay >= remaining:
+            # A hedge could not finish in time anyway
+            return await self._call_gemini(model, prompt, generation_config, operation)
+        
+        return await run_hedged(
+            lambda: self._call_gemini(model, prompt, generation_config, operation),
+            hedge_delay,
+            on_complete=lambda hedge_won: safe_track("track_gemini_hedged_request", model_name.split("/")[-1], hedge_won)
+        )
     
     @retry(
-        stop=stop_after_attempt(3),
+        stop=(stop_after_attempt(3) | stop_at_deadline()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((RateLimitError, ConnectionError, TimeoutError)),
         before_sleep=before_sleep_log(logger, logging.WARNING)
     )
-    async def _make_api_call(self, model: genai.GenerativeModel, prompt: str, 
-                           generation_config: Dict[str, Any]) -> str:
-        """Make an API call to Gemini with retry logic"""
-        await self._check_rate_limit()
+    async def _call_gemini(self, model: genai.GenerativeModel, prompt: str, 
+                          generation_config: Dict[str, Any], operation: str = "unknown") -> str:
+        """Call the Gemini API with retry logic"""
+        model_name = getattr(model, "model_name", "unknown")
+        await self._check_rate_limit(model_name)
+        timeout = self._call_timeout()
         
         try:
-            # Use asyncio to run the synchronous API call in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                lambda: model.generate_content(
-                    prompt,
-                    generation_config=generation_config
+            start = time.monotonic()
+            async with self.rate_limiter.slot(model_name):
+                # Run the synchronous SDK call on the dedicated Gemini thread pool
+                response = await get_gemini_executor().run(
+                    lambda: model.generate_content(
+                        prompt,
+                        generation_config=generation_config,
+                        request_options={"timeout": timeout}
+                    ),
+                    model_name=model_name,
+                    timeout=timeout
                 )
-            )
             
             if not response.text:
                 raise GeminiAPIError("Empty response from Gemini API")
             
+            self.latency_tracker.observe(str(model_name), time.monotonic() - start)
+            self._record_token_usage(operation, model_name, prompt, response.text,
+                                     getattr(response, "usage_metadata", None))
             logger.debug(f"Gemini API call successful, response length: {len(response.text)}")
             return response.text.strip()
             
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Handle specific error types
-            if "quota" in error_msg or "limit" in error_msg:
-                if "rate" in error_msg:
-                    raise RateLimitError(f"Rate limit exceeded: {e}")
-                else:
-                    raise QuotaExceededError(f"Quota exceeded: {e}")
-            elif "connection" in error_msg or "network" in error_msg:
-                raise ConnectionError(f"Network error: {e}")
-            elif "timeout" in error_msg:
-                raise TimeoutError(f"Request timeout: {e}")
+            raise self._classify_error(e) from e
+    
+    async def _stream_gemini(self, model: genai.GenerativeModel, prompt: str,
+                            generation_config: Dict[str, Any], operation: str = "unknown") -> AsyncIterator[str]:
+        """Stream text chunks from the Gemini API as they are generated"""
+        model_name = getattr(model, "model_name", "unknown")
+        await self._check_rate_limit(model_name)
+        timeout = self._call_timeout()
+        chunks: List[str] = []
+        usage = None
+        
+        try:
+            # The slot is held until the stream is fully consumed
+            async with self.rate_limiter.slot(model_name):
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True,
+                    request_options={"timeout": timeout}
+                )
+                
+                async for chunk in response:
+                    # The final chunk carries the token counts for the whole response
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    text = self._get_chunk_text(chunk)
+                    if text:
+                        chunks.append(text)
+                        yield text
+                    
+        except Exception as e:
+            raise self._classify_error(e) from e
+        
+        self._record_token_usage(operation, model_name, prompt, "".join(chunks), usage)
+    
+    def _record_token_usage(self, operation: str, model_name: str, prompt: str,
+                            response_text: str, usage: Any = None) -> None:
+        """Record prompt and response tokens, preferring Gemini's counts over estimates"""
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        response_tokens = getattr(usage, "candidates_token_count", None)
+        if not isinstance(prompt_tokens, int) or not prompt_tokens:
+            prompt_tokens = estimate_tokens(prompt)
+        if not isinstance(response_tokens, int) or not response_tokens:
+            response_tokens = estimate_tokens(response_text)
+        safe_track("track_gemini_token_usage", operation, str(model_name).split("/")[-1], prompt_tokens, response_tokens)
+    
+    @staticmethod
+    def _get_chunk_text(chunk: Any) -> str:
+        """Extract text from a streamed chunk, skipping chunks without text parts"""
+        try:
+            return chunk.text or ""
+        except ValueError:
+            # Raised by the SDK for chunks that only carry safety or finish metadata
+            return ""
+    
+    def _classify_error(self, error: Exception) -> Exception:
+        """Map a raw Gemini SDK error to the service's exception types"""
+        error_msg = str(error).lower()
+        
+        # Handle specific error types
+        if "quota" in error_msg or "limit" in error_msg:
+            if "rate" in error_msg:
+                return RateLimitError(f"Rate limit exceeded: {error}")
             else:
-                raise GeminiAPIError(f"Gemini API error: {e}")
+                return QuotaExceededError(f"Quota exceeded: {error}")
+        elif "connection" in error_msg or "network" in error_msg:
+            return ConnectionError(f"Network error: {error}")
+        elif "timeout" in error_msg:
+            return TimeoutError(f"Request timeout: {error}")
+        else:
+            return GeminiAPIError(f"Gemini API error: {error}")
     
     def build_system_prompt(self, user_context: UserContext) -> str:
         """Build context-aware system prompt for EdAgent"""
@@ -179,7 +322,9 @@ class GeminiAIService(AIServiceInterface):
             # Build the full prompt using prompt engineering system
             full_prompt = self.prompt_builder.build_conversation_prompt(prompt, context)
             
-            response = await self._make_api_call(model, full_prompt, generation_config)
+            # The prompt carries the user's context and history, so it is never shared
+            response = await self._make_api_call(model, full_prompt, generation_config,
+                                                 operation="conversation", cacheable=False)
             
             # Process the response for better formatting and validation
             processed_response = self.response_handler.process_conversation_response(response, context)
@@ -190,8 +335,40 @@ class GeminiAIService(AIServiceInterface):
         except Exception as e:
             logger.error(f"Error generating response: {e}")
             # Provide fallback response
-            return ("I'm having trouble connecting right now, but I'm here to help with your career "
-                   "and learning goals. Could you please try asking your question again?")
+            return FALLBACK_CONVERSATION_RESPONSE
+    
+    async def generate_response_stream(self, prompt: str, context: UserContext) -> AsyncIterator[str]:
+        """
+        Stream a conversational response from Gemini
+        
+        Yields raw text chunks as soon as Gemini produces them. The joined text
+        has not been post-processed; pass it through
+        response_handler.process_conversation_response for the final message.
+        
+        A failure before the first chunk yields the fallback response instead.
+        A failure after chunks were yielded is raised, so callers can tell a
+        truncated answer from a complete one.
+        
+        Like generate_response, streamed answers are not cached: the prompt
+        carries the user's context and history.
+        """
+        model = self._get_model("chat")
+        generation_config = self._get_generation_config("chat")
+        full_prompt = self.prompt_builder.build_conversation_prompt(prompt, context)
+        
+        chunks: List[str] = []
+        try:
+            async for chunk in self._stream_gemini(model, full_prompt, generation_config, operation="conversation"):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            if chunks:
+                raise
+            yield FALLBACK_CONVERSATION_RESPONSE
+            return
+        
+        logger.info(f"Streamed {len(chunks)} chunks for user {context.user_id if context else 'unknown'}")
     
     async def assess_skills(self, responses: List[str]) -> SkillAssessment:
         """Assess user skills based on their responses"""
@@ -204,7 +381,8 @@ class GeminiAIService(AIServiceInterface):
             skill_area = self._infer_skill_area(responses)
             assessment_prompt = self.prompt_builder.build_skill_assessment_prompt(skill_area, responses)
             
-            response = await self._make_api_call(model, assessment_prompt, generation_config)
+            response = await self._make_api_call(model, assessment_prompt, generation_config,
+                                                 operation="skill_assessment")
             
             # Process the response using the structured response handler
             assessment = self.response_handler.process_skill_assessment_response(response, "unknown")
@@ -233,7 +411,8 @@ class GeminiAIService(AIServiceInterface):
             # Create learning path prompt using prompt engineering system
             learning_path_prompt = self.prompt_builder.build_learning_path_prompt(goal, current_skills)
             
-            response = await self._make_api_call(model, learning_path_prompt, generation_config)
+            response = await self._make_api_call(model, learning_path_prompt, generation_config,
+                                                 operation="learning_path")
             
             # Process the response using the structured response handler
             learning_path = self.response_handler.process_learning_path_response(response, goal)
@@ -272,4 +451,4 @@ class GeminiAIService(AIServiceInterface):
         if skill_scores:
             return max(skill_scores, key=skill_scores.get).replace("_", " ").title()
         else:
-            return "General"
\ No newline at end of file
+            return "General"
@@ -0,0 +1,90 @@
+"""
+Bulk ingestion of crawled content into the content recommendation cache
+
+Crawls of YouTube and course platforms produce ContentRecommendation items
+faster than they can be saved one ORM object at a time. ingest_content reads
+them from an async iterator and writes them in batches, each batch one
+upsert matched by URL: new content is inserted, content cached before is
+refreshed and its last_verified time moved forward.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncIterable, Callable, Dict, List, Optional
+
+from ..config.settings import Settings, get_settings
+from ..database.connection import db_manager
+from ..database.utils import DatabaseUtils
+from ..models.content import ContentRecommendation
+
+
+logger = logging.getLogger(__name__)
+
+
+def content_to_row(content: ContentRecommendation) -> Dict[str, Any]:
+    """
+    Map a content item to content_recommendations column values
+
+    Args:
+        content: Content item from a crawl
+
+    Returns:
+        Column values for DatabaseUtils.upsert_content_recommendations
+    """
+    return {
+        "title": content.title[:300],
+        "url": content.url,
+        "platform": content.platform.value,
+        "content_type": content.content_type.value,
+        "duration_minutes": int(content.duration.total_seconds() // 60) if content.duration else None,
+        # 0.0 is the "not rated" default; unrated content sorts last in tag search
+        "rating": content.rating or None,
+        "is_free": content.is_free,
+        "skill_tags": list(content.skills_covered),
+        "difficulty_level": content.difficulty_level.value
+    }
+
+
+async def ingest_content(
+    items: AsyncIterable[ContentRecommendation],
+    batch_size: Optional[int] = None,
+    session_factory: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+    settings: Optional[Settings] = None
+) -> int:
+    """
+    Insert or refresh crawled content in the content cache, in batches
+
+    Each batch is saved in its own session, so a long crawl does not hold a
+    transaction open and a failure loses at most the batch being written.
+
+    Args:
+        items: Content items, e.g. from an async generator over search results
+        batch_size: Items per upsert (default: CONTENT_INGEST_BATCH_SIZE)
+        session_factory: Opens a session that commits on exit (default: db_manager.get_session)
+        settings: Application settings
+
+    Returns:
+        Number of content items inserted or refreshed
+    """
+    settings = settings or get_settings()
+    batch_size = max(1, batch_size or settings.content_ingest_batch_size)
+    session_factory = session_factory or db_manager.get_session
+    verified_at = datetime.utcnow()
+
+    total = 0
+    batch: List[Dict[str, Any]] = []
+
+    async def save() -> int:
+        async with session_factory() as session:
+            return await DatabaseUtils.upsert_content_recommendations(session, batch, verified_at)
+
+    async for content in items:
+        batch.append(content_to_row(content))
+        if len(batch) >= batch_size:
+            total += await save()
+            batch = []
+    if batch:
+        total += await save()
+
+    logger.info(f"Ingested {total} content recommendations")
+    return total
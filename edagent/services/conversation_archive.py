@@ -0,0 +1,321 @@
+"""
+Conversation turns past retention, kept in compressed archive files
+
+ConversationArchiver moves conversation turns older than
+CONVERSATION_RETENTION_DAYS out of the database into gzip-compressed JSON
+Lines files under CONVERSATION_ARCHIVE_DIR, one directory per month and one
+file per shard of users:
+
+    archive/conversations/2026-07/3.jsonl.gz
+
+On PostgreSQL whole months are archived from their partition and the
+partition is then dropped, which frees its space at once without touching
+the table new turns are written to. Turns outside a monthly partition (in
+the default partition, or in a plain SQLite table) are archived and deleted
+in chunks, each delete a short transaction of its own, so retention never
+holds the write lock for long.
+
+ConversationArchive reads a user's archived turns back on demand and
+removes them when the user's data is deleted.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncContextManager, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ..config.settings import Settings, get_settings
+from ..database.connection import db_manager
+from ..database.models import Conversation as DBConversation
+from ..database.partitions import MonthPartition, create_partitions, drop_partition, list_partitions, month_start
+from ..database.utils import DatabaseUtils
+from ..utils.metrics import safe_track
+
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(timestamp: datetime) -> datetime:
+    # SQLite returns the stored UTC timestamps without a timezone
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def conversation_to_record(conversation: DBConversation) -> Dict[str, Any]:
+    """Convert a conversation to its archive record"""
+    return {
+        "id": str(conversation.id),
+        "user_id": str(conversation.user_id),
+        # Fixed-width timestamps, so records sort by them as strings
+        "timestamp": _utc(conversation.timestamp).isoformat(timespec="microseconds"),
+        "message": conversation.message,
+        "response": conversation.response,
+        "message_type": conversation.message_type,
+        "context_data": conversation.context_data
+    }
+
+
+def record_to_conversation(record: Dict[str, Any]) -> DBConversation:
+    """Convert an archive record back to a (transient) conversation"""
+    return DBConversation(
+        id=uuid.UUID(record["id"]),
+        user_id=uuid.UUID(record["user_id"]),
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+        message=record["message"],
+        response=record["response"],
+        message_type=record["message_type"],
+        context_data=record["context_data"]
+    )
+
+
+class ConversationArchive:
+    """
+    Archived conversation turns in gzip-compressed JSON Lines files
+
+    A user's turns are in one file per month, the file of their shard (the
+    first hex digit of the user id), so reading one user's history opens one
+    file per archived month. Each write appends a gzip member to the file;
+    readers see the members as one stream. Writing a chunk again (after a
+    retry) is harmless: records are read back by id.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    async def write(self, conversations: Sequence[DBConversation]) -> int:
+        """
+        Append conversations to the archive
+
+        Args:
+            conversations: Conversations to archive
+
+        Returns:
+            Number of conversations written
+        """
+        records = [conversation_to_record(conversation) for conversation in conversations]
+        if records:
+            await asyncio.to_thread(self._write, records)
+        return len(records)
+
+    async def read_user(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Read a user's archived conversations
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Archive records of the user's conversations, newest first
+        """
+        return await asyncio.to_thread(self._read_user, str(user_id))
+
+    async def delete_user(self, user_id: str) -> int:
+        """
+        Remove a user's conversations from the archive
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Number of archived conversations removed
+        """
+        return await asyncio.to_thread(self._delete_user, str(user_id))
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        files = defaultdict(list)
+        for record in records:
+            files[self._path(record["timestamp"][:7], record["user_id"])].append(record)
+
+        with self._lock:
+            for path, file_records in files.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(path, "at", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in file_records)
+
+    def _read_user(self, user_id: str) -> List[Dict[str, Any]]:
+        records = {}
+        with self._lock:
+            for path in self._user_files(user_id):
+                for record in self._user_records(path, user_id):
+                    records[record["id"]] = record
+        return sorted(records.values(), key=lambda record: (record["timestamp"], record["id"]), reverse=True)
+
+    def _delete_user(self, user_id: str) -> int:
+        removed = 0
+        with self._lock:
+            for path in self._user_files(user_id):
+                lines = list(self._lines(path))
+                kept = [line for line in lines if not self._is_users(line, user_id)]
+                if len(kept) == len(lines):
+                    continue
+                removed += len(lines) - len(kept)
+                if kept:
+                    temporary = path.with_suffix(".tmp")
+                    with gzip.open(temporary, "wt", encoding="utf-8") as f:
+                        f.writelines(kept)
+                    os.replace(temporary, path)
+                else:
+                    path.unlink()
+        return removed
+
+    def _path(self, month: str, user_id: str) -> Path:
+        return self.directory / month / f"{uuid.UUID(user_id).hex[0]}.jsonl.gz"
+
+    def _user_files(self, user_id: str) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        months = sorted((path.name for path in self.directory.iterdir() if path.is_dir()), reverse=True)
+        paths = [self._path(month, user_id) for month in months]
+        return [path for path in paths if path.exists()]
+
+    def _user_records(self, path: Path, user_id: str) -> Iterator[Dict[str, Any]]:
+        for line in self._lines(path):
+            if self._is_users(line, user_id):
+                yield json.loads(line)
+
+    @staticmethod
+    def _is_users(line: str, user_id: str) -> bool:
+        # Cheap substring test first; most lines in a shard belong to other users
+        return user_id in line and json.loads(line)["user_id"] == user_id
+
+    @staticmethod
+    def _lines(path: Path) -> Iterator[str]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                yield from f
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            # A write cut short leaves a truncated last member; what came before it is intact
+            logger.warning(f"Conversation archive file {path} is truncated: {e}")
+
+
+class ConversationArchiver:
+    """
+    Move conversations past retention from the database to the archive
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        archive: Optional[ConversationArchive] = None,
+        session_factory: Optional[Callable[[], AsyncContextManager[Any]]] = None
+    ):
+        """
+        Args:
+            settings: Application settings
+            archive: Archive to write to (default: the process-wide archive)
+            session_factory: Opens a session, read-only if asked, that commits on exit
+                (default: db_manager.get_session)
+        """
+        self.settings = settings or get_settings()
+        self.archive = archive or get_conversation_archive()
+        self._session_factory = session_factory
+
+    async def create_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create the monthly partitions new conversations will go to
+
+        Returns:
+            Names of the partitions created; none if the table is not partitioned
+        """
+        async with self._session() as session:
+            return await create_partitions(session, self.settings.conversation_partition_months_ahead, now)
+
+    async def archive_old_conversations(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Archive and delete the conversations older than the retention period
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Conversations archived by dropping whole partitions and by
+            deleting rows, keyed "partition" and "rows"
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.settings.conversation_retention_days)
+        archived = {"partition": 0, "rows": 0}
+
+        async with self._session() as session:
+            partitions = await list_partitions(session)
+        if partitions:
+            # The month the cutoff falls in is kept whole and dropped with its partition later
+            cutoff = month_start(cutoff)
+            for partition in partitions:
+                if partition.end <= cutoff:
+                    archived["partition"] += await self._archive_partition(partition)
+
+        archived["rows"] = await self._archive_rows(cutoff)
+
+        for method, count in archived.items():
+            if count:
+                safe_track("track_conversations_archived", method, count)
+        logger.info(
+            f"Archived conversations older than {cutoff.isoformat()}: "
+            f"{archived['partition']} from dropped partitions, {archived['rows']} deleted as rows"
+        )
+        return archived
+
+    async def _archive_partition(self, partition: MonthPartition) -> int:
+        """Archive a month's partition, then drop it"""
+        count = 0
+        after = None
+        while True:
+            async with self._session(readonly=True) as session:
+                conversations = await DatabaseUtils.get_conversations_before(
+                    session, partition.end, self.settings.conversation_archive_chunk_size,
+                    since=partition.start, after=after
+                )
+            if not conversations:
+                break
+            count += await self.archive.write(conversations)
+            after = (conversations[-1].timestamp, conversations[-1].id)
+
+        async with self._session() as session:
+            await drop_partition(session, partition)
+        return count
+
+    async def _archive_rows(self, cutoff: datetime) -> int:
+        """Archive and delete rows older than the cutoff, a chunk per transaction"""
+        count = 0
+        while True:
+            # Read without the write lock; after the first delete, reads follow it to the primary
+            async with self._session(readonly=True) as session:
+                conversations = await DatabaseUtils.get_conversations_before(
+                    session, cutoff, self.settings.conversation_archive_chunk_size
+                )
+            if not conversations:
+                break
+            # Written before deleting: a failure in between archives the chunk twice, never loses it
+            await self.archive.write(conversations)
+            async with self._session() as session:
+                deleted = await DatabaseUtils.delete_conversations(session, conversations)
+            if not deleted:
+                logger.warning(f"Archived {len(conversations)} conversations that could not be deleted")
+                break
+            count += deleted
+        return count
+
+    def _session(self, readonly: bool = False) -> AsyncContextManager[Any]:
+        session_factory = self._session_factory or db_manager.get_session
+        return session_factory(readonly=readonly)
+
+
+_conversation_archive: Optional[ConversationArchive] = None
+
+
+def get_conversation_archive() -> ConversationArchive:
+    """Get the process-wide conversation archive"""
+    global _conversation_archive
+    if _conversation_archive is None:
+        _conversation_archive = ConversationArchive(get_settings().conversation_archive_dir)
+    return _conversation_archive
@@ -3,7 +3,7 @@ Conversation flow controller for EdAgent
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Awaitable
 from datetime import datetime
 import asyncio
 
@@ -21,36 +21,76 @@ from .response_processing import StructuredResponseHandler
 from .learning_path_generator import EnhancedLearningPathGenerator
 from .resume_analyzer import ResumeAnalyzer
 from .interview_preparation import InterviewPreparationService
+from .conversation_summarizer import ConversationSummarizer
+from .conversation_state_store import ConversationState, create_conversation_state_store
+from .fan_out import branch_timings, fan_out
+from .keyword_matching import KeywordMatcher
+from .question_bank import get_question_bank, infer_difficulty
+from .user_lanes import UserMessageLanes
 from ..models.resume import Resume, ResumeAnalysis
 from ..models.interview import InterviewSession, InterviewType, DifficultyLevel, IndustryGuidance
 
 logger = logging.getLogger(__name__)
 
+# Keyword sets behind routing decisions, compiled once
+_GENERAL_RESUME_QUESTION = KeywordMatcher({
+    "general": [
+        "how to", "what should", "tips for", "advice on", "help with",
+        "best practices", "how do i", "what makes", "should i include"
+    ]
+})
+_RESUME_QUESTION_TOPICS = KeywordMatcher({
+    "formatting": ["format", "structure", "layout"],
+    "skills": ["skill", "abilities", "competencies"],
+    "experience": ["experience", "work", "job"],
+    "summary": ["summary", "objective", "profile"],
+    "optimization": ["keyword", "ats", "applicant tracking"]
+})
+_INTERVIEW_REQUESTS = KeywordMatcher({
+    "general_advice": [
+        "interview tips", "how to prepare", "interview advice", "what should i expect",
+        "interview best practices", "how to answer", "common mistakes"
+    ],
+    "practice": [
+        "practice interview", "mock interview", "practice questions", "interview practice",
+        "let's practice", "can we practice", "start practice", "practice session"
+    ],
+    "industry_guidance": [
+        "tech interview", "software interview", "finance interview", "healthcare interview",
+        "marketing interview", "consulting interview", "industry specific", "what to expect in"
+    ]
+})
+_TARGET_ROLES = KeywordMatcher({
+    "software developer": ["software developer", "developer", "programmer", "software engineer"],
+    "data scientist": ["data scientist", "data analyst", "machine learning engineer"],
+    "product manager": ["product manager", "pm", "product owner"],
+    "marketing manager": ["marketing manager", "marketing", "digital marketing"],
+    "sales representative": ["sales rep", "sales", "account manager"],
+    "consultant": ["consultant", "consulting", "advisor"]
+})
+_MESSAGE_INDUSTRIES = KeywordMatcher({
+    "Technology": ["tech", "technology", "software", "it", "startup"],
+    "Healthcare": ["healthcare", "medical", "health", "hospital", "pharma"],
+    "Finance": ["finance", "banking", "investment", "fintech", "financial"],
+    "Education": ["education", "academic", "university", "school", "teaching"],
+    "Marketing": ["marketing", "advertising", "media", "digital marketing"],
+    "Consulting": ["consulting", "advisory", "strategy", "management consulting"]
+})
+_GOAL_INDUSTRIES = KeywordMatcher({
+    "Technology": ["software", "developer", "programming", "tech", "engineer", "data"],
+    "Healthcare": ["healthcare", "medical", "nurse", "doctor", "health"],
+    "Finance": ["finance", "banking", "investment", "accounting", "financial"],
+    "Education": ["education", "teacher", "instructor", "academic", "training"],
+    "Marketing": ["marketing", "advertising", "social media", "brand", "digital marketing"],
+    "Consulting": ["consulting", "consultant", "advisory", "strategy"]
+})
 
-class ConversationState:
-    """Manages conversation state for a user session"""
-    
-    def __init__(self, user_id: str):
-        self.user_id = user_id
-        self.current_context: Optional[str] = None  # "general", "assessment", "learning_path"
-        self.active_assessment: Optional[AssessmentSession] = None
-        self.pending_learning_path: Optional[str] = None  # Goal for learning path creation
-        self.last_activity: datetime = datetime.now()
-        self.message_count: int = 0
-    
-    def update_activity(self) -> None:
-        """Update last activity timestamp"""
-        self.last_activity = datetime.now()
-        self.message_count += 1
-    
-    def is_in_assessment(self) -> bool:
-        """Check if user is currently in an assessment"""
-        return (self.active_assessment is not None and 
-                self.active_assessment.status == ConversationStatus.ACTIVE)
-    
-    def is_creating_learning_path(self) -> bool:
-        """Check if user is in learning path creation flow"""
-        return self.pending_learning_path is not None
+
+def _page_turns(limit: int) -> int:
+    """Number of conversation turns in a page of limit messages"""
+    if limit < 2 or limit % 2:
+        raise ValueError(f"History pages hold whole turns of two messages; limit must be even, not {limit}")
+    return limit // 2
 
 
 class ConversationManager(ConversationManagerInterface):
@@ -70,9 +110,21 @@ class ConversationManager(ConversationManagerInterface):
         self.learning_path_generator = EnhancedLearningPathGenerator()
         self.resume_analyzer = ResumeAnalyzer(self.ai_service)
         self.interview_service = InterviewPreparationService(self.ai_service)
+        self.summarizer = ConversationSummarizer(self.ai_service, self.user_context_manager, settings)
+        self._report_timings = settings.api_debug
+        
+        # Adaptive assessment questions are served from memory; Gemini only writes new skill areas
+        self.question_bank = get_question_bank()
         
         # Track conversation states for active users
-        self._conversation_states: Dict[str, ConversationState] = {}
+        self._conversation_states = create_conversation_state_store(settings)
+        
+        # A user's messages are handled one at a time so they never share a state mid-turn
+        self._lanes = UserMessageLanes(
+            enabled=settings.user_lane_enabled,
+            max_queued=settings.user_lane_max_queued,
+            coalesce_duplicates=settings.user_lane_coalesce_duplicates
+        )
         
         # Conversation flow keywords for routing
         self._assessment_keywords = [
@@ -96,42 +148,42 @@ class ConversationManager(ConversationManagerInterface):
             "interview questions", "interview practice", "mock interview", "job interview",
             "interview tips", "interview coaching", "interview feedback"
         ]
+        
+        # All intents are found in one pass; the configured priority breaks ties
+        self._intent_matcher = KeywordMatcher(
+            {
+                "assessment": self._assessment_keywords,
+                "learning_path": self._learning_path_keywords,
+                "content_recommendation": self._content_keywords,
+                "resume_analysis": self._resume_keywords,
+                "interview_preparation": self._interview_keywords
+            },
+            priority=[name.strip() for name in settings.intent_priority.split(",") if name.strip()]
+        )
     
-    def _get_conversation_state(self, user_id: str) -> ConversationState:
-        """Get or create conversation state for user"""
-        if user_id not in self._conversation_states:
-            self._conversation_states[user_id] = ConversationState(user_id)
+    async def close(self) -> None:
+        """Finish background work before shutdown"""
+        await self.summarizer.close()
+    
+    async def _get_conversation_state(self, user_id: str) -> ConversationState:
+        """Get or create conversation state for user; changes are kept once saved"""
+        state = await self._conversation_states.get(user_id)
+        if state is None:
+            state = ConversationState(user_id)
         
-        state = self._conversation_states[user_id]
         state.update_activity()
         return state
     
+    async def _save_conversation_state(self, conv_state: ConversationState) -> None:
+        """Save conversation state, logging rather than raising store failures"""
+        try:
+            await self._conversation_states.save(conv_state)
+        except Exception as e:
+            logger.error(f"Error saving conversation state for user {conv_state.user_id}: {e}")
+    
     def _detect_intent(self, message: str) -> str:
         """Detect user intent from message content"""
-        message_lower = message.lower()
-        
-        # Check for assessment intent
-        if any(keyword in message_lower for keyword in self._assessment_keywords):
-            return "assessment"
-        
-        # Check for learning path intent
-        if any(keyword in message_lower for keyword in self._learning_path_keywords):
-            return "learning_path"
-        
-        # Check for content recommendation intent
-        if any(keyword in message_lower for keyword in self._content_keywords):
-            return "content_recommendation"
-        
-        # Check for resume analysis intent
-        if any(keyword in message_lower for keyword in self._resume_keywords):
-            return "resume_analysis"
-        
-        # Check for interview preparation intent
-        if any(keyword in message_lower for keyword in self._interview_keywords):
-            return "interview_preparation"
-        
-        # Default to general conversation
-        return "general"
+        return self._intent_matcher.first(message, default="general")
     
     async def handle_message(self, user_id: str, message: str) -> ConversationResponse:
         """
@@ -143,38 +195,63 @@ class ConversationManager(ConversationManagerInterface):
             
         Returns:
             Structured conversation response
+            
+        Raises:
+            UserLaneFullError: If the user already has too many messages waiting
         """
-        try:
-            # Get conversation state
-            conv_state = self._get_conversation_state(user_id)
+        return await self._lanes.run(user_id, message, lambda: self._process_message(user_id, message))
+    
+    async def handle_message_stream(
+        self, 
+        user_id: str, 
+        message: str, 
+        on_chunk: Callable[[str], Awaitable[None]]
+    ) -> ConversationResponse:
+        """
+        Handle incoming user message, streaming general conversation replies
+        
+        General conversation responses are forwarded to on_chunk as Gemini
+        produces them. Other intents (assessments, learning paths, ...) are
+        handled exactly as in handle_message and produce no chunks.
+        
+        Args:
+            user_id: Unique user identifier
+            message: User's input message
+            on_chunk: Coroutine called with each raw response chunk
             
-            # Get or create user context
-            user_context = await self._get_or_create_user_context(user_id)
+        Returns:
+            Final structured conversation response with post-processed message
             
-            # Handle ongoing assessment
-            if conv_state.is_in_assessment():
-                return await self._handle_assessment_response(user_id, message, conv_state)
-            
-            # Handle learning path creation flow
-            if conv_state.is_creating_learning_path():
-                return await self._handle_learning_path_creation(user_id, message, conv_state)
-            
-            # Detect intent for new conversation
-            intent = self._detect_intent(message)
-            
-            # Route to appropriate handler
-            if intent == "assessment":
-                return await self._initiate_skill_assessment(user_id, message, user_context)
-            elif intent == "learning_path":
-                return await self._initiate_learning_path_creation(user_id, message, user_context)
-            elif intent == "content_recommendation":
-                return await self._handle_content_request(user_id, message, user_context)
-            elif intent == "resume_analysis":
-                return await self._handle_resume_analysis_request(user_id, message, user_context)
-            elif intent == "interview_preparation":
-                return await self._handle_interview_preparation_request(user_id, message, user_context)
-            else:
-                return await self._handle_general_conversation(user_id, message, user_context)
+        Raises:
+            UserLaneFullError: If the user already has too many messages waiting
+        """
+        return await self._lanes.run(
+            user_id, message, lambda: self._process_message(user_id, message, on_chunk=on_chunk)
+        )
+    
+    async def _process_message(
+        self, 
+        user_id: str, 
+        message: str, 
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> ConversationResponse:
+        """Handle a message and save the turn to the user's history"""
+        response: Optional[ConversationResponse] = None
+        conv_state: Optional[ConversationState] = None
+        try:
+            with branch_timings() as timings:
+                # Conversation state and user context are stored separately
+                loaded = await fan_out({
+                    "conversation_state": self._get_conversation_state(user_id),
+                    "user_context": self._get_or_create_user_context(user_id)
+                })
+                conv_state = loaded["conversation_state"]
+                
+                response = await self._route_message(user_id, message, conv_state, loaded["user_context"], on_chunk)
+            
+            if self._report_timings:
+                response.metadata["branch_timings_ms"] = timings
+            return response
         
         except Exception as e:
             logger.error(f"Error handling message for user {user_id}: {e}")
@@ -184,26 +261,71 @@ class ConversationManager(ConversationManagerInterface):
                 confidence_score=0.5
             )
         finally:
+            # Keep flow changes (assessments, learning path requests) for the next message
+            if conv_state is not None:
+                await self._save_conversation_state(conv_state)
+            
             # Save conversation to history
-            try:
-                if 'user_context' in locals():
-                    await self._save_conversation(user_id, message, locals().get('response'))
-            except Exception as e:
-                logger.error(f"Error saving conversation for user {user_id}: {e}")
+            if response is not None:
+                await self._save_conversation(user_id, message, response)
     
-    async def start_skill_assessment(self, user_id: str) -> AssessmentSession:
+    async def _route_message(
+        self, 
+        user_id: str, 
+        message: str, 
+        conv_state: ConversationState,
+        user_context: UserContext,
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> ConversationResponse:
+        """Route a message to the handler for its intent"""
+        # Handle ongoing assessment
+        if conv_state.is_in_assessment():
+            return await self._handle_assessment_response(user_id, message, conv_state)
+        
+        # Handle learning path creation flow
+        if conv_state.is_creating_learning_path():
+            return await self._handle_learning_path_creation(user_id, message, conv_state)
+        
+        # Detect intent for new conversation
+        intent = self._detect_intent(message)
+        
+        # Route to appropriate handler
+        if intent == "assessment":
+            return await self._initiate_skill_assessment(user_id, message, user_context, conv_state)
+        elif intent == "learning_path":
+            return await self._initiate_learning_path_creation(user_id, message, user_context, conv_state)
+        elif intent == "content_recommendation":
+            return await self._handle_content_request(user_id, message, user_context)
+        elif intent == "resume_analysis":
+            return await self._handle_resume_analysis_request(user_id, message, user_context)
+        elif intent == "interview_preparation":
+            return await self._handle_interview_preparation_request(user_id, message, user_context)
+        elif on_chunk is not None:
+            return await self._handle_general_conversation_stream(user_id, message, user_context, on_chunk)
+        else:
+            return await self._handle_general_conversation(user_id, message, user_context)
+    
+    async def start_skill_assessment(
+        self, 
+        user_id: str, 
+        conv_state: Optional[ConversationState] = None
+    ) -> AssessmentSession:
         """
         Start a skill assessment session
         
         Args:
             user_id: Unique user identifier
+            conv_state: State of the message being handled, saved by the
+                caller; the user's stored state is updated if omitted
             
         Returns:
             New assessment session
         """
         try:
             # Get conversation state
-            conv_state = self._get_conversation_state(user_id)
+            save_state = conv_state is None
+            if save_state:
+                conv_state = await self._get_conversation_state(user_id)
             
             # Create new assessment session
             assessment = AssessmentSession(
@@ -218,6 +340,8 @@ class ConversationManager(ConversationManagerInterface):
             # Update conversation state
             conv_state.active_assessment = assessment
             conv_state.current_context = "assessment"
+            if save_state:
+                await self._save_conversation_state(conv_state)
             
             logger.info(f"Started skill assessment for user {user_id}")
             return assessment
@@ -239,14 +363,16 @@ class ConversationManager(ConversationManagerInterface):
         """
         try:
             # Get user context and skills
-            user_context = await self._get_or_create_user_context(user_id)
-            current_skills = await self.user_context_manager.get_user_skills(user_id)
+            loaded = await fan_out({
+                "learning_path.user_context": self._get_or_create_user_context(user_id),
+                "learning_path.user_skills": self.user_context_manager.get_user_skills(user_id)
+            })
             
             # Generate comprehensive learning path using enhanced generator
             learning_path = await self.learning_path_generator.create_comprehensive_learning_path(
                 goal=goal,
-                current_skills=current_skills,
-                user_context=user_context
+                current_skills=loaded["learning_path.user_skills"],
+                user_context=loaded["learning_path.user_context"]
             )
             
             # Save learning path to database
@@ -265,31 +391,26 @@ class ConversationManager(ConversationManagerInterface):
             logger.error(f"Error generating learning path for user {user_id}: {e}")
             raise
     
-    async def get_conversation_history(self, user_id: str) -> List[Message]:
+    async def get_conversation_history(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Message]:
         """
         Retrieve conversation history for a user
         
         Args:
             user_id: Unique user identifier
+            limit: Maximum number of messages to retrieve
+            offset: Number of most recent messages to skip
             
         Returns:
-            List of conversation messages
+            List of conversation messages, most recent first
         """
         try:
             # Get conversation history from user context manager
-            history_data = await self.user_context_manager.get_conversation_history(user_id)
+            history_data = await self.user_context_manager.get_conversation_history(
+                user_id, limit=limit, offset=offset
+            )
             
             # Convert to Message objects
-            messages = []
-            for msg_data in history_data:
-                message = Message(
-                    id=msg_data["id"],
-                    content=msg_data["content"],
-                    message_type=MessageType(msg_data["message_type"]),
-                    timestamp=datetime.fromisoformat(msg_data["timestamp"]),
-                    metadata=msg_data.get("metadata", {})
-                )
-                messages.append(message)
+            messages = self._to_messages(history_data)
             
             logger.info(f"Retrieved {len(messages)} messages for user {user_id}")
             return messages
@@ -298,6 +419,99 @@ class ConversationManager(ConversationManagerInterface):
             logger.error(f"Error retrieving conversation history for user {user_id}: {e}")
             return []
     
+    async def get_conversation_offset_page(self, user_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        Retrieve a page of conversation history by message offset
+        
+        Kept for clients of the deprecated offset parameter: every skipped
+        message is read again, so pages get slower the further back they are.
+        Use get_conversation_page instead.
+        
+        Args:
+            user_id: Unique user identifier
+            limit: Maximum number of messages to retrieve
+            offset: Number of most recent messages to skip
+            
+        Returns:
+            Dictionary with messages (most recent first) and total_count
+        """
+        messages = await self.get_conversation_history(user_id, limit=limit, offset=offset)
+        total_count = await self.user_context_manager.count_conversation_messages(user_id)
+        return {"messages": messages, "total_count": total_count}
+    
+    async def get_conversation_page(
+        self, 
+        user_id: str, 
+        limit: int = 50, 
+        before: Optional[str] = None, 
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve a page of conversation history for a user
+        
+        Pages hold whole conversation turns of two messages, so limit must
+        be even.
+        
+        Args:
+            user_id: Unique user identifier
+            limit: Maximum number of messages to retrieve
+            before: older_cursor of a previous page, to scroll back
+            after: newer_cursor of a previous page, to get newer messages
+            
+        Returns:
+            Dictionary with messages (most recent first), older_cursor,
+            newer_cursor and total_count
+            
+        Raises:
+            ValueError: If a cursor is invalid or limit is odd
+        """
+        page = await self.user_context_manager.get_conversation_page(
+            user_id, turns=_page_turns(limit), before=before, after=after
+        )
+        page["messages"] = self._to_messages(page["messages"])
+        return page
+    
+    async def get_archived_conversation_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve a page of a user's archived conversation history
+        
+        Like get_conversation_page, limit must be even.
+        
+        Args:
+            user_id: Unique user identifier
+            limit: Maximum number of messages to retrieve
+            before: older_cursor of a previous archived page, to scroll back
+        
+        Returns:
+            Dictionary with messages (most recent first), older_cursor and total_count
+        
+        Raises:
+            ValueError: If the cursor is invalid or limit is odd
+        """
+        page = await self.user_context_manager.get_archived_conversation_page(
+            user_id, turns=_page_turns(limit), before=before
+        )
+        page["messages"] = self._to_messages(page["messages"])
+        return page
+    
+    def _to_messages(self, history_data: List[Dict[str, Any]]) -> List[Message]:
+        """Convert stored history entries to Message objects"""
+        return [
+            Message(
+                id=msg_data["id"],
+                content=msg_data["content"],
+                message_type=MessageType(msg_data["message_type"]),
+                timestamp=datetime.fromisoformat(msg_data["timestamp"]),
+                metadata=msg_data.get("metadata", {})
+            )
+            for msg_data in history_data
+        ]
+    
     async def _get_or_create_user_context(self, user_id: str) -> UserContext:
         """Get existing user context or create new one"""
         user_context = await self.user_context_manager.get_user_context(user_id)
@@ -327,33 +541,79 @@ class ConversationManager(ConversationManagerInterface):
                 confidence_score=0.9
             )
             
-            # Add contextual follow-up questions based on user context
-            if not user_context.current_skills:
-                response.add_follow_up_question("Would you like me to assess your current skills?")
+            self._add_general_follow_up_questions(response, user_context)
+            return response
+        
+        except Exception as e:
+            logger.error(f"Error in general conversation for user {user_id}: {e}")
+            return ConversationResponse(
+                message="I'm here to help with your career and learning goals. What would you like to discuss?",
+                response_type="text",
+                confidence_score=0.5
+            )
+    
+    async def _handle_general_conversation_stream(
+        self, 
+        user_id: str, 
+        message: str, 
+        user_context: UserContext,
+        on_chunk: Callable[[str], Awaitable[None]]
+    ) -> ConversationResponse:
+        """Handle general conversation flow, forwarding response chunks as they arrive"""
+        chunks: List[str] = []
+        try:
+            async for chunk in self.ai_service.generate_response_stream(message, user_context):
+                chunks.append(chunk)
+                await on_chunk(chunk)
             
-            if not user_context.career_goals:
-                response.add_follow_up_question("What are your career goals? I can help create a learning path.")
+            # Post-processing only makes sense on the complete text
+            ai_response = self.response_handler.process_conversation_response("".join(chunks), user_context)
             
+            response = ConversationResponse(
+                message=ai_response,
+                response_type="text",
+                confidence_score=0.9,
+                metadata={"streamed": True, "chunk_count": len(chunks)}
+            )
+            
+            self._add_general_follow_up_questions(response, user_context)
             return response
         
         except Exception as e:
-            logger.error(f"Error in general conversation for user {user_id}: {e}")
+            logger.error(f"Error in streaming conversation for user {user_id}: {e}")
+            if chunks:
+                # The user has already seen part of the answer; end it as truncated
+                return ConversationResponse(
+                    message="".join(chunks).strip(),
+                    response_type="text",
+                    confidence_score=0.3,
+                    metadata={"streamed": True, "chunk_count": len(chunks), "truncated": True}
+                )
             return ConversationResponse(
                 message="I'm here to help with your career and learning goals. What would you like to discuss?",
                 response_type="text",
                 confidence_score=0.5
             )
     
+    def _add_general_follow_up_questions(self, response: ConversationResponse, user_context: UserContext) -> None:
+        """Add contextual follow-up questions based on user context"""
+        if not user_context.current_skills:
+            response.add_follow_up_question("Would you like me to assess your current skills?")
+        
+        if not user_context.career_goals:
+            response.add_follow_up_question("What are your career goals? I can help create a learning path.")
+    
     async def _initiate_skill_assessment(
         self, 
         user_id: str, 
         message: str, 
-        user_context: UserContext
+        user_context: UserContext,
+        conv_state: Optional[ConversationState] = None
     ) -> ConversationResponse:
         """Initiate skill assessment flow"""
         try:
             # Start assessment session
-            assessment = await self.start_skill_assessment(user_id)
+            assessment = await self.start_skill_assessment(user_id, conv_state)
             
             # Get first question
             if assessment.questions:
@@ -391,6 +651,9 @@ class ConversationManager(ConversationManagerInterface):
             
             # Add user response to assessment
             assessment.add_response(message)
+            answered = assessment.questions[assessment.responses[-1]["question_index"]]
+            if answered.get("type") == "adaptive":
+                self.question_bank.record_answered(answered["question"])
             
             # Generate adaptive questions after initial responses (only once)
             if len(assessment.responses) == 3 and len(assessment.questions) == 5:
@@ -517,7 +780,8 @@ class ConversationManager(ConversationManagerInterface):
         self, 
         user_id: str, 
         message: str, 
-        user_context: UserContext
+        user_context: UserContext,
+        conv_state: Optional[ConversationState] = None
     ) -> ConversationResponse:
         """Initiate learning path creation flow"""
         try:
@@ -546,9 +810,13 @@ class ConversationManager(ConversationManagerInterface):
             
             else:
                 # Ask for goal clarification
-                conv_state = self._get_conversation_state(user_id)
+                save_state = conv_state is None
+                if save_state:
+                    conv_state = await self._get_conversation_state(user_id)
                 conv_state.current_context = "learning_path"
                 conv_state.pending_learning_path = "pending"
+                if save_state:
+                    await self._save_conversation_state(conv_state)
                 
                 response = ConversationResponse(
                     message="I'd love to create a learning path for you! What specific career goal or skill would you like to work towards?",
@@ -702,9 +970,10 @@ class ConversationManager(ConversationManagerInterface):
             if skill_area != "General" and assessment.skill_area == "General":
                 assessment.skill_area = skill_area
             
-            # Generate skill-specific questions using AI service
+            # Get skill-specific questions, from the question bank unless the skill area is new
+            asked = [question["question"] for question in assessment.questions]
             try:
-                adaptive_questions = await self._get_skill_specific_questions(skill_area, responses_text)
+                adaptive_questions = await self._get_skill_specific_questions(skill_area, responses_text, asked)
             except Exception as e:
                 logger.error(f"Error getting adaptive questions: {e}")
                 adaptive_questions = self._get_fallback_questions_for_skill(skill_area)
@@ -720,20 +989,37 @@ class ConversationManager(ConversationManagerInterface):
             # Add fallback questions if adaptive generation fails
             self._add_fallback_questions(assessment)
     
-    async def _get_skill_specific_questions(self, skill_area: str, previous_responses: List[str]) -> List[str]:
-        """Get skill-specific assessment questions from AI service"""
+    async def _get_skill_specific_questions(
+        self, 
+        skill_area: str, 
+        previous_responses: List[str], 
+        asked: Optional[List[str]] = None
+    ) -> List[str]:
+        """Get skill-specific assessment questions, generating them only for skill areas not in the question bank"""
+        difficulty = infer_difficulty(previous_responses)
+        if self.question_bank.enabled:
+            banked = self.question_bank.select(skill_area, difficulty, 3, exclude=asked or [])
+            if banked:
+                return banked
+        
         try:
             # Use AI service to generate targeted questions
             prompt = self.prompt_builder.build_adaptive_assessment_prompt(skill_area, previous_responses)
             model = self.ai_service._get_model("reasoning")
             generation_config = self.ai_service._get_generation_config("reasoning")
             
-            response = await self.ai_service._make_api_call(model, prompt, generation_config)
+            response = await self.ai_service._make_api_call(
+                model, prompt, generation_config, operation="adaptive_assessment"
+            )
             
             # Parse questions from response
-            questions = self.response_handler.parse_assessment_questions(response)
+            questions = self.response_handler.parse_assessment_questions(response)[:3]  # Limit to 3 additional questions
             
-            return questions[:3]  # Limit to 3 additional questions
+            if self.question_bank.enabled:
+                # Banked so the next assessment in this skill area does not wait for Gemini
+                self.question_bank.add(skill_area, difficulty, questions, source="live")
+            
+            return questions
             
         except Exception as e:
             logger.error(f"Error getting skill-specific questions: {e}")
@@ -921,6 +1207,7 @@ class ConversationManager(ConversationManagerInterface):
                     message_type=response.response_type,
                     context_data=response.metadata
                 )
+                self.summarizer.record_turn(user_id)
         except Exception as e:
             logger.error(f"Error saving conversation for user {user_id}: {e}")
     
@@ -1020,13 +1307,7 @@ class ConversationManager(ConversationManagerInterface):
     
     def _is_general_resume_question(self, message: str) -> bool:
         """Check if message is asking for general resume advice vs. specific analysis"""
-        general_patterns = [
-            "how to", "what should", "tips for", "advice on", "help with",
-            "best practices", "how do i", "what makes", "should i include"
-        ]
-        
-        message_lower = message.lower()
-        return any(pattern in message_lower for pattern in general_patterns)
+        return _GENERAL_RESUME_QUESTION.matches(message)
     
     def _create_resume_submission_guidance(self, user_context: UserContext) -> str:
         """Create guidance for submitting resume for analysis"""
@@ -1127,20 +1408,7 @@ What specific aspect of your resume would you like to work on first?"""
     
     def _categorize_resume_question(self, message: str) -> str:
         """Categorize the type of resume question"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ["format", "structure", "layout"]):
-            return "formatting"
-        elif any(word in message_lower for word in ["skill", "abilities", "competencies"]):
-            return "skills"
-        elif any(word in message_lower for word in ["experience", "work", "job"]):
-            return "experience"
-        elif any(word in message_lower for word in ["summary", "objective", "profile"]):
-            return "summary"
-        elif any(word in message_lower for word in ["keyword", "ats", "applicant tracking"]):
-            return "optimization"
-        else:
-            return "general"
+        return _RESUME_QUESTION_TOPICS.first(message, default="general")
     
     def _format_resume_analysis_results(self, analysis: ResumeAnalysis) -> str:
         """Format resume analysis results for conversation display"""
@@ -1251,30 +1519,15 @@ What specific aspect of your resume would you like to work on first?"""
     
     def _is_general_interview_question(self, message: str) -> bool:
         """Check if message is asking for general interview advice"""
-        message_lower = message.lower()
-        general_patterns = [
-            "interview tips", "how to prepare", "interview advice", "what should i expect",
-            "interview best practices", "how to answer", "common mistakes"
-        ]
-        return any(pattern in message_lower for pattern in general_patterns)
+        return "general_advice" in _INTERVIEW_REQUESTS.categories(message)
     
     def _wants_practice_session(self, message: str) -> bool:
         """Check if user wants to start a practice interview session"""
-        message_lower = message.lower()
-        practice_patterns = [
-            "practice interview", "mock interview", "practice questions", "interview practice",
-            "let's practice", "can we practice", "start practice", "practice session"
-        ]
-        return any(pattern in message_lower for pattern in practice_patterns)
+        return "practice" in _INTERVIEW_REQUESTS.categories(message)
     
     def _wants_industry_guidance(self, message: str) -> bool:
         """Check if user wants industry-specific interview guidance"""
-        message_lower = message.lower()
-        industry_patterns = [
-            "tech interview", "software interview", "finance interview", "healthcare interview",
-            "marketing interview", "consulting interview", "industry specific", "what to expect in"
-        ]
-        return any(pattern in message_lower for pattern in industry_patterns)
+        return "industry_guidance" in _INTERVIEW_REQUESTS.categories(message)
     
     async def _provide_general_interview_advice(self, user_id: str, message: str, 
                                               user_context: UserContext) -> ConversationResponse:
@@ -1397,29 +1650,15 @@ Take your time to think about your answer. When you're ready, share your respons
     
     def _extract_target_role(self, message: str, user_context: UserContext) -> str:
         """Extract target role from message or user context"""
-        message_lower = message.lower()
-        
-        # Common role patterns
-        role_patterns = {
-            "software developer": ["software developer", "developer", "programmer", "software engineer"],
-            "data scientist": ["data scientist", "data analyst", "machine learning engineer"],
-            "product manager": ["product manager", "pm", "product owner"],
-            "marketing manager": ["marketing manager", "marketing", "digital marketing"],
-            "sales representative": ["sales rep", "sales", "account manager"],
-            "consultant": ["consultant", "consulting", "advisor"]
-        }
-        
-        for role, patterns in role_patterns.items():
-            if any(pattern in message_lower for pattern in patterns):
-                return role
+        role = _TARGET_ROLES.first(message)
+        if role:
+            return role
         
         # Check user context career goals
-        if user_context.career_goals:
-            for goal in user_context.career_goals:
-                goal_lower = goal.lower()
-                for role, patterns in role_patterns.items():
-                    if any(pattern in goal_lower for pattern in patterns):
-                        return role
+        for goal in user_context.career_goals or []:
+            role = _TARGET_ROLES.first(goal)
+            if role:
+                return role
         
         return "Software Developer"  # Default role
     
@@ -1429,40 +1668,14 @@ Take your time to think about your answer. When you're ready, share your respons
     
     def _extract_industry_from_message(self, message: str) -> Optional[str]:
         """Extract industry from message text"""
-        message_lower = message.lower()
-        
-        industry_keywords = {
-            "Technology": ["tech", "technology", "software", "it", "startup"],
-            "Healthcare": ["healthcare", "medical", "health", "hospital", "pharma"],
-            "Finance": ["finance", "banking", "investment", "fintech", "financial"],
-            "Education": ["education", "academic", "university", "school", "teaching"],
-            "Marketing": ["marketing", "advertising", "media", "digital marketing"],
-            "Consulting": ["consulting", "advisory", "strategy", "management consulting"]
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in message_lower for keyword in keywords):
-                return industry
-        
-        return None
+        return _MESSAGE_INDUSTRIES.first(message)
     
     def _infer_industry_from_context(self, user_context: UserContext) -> str:
         """Infer industry from user context"""
         if user_context.career_goals:
-            goals_text = " ".join(user_context.career_goals).lower()
-            
-            industry_keywords = {
-                "Technology": ["software", "developer", "programming", "tech", "engineer", "data"],
-                "Healthcare": ["healthcare", "medical", "nurse", "doctor", "health"],
-                "Finance": ["finance", "banking", "investment", "accounting", "financial"],
-                "Education": ["education", "teacher", "instructor", "academic", "training"],
-                "Marketing": ["marketing", "advertising", "social media", "brand", "digital marketing"],
-                "Consulting": ["consulting", "consultant", "advisory", "strategy"]
-            }
-            
-            for industry, keywords in industry_keywords.items():
-                if any(keyword in goals_text for keyword in keywords):
-                    return industry
+            industry = _GOAL_INDUSTRIES.first(" ".join(user_context.career_goals))
+            if industry:
+                return industry
         
         return "Technology"  # Default industry
     
@@ -0,0 +1,184 @@
+"""
+Stores for per-user conversation flow state (assessments, learning path creation)
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from ..config.settings import Settings
+from ..models.conversation import AssessmentSession, ConversationStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationState:
+    """Manages conversation state for a user session"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.current_context: Optional[str] = None  # "general", "assessment", "learning_path"
+        self.active_assessment: Optional[AssessmentSession] = None
+        self.pending_learning_path: Optional[str] = None  # Goal for learning path creation
+        self.last_activity: datetime = datetime.now()
+        self.message_count: int = 0
+
+    def update_activity(self) -> None:
+        """Update last activity timestamp"""
+        self.last_activity = datetime.now()
+        self.message_count += 1
+
+    def is_in_assessment(self) -> bool:
+        """Check if user is currently in an assessment"""
+        return (self.active_assessment is not None and
+                self.active_assessment.status == ConversationStatus.ACTIVE)
+
+    def is_creating_learning_path(self) -> bool:
+        """Check if user is in learning path creation flow"""
+        return self.pending_learning_path is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            "user_id": self.user_id,
+            "current_context": self.current_context,
+            "active_assessment": self.active_assessment.to_dict() if self.active_assessment else None,
+            "pending_learning_path": self.pending_learning_path,
+            "last_activity": self.last_activity.isoformat(),
+            "message_count": self.message_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConversationState':
+        """Create ConversationState from dictionary"""
+        state = cls(data["user_id"])
+        state.current_context = data.get("current_context")
+        if data.get("active_assessment"):
+            state.active_assessment = AssessmentSession.from_dict(data["active_assessment"])
+        state.pending_learning_path = data.get("pending_learning_path")
+        state.last_activity = datetime.fromisoformat(data["last_activity"])
+        state.message_count = data.get("message_count", 0)
+        return state
+
+
+class ConversationStateStore(ABC):
+    """Storage for conversation states, keyed by user ID"""
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        """Get a user's state, or None if there is none or it expired"""
+
+    @abstractmethod
+    async def save(self, state: ConversationState) -> None:
+        """Store a state after it changed; states are not persisted until saved"""
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> None:
+        """Remove a user's state"""
+
+
+class InMemoryConversationStateStore(ConversationStateStore):
+    """
+    Per-process state store with idle expiry and a size bound
+
+    States idle for longer than ttl_seconds (by last_activity) are dropped,
+    and the least recently active states are evicted beyond max_entries.
+    get() returns the stored object itself, so flow state only works within
+    one worker process; use the Redis store when running several.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._states: "OrderedDict[str, ConversationState]" = OrderedDict()
+
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        state = self._states.get(user_id)
+        if state is None:
+            return None
+        if self._is_expired(state):
+            del self._states[user_id]
+            return None
+        return state
+
+    async def save(self, state: ConversationState) -> None:
+        self._states[state.user_id] = state
+        self._states.move_to_end(state.user_id)
+
+        # Least recently active states are at the front
+        while self._states:
+            oldest = next(iter(self._states.values()))
+            if len(self._states) <= self.max_entries and not self._is_expired(oldest):
+                break
+            self._states.popitem(last=False)
+
+    async def delete(self, user_id: str) -> None:
+        self._states.pop(user_id, None)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _is_expired(self, state: ConversationState) -> bool:
+        return datetime.now() - state.last_activity > self.ttl
+
+
+class RedisConversationStateStore(ConversationStateStore):
+    """
+    State store shared by every worker through Redis
+
+    States are stored as JSON and expire ttl_seconds after they were last
+    saved. Each get() returns a fresh copy, so changes must be saved.
+    """
+
+    def __init__(self, redis_client: Any, ttl_seconds: int = 3600, key_prefix: str = "edagent:conversation_state:"):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        payload = await self.redis.get(self.key_prefix + user_id)
+        if payload is None:
+            return None
+        try:
+            return ConversationState.from_dict(json.loads(payload))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable conversation state for user {user_id}: {e}")
+            return None
+
+    async def save(self, state: ConversationState) -> None:
+        payload = json.dumps(state.to_dict(), default=str)
+        await self.redis.set(self.key_prefix + state.user_id, payload, ex=self.ttl_seconds)
+
+    async def delete(self, user_id: str) -> None:
+        await self.redis.delete(self.key_prefix + user_id)
+
+
+def create_conversation_state_store(settings: Settings) -> ConversationStateStore:
+    """
+    Create the conversation state store configured in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Configured ConversationStateStore, falling back to the in-memory store
+        when Redis is selected but not configured
+    """
+    if settings.conversation_state_backend == "redis":
+        if settings.redis_url:
+            from ..database.redis_client import get_redis_client
+            return RedisConversationStateStore(
+                get_redis_client(settings.redis_url), ttl_seconds=settings.conversation_state_ttl_seconds
+            )
+        logger.warning("Conversation state backend set to redis but REDIS_URL is not configured, using memory")
+
+    return InMemoryConversationStateStore(
+        max_entries=settings.conversation_state_max_entries,
+        ttl_seconds=settings.conversation_state_ttl_seconds
+    )
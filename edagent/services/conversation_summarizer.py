@@ -0,0 +1,143 @@
+"""
+Rolling per-user conversation summaries for constant-size history prompts
+"""
+
+import asyncio
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ..config.settings import Settings, get_settings
+from .deadlines import no_deadline
+from .prompt_engineering import MAX_HISTORY_MESSAGES
+from .token_budget import truncate_to_tokens
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+# Turns with a message in the prompt's recent history; they stay out of the summary
+RECENT_HISTORY_TURNS = math.ceil(MAX_HISTORY_MESSAGES / 2)
+
+
+class ConversationSummarizer:
+    """
+    Keep a compact running summary of each user's conversation
+
+    Every interval_turns saved turns, a background task folds the turns the
+    summary does not cover yet into it and stores the result with the user.
+    Conversation prompts then carry the summary plus the last few turns, so
+    their size no longer depends on how long the user has been chatting.
+    Turns still in the recent history window are left out of the summary so
+    prompts do not pay for them twice.
+
+    Turn counts live in memory, for at most as many users as the
+    conversation state store keeps; the least recently active user's count
+    is dropped beyond that. After a restart or a dropped count the next
+    refresh still picks up every turn newer than the stored summary, it just
+    happens later.
+    """
+
+    def __init__(self, ai_service: Any, user_context_manager: Any, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        self.ai_service = ai_service
+        self.user_context_manager = user_context_manager
+        self.enabled = self.settings.conversation_summary_enabled
+        self.interval_turns = max(1, self.settings.conversation_summary_interval_turns)
+        self.max_turns = max(1, self.settings.conversation_summary_max_turns)
+        self.max_tracked_users = max(1, self.settings.conversation_state_max_entries)
+        self._pending_turns: "OrderedDict[str, int]" = OrderedDict()
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+    def record_turn(self, user_id: str) -> Optional["asyncio.Task[None]"]:
+        """
+        Count a saved turn, starting a background refresh when one is due
+
+        Args:
+            user_id: Unique user identifier
+
+        Returns:
+            The refresh task if one was started
+        """
+        if not self.enabled:
+            return None
+
+        pending = self._pending_turns.pop(user_id, 0) + 1
+        if pending < self.interval_turns or user_id in self._tasks:
+            # A running refresh will not see these turns; the next one will
+            self._pending_turns[user_id] = pending
+            if len(self._pending_turns) > self.max_tracked_users:
+                self._pending_turns.popitem(last=False)
+            return None
+
+        task = asyncio.ensure_future(self._refresh_in_background(user_id))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda _, u=user_id: self._tasks.pop(u, None))
+        return task
+
+    async def refresh(self, user_id: str) -> Optional[str]:
+        """
+        Fold turns newer than the stored summary, but older than the recent
+        history window, into it
+
+        At most max_turns turns are folded in per refresh; any remainder is
+        handled by the next one.
+
+        Args:
+            user_id: Unique user identifier
+
+        Returns:
+            The current summary, or None if the user does not exist
+        """
+        stored = await self.user_context_manager.get_conversation_summary(user_id)
+        if stored is None:
+            return None
+
+        turns = await self.user_context_manager.get_conversations_since(
+            user_id, stored["summarized_through"], self.max_turns, exclude_newest=RECENT_HISTORY_TURNS
+        )
+        if not turns:
+            return stored["summary"]
+
+        prompt_builder = self.ai_service.prompt_builder
+        prompt = prompt_builder.build_conversation_summary_prompt(stored["summary"], turns)
+        response = await self.ai_service._make_api_call(
+            self.ai_service._get_model("chat"),
+            prompt,
+            self.ai_service._get_generation_config("chat"),
+            operation="conversation_summary",
+            cacheable=False
+        )
+
+        summary = truncate_to_tokens(response.strip(), prompt_builder.budget.summary_tokens)
+        await self.user_context_manager.save_conversation_summary(
+            user_id, summary, turns[-1]["timestamp"]
+        )
+        logger.debug(f"Folded {len(turns)} turns into the conversation summary for user {user_id}")
+        return summary
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Wait briefly for running refreshes, then cancel the rest"""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.info(f"Cancelled {len(pending)} conversation summary refreshes on shutdown")
+
+    async def _refresh_in_background(self, user_id: str) -> None:
+        """Refresh a summary, logging rather than raising failures"""
+        try:
+            # Summaries are not part of the reply; the request's deadline does not apply
+            with no_deadline():
+                await self.refresh(user_id)
+            safe_track("track_conversation_summary_update", "success")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not refresh conversation summary for user {user_id}: {e}")
+            safe_track("track_conversation_summary_update", "error")
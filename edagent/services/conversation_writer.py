@@ -0,0 +1,227 @@
+"""
+Write-behind persistence of conversation turns
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, List, Optional
+
+from ..config.settings import Settings, get_settings
+from ..database.connection import db_manager, mark_recent_write
+from ..database.utils import DatabaseUtils
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+# Dead-lettered turns kept in memory for inspection; older ones are only in the logs
+DEAD_LETTER_LIMIT = 1000
+
+
+@dataclass
+class _QueuedTurn:
+    """A conversation turn waiting to be saved"""
+    row: Dict[str, Any]
+    saved: "asyncio.Future[None]"
+
+
+class ConversationWriter:
+    """
+    Save conversation turns in batches from a background task
+
+    submit() queues a turn and returns, so replies do not wait for a commit.
+    A worker inserts queued turns in one multi-row statement once batch_size
+    turns are waiting or flush_interval seconds after the first one arrived.
+    A failed batch is retried with exponential backoff; if it keeps failing,
+    its turns are inserted one at a time so a single bad row (e.g. for a
+    user deleted meanwhile) cannot take the others down, and the rows that
+    still fail are dead-lettered: logged, counted and kept in dead_letters.
+
+    When the queue is full, submit() waits for room rather than dropping
+    turns. Readers that need a user's latest turns call flush(user_id)
+    first; close() drains the queue on shutdown.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        session_factory: Optional[Callable[[], AsyncContextManager[Any]]] = None
+    ):
+        settings = settings or get_settings()
+        self.enabled = settings.conversation_write_behind_enabled
+        self.queue_size = max(1, settings.conversation_write_queue_size)
+        self.batch_size = max(1, settings.conversation_write_batch_size)
+        self.flush_interval = max(0.0, settings.conversation_write_flush_interval_seconds)
+        self.max_retries = max(0, settings.conversation_write_max_retries)
+        self.retry_backoff = max(0.0, settings.conversation_write_retry_backoff_seconds)
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=DEAD_LETTER_LIMIT)
+        self._session_factory = session_factory
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[_QueuedTurn]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._pending: Dict[str, List["asyncio.Future[None]"]] = {}
+
+    async def submit(
+        self,
+        user_id: str,
+        user_message: str,
+        assistant_response: str,
+        message_type: str = "general",
+        context_data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue a conversation turn to be saved
+
+        Args:
+            user_id: Unique user identifier
+            user_message: User's message
+            assistant_response: Assistant's response
+            message_type: Type of conversation (general, assessment, etc.)
+            context_data: Additional context data
+        """
+        self._ensure_worker()
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": uuid.UUID(user_id) if isinstance(user_id, str) else user_id,
+            "message": user_message,
+            "response": assistant_response,
+            "message_type": message_type,
+            "context_data": context_data or {},
+            # Taken now, not at insert time, so history keeps the order turns happened in
+            "timestamp": datetime.now(timezone.utc)
+        }
+        turn = _QueuedTurn(row=row, saved=self._loop.create_future())
+        self._pending.setdefault(str(user_id), []).append(turn.saved)
+
+        await self._queue.put(turn)
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        safe_track("update_conversation_write_queue_depth", self._queue.qsize())
+
+    async def flush(self, user_id: Optional[str] = None) -> None:
+        """
+        Wait until turns queued so far are saved or dead-lettered
+
+        Args:
+            user_id: Only wait for this user's turns (all turns if None)
+        """
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        if user_id is None:
+            waiting = [saved for pending in self._pending.values() for saved in pending]
+        else:
+            waiting = list(self._pending.get(str(user_id), []))
+        if not waiting:
+            return
+
+        # Write what is queued now instead of waiting for the batch to fill
+        self._wakeup.set()
+        await asyncio.gather(*(asyncio.shield(saved) for saved in waiting))
+        # The caller reads next, so read from the primary the turns were written to
+        mark_recent_write()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Save queued turns, giving up after timeout, and stop the worker"""
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            self._worker = None
+            return
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            unsaved = sum(len(pending) for pending in self._pending.values())
+            logger.error(f"Conversation write-behind drain timed out, {unsaved} turns not saved")
+
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and futures belong to one event loop; start afresh on a new one
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._wakeup = asyncio.Event()
+            self._pending = {}
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() + 1 < self.batch_size and not self._wakeup.is_set():
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if self._queue.empty():
+                self._wakeup.clear()
+            safe_track("update_conversation_write_queue_depth", self._queue.qsize())
+
+            try:
+                await self._write_batch(batch)
+            finally:
+                for turn in batch:
+                    self._mark_done(turn)
+
+    async def _write_batch(self, batch: List[_QueuedTurn]) -> None:
+        rows = [turn.row for turn in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._insert(rows)
+                safe_track("track_conversation_write_batch", len(rows), attempt)
+                safe_track("track_conversation_writes", "saved", len(rows))
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Saving {len(rows)} conversation turns failed after {attempt + 1} attempts: {e}")
+                    safe_track("track_conversation_write_batch", len(rows), attempt)
+                    break
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Saving {len(rows)} conversation turns failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+        for row in rows:
+            try:
+                await self._insert([row])
+                safe_track("track_conversation_writes", "saved", 1)
+            except Exception as e:
+                logger.error(f"Dead-lettered conversation turn {row['id']} for user {row['user_id']}: {e}")
+                self.dead_letters.append(row)
+                safe_track("track_conversation_writes", "dead_lettered", 1)
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        session_factory = self._session_factory or db_manager.get_session
+        async with session_factory() as session:
+            await DatabaseUtils.add_conversations(session, rows)
+
+    def _mark_done(self, turn: _QueuedTurn) -> None:
+        if not turn.saved.done():
+            turn.saved.set_result(None)
+        user_id = str(turn.row["user_id"])
+        pending = self._pending.get(user_id, [])
+        if turn.saved in pending:
+            pending.remove(turn.saved)
+        if not pending:
+            self._pending.pop(user_id, None)
+
+
+_conversation_writer: Optional[ConversationWriter] = None
+
+
+def get_conversation_writer() -> ConversationWriter:
+    """Get the process-wide conversation writer, shared by every UserContextManager"""
+    global _conversation_writer
+    if _conversation_writer is None:
+        _conversation_writer = ConversationWriter()
+    return _conversation_writer
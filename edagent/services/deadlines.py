@@ -0,0 +1,106 @@
+"""
+Request deadlines for AI calls
+
+Endpoints open a deadline scope around request handling; services read the
+remaining time from the current context instead of threading a timeout
+argument through every call. Tasks created inside the scope inherit it.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Deadline:
+    """A point in time by which a request must be answered"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Get the seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed"""
+        return time.monotonic() >= self.expires_at
+
+    def extend_to(self, other: Optional["Deadline"]) -> None:
+        """Push this deadline out to other's if that is later; None removes the limit"""
+        self.expires_at = max(self.expires_at, other.expires_at if other is not None else math.inf)
+
+    def copy(self) -> "Deadline":
+        """Get an independent deadline expiring at the same time"""
+        deadline = Deadline(0)
+        deadline.expires_at = self.expires_at
+        return deadline
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("edagent_request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Set the deadline for AI calls made within the block
+
+    An enclosing deadline that expires sooner stays in effect. Passing None
+    leaves the current deadline unchanged.
+
+    Args:
+        seconds: Time budget for the block
+    """
+    outer = _current_deadline.get()
+    if seconds is None:
+        yield outer
+        return
+
+    deadline = Deadline(seconds)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the current request, if any"""
+    return _current_deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Get the seconds left for the current request, or None without a deadline"""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+@contextmanager
+def use_deadline(deadline: Optional[Deadline]) -> Iterator[None]:
+    """
+    Make deadline the current one for the block, replacing any enclosing deadline
+
+    Unlike deadline_scope, the deadline may be later than the enclosing one.
+    Used for work shared by several requests, and for background work.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """
+    Lift the current deadline for the block
+
+    For background work started from a request, which would otherwise
+    inherit the request's deadline.
+    """
+    with use_deadline(None):
+        yield
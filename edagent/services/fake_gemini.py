@@ -0,0 +1,211 @@
+"""
+Offline stand-in for Gemini models, for load testing and benchmarks
+
+Selected with AI_SERVICE_BACKEND=fake. The model registry then hands out
+FakeGeminiModel instances instead of genai.GenerativeModel, so the whole
+GeminiAIService stack (cache, coalescing, rate limiting, executor, response
+processing) runs unchanged without network access or API quota.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+from ..config.settings import Settings
+
+
+@dataclass
+class FakeGeminiProfile:
+    """Latency and failure behaviour of the fake models"""
+    latency_median_ms: float = 800.0
+    latency_p95_ms: float = 2500.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: Optional[int] = None
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FakeGeminiProfile":
+        """Create a profile from FAKE_AI_* settings"""
+        return cls(
+            latency_median_ms=settings.fake_ai_latency_median_ms,
+            latency_p95_ms=settings.fake_ai_latency_p95_ms,
+            error_rate=settings.fake_ai_error_rate,
+            rate_limit_rate=settings.fake_ai_rate_limit_rate,
+            seed=settings.fake_ai_seed
+        )
+
+    def sample_latency(self) -> float:
+        """Sample a call latency in seconds from a log-normal distribution"""
+        if self.latency_median_ms <= 0:
+            return 0.0
+        # Log-normal with the configured median and 95th percentile (z = 1.645)
+        p95 = max(self.latency_p95_ms, self.latency_median_ms)
+        sigma = math.log(p95 / self.latency_median_ms) / 1.645
+        return self._random.lognormvariate(math.log(self.latency_median_ms), sigma) / 1000.0
+
+    def sample_failure(self) -> Optional[Exception]:
+        """Decide whether a call fails, returning the error to raise"""
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return google_exceptions.ResourceExhausted("Rate limit exceeded for requests per minute")
+        if roll < self.rate_limit_rate + self.error_rate:
+            return google_exceptions.ServiceUnavailable("The model is overloaded. Please try again later.")
+        return None
+
+
+class FakeGeminiResponse:
+    """Minimal GenerateContentResponse stand-in"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Offline replacement for genai.GenerativeModel"""
+
+    def __init__(self, model_name: str, profile: FakeGeminiProfile):
+        self.model_name = f"models/{model_name}"
+        self.profile = profile
+
+    def generate_content(self, contents: str, generation_config: Any = None,
+                         request_options: Any = None, **kwargs) -> FakeGeminiResponse:
+        """Blocking generation, as called from the Gemini executor"""
+        latency, error = self.profile.sample_latency(), self.profile.sample_failure()
+        if isinstance(error, google_exceptions.ResourceExhausted):
+            # Quota rejections come back quickly
+            time.sleep(min(latency, 0.05))
+            raise error
+
+        time.sleep(latency)
+        if error:
+            raise error
+        return FakeGeminiResponse(render_fake_response(contents))
+
+    async def generate_content_async(self, contents: str, generation_config: Any = None,
+                                     stream: bool = False, request_options: Any = None, **kwargs) -> Any:
+        """Async generation; returns an async iterable of chunks when stream is set"""
+        latency, error = self.profile.sample_latency(), self.profile.sample_failure()
+        if isinstance(error, google_exceptions.ResourceExhausted):
+            await asyncio.sleep(min(latency, 0.05))
+            raise error
+
+        text = render_fake_response(contents)
+        if not stream:
+            await asyncio.sleep(latency)
+            if error:
+                raise error
+            return FakeGeminiResponse(text)
+
+        # Spend a third of the latency before the first chunk and spread the rest
+        await asyncio.sleep(latency / 3)
+        if error:
+            raise error
+        return self._stream_chunks(text, latency * 2 / 3)
+
+    async def _stream_chunks(self, text: str, duration: float) -> AsyncIterator[FakeGeminiResponse]:
+        words = text.split(" ")
+        chunks = [" ".join(words[i:i + 8]) + " " for i in range(0, len(words), 8)]
+        delay = duration / max(1, len(chunks))
+        for chunk in chunks:
+            yield FakeGeminiResponse(chunk)
+            await asyncio.sleep(delay)
+
+
+def render_fake_response(prompt: str) -> str:
+    """Build a response in the shape StructuredResponseHandler expects for the prompt"""
+    if "Provide a structured assessment in JSON format" in prompt:
+        return _fake_skill_assessment(prompt)
+    if "Create a structured learning path" in prompt:
+        return _fake_learning_path(prompt)
+    if "Update the running summary" in prompt:
+        return _fake_conversation_summary(prompt)
+    return _fake_conversation(prompt)
+
+
+def _fake_skill_assessment(prompt: str) -> str:
+    match = re.search(r"skill level in (.+?)\.", prompt)
+    skill_area = match.group(1).strip() if match else "General"
+    return json.dumps({
+        "skill_area": skill_area,
+        "overall_level": "intermediate",
+        "confidence_score": 0.7,
+        "strengths": [f"Practical experience with {skill_area}", "Clear communication"],
+        "weaknesses": ["Limited exposure to advanced topics"],
+        "recommendations": [f"Build a portfolio project using {skill_area}", "Study design patterns"],
+        "detailed_scores": {"fundamentals": 0.75, "practical_application": 0.65}
+    })
+
+
+def _fake_learning_path(prompt: str) -> str:
+    match = re.search(r"^Goal: (.+)$", prompt, re.MULTILINE)
+    goal = match.group(1).strip() if match else "your goal"
+    milestones: List[Dict[str, Any]] = []
+    for index, (title, level) in enumerate([
+        ("Foundations", "beginner"),
+        ("Core Skills", "beginner"),
+        ("Applied Projects", "intermediate"),
+        ("Job Readiness", "intermediate"),
+    ]):
+        milestones.append({
+            "title": title,
+            "description": f"Step {index + 1} towards {goal}",
+            "skills_to_learn": [f"{title.lower()} skill"],
+            "prerequisites": [milestones[-1]["title"]] if milestones else [],
+            "estimated_duration_days": 14,
+            "difficulty_level": level,
+            "assessment_criteria": [f"Complete the {title.lower()} exercise"],
+            "resources": [{
+                "title": f"{title} video course",
+                "url": "https://www.youtube.com/results?search_query=" + title.lower().replace(" ", "+"),
+                "type": "video",
+                "is_free": True,
+                "duration_hours": 3
+            }]
+        })
+    return json.dumps({
+        "title": f"Learning Path: {goal}",
+        "description": f"A step-by-step plan to {goal}",
+        "difficulty_level": "beginner",
+        "prerequisites": [],
+        "target_skills": [milestone["skills_to_learn"][0] for milestone in milestones],
+        "milestones": milestones
+    })
+
+
+def _fake_conversation_summary(prompt: str) -> str:
+    previous = re.search(r"Current summary:\n(.*?)\n\nNew conversation turns:", prompt, re.DOTALL)
+    max_words = re.search(r"at most (\d+) words", prompt)
+    topics = [topic.strip()[:80] for topic in re.findall(r"^User: (.+)$", prompt, re.MULTILINE)]
+
+    summary = previous.group(1).strip() if previous else ""
+    if summary == "(none yet)":
+        summary = ""
+    if topics:
+        summary = f"{summary} The user asked about: {'; '.join(topics)}.".strip()
+
+    # Keep the most recent part, as a real summary would favour new facts
+    words = summary.split()
+    limit = int(max_words.group(1)) if max_words else 300
+    return " ".join(words[-limit:])
+
+
+def _fake_conversation(prompt: str) -> str:
+    match = re.search(r"User message: (.+?)\n", prompt, re.DOTALL)
+    topic = match.group(1).strip()[:80] if match else "your question"
+    return (
+        f"Great question about \"{topic}\". Start by identifying the core skills employers ask for, "
+        "then pick one free course and one hands-on project to practice them. "
+        "Set aside a few focused hours each week and review your progress every Friday. "
+        "Would you like me to assess your current skills or build a learning path?"
+    )
@@ -0,0 +1,98 @@
+"""
+Structured concurrency for independent steps within a request
+
+fan_out() runs named branches concurrently and returns once all of them
+finished. No branch outlives the call: when one fails or times out, the
+others are cancelled before the error is raised, and cancelling the caller
+cancels every branch. Branches run in tasks created from the caller's
+context, so request deadlines apply to them as well.
+
+Inside a branch_timings() scope, each branch's duration is recorded so
+callers can report where the time of a request went.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_branch_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("edagent_branch_timings", default=None)
+
+
+async def fan_out(
+    branches: Mapping[str, Awaitable[Any]],
+    timeouts: Optional[Mapping[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Run independent steps concurrently
+
+    Branches start in the given order, so put the one that waits on I/O
+    soonest (e.g. a Gemini call) first to overlap it with the others.
+
+    Args:
+        branches: Awaitables by branch name
+        timeouts: Seconds allowed per branch name; branches not listed are
+            bounded only by the request deadline
+
+    Returns:
+        Each branch's result by name
+
+    Raises:
+        asyncio.TimeoutError: If a branch exceeded its timeout
+        Exception: The first error raised by a branch, in branch order
+    """
+    timeouts = timeouts or {}
+    tasks = {
+        name: asyncio.ensure_future(_run_branch(name, awaitable, timeouts.get(name)))
+        for name, awaitable in branches.items()
+    }
+    try:
+        await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # Cancel what is still running, on failure or when the caller is cancelled
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    errors = [task.exception() for task in tasks.values() if not task.cancelled() and task.exception()]
+    if errors:
+        raise errors[0]
+    return {name: task.result() for name, task in tasks.items()}
+
+
+@contextmanager
+def branch_timings() -> Iterator[Dict[str, float]]:
+    """
+    Record the duration of branches run within the block
+
+    Yields:
+        Milliseconds per branch name, filled in as branches finish
+    """
+    timings: Dict[str, float] = {}
+    token = _branch_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _branch_timings.reset(token)
+
+
+async def _run_branch(name: str, awaitable: Awaitable[Any], timeout: Optional[float]) -> Any:
+    started = time.perf_counter()
+    try:
+        if timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Branch {name} timed out after {timeout:.1f}s")
+            raise
+    finally:
+        timings = _branch_timings.get()
+        if timings is not None:
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
@@ -0,0 +1,130 @@
+"""
+Dedicated thread pool for blocking Gemini SDK calls
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+from ..config.settings import get_settings
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GeminiExecutor:
+    """
+    Bounded thread pool for synchronous Gemini SDK calls
+
+    Keeps long model calls off the event loop's default executor, which the
+    rest of the process (password hashing, file I/O, ...) relies on. Calls
+    that time out while still queued are cancelled before they start;
+    calls already running are bounded by the SDK request timeout passed in
+    by the caller.
+    """
+
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gemini")
+        self._lock = threading.Lock()
+        self._queued: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._closed = False
+
+    @staticmethod
+    def _model_label(model_name: str) -> str:
+        """Strip the 'models/' prefix the SDK adds to model names"""
+        return str(model_name).split("/")[-1]
+
+    async def run(
+        self,
+        func: Callable[[], T],
+        model_name: str = "unknown",
+        timeout: Optional[float] = None
+    ) -> T:
+        """
+        Run a blocking call on the Gemini pool
+
+        Args:
+            func: Zero-argument callable performing the SDK call
+            model_name: Model being called (metrics label)
+            timeout: Seconds to wait for the result, including queue time
+
+        Returns:
+            The callable's result
+
+        Raises:
+            TimeoutError: If the call does not finish within timeout
+        """
+        if self._closed:
+            raise RuntimeError("Gemini executor has been shut down")
+
+        label = self._model_label(model_name)
+        self._adjust(label, queued=1)
+
+        def call() -> T:
+            self._adjust(label, queued=-1, active=1)
+            try:
+                return func()
+            finally:
+                self._adjust(label, active=-1)
+
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Gemini call to {label} timed out after {timeout:.1f}s")
+            safe_track("track_gemini_call_timeout", label)
+            raise TimeoutError(f"Gemini call timeout after {timeout:.1f}s")
+        finally:
+            # Succeeds only if the call never started; it then still counts as queued
+            if future.cancel():
+                self._adjust(label, queued=-1)
+
+    def _adjust(self, label: str, queued: int = 0, active: int = 0) -> None:
+        """Update per-model counters from either the event loop or a worker thread"""
+        with self._lock:
+            self._queued[label] = self._queued.get(label, 0) + queued
+            self._active[label] = self._active.get(label, 0) + active
+            queue_depth = self._queued[label]
+            saturation = self._active[label] / self.max_workers
+        safe_track("update_gemini_executor_usage", label, queue_depth, saturation)
+
+    def queue_depth(self, model_name: str) -> int:
+        """Get the number of calls for a model waiting for a worker"""
+        return self._queued.get(self._model_label(model_name), 0)
+
+    def active_calls(self, model_name: str) -> int:
+        """Get the number of calls for a model currently running"""
+        return self._active.get(self._model_label(model_name), 0)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting calls and cancel any that have not started"""
+        self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Shared by every GeminiAIService instance so the process has one bounded pool
+_gemini_executor: Optional[GeminiExecutor] = None
+
+
+def get_gemini_executor() -> GeminiExecutor:
+    """Get the process-wide Gemini executor, creating it on first use"""
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = GeminiExecutor(get_settings().gemini_executor_max_workers)
+        logger.info(f"Gemini executor started with {_gemini_executor.max_workers} workers")
+    return _gemini_executor
+
+
+def shutdown_gemini_executor(wait: bool = False) -> None:
+    """Shut down the process-wide Gemini executor"""
+    global _gemini_executor
+    if _gemini_executor is not None:
+        _gemini_executor.shutdown(wait=wait)
+        _gemini_executor = None
+        logger.info("Gemini executor shut down")
@@ -0,0 +1,86 @@
+"""
+Hedged requests for tail-latency reduction
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling per-model call latencies used to pick the hedge delay"""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, model_name: str, seconds: float) -> None:
+        """Record the latency of a successful call"""
+        samples = self._samples.get(model_name)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._samples[model_name] = samples
+        samples.append(seconds)
+
+    def percentile(self, model_name: str, percentile: float) -> Optional[float]:
+        """Get a latency percentile (0-100), or None until enough samples exist"""
+        samples = self._samples.get(model_name)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+async def run_hedged(
+    func: Callable[[], Awaitable[T]],
+    hedge_delay: float,
+    on_complete: Optional[Callable[[bool], None]] = None
+) -> T:
+    """
+    Run func, starting a second identical attempt if the first is slow
+
+    The first attempt to succeed wins and the other is cancelled. If one
+    attempt fails the other is still awaited; the first error is raised only
+    when both fail.
+
+    Args:
+        func: Zero-argument coroutine function performing the call
+        hedge_delay: Seconds to wait for the first attempt before hedging
+        on_complete: Called with True if the hedge won, False if the primary won
+
+    Returns:
+        The result of the winning attempt
+    """
+    primary = asyncio.ensure_future(func())
+    pending: Set["asyncio.Future[T]"] = {primary}
+    errors = []
+
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+        if primary in done:
+            return primary.result()
+
+        logger.debug(f"No response after {hedge_delay:.2f}s, sending hedged request")
+        hedge = asyncio.ensure_future(func())
+        pending.add(hedge)
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if on_complete:
+                        on_complete(task is hedge)
+                    return task.result()
+                errors.append(task.exception())
+
+        raise errors[0]
+    finally:
+        for task in pending:
+            task.cancel()
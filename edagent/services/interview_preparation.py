@@ -89,7 +89,8 @@ class InterviewPreparationService:
             response = await self.ai_service._make_api_call(
                 self.ai_service._get_model("reasoning"),
                 prompt,
-                self.ai_service._get_generation_config("reasoning")
+                self.ai_service._get_generation_config("reasoning"),
+                operation="interview_questions"
             )
             
             # Parse the response into InterviewQuestion objects
@@ -250,7 +251,8 @@ Generate diverse questions that cover different aspects of the role and assess v
             response = await self.ai_service._make_api_call(
                 self.ai_service._get_model("reasoning"),
                 prompt,
-                self.ai_service._get_generation_config("reasoning")
+                self.ai_service._get_generation_config("reasoning"),
+                operation="interview_feedback"
             )
             
             # Parse feedback response
@@ -377,7 +379,8 @@ Consider:
             response = await self.ai_service._make_api_call(
                 self.ai_service._get_model("reasoning"),
                 prompt,
-                self.ai_service._get_generation_config("reasoning")
+                self.ai_service._get_generation_config("reasoning"),
+                operation="interview_guidance"
             )
             
             guidance = self._parse_industry_guidance_response(response, industry)
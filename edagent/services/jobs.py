@@ -0,0 +1,380 @@
+"""
+Background jobs for long-running generation requests
+
+Endpoints whose work can outlast an HTTP request (learning path generation,
+resume analysis, interview session creation) submit it as a job and answer
+202 Accepted with the job's id. A pool of workers in the app process runs
+queued jobs; clients poll the job's status, and listeners (the WebSocket
+connection manager) are told when a job finishes.
+
+Job records live in a JobStore: in memory for a single process, or in Redis
+so that any worker process can answer a status poll. A job runs in the
+process that accepted it.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import Settings, get_settings
+from .deadlines import deadline_scope
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[], Awaitable[Dict[str, Any]]]
+JobListener = Callable[["Job"], Awaitable[None]]
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done, successfully or not"""
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+    def __init__(self, queued: int):
+        self.queued = queued
+        super().__init__(f"Job queue is full with {queued} jobs waiting")
+
+
+@dataclass
+class Job:
+    """A unit of background work and its outcome"""
+    kind: str
+    user_id: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "user_id": self.user_id,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """Create Job from dictionary"""
+        return cls(
+            kind=data["kind"],
+            user_id=data["user_id"],
+            id=data["id"],
+            status=JobStatus(data["status"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
+            finished_at=datetime.fromisoformat(data["finished_at"]) if data.get("finished_at") else None,
+            result=data.get("result"),
+            error=data.get("error")
+        )
+
+
+class JobStore(ABC):
+    """Storage for job records, keyed by job ID"""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get a job, or None if there is none or it expired"""
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """Store a job after it changed"""
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Per-process job store with expiry and a size bound
+
+    Finished jobs are dropped ttl_seconds after they finished, and the
+    oldest jobs are evicted beyond max_entries. Only the process that
+    accepted a job can report on it; use the Redis store when running
+    several worker processes.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if self._is_expired(job):
+            del self._jobs[job_id]
+            return None
+        return job
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+        # Jobs are kept in submission order, so the oldest are at the front
+        while self._jobs:
+            oldest = next(iter(self._jobs.values()))
+            if len(self._jobs) <= self.max_entries and not self._is_expired(oldest):
+                break
+            self._jobs.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _is_expired(self, job: Job) -> bool:
+        return job.finished_at is not None and datetime.now() - job.finished_at > self.ttl
+
+
+class RedisJobStore(JobStore):
+    """
+    Job store shared by every worker process through Redis
+
+    Jobs are stored as JSON and expire ttl_seconds after they were last
+    saved, so ttl_seconds must exceed the job timeout.
+    """
+
+    def __init__(self, redis_client: Any, ttl_seconds: int = 3600, key_prefix: str = "edagent:job:"):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        payload = await self.redis.get(self.key_prefix + job_id)
+        if payload is None:
+            return None
+        try:
+            return Job.from_dict(json.loads(payload))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable job {job_id}: {e}")
+            return None
+
+    async def save(self, job: Job) -> None:
+        payload = json.dumps(job.to_dict(), default=str)
+        await self.redis.set(self.key_prefix + job.id, payload, ex=self.ttl_seconds)
+
+
+def create_job_store(settings: Settings) -> JobStore:
+    """
+    Create the job store configured in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Configured JobStore, falling back to the in-memory store when Redis
+        is selected but not configured
+    """
+    if settings.job_store_backend == "redis":
+        if settings.redis_url:
+            from ..database.redis_client import get_redis_client
+            return RedisJobStore(get_redis_client(settings.redis_url), ttl_seconds=settings.job_ttl_seconds)
+        logger.warning("Job store backend set to redis but REDIS_URL is not configured, using memory")
+
+    return InMemoryJobStore(max_entries=settings.job_max_entries, ttl_seconds=settings.job_ttl_seconds)
+
+
+class JobRunner:
+    """
+    Run submitted jobs on a pool of background workers
+
+    submit() records the job as queued and returns at once; one of
+    `workers` worker tasks runs it later, with the job timeout as its AI
+    deadline rather than the request's. At most queue_size jobs wait to
+    start; beyond that, submit() raises JobQueueFullError. A failed job
+    keeps its error message; listeners are called once a job finishes
+    either way.
+
+    On close(), jobs that have not started are marked failed, and running
+    ones get a grace period before they are cancelled and marked failed.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, store: Optional[JobStore] = None):
+        settings = settings or get_settings()
+        self.workers = max(1, settings.job_workers)
+        self.queue_size = max(1, settings.job_queue_size)
+        self.timeout = settings.job_timeout_seconds
+        self.store = store or create_job_store(settings)
+        self._listeners: List[JobListener] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Tuple[Job, JobFunc]]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._done: Dict[str, "asyncio.Future[Job]"] = {}
+
+    def add_listener(self, listener: JobListener) -> None:
+        """Call a coroutine function with each job once it finishes"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    async def submit(self, kind: str, user_id: str, func: JobFunc) -> Job:
+        """
+        Queue work to run in the background
+
+        Args:
+            kind: Kind of job, e.g. "learning_path"
+            user_id: User the job is for, who is notified when it finishes
+            func: Zero-argument coroutine function returning the job's
+                JSON-serializable result
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If queue_size jobs are already waiting
+        """
+        self._ensure_workers()
+        if self._queue.full():
+            safe_track("track_background_job", kind, "rejected", None)
+            raise JobQueueFullError(self._queue.qsize())
+
+        job = Job(kind=kind, user_id=user_id)
+        await self.store.save(job)
+        self._done[job.id] = self._loop.create_future()
+        self._queue.put_nowait((job, func))
+        safe_track("track_background_job", kind, JobStatus.QUEUED.value, None)
+        safe_track("update_background_job_queue_depth", self._queue.qsize())
+        logger.info(f"Queued {kind} job {job.id} for user {user_id}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get a job's current state"""
+        return await self.store.get(job_id)
+
+    async def wait(self, job_id: str) -> Job:
+        """
+        Wait for a job submitted to this runner to finish
+
+        Raises:
+            KeyError: If the job was not submitted here or already finished
+                before the runner restarted
+        """
+        return await asyncio.shield(self._done[job_id])
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop the workers, giving running jobs up to timeout seconds to finish"""
+        if not self._tasks or self._loop is not asyncio.get_running_loop():
+            self._tasks = []
+            return
+
+        # Jobs that have not started will not run
+        while not self._queue.empty():
+            job, _ = self._queue.get_nowait()
+            self._queue.task_done()
+            job.error = "The server shut down before the job started"
+            await self._finish(job, JobStatus.FAILED)
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Background jobs still running at shutdown are being cancelled")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and futures belong to one event loop; start afresh on a new one
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._done = {}
+            self._tasks = []
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            # Started from an empty context so workers do not inherit the submitting request's deadline
+            self._tasks.append(contextvars.Context().run(loop.create_task, self._work()))
+
+    async def _work(self) -> None:
+        while True:
+            job, func = await self._queue.get()
+            safe_track("update_background_job_queue_depth", self._queue.qsize())
+            try:
+                await self._run(job, func)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, func: JobFunc) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        await self._save(job)
+        started = time.perf_counter()
+
+        try:
+            with deadline_scope(self.timeout):
+                job.result = await asyncio.wait_for(func(), self.timeout)
+            status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.error = "The server shut down before the job finished"
+            await self._finish(job, JobStatus.FAILED, time.perf_counter() - started)
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"{job.kind} job {job.id} timed out after {self.timeout:.0f}s")
+            job.error = f"The job did not finish within {self.timeout:.0f} seconds"
+            status = JobStatus.FAILED
+        except Exception as e:
+            logger.error(f"{job.kind} job {job.id} failed: {e}")
+            job.error = str(e) or e.__class__.__name__
+            status = JobStatus.FAILED
+
+        await self._finish(job, status, time.perf_counter() - started)
+
+    async def _finish(self, job: Job, status: JobStatus, duration: Optional[float] = None) -> None:
+        job.status = status
+        job.finished_at = datetime.now()
+        await self._save(job)
+        safe_track("track_background_job", job.kind, status.value, duration)
+
+        done = self._done.pop(job.id, None)
+        if done is not None and not done.done():
+            done.set_result(job)
+
+        for listener in self._listeners:
+            try:
+                await listener(job)
+            except Exception as e:
+                logger.warning(f"Job listener failed for job {job.id}: {e}")
+
+    async def _save(self, job: Job) -> None:
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            logger.error(f"Could not save the state of job {job.id}: {e}")
+
+
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """Get the process-wide job runner"""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner()
+    return _job_runner
@@ -0,0 +1,139 @@
+"""
+Single-pass keyword matching for routing user messages
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """A keyword found in a text; positions refer to the lowercased text"""
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Find which keyword categories occur in a text with one compiled pattern
+
+    Keywords match as case-insensitive substrings, so categories() gives the
+    same answer as `any(keyword in text.lower() for keyword in keywords)` for
+    every category, in one scan instead of one per keyword. The pattern is a
+    trie of all keywords: the regex engine skips ahead to characters that can
+    start a keyword, then follows only keywords sharing a prefix with the
+    text and takes the longest. Shorter keywords starting there are its
+    prefixes and are reported along with it, and the scan resumes one
+    character after the match starts, so overlapping keywords are all found,
+    as with an Aho-Corasick automaton.
+
+    Categories are ranked by priority (definition order unless given), which
+    first() uses to pick one when several match.
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]], priority: Optional[Sequence[str]] = None):
+        """
+        Build the matcher
+
+        Args:
+            categories: Keywords per category, in default priority order
+            priority: Categories in priority order; unlisted ones follow in
+                definition order
+
+        Raises:
+            ValueError: If priority names an unknown category or no keywords are given
+        """
+        unknown = [name for name in priority or () if name not in categories]
+        if unknown:
+            raise ValueError(f"Unknown keyword categories in priority: {', '.join(unknown)}")
+        self.priority: Tuple[str, ...] = tuple(dict.fromkeys([*(priority or ()), *categories]))
+
+        keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword and category not in keyword_categories.setdefault(keyword, []):
+                    keyword_categories[keyword].append(category)
+        if not keyword_categories:
+            raise ValueError("KeywordMatcher needs at least one keyword")
+
+        # The scan finds the longest keyword at each position; shorter ones there are its prefixes
+        self._prefixes: Dict[str, List[Tuple[str, str]]] = {
+            keyword: sorted(
+                (
+                    (category, prefix)
+                    for prefix, prefix_categories in keyword_categories.items() if keyword.startswith(prefix)
+                    for category in prefix_categories
+                ),
+                key=lambda item: -len(item[1])
+            )
+            for keyword in keyword_categories
+        }
+        self._implied: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(category for category, _ in prefixes)
+            for keyword, prefixes in self._prefixes.items()
+        }
+
+        self._pattern = re.compile(_build_trie_pattern(keyword_categories))
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        Find every keyword occurrence in a text
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Matches ordered by start position, longest first
+        """
+        matches = []
+        for start, keyword in self._scan(text.lower()):
+            for category, prefix in self._prefixes[keyword]:
+                matches.append(KeywordMatch(category, prefix, start, start + len(prefix)))
+        return matches
+
+    def categories(self, text: str) -> Set[str]:
+        """Get every category with a keyword in the text"""
+        matched: Set[str] = set()
+        for _, keyword in self._scan(text.lower()):
+            matched |= self._implied[keyword]
+        return matched
+
+    def first(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the highest-priority category with a keyword in the text"""
+        matched = self.categories(text)
+        return next((category for category in self.priority if category in matched), default)
+
+    def matches(self, text: str) -> bool:
+        """Check whether any keyword occurs in the text"""
+        return self._pattern.search(text.lower()) is not None
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield the longest keyword starting at each position where one starts"""
+        search = self._pattern.search
+        found = search(text)
+        while found is not None:
+            start = found.start()
+            yield start, found.group()
+            found = search(text, start + 1)
+
+
+def _build_trie_pattern(keywords: Dict[str, List[str]]) -> str:
+    """Build a regex matching the longest keyword at a position, sharing common prefixes"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Optional rather than an empty branch: greedy, so the longest keyword wins
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from ..models.user_context import UserContext, SkillLevel, SkillLevelEnum
 from ..models.learning import LearningPath, Milestone, DifficultyLevel
 from .ai_service import GeminiAIService
+from .fan_out import fan_out
 from .prompt_engineering import PromptBuilder
 from .response_processing import StructuredResponseHandler
 
@@ -498,11 +499,13 @@ class EnhancedLearningPathGenerator:
         try:
             logger.info(f"Creating comprehensive learning path for goal: {goal}")
             
-            # Step 1: Analyze prerequisites
-            prerequisite_analysis = self.prerequisite_analyzer.analyze_prerequisites(goal, current_skills)
-            
-            # Step 2: Generate base learning path using AI
-            base_learning_path = await self.ai_service.create_learning_path(goal, current_skills)
+            # Steps 1-2: Generate base learning path using AI, analyzing prerequisites meanwhile
+            results = await fan_out({
+                "learning_path.generation": self.ai_service.create_learning_path(goal, current_skills),
+                "learning_path.prerequisites": self._analyze_prerequisites(goal, current_skills)
+            })
+            base_learning_path = results["learning_path.generation"]
+            prerequisite_analysis = results["learning_path.prerequisites"]
             
             # Step 3: Add prerequisite milestones if needed
             if prerequisite_analysis["missing"]:
@@ -567,6 +570,10 @@ class EnhancedLearningPathGenerator:
             # Return fallback learning path
             return self.response_handler._create_fallback_learning_path(goal)
     
+    async def _analyze_prerequisites(self, goal: str, current_skills: Dict[str, SkillLevel]) -> Dict[str, Any]:
+        """Analyze prerequisites for the goal"""
+        return self.prerequisite_analyzer.analyze_prerequisites(goal, current_skills)
+    
     def _fix_common_issues(self, learning_path: LearningPath, issues: List[str]) -> LearningPath:
         """Fix common issues in learning paths"""
         
@@ -0,0 +1,141 @@
+"""
+Registry of reusable Gemini model instances and generation configs
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+from ..config.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Named safety profiles; "educational" is less restrictive to allow career and learning content
+SAFETY_PROFILES: Dict[str, Dict[HarmCategory, HarmBlockThreshold]] = {
+    "educational": {
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    },
+}
+
+DEFAULT_SAFETY_PROFILE = "educational"
+
+
+class GeminiModelRegistry:
+    """
+    Build each Gemini model and generation config once and reuse it
+
+    Models are keyed by (model_name, safety_profile). GenerativeModel
+    instances hold no per-request state, so one instance per key can serve
+    every request. Generation configs are shared dicts and must not be
+    mutated by callers.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, str], genai.GenerativeModel] = {}
+        self._generation_configs: Dict[str, Dict[str, Any]] = {}
+        self._fake_profile: Optional[Any] = None
+
+    def _model_name(self, model_type: str) -> str:
+        if model_type == "reasoning":
+            return self.settings.gemini_model_reasoning
+        return self.settings.gemini_model_chat
+
+    def get_model(self, model_type: str = "chat", safety_profile: str = DEFAULT_SAFETY_PROFILE) -> genai.GenerativeModel:
+        """Get the Gemini model for a model type, building it on first use"""
+        key = (self._model_name(model_type), safety_profile)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            model = self._models.get(key)
+            if model is None:
+                if safety_profile not in SAFETY_PROFILES:
+                    raise ValueError(f"Unknown safety profile: {safety_profile}")
+                model = self._build_model(key[0], safety_profile)
+                self._models[key] = model
+                logger.debug(f"Built Gemini model {key[0]} with {safety_profile} safety profile")
+            return model
+
+    def _build_model(self, model_name: str, safety_profile: str) -> genai.GenerativeModel:
+        """Build a model for the configured AI service backend"""
+        if self.settings.ai_service_backend == "fake":
+            from .fake_gemini import FakeGeminiModel, FakeGeminiProfile
+            if self._fake_profile is None:
+                logger.warning("AI_SERVICE_BACKEND=fake: Gemini calls are served by the offline stand-in")
+                # One profile per registry so a seed gives a single reproducible sequence
+                self._fake_profile = FakeGeminiProfile.from_settings(self.settings)
+            return FakeGeminiModel(model_name, self._fake_profile)
+
+        return genai.GenerativeModel(
+            model_name=model_name,
+            safety_settings=SAFETY_PROFILES[safety_profile]
+        )
+
+    def get_generation_config(self, model_type: str = "chat") -> Dict[str, Any]:
+        """Get the shared generation config for a model type"""
+        config = self._generation_configs.get(model_type)
+        if config is not None:
+            return config
+
+        if model_type == "reasoning":
+            config = {
+                "temperature": self.settings.gemini_temperature_reasoning,
+                "max_output_tokens": self.settings.gemini_max_tokens_learning_path,
+                "top_p": 0.8,
+                "top_k": 40
+            }
+        else:
+            config = {
+                "temperature": self.settings.gemini_temperature_chat,
+                "max_output_tokens": self.settings.gemini_max_tokens_response,
+                "top_p": 0.9,
+                "top_k": 40
+            }
+        self._generation_configs[model_type] = config
+        return config
+
+    def warmup(self) -> None:
+        """Build the chat and reasoning models and configs ahead of the first request"""
+        for model_type in ("chat", "reasoning"):
+            self.get_model(model_type)
+            self.get_generation_config(model_type)
+        logger.info(f"Gemini model registry warmed up with {len(self._models)} models")
+
+    def reload(self, settings: Optional[Settings] = None) -> None:
+        """
+        Drop cached models and configs so they are rebuilt from settings
+
+        Args:
+            settings: New settings to build from; defaults to the current ones
+        """
+        with self._lock:
+            if settings is not None:
+                self.settings = settings
+            # Swap rather than clear so concurrent readers never see a half-emptied dict
+            self._models = {}
+            self._generation_configs = {}
+            self._fake_profile = None
+        logger.info("Gemini model registry reloaded")
+
+
+# Shared by every GeminiAIService instance so models are built once per process
+_model_registry: Optional[GeminiModelRegistry] = None
+
+
+def get_model_registry() -> GeminiModelRegistry:
+    """Get the process-wide Gemini model registry"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = GeminiModelRegistry()
+    return _model_registry
@@ -20,6 +20,9 @@ from ..models.privacy import (
     DataExportRequest, DataExportResult, DataDeletionRequest,
     DataDeletionResult, AuditLogEntry, PrivacyAction
 )
+from .conversation_archive import get_conversation_archive
+from .conversation_writer import get_conversation_writer
+from .user_context_cache import get_user_context_cache
 
 
 logger = logging.getLogger(__name__)
@@ -31,6 +34,9 @@ class PrivacyService:
     async def export_user_data(self, user_id: str) -> DataExportResult:
         """Export all user data in a structured format"""
         try:
+            # Include turns still waiting to be saved
+            await get_conversation_writer().flush(user_id)
+            
             async with db_manager.get_session() as db_session:
                 # Verify user exists
                 user_query = select(User).where(User.id == uuid.UUID(user_id))
@@ -82,6 +88,9 @@ class PrivacyService:
             )
         
         try:
+            # Queued turns must not be saved after their user's data is deleted
+            await get_conversation_writer().flush(user_id)
+            
             async with db_manager.get_session() as db_session:
                 # Verify user exists
                 user_query = select(User).where(User.id == uuid.UUID(user_id))
@@ -118,6 +127,9 @@ class PrivacyService:
                 
                 await db_session.commit()
                 
+                # Deleted data must not keep being served from the context cache
+                await get_user_context_cache().invalidate(user_id, "deletion")
+                
                 logger.info(f"Deleted data for user {user_id}: {deleted_data}")
                 
                 return DataDeletionResult(
@@ -138,7 +150,7 @@ class PrivacyService:
     async def get_user_data_summary(self, user_id: str) -> Dict[str, Any]:
         """Get a summary of what data exists for a user"""
         try:
-            async with db_manager.get_session() as db_session:
+            async with db_manager.get_session(readonly=True) as db_session:
                 user_uuid = uuid.UUID(user_id)
                 
                 # Count data by type
@@ -230,6 +242,14 @@ class PrivacyService:
             for conv in conversations
         ]
         
+        # Conversations past retention are in the archive instead
+        exported_ids = {conv["id"] for conv in export_data["conversations"]}
+        export_data["conversations"].extend(
+            {key: record[key] for key in ("id", "message", "response", "timestamp", "message_type", "context_data")}
+            for record in reversed(await get_conversation_archive().read_user(str(user_id)))
+            if record["id"] not in exported_ids
+        )
+        
         # Learning paths with milestones
         lp_query = select(LearningPath).options(
             selectinload(LearningPath.milestones)
@@ -317,6 +337,7 @@ class PrivacyService:
             delete_query = delete(Conversation).where(Conversation.user_id == user_id)
             result = await db_session.execute(delete_query)
             count = result.rowcount
+            count += await get_conversation_archive().delete_user(str(user_id))
             
         elif data_type == "skills":
             delete_query = delete(UserSkill).where(UserSkill.user_id == user_id)
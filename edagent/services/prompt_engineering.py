@@ -2,10 +2,22 @@
 Prompt engineering system for EdAgent
 """
 
-from typing import Dict, List, Optional, Any
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime
 from ..models.user_context import UserContext, SkillLevel
 from ..models.learning import SkillAssessment, LearningPath
+from .token_budget import PromptBudget, PromptSection, allocate_budget, estimate_tokens, truncate_to_tokens
+from ..utils.metrics import safe_track
+
+if TYPE_CHECKING:
+    from .question_bank import QuestionBank
+
+
+logger = logging.getLogger(__name__)
+
+# Number of recent messages considered for conversation context
+MAX_HISTORY_MESSAGES = 5
 
 
 class PromptTemplates:
@@ -130,29 +142,50 @@ Consider the user's learning style: {learning_style}
 Time commitment: {time_commitment}
 Budget preference: {budget_preference}"""
 
+    # Rolling conversation summary prompt
+    CONVERSATION_SUMMARY_PROMPT = """Update the running summary of a career coaching conversation between a user and EdAgent.
+
+Keep facts that matter for future coaching: the user's goals, background, skills and skill levels, preferences, decisions made, advice already given, and open questions. Drop greetings, small talk and repeated details. Write in the third person about "the user"."""
+
 
 class PromptBuilder:
     """Builds context-aware prompts for different EdAgent functions"""
     
-    def __init__(self):
+    def __init__(self, budget: Optional[PromptBudget] = None):
         self.templates = PromptTemplates()
+        self.budget = budget or PromptBudget()
     
     def build_conversation_prompt(self, user_message: str, context: UserContext) -> str:
-        """Build a prompt for general conversation with user context"""
-        system_prompt = self._build_base_system_prompt(context)
-        
-        # Add conversation context
-        conversation_context = self._build_conversation_context(context)
-        
-        full_prompt = f"""{system_prompt}
-
-{conversation_context}
-
-User message: {user_message}
-
-Response:"""
-        
-        return full_prompt
+        """Build a prompt for general conversation with user context, trimmed to the token budget"""
+        profile = f"Current user context:\n{self._build_user_context_summary(context)}" if context else ""
+        summary = self._build_conversation_summary(context)
+        
+        # Sections are trimmed lowest priority first: history, summary, profile, then the message
+        sections = [
+            PromptSection("system", self.templates.BASE_SYSTEM_PROMPT, priority=5,
+                          max_tokens=self.budget.system_tokens),
+            PromptSection("user_message", user_message, priority=4,
+                          max_tokens=self.budget.user_message_tokens),
+            PromptSection("profile", profile, priority=3, max_tokens=self.budget.profile_tokens),
+            PromptSection("summary", summary, priority=2, max_tokens=self.budget.summary_tokens),
+            PromptSection("history", self._build_conversation_context(context), priority=1,
+                          max_tokens=self.budget.history_tokens),
+        ]
+        allowance = self._allocate("conversation", sections, estimate_tokens("User message: \n\nResponse:"))
+        
+        system_prompt = truncate_to_tokens(self.templates.BASE_SYSTEM_PROMPT, allowance["system"])
+        profile = truncate_to_tokens(profile, allowance["profile"])
+        if profile:
+            system_prompt += f"\n\n{profile}"
+        
+        parts = [
+            system_prompt,
+            self._build_conversation_summary(context, allowance["summary"]),
+            self._build_conversation_context(context, allowance["history"]),
+            f"User message: {truncate_to_tokens(user_message, allowance['user_message'])}",
+            "Response:"
+        ]
+        return "\n\n".join(part for part in parts if part)
     
     def build_skill_assessment_prompt(self, skill_area: str, user_responses: List[str]) -> str:
         """Build a prompt for skill assessment analysis"""
@@ -203,6 +236,23 @@ User Learning Preferences:
 - Preferred content types: {', '.join(prefs.content_types)}
 - Difficulty preference: {prefs.difficulty_preference}"""
         
+        # The instructions and JSON schema are never trimmed; only user-supplied sections are
+        sections = [
+            PromptSection("user_message", goal, priority=3, max_tokens=self.budget.user_message_tokens),
+            PromptSection("profile", skills_summary, priority=2, max_tokens=self.budget.profile_tokens),
+            PromptSection("preferences", preferences_text, priority=1, max_tokens=self.budget.profile_tokens),
+        ]
+        instructions_tokens = estimate_tokens(self._render_learning_path_prompt("", "", ""))
+        allowance = self._allocate("learning_path", sections, instructions_tokens)
+        
+        return self._render_learning_path_prompt(
+            truncate_to_tokens(goal, allowance["user_message"]),
+            truncate_to_tokens(skills_summary, allowance["profile"]),
+            truncate_to_tokens(preferences_text, allowance["preferences"])
+        )
+    
+    def _render_learning_path_prompt(self, goal: str, skills_summary: str, preferences_text: str) -> str:
+        """Render the learning path prompt from its already-trimmed sections"""
         prompt = f"""{self.templates.LEARNING_PATH_SYSTEM_PROMPT}
 
 Goal: {goal}
@@ -338,6 +388,58 @@ How do you typically learn new concepts or technologies?"""
         
         return prompt
     
+    def build_question_bank_prompt(self, skill_area: str, difficulties: List[str], per_difficulty: int) -> str:
+        """Build a prompt for generating a batch of assessment questions at several difficulties"""
+        levels = ", ".join(difficulties)
+        
+        prompt = f"""Generate skill assessment questions for learners in {skill_area}: {per_difficulty} questions for each of these levels: {levels}.
+
+The questions should:
+1. Suit a learner at that level, from first steps to in-depth practical experience
+2. Assess practical application rather than definitions
+3. Invite the learner to describe their own experience
+4. Be conversational and encouraging
+5. Not depend on answers to earlier questions
+
+Write one question per line, starting with its level and a colon, without numbering or other formatting. Each question should be a complete sentence ending with a question mark.
+
+Example format:
+beginner: Have you tried writing any small programs, even by following a tutorial?
+intermediate: Can you walk me through a project where you had to debug something tricky?
+advanced: How do you decide how to structure a larger codebase so it stays maintainable?"""
+        
+        return prompt
+
+    def build_conversation_summary_prompt(self, previous_summary: Optional[str], 
+                                          turns: List[Dict[str, Any]]) -> str:
+        """
+        Build a prompt that folds new conversation turns into the running summary
+        
+        Args:
+            previous_summary: Current summary, if any
+            turns: Turns not yet in the summary, oldest first, each with
+                "message" and "response" keys
+        """
+        max_words = max(1, int(self.budget.summary_tokens * 0.75))
+        turn_budget = max(self.budget.history_tokens // max(len(turns), 1), 1)
+        turns_text = "\n".join(
+            f"User: {truncate_to_tokens(turn['message'], turn_budget)}\n"
+            f"EdAgent: {truncate_to_tokens(turn['response'], turn_budget)}"
+            for turn in turns
+        )
+        
+        prompt = f"""{self.templates.CONVERSATION_SUMMARY_PROMPT}
+
+Current summary:
+{previous_summary or "(none yet)"}
+
+New conversation turns:
+{turns_text}
+
+Write the updated summary in at most {max_words} words. Respond with the summary text only."""
+        
+        return prompt
+    
     def _build_base_system_prompt(self, context: Optional[UserContext] = None) -> str:
         """Build the base system prompt with user context"""
         base_prompt = self.templates.BASE_SYSTEM_PROMPT
@@ -371,20 +473,80 @@ How do you typically learn new concepts or technologies?"""
         
         return "\n".join(summary_parts)
     
-    def _build_conversation_context(self, context: UserContext) -> str:
-        """Build conversation context from user history"""
-        if not context.conversation_history:
+    def _build_conversation_context(self, context: UserContext, max_tokens: Optional[int] = None) -> str:
+        """
+        Build conversation context from user history
+        
+        With max_tokens, the newest messages that fit are kept whole and the
+        rest of the budget is filled with the end of the next older message,
+        so the context uses its whole allowance once history is long enough.
+        """
+        if not context or not context.conversation_history:
             return "This is the start of a new conversation."
         
         # Include last few messages for context (limit to avoid token overflow)
-        recent_messages = context.conversation_history[-5:] if len(context.conversation_history) > 5 else context.conversation_history
+        recent_messages = [str(message) for message in context.conversation_history[-MAX_HISTORY_MESSAGES:]]
+        
+        context_text = self._render_conversation_context(recent_messages)
+        if max_tokens is None or estimate_tokens(context_text) <= max_tokens:
+            return context_text
+        
+        kept: List[str] = []
+        for message in reversed(recent_messages):
+            if estimate_tokens(self._render_conversation_context([message] + kept)) <= max_tokens:
+                kept.insert(0, message)
+                continue
+            
+            # Fill what is left with the end of this message
+            remaining = max_tokens - estimate_tokens(self._render_conversation_context([""] + kept))
+            while remaining > 0:
+                part = truncate_to_tokens(message, remaining, keep="tail")
+                if not part:
+                    break
+                if estimate_tokens(self._render_conversation_context([part] + kept)) <= max_tokens:
+                    kept.insert(0, part)
+                    break
+                remaining -= 1
+            break
         
+        return self._render_conversation_context(kept) if kept else ""
+    
+    @staticmethod
+    def _render_conversation_context(messages: List[str]) -> str:
+        """Render recent messages as a numbered list"""
         context_text = "Recent conversation context:\n"
-        for i, message in enumerate(recent_messages, 1):
+        for i, message in enumerate(messages, 1):
             context_text += f"{i}. {message}\n"
-        
         return context_text
     
+    def _build_conversation_summary(self, context: Optional[UserContext], 
+                                    max_tokens: Optional[int] = None) -> str:
+        """Build the summary of conversation older than the recent history"""
+        if not context or not context.conversation_summary:
+            return ""
+        
+        header = "Summary of earlier conversation:\n"
+        summary = context.conversation_summary
+        if max_tokens is not None:
+            # Cut the body, never the header, so a full-size summary is not dropped whole
+            summary = truncate_to_tokens(summary, max_tokens - estimate_tokens(header))
+            if not summary:
+                return ""
+        return f"{header}{summary}"
+    
+    def _allocate(self, prompt_type: str, sections: List[PromptSection], fixed_tokens: int) -> Dict[str, int]:
+        """Allocate the prompt budget across sections and record where tokens go"""
+        allowance = allocate_budget(sections, self.budget.total_tokens - fixed_tokens)
+        
+        for section in sections:
+            trimmed = section.tokens - allowance[section.name]
+            if trimmed > 0:
+                logger.debug(f"Trimmed {trimmed} tokens from {prompt_type} prompt section {section.name}")
+            safe_track("track_prompt_section_tokens", prompt_type, section.name, allowance[section.name], trimmed)
+        safe_track("track_prompt_section_tokens", prompt_type, "instructions", fixed_tokens, 0)
+        
+        return allowance
+    
     def _format_responses(self, responses: List[str]) -> str:
         """Format user responses for assessment prompt"""
         formatted = []
@@ -407,11 +569,18 @@ How do you typically learn new concepts or technologies?"""
 class SkillAssessmentQuestionGenerator:
     """Generates contextual questions for skill assessments"""
     
-    def __init__(self):
+    def __init__(self, question_bank: Optional["QuestionBank"] = None):
         self.templates = PromptTemplates()
+        self.question_bank = question_bank
     
-    def get_assessment_questions(self, skill_area: str, num_questions: int = 5) -> List[str]:
-        """Get assessment questions for a specific skill area"""
+    def get_assessment_questions(self, skill_area: str, num_questions: int = 5, 
+                                 difficulty: str = "beginner") -> List[str]:
+        """Get assessment questions for a specific skill area, from the question bank if one is given"""
+        if self.question_bank is not None:
+            banked = self.question_bank.select(skill_area, difficulty, num_questions)
+            if banked:
+                return banked
+        
         skill_area_lower = skill_area.lower().replace(" ", "_")
         
         # Find matching question set
@@ -475,4 +644,4 @@ def build_learning_path_prompt(goal: str, current_skills: Dict[str, SkillLevel],
 def get_assessment_questions(skill_area: str, num_questions: int = 5) -> List[str]:
     """Convenience function to get assessment questions"""
     generator = SkillAssessmentQuestionGenerator()
-    return generator.get_assessment_questions(skill_area, num_questions)
\ No newline at end of file
+    return generator.get_assessment_questions(skill_area, num_questions)
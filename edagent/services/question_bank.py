@@ -0,0 +1,434 @@
+"""
+Pre-generated skill assessment questions, served from memory
+
+The bank indexes assessment questions by skill area and difficulty so an
+assessment picks its follow-up questions without a Gemini round-trip.
+Questions come from the static templates, from offline batch generation
+(build_question_bank) and from live Gemini calls for skill areas the bank
+has not seen yet; those are kept, so the next assessment in the area is
+served from memory too.
+
+Each question counts how often it was asked and answered. Counts and new
+questions are kept in memory and written to the assessment_questions table
+in batches by flush().
+"""
+
+import asyncio
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ..config.settings import Settings, get_settings
+from ..database.connection import db_manager
+from ..database.utils import DatabaseUtils
+from .keyword_matching import KeywordMatcher
+from .prompt_engineering import PromptBuilder, PromptTemplates
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+# Questions asked this often but answered less than half the time are served last
+POOR_ANSWER_RATE = 0.5
+POOR_ANSWER_MIN_SERVED = 20
+
+# Signs of a user's experience in their answers, for choosing question difficulty
+_EXPERIENCE_SIGNALS = KeywordMatcher({
+    "beginner": [
+        "beginner", "never", "just started", "new to", "no experience", "not sure",
+        "a little", "haven't", "tutorial", "learning the basics"
+    ],
+    "intermediate": [
+        "built", "project", "some experience", "familiar with", "comfortable with",
+        "side project", "freelance", "a few"
+    ],
+    "advanced": [
+        "years of experience", "professionally", "in production", "architect", "senior",
+        "led a team", "mentor", "deployed", "optimized", "scaled"
+    ]
+})
+
+_QUESTION_LINE = re.compile(r"^\W*(beginner|intermediate|advanced)\W*:\s*(.+\?)\s*$", re.IGNORECASE)
+
+
+def normalize_skill_area(skill_area: str) -> str:
+    """Get the bank key for a skill area, e.g. "Web Development" -> "web_development\""""
+    return re.sub(r"[\s_]+", "_", skill_area.strip().lower())
+
+
+def infer_difficulty(responses: Sequence[str]) -> str:
+    """
+    Guess which question difficulty suits a user from their answers so far
+
+    Args:
+        responses: The user's assessment answers
+
+    Returns:
+        The difficulty with the most matching signals; beginner when none match
+    """
+    counts = dict.fromkeys(DIFFICULTIES, 0)
+    for response in responses:
+        for match in _EXPERIENCE_SIGNALS.find_all(response):
+            counts[match.category] += 1
+    # Ties go to the easier level
+    return max(DIFFICULTIES, key=lambda difficulty: counts[difficulty])
+
+
+def parse_question_batch(text: str) -> Dict[str, List[str]]:
+    """
+    Parse a batch generated from build_question_bank_prompt
+
+    Args:
+        text: Model output with one "level: question?" per line
+
+    Returns:
+        Questions by difficulty; lines in another format are skipped
+    """
+    questions: Dict[str, List[str]] = {difficulty: [] for difficulty in DIFFICULTIES}
+    for line in text.splitlines():
+        match = _QUESTION_LINE.match(line)
+        if match:
+            questions[match.group(1).lower()].append(match.group(2).strip())
+    return questions
+
+
+@dataclass(eq=False)
+class BankedQuestion:
+    """An assessment question and how it has been used"""
+    skill_area: str
+    difficulty: str
+    text: str
+    source: str = "batch"
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    times_served: int = 0
+    times_answered: int = 0
+
+    @property
+    def answer_rate(self) -> float:
+        """Share of the times asked that the question was answered"""
+        return self.times_answered / self.times_served if self.times_served else 1.0
+
+    @property
+    def answered_poorly(self) -> bool:
+        """Whether users tend to leave the question unanswered"""
+        return self.times_served >= POOR_ANSWER_MIN_SERVED and self.answer_rate < POOR_ANSWER_RATE
+
+
+class QuestionBank:
+    """
+    In-memory index of assessment questions by skill area and difficulty
+
+    select() prefers questions at the requested difficulty and moves to the
+    nearest other difficulties when those run out. Within a difficulty,
+    questions users tend to leave unanswered come last and the rest rotate
+    by how often they were asked, so repeated assessments see different
+    questions and new ones get asked.
+
+    Lookups and usage counting are synchronous and do not touch the
+    database; flush() saves new questions and the counts gathered since the
+    last flush, and runs in the background every flush_every changes.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        session_factory: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+        seed_templates: bool = True
+    ):
+        settings = settings or get_settings()
+        self.enabled = settings.question_bank_enabled
+        self.flush_every = max(1, settings.question_bank_flush_every)
+        self._session_factory = session_factory
+        self._index: Dict[str, Dict[str, List[BankedQuestion]]] = {}
+        self._by_text: Dict[str, BankedQuestion] = {}
+        self._unsaved: List[BankedQuestion] = []
+        self._usage: Dict[BankedQuestion, List[int]] = {}
+        self._served: Dict[str, BankedQuestion] = {}
+        self._changes = 0
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+        if seed_templates:
+            # Saved with the first flush, but not a reason to start one
+            for skill_area, questions in PromptTemplates.SKILL_ASSESSMENT_QUESTIONS.items():
+                for text in questions:
+                    question = BankedQuestion(normalize_skill_area(skill_area), "beginner", text, source="template")
+                    self._put(question)
+                    self._unsaved.append(question)
+
+    def has_skill_area(self, skill_area: str) -> bool:
+        """Check whether the bank has questions for a skill area"""
+        return normalize_skill_area(skill_area) in self._index
+
+    def skill_areas(self) -> List[str]:
+        """Get the skill areas in the bank"""
+        return list(self._index)
+
+    def count(self, skill_area: str, difficulty: Optional[str] = None) -> int:
+        """Get the number of questions for a skill area, optionally at one difficulty"""
+        by_difficulty = self._index.get(normalize_skill_area(skill_area), {})
+        if difficulty is not None:
+            return len(by_difficulty.get(difficulty, []))
+        return sum(len(questions) for questions in by_difficulty.values())
+
+    def add(self, skill_area: str, difficulty: str, questions: Iterable[str], source: str = "batch") -> int:
+        """
+        Add questions to the bank; ones already in it are skipped
+
+        Args:
+            skill_area: Skill area the questions assess
+            difficulty: One of DIFFICULTIES
+            questions: Question texts
+            source: Where the questions came from (template, batch or live)
+
+        Returns:
+            Number of questions added
+
+        Raises:
+            ValueError: If the difficulty is unknown
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown question difficulty: {difficulty}")
+
+        area = normalize_skill_area(skill_area)
+        added = 0
+        for text in questions:
+            text = text.strip()
+            if not text or self._key(area, text) in self._by_text:
+                continue
+            question = BankedQuestion(skill_area=area, difficulty=difficulty, text=text, source=source)
+            self._put(question)
+            self._unsaved.append(question)
+            added += 1
+        if added:
+            self._changed(added)
+        return added
+
+    def select(
+        self,
+        skill_area: str,
+        difficulty: str,
+        count: int,
+        exclude: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Pick questions for an assessment and count them as asked
+
+        Args:
+            skill_area: Skill area being assessed
+            difficulty: Difficulty suiting the user, see infer_difficulty()
+            count: Maximum number of questions
+            exclude: Question texts the user was already asked
+
+        Returns:
+            Up to count question texts; empty if the skill area is not banked
+        """
+        by_difficulty = self._index.get(normalize_skill_area(skill_area))
+        if not by_difficulty:
+            safe_track("track_assessment_question_lookup", "miss")
+            return []
+
+        skipped = {text.strip().lower() for text in exclude}
+        target = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 0
+        candidates = [
+            question
+            for questions in by_difficulty.values()
+            for question in questions
+            if question.text.lower() not in skipped
+        ]
+        candidates.sort(key=lambda question: (
+            abs(DIFFICULTIES.index(question.difficulty) - target),
+            question.answered_poorly,
+            question.times_served
+        ))
+
+        chosen = candidates[:count]
+        safe_track("track_assessment_question_lookup", "hit" if chosen else "miss")
+        for question in chosen:
+            question.times_served += 1
+            self._usage.setdefault(question, [0, 0])[0] += 1
+            self._served[question.text.lower()] = question
+        if chosen:
+            self._changed(len(chosen))
+        return [question.text for question in chosen]
+
+    def record_answered(self, question_text: str) -> None:
+        """Count a question served by select() as answered; other questions are ignored"""
+        question = self._served.get(question_text.strip().lower())
+        if question is None:
+            return
+        question.times_answered += 1
+        self._usage.setdefault(question, [0, 0])[1] += 1
+        self._changed(1)
+
+    async def load(self) -> int:
+        """
+        Load banked questions and their usage counts from the database
+
+        Returns:
+            Number of questions loaded
+        """
+        async with self._session() as session:
+            rows = await DatabaseUtils.get_assessment_questions(session)
+
+        for row in rows:
+            known = self._by_text.get(self._key(row.skill_area, row.question))
+            if known is not None:
+                # Already saved: adopt the saved row's identity and counts
+                known.id = str(row.id)
+                known.times_served = row.times_served + self._usage.get(known, [0, 0])[0]
+                known.times_answered = row.times_answered + self._usage.get(known, [0, 0])[1]
+                if known in self._unsaved:
+                    self._unsaved.remove(known)
+                continue
+            if row.difficulty in DIFFICULTIES:
+                self._put(BankedQuestion(
+                    skill_area=row.skill_area,
+                    difficulty=row.difficulty,
+                    text=row.question,
+                    source=row.source,
+                    id=str(row.id),
+                    times_served=row.times_served,
+                    times_answered=row.times_answered
+                ))
+
+        logger.info(f"Loaded {len(rows)} assessment questions for {len(self._index)} skill areas")
+        return len(rows)
+
+    async def flush(self) -> None:
+        """Save new questions and the usage counted since the last flush"""
+        if self._flush_task is not None and not self._flush_task.done() \
+                and self._flush_task is not asyncio.current_task():
+            await asyncio.shield(self._flush_task)
+
+        unsaved, self._unsaved = self._unsaved, []
+        usage, self._usage = self._usage, {}
+        self._changes = 0
+        if not unsaved and not usage:
+            return
+
+        try:
+            async with self._session() as session:
+                await DatabaseUtils.add_assessment_questions(session, [
+                    {
+                        "id": uuid.UUID(question.id),
+                        "skill_area": question.skill_area,
+                        "difficulty": question.difficulty,
+                        "question": question.text,
+                        "source": question.source,
+                        "times_served": 0,
+                        "times_answered": 0
+                    }
+                    for question in unsaved
+                ])
+                await DatabaseUtils.record_assessment_question_usage(session, {
+                    uuid.UUID(question.id): (served, answered)
+                    for question, (served, answered) in usage.items()
+                })
+        except Exception as e:
+            logger.error(f"Could not save the assessment question bank: {e}")
+            # Keep what was not saved for the next flush
+            self._unsaved = unsaved + self._unsaved
+            for question, (served, answered) in usage.items():
+                counts = self._usage.setdefault(question, [0, 0])
+                counts[0] += served
+                counts[1] += answered
+            return
+
+        logger.debug(f"Saved {len(unsaved)} new assessment questions and usage of {len(usage)}")
+
+    async def close(self) -> None:
+        """Save what is still in memory before shutdown"""
+        await self.flush()
+
+    def _put(self, question: BankedQuestion) -> None:
+        self._index.setdefault(question.skill_area, {}).setdefault(question.difficulty, []).append(question)
+        self._by_text[self._key(question.skill_area, question.text)] = question
+
+    @staticmethod
+    def _key(skill_area: str, text: str) -> str:
+        return f"{skill_area}\n{text.lower()}"
+
+    def _session(self) -> AsyncContextManager[Any]:
+        session_factory = self._session_factory or db_manager.get_session
+        return session_factory()
+
+    def _changed(self, changes: int) -> None:
+        """Start a background flush once enough changes have built up"""
+        self._changes += changes
+        if self._changes < self.flush_every or (self._flush_task is not None and not self._flush_task.done()):
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # No event loop (e.g. seeding at import time); the next flush saves it
+            pass
+
+
+async def build_question_bank(
+    bank: QuestionBank,
+    ai_service: Any,
+    skill_areas: Sequence[str],
+    per_difficulty: Optional[int] = None,
+    concurrency: int = 4
+) -> Dict[str, int]:
+    """
+    Generate questions for skill areas offline and save them to the bank
+
+    Each skill area costs one Gemini call, which asks for questions at
+    every difficulty at once. A skill area whose call fails is skipped.
+
+    Args:
+        bank: Question bank to add to
+        ai_service: GeminiAIService making the calls
+        skill_areas: Skill areas to generate questions for
+        per_difficulty: Questions to ask for per difficulty; defaults to
+            QUESTION_BANK_QUESTIONS_PER_DIFFICULTY
+        concurrency: Maximum Gemini calls in flight
+
+    Returns:
+        Number of questions added per skill area
+    """
+    per_difficulty = per_difficulty or get_settings().question_bank_questions_per_difficulty
+    prompt_builder = PromptBuilder()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def generate(skill_area: str) -> int:
+        prompt = prompt_builder.build_question_bank_prompt(
+            skill_area.replace("_", " ").title(), list(DIFFICULTIES), per_difficulty
+        )
+        async with semaphore:
+            text = await ai_service._make_api_call(
+                ai_service._get_model("reasoning"),
+                prompt,
+                ai_service._get_generation_config("reasoning"),
+                operation="question_bank"
+            )
+        questions = parse_question_batch(text)
+        return sum(
+            bank.add(skill_area, difficulty, questions[difficulty][:per_difficulty], source="batch")
+            for difficulty in DIFFICULTIES
+        )
+
+    results = await asyncio.gather(*(generate(area) for area in skill_areas), return_exceptions=True)
+    added: Dict[str, int] = {}
+    for skill_area, result in zip(skill_areas, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Could not generate assessment questions for {skill_area}: {result}")
+            continue
+        added[skill_area] = result
+    await bank.flush()
+    return added
+
+
+_question_bank: Optional[QuestionBank] = None
+
+
+def get_question_bank() -> QuestionBank:
+    """Get the process-wide question bank, shared by every ConversationManager"""
+    global _question_bank
+    if _question_bank is None:
+        _question_bank = QuestionBank()
+    return _question_bank
@@ -0,0 +1,268 @@
+"""
+Token bucket rate limiting and concurrency control for Gemini API calls
+"""
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from ..config.settings import Settings
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketBackend(ABC):
+    """
+    Abstract token bucket storage
+
+    Buckets hand out reservations rather than yes/no answers: a reservation
+    always succeeds and returns how long the caller must wait before its
+    token becomes available. Reservations are granted in call order, which
+    makes waiting FIFO and spreads a burst smoothly over the refill rate
+    instead of releasing every waiter at once.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1.0, float(capacity))
+
+    @abstractmethod
+    async def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and get the number of seconds to wait before using them"""
+        pass
+
+    @abstractmethod
+    async def refund(self, tokens: float = 1.0) -> None:
+        """Return reserved tokens that will not be used"""
+        pass
+
+
+class LocalTokenBucket(TokenBucketBackend):
+    """In-process token bucket with continuous refill"""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        super().__init__(rate_per_second, capacity)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    async def reserve(self, tokens: float = 1.0) -> float:
+        # No awaits between refill and update, so this is atomic on the event loop
+        self._refill()
+        self._tokens -= tokens
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate_per_second
+
+    async def refund(self, tokens: float = 1.0) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    @property
+    def available_tokens(self) -> float:
+        """Get the number of tokens currently available (negative when in debt)"""
+        self._refill()
+        return self._tokens
+
+
+# Refill and reserve atomically so every worker process draws from one budget.
+# Time comes from the Redis server clock (Redis 5+ replicates script effects,
+# so TIME is allowed before writes): worker clocks can disagree by more than
+# a refill interval, which would let a fast clock mint tokens.
+_REFILL_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+updated_at = math.max(now, updated_at)
+"""
+
+_RESERVE_SCRIPT = _REFILL_LUA + """
+tokens = tokens - tonumber(ARGV[3])
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', updated_at)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+# Refunds never push the bucket above capacity, matching LocalTokenBucket
+_REFUND_SCRIPT = _REFILL_LUA + """
+tokens = math.min(capacity, tokens + tonumber(ARGV[3]))
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', updated_at)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return tostring(tokens)
+"""
+
+
+class RedisTokenBucket(TokenBucketBackend):
+    """
+    Token bucket shared across worker processes through Redis
+
+    Falls back to a local bucket with the same parameters if Redis is
+    unavailable, so an outage degrades to per-process limiting rather than
+    failing requests.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        rate_per_second: float,
+        capacity: float,
+        key: str = "edagent:rate_limit:gemini"
+    ):
+        super().__init__(rate_per_second, capacity)
+        self.redis = redis_client
+        self.key = key
+        self.fallback = LocalTokenBucket(rate_per_second, capacity)
+        # Keep idle state around long enough to refill completely
+        self._ttl_seconds = int(math.ceil(self.capacity / rate_per_second)) + 60
+
+    async def reserve(self, tokens: float = 1.0) -> float:
+        try:
+            wait = await self.redis.eval(
+                _RESERVE_SCRIPT,
+                1,
+                self.key,
+                self.rate_per_second,
+                self.capacity,
+                tokens,
+                self._ttl_seconds
+            )
+            return float(wait)
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local bucket: {e}")
+            return await self.fallback.reserve(tokens)
+
+    async def refund(self, tokens: float = 1.0) -> None:
+        try:
+            await self.redis.eval(
+                _REFUND_SCRIPT,
+                1,
+                self.key,
+                self.rate_per_second,
+                self.capacity,
+                tokens,
+                self._ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Could not refund rate limit tokens: {e}")
+
+
+class GeminiRateLimiter:
+    """
+    Rate limiter and concurrency governor for Gemini API calls
+
+    Every call first reserves a token from the shared bucket (requests per
+    minute with a burst allowance), then takes one of a fixed number of
+    in-flight slots for its model. Both stages are FIFO and report their
+    wait times so RATE_LIMIT_RPM and GEMINI_MAX_CONCURRENCY can be tuned
+    from observed data.
+    """
+
+    def __init__(self, bucket: TokenBucketBackend, max_concurrency_per_model: int = 8):
+        self.bucket = bucket
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    @staticmethod
+    def _model_label(model_name: str) -> str:
+        """Strip the 'models/' prefix the SDK adds to model names"""
+        return str(model_name).split("/")[-1]
+
+    async def acquire(self, model_name: str = "unknown") -> float:
+        """
+        Wait until a rate limit token is available
+
+        Args:
+            model_name: Model the token is used for (metrics label only)
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        wait = await self.bucket.reserve(1)
+
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.2f} seconds for a token")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Give the token back so later waiters are not delayed for nothing
+                await self.bucket.refund(1)
+                raise
+
+        waited = time.monotonic() - start
+        safe_track("track_gemini_rate_limit_wait", self._model_label(model_name), "token", waited)
+        return waited
+
+    @asynccontextmanager
+    async def slot(self, model_name: str = "unknown") -> AsyncIterator[None]:
+        """Hold one of the model's in-flight slots for the duration of the block"""
+        label = self._model_label(model_name)
+        semaphore = self._semaphores.get(label)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency_per_model)
+            self._semaphores[label] = semaphore
+
+        start = time.monotonic()
+        async with semaphore:
+            safe_track("track_gemini_rate_limit_wait", label, "concurrency", time.monotonic() - start)
+            self._in_flight[label] = self._in_flight.get(label, 0) + 1
+            safe_track("update_gemini_in_flight", label, self._in_flight[label])
+            try:
+                yield
+            finally:
+                self._in_flight[label] -= 1
+                safe_track("update_gemini_in_flight", label, self._in_flight[label])
+
+    def in_flight(self, model_name: str) -> int:
+        """Get the number of in-flight calls for a model"""
+        return self._in_flight.get(self._model_label(model_name), 0)
+
+
+def create_rate_limiter(settings: Settings) -> GeminiRateLimiter:
+    """
+    Create the Gemini rate limiter configured in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        GeminiRateLimiter backed by Redis when configured, otherwise by an
+        in-process bucket
+    """
+    rate_per_second = settings.rate_limit_requests_per_minute / 60.0
+    capacity = settings.rate_limit_burst_size
+
+    bucket: TokenBucketBackend
+    if settings.rate_limit_backend == "redis" and settings.redis_url:
+        from ..database.redis_client import get_redis_client
+        bucket = RedisTokenBucket(get_redis_client(settings.redis_url), rate_per_second, capacity)
+    else:
+        if settings.rate_limit_backend == "redis":
+            logger.warning("Rate limit backend set to redis but REDIS_URL is not configured, using memory")
+        bucket = LocalTokenBucket(rate_per_second, capacity)
+
+    return GeminiRateLimiter(bucket, settings.gemini_max_concurrent_requests)
@@ -0,0 +1,108 @@
+"""
+Single-flight request coalescing for identical in-flight AI calls
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from .deadlines import Deadline, current_deadline, use_deadline
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _InFlightCall:
+    """A shared pending call, its deadline and the number of callers waiting on it"""
+
+    def __init__(self, task: "asyncio.Task[Any]", deadline: Optional[Deadline]):
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one underlying call
+
+    The underlying call runs in its own task. Every caller, including the
+    one that started it, awaits a shielded view of that task, so:
+
+    - a cancelled caller only stops waiting; the call keeps running for the rest
+    - the call is cancelled once every caller has gone away
+    - a result or exception is delivered to every waiting caller
+    - the call runs under the most generous deadline of its callers, so a
+      caller with a long deadline is not cut short by one with a short
+      deadline; each caller still stops waiting at its own deadline
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._calls: Dict[str, _InFlightCall] = {}
+        self.coalesced_count = 0
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[T]],
+        metric_label: Optional[str] = None
+    ) -> T:
+        """
+        Run func once for all concurrent callers using the same key
+
+        Args:
+            key: Identity of the call (e.g. model, config and prompt fingerprint)
+            func: Zero-argument coroutine function performing the call
+            metric_label: Label used when reporting coalesced callers
+
+        Returns:
+            The result of the shared call
+        """
+        deadline = current_deadline()
+        call = self._calls.get(key)
+        if call is None:
+            # The task gets its own deadline so later callers can extend it
+            shared_deadline = deadline.copy() if deadline is not None else None
+            with use_deadline(shared_deadline):
+                task = asyncio.ensure_future(func())
+            call = _InFlightCall(task, shared_deadline)
+            self._calls[key] = call
+            task.add_done_callback(lambda done, k=key, c=call: self._on_done(k, c, done))
+        else:
+            if call.deadline is not None:
+                call.deadline.extend_to(deadline)
+            self.coalesced_count += 1
+            logger.debug(f"Coalesced request into in-flight call for {self.name}")
+            safe_track("track_gemini_request_coalesced", str(metric_label or self.name).split("/")[-1])
+
+        call.waiters += 1
+        try:
+            if deadline is None:
+                return await asyncio.shield(call.task)
+            # Raises TimeoutError when this caller's deadline passes first
+            return await asyncio.wait_for(asyncio.shield(call.task), deadline.remaining())
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is interested in the result any more. Forget the call
+                # now rather than in _on_done, which only runs on a later loop
+                # iteration, so a caller arriving in between starts a fresh call
+                # instead of joining one that is being cancelled.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        """Get the number of distinct calls currently in flight"""
+        return len(self._calls)
+
+    def _on_done(self, key: str, call: _InFlightCall, task: "asyncio.Task[Any]") -> None:
+        """Forget a finished call so the next request starts a fresh one"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+        # Mark the exception as retrieved when every waiter was cancelled first
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,214 @@
+"""
+Response caching for Gemini API calls
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from ..config.settings import Settings
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheBackend(ABC):
+    """Abstract storage backend for cached AI responses"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        """Store a response for ttl_seconds"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a cached response"""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all cached responses"""
+        pass
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisResponseCache(ResponseCacheBackend):
+    """Redis-backed cache shared across API workers"""
+
+    def __init__(self, redis_client: Any, key_prefix: str = "edagent:ai_cache:"):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.redis.get(self.key_prefix + key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self.redis.set(self.key_prefix + key, value, ex=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self.redis.delete(self.key_prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self.redis.scan_iter(match=self.key_prefix + "*"):
+            await self.redis.delete(key)
+
+
+class AIResponseCache:
+    """
+    Cache for Gemini responses keyed by model, generation config and prompt fingerprint
+
+    Backend failures are logged and treated as cache misses so that a cache
+    outage never breaks response generation.
+    """
+
+    _WHITESPACE_RE = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        backend: ResponseCacheBackend,
+        ttl_by_model_type: Dict[str, int],
+        enabled: bool = True
+    ):
+        self.backend = backend
+        self.ttl_by_model_type = ttl_by_model_type
+        self.enabled = enabled
+
+    @classmethod
+    def normalize_prompt(cls, prompt: str) -> str:
+        """
+        Normalize prompt text so trivially different prompts share a fingerprint
+
+        Only Unicode compatibility forms and whitespace are normalized. Case is
+        kept: it is significant in code, identifiers and names.
+        """
+        normalized = unicodedata.normalize("NFKC", prompt)
+        normalized = cls._WHITESPACE_RE.sub(" ", normalized)
+        return normalized.strip()
+
+    @classmethod
+    def fingerprint(cls, prompt: str) -> str:
+        """Get a stable fingerprint for a prompt"""
+        return hashlib.sha256(cls.normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def build_key(cls, model_name: str, generation_config: Dict[str, Any], prompt: str) -> str:
+        """Build the cache key for a model call"""
+        key_data = json.dumps(
+            {
+                "model": str(model_name),
+                "config": generation_config or {},
+                "prompt": cls.fingerprint(prompt),
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str, model_name: str) -> Optional[str]:
+        """Look up a cached response and record the hit or miss"""
+        if not self.enabled:
+            return None
+
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"AI response cache lookup failed: {e}")
+            value = None
+
+        safe_track("track_gemini_cache_lookup", str(model_name).split("/")[-1], value is not None)
+        return value
+
+    async def set(self, key: str, value: str, model_type: str = "chat") -> None:
+        """Store a response using the TTL configured for the model type"""
+        if not self.enabled:
+            return
+
+        ttl_seconds = self.ttl_by_model_type.get(model_type, 0)
+        if ttl_seconds <= 0:
+            return
+
+        try:
+            await self.backend.set(key, value, ttl_seconds)
+        except Exception as e:
+            logger.warning(f"AI response cache store failed: {e}")
+
+    async def clear(self) -> None:
+        """Remove all cached responses"""
+        await self.backend.clear()
+
+
+def create_response_cache(settings: Settings) -> AIResponseCache:
+    """
+    Create the AI response cache configured in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Configured AIResponseCache, falling back to the in-memory backend
+        when Redis is selected but not configured
+    """
+    backend: ResponseCacheBackend
+    if settings.ai_cache_backend == "redis" and settings.redis_url:
+        from ..database.redis_client import get_redis_client
+        backend = RedisResponseCache(get_redis_client(settings.redis_url))
+    else:
+        if settings.ai_cache_backend == "redis":
+            logger.warning("AI cache backend set to redis but REDIS_URL is not configured, using memory")
+        backend = InMemoryResponseCache(max_entries=settings.ai_cache_max_entries)
+
+    return AIResponseCache(
+        backend=backend,
+        ttl_by_model_type={
+            "chat": settings.ai_cache_ttl_chat_seconds,
+            "reasoning": settings.ai_cache_ttl_reasoning_seconds,
+        },
+        enabled=settings.ai_cache_enabled
+    )
@@ -14,6 +14,7 @@ from ..models.resume import (
 from ..models.user_context import UserContext
 from ..interfaces.ai_interface import AIServiceInterface
 from .ai_service import GeminiAIService
+from .fan_out import fan_out
 
 
 logger = logging.getLogger(__name__)
@@ -73,16 +74,23 @@ class ResumeAnalyzer:
                 overall_score=0.0  # Will be calculated later
             )
             
-            # Perform different types of analysis
-            await self._analyze_content_quality(resume, analysis)
-            await self._analyze_structure_and_format(resume, analysis)
-            await self._analyze_industry_alignment(resume, analysis)
-            await self._analyze_ats_compatibility(resume, analysis)
-            await self._analyze_keyword_optimization(resume, analysis)
-            
-            # Generate AI-powered feedback if available
+            # AI feedback does not depend on the rule-based checks, so those run
+            # while the Gemini call is waiting (it is started first)
+            branches = {}
             if user_context:
-                await self._generate_ai_feedback(resume, analysis, user_context)
+                branches["resume.ai_feedback"] = self._generate_ai_feedback(resume, user_context)
+            branches["resume.rule_checks"] = self._run_rule_checks(resume, analysis)
+            results = await fan_out(branches)
+            
+            # Add AI-powered feedback after the rule-based feedback
+            for feedback_item in results.get("resume.ai_feedback", []):
+                analysis.add_feedback(
+                    "AI Analysis",
+                    FeedbackSeverity.SUGGESTION,
+                    feedback_item["message"],
+                    feedback_item["suggestion"],
+                    industry_specific=True
+                )
             
             # Calculate overall score
             analysis.overall_score = self._calculate_overall_score(analysis)
@@ -98,6 +106,14 @@ class ResumeAnalyzer:
             # Return basic analysis with error feedback
             return self._create_fallback_analysis(resume, str(e))
     
+    async def _run_rule_checks(self, resume: Resume, analysis: ResumeAnalysis) -> None:
+        """Perform the rule-based types of analysis"""
+        await self._analyze_content_quality(resume, analysis)
+        await self._analyze_structure_and_format(resume, analysis)
+        await self._analyze_industry_alignment(resume, analysis)
+        await self._analyze_ats_compatibility(resume, analysis)
+        await self._analyze_keyword_optimization(resume, analysis)
+    
     async def _analyze_content_quality(self, resume: Resume, analysis: ResumeAnalysis) -> None:
         """Analyze the quality of resume content"""
         
@@ -381,8 +397,7 @@ class ResumeAnalyzer:
         else:
             analysis.strengths.append("Good use of action verbs")
     
-    async def _generate_ai_feedback(self, resume: Resume, analysis: ResumeAnalysis, 
-                                  user_context: UserContext) -> None:
+    async def _generate_ai_feedback(self, resume: Resume, user_context: UserContext) -> List[Dict[str, str]]:
         """Generate AI-powered feedback using Gemini"""
         try:
             # Create a prompt for resume analysis
@@ -391,21 +406,13 @@ class ResumeAnalyzer:
             # Get AI response
             ai_response = await self.ai_service.generate_response(prompt, user_context)
             
-            # Parse AI feedback and add to analysis
-            ai_feedback = self._parse_ai_feedback(ai_response)
-            
-            for feedback_item in ai_feedback:
-                analysis.add_feedback(
-                    "AI Analysis",
-                    FeedbackSeverity.SUGGESTION,
-                    feedback_item["message"],
-                    feedback_item["suggestion"],
-                    industry_specific=True
-                )
+            # Parse AI feedback
+            return self._parse_ai_feedback(ai_response)
             
         except Exception as e:
             logger.warning(f"Could not generate AI feedback: {e}")
             # Continue without AI feedback
+            return []
     
     def _build_ai_analysis_prompt(self, resume: Resume, user_context: UserContext) -> str:
         """Build prompt for AI-powered resume analysis"""
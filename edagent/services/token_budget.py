@@ -0,0 +1,158 @@
+"""
+Token estimation and prompt budget allocation
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Gemini tokenizes English prose at roughly four characters per token
+CHARS_PER_TOKEN = 4.0
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+TRUNCATION_MARKER = "..."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens Gemini will count for text
+
+    Uses the larger of a character-based and a word/punctuation-based count
+    so that both long prose and symbol-heavy text (JSON, code) are not
+    underestimated. Exact counts need a count_tokens round trip to the API,
+    which is too slow to run on every prompt.
+    """
+    if not text:
+        return 0
+    by_chars = math.ceil(len(text) / CHARS_PER_TOKEN)
+    by_words = len(_WORD_PATTERN.findall(text))
+    return max(by_chars, by_words)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """
+    Trim text to at most max_tokens estimated tokens
+
+    Whole lines are kept where possible; a line that does not fit on its own
+    is cut and marked with an ellipsis.
+
+    Args:
+        text: Text to trim
+        max_tokens: Token budget for the text
+        keep: "head" keeps the beginning of the text, "tail" keeps the end
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    lines = text.splitlines()
+    if keep == "tail":
+        lines.reverse()
+
+    kept: List[str] = []
+    for line in lines:
+        candidate = kept + [line]
+        if estimate_tokens("\n".join(candidate)) <= max_tokens:
+            kept = candidate
+            continue
+        if not kept:
+            kept = [_cut_line(line, max_tokens, keep)]
+        break
+
+    if keep == "tail":
+        kept.reverse()
+    return "\n".join(kept)
+
+
+def _cut_line(line: str, max_tokens: int, keep: str) -> str:
+    """Cut a single line down to max_tokens, marking the cut"""
+    low, high = 0, len(line)
+    # Binary search for the longest slice that fits alongside the marker
+    while low < high:
+        middle = (low + high + 1) // 2
+        part = line[:middle] if keep == "head" else line[-middle:]
+        if estimate_tokens(part + TRUNCATION_MARKER) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+
+    if low == 0:
+        return ""
+    if keep == "head":
+        return line[:low].rstrip() + TRUNCATION_MARKER
+    return TRUNCATION_MARKER + line[-low:].lstrip()
+
+
+@dataclass
+class PromptSection:
+    """A named part of a prompt with its own cap and trim priority"""
+
+    name: str
+    text: str
+    priority: int  # higher is trimmed last
+    max_tokens: Optional[int] = None
+    keep: str = "head"
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class PromptBudget:
+    """Token budgets for prompt sections and the prompt as a whole"""
+
+    total_tokens: int = 6000
+    system_tokens: int = 1500
+    profile_tokens: int = 600
+    history_tokens: int = 2000
+    user_message_tokens: int = 1500
+    summary_tokens: int = 400
+
+    @classmethod
+    def from_settings(cls, settings) -> "PromptBudget":
+        """Build the budget from application settings"""
+        return cls(
+            total_tokens=settings.prompt_max_tokens,
+            system_tokens=settings.prompt_system_tokens,
+            profile_tokens=settings.prompt_profile_tokens,
+            history_tokens=settings.prompt_history_tokens,
+            user_message_tokens=settings.prompt_user_message_tokens,
+            summary_tokens=settings.prompt_summary_tokens
+        )
+
+
+def allocate_budget(sections: List[PromptSection], total_tokens: int) -> Dict[str, int]:
+    """
+    Decide how many tokens each section may use
+
+    Every section is first held to its own cap. If the sections still do not
+    fit in total_tokens, the lowest-priority sections give up tokens first
+    until they do.
+
+    Args:
+        sections: Prompt sections to allocate
+        total_tokens: Tokens available to all sections together
+
+    Returns:
+        Token allowance for each section, keyed by section name
+    """
+    allowance: Dict[str, int] = {}
+    for section in sections:
+        tokens = section.tokens
+        if section.max_tokens is not None:
+            tokens = min(tokens, section.max_tokens)
+        allowance[section.name] = tokens
+
+    overflow = sum(allowance.values()) - max(total_tokens, 0)
+    for section in sorted(sections, key=lambda s: s.priority):
+        if overflow <= 0:
+            break
+        reduction = min(allowance[section.name], overflow)
+        allowance[section.name] -= reduction
+        overflow -= reduction
+
+    return allowance
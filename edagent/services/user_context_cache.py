@@ -0,0 +1,161 @@
+"""
+Cache of UserContext objects in front of the database
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from ..config.settings import Settings, get_settings
+from ..models.user_context import UserContext
+from .response_cache import InMemoryResponseCache, RedisResponseCache, ResponseCacheBackend
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+
+class UserContextCache:
+    """
+    TTL cache of user contexts keyed by user ID
+
+    Contexts are stored serialized, so callers always get their own copy and
+    cannot change the cached entry by mutating it. Writers keep the cache
+    coherent through UserContextManager: profile, skill, assessment and
+    summary changes invalidate the entry, and new conversation turns are
+    appended to it. With a shared backend (Redis) new turns invalidate the
+    entry instead, because a read-modify-write from several workers could
+    drop a turn.
+
+    Backend failures are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        backend: ResponseCacheBackend,
+        ttl_seconds: int = 300,
+        history_messages: int = 10,
+        update_in_place: bool = True,
+        enabled: bool = True
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.history_messages = history_messages
+        self.update_in_place = update_in_place
+        self.enabled = enabled and ttl_seconds > 0
+
+    async def get(self, user_id: str) -> Optional[UserContext]:
+        """Get a cached context, recording the hit or miss and the entry's age"""
+        if not self.enabled:
+            return None
+
+        entry = await self._get_entry(user_id)
+        if entry is None:
+            safe_track("track_user_context_cache_lookup", False, None)
+            return None
+
+        safe_track("track_user_context_cache_lookup", True, time.time() - entry["cached_at"])
+        return UserContext.from_dict(entry["context"])
+
+    async def set(self, context: UserContext) -> None:
+        """Store a context freshly loaded from the database"""
+        if not self.enabled:
+            return
+        await self._set_entry(context.user_id, {"cached_at": time.time(), "context": context.to_dict()})
+
+    async def invalidate(self, user_id: str, reason: str = "update") -> None:
+        """Drop a user's cached context after a write"""
+        if not self.enabled:
+            return
+
+        try:
+            await self.backend.delete(user_id)
+        except Exception as e:
+            logger.warning(f"User context cache invalidation failed for {user_id}: {e}")
+        safe_track("track_user_context_cache_invalidation", reason)
+
+    async def record_conversation(self, user_id: str, message: str, response: str) -> None:
+        """Append a conversation turn to a cached context's history"""
+        if not self.enabled:
+            return
+        if not self.update_in_place:
+            await self.invalidate(user_id, "conversation")
+            return
+
+        # No awaits yield control with the in-memory backend, so this cannot interleave
+        entry = await self._get_entry(user_id)
+        if entry is None:
+            return
+
+        context = entry["context"]
+        history = context.get("conversation_history", []) + [message, response]
+        context["conversation_history"] = history[-self.history_messages:]
+        context["last_active"] = datetime.now().isoformat()
+        # Keep the original load time: the rest of the entry is as old as it was
+        await self._set_entry(user_id, entry, ttl_seconds=self._remaining_ttl(entry))
+
+    async def clear(self) -> None:
+        """Remove all cached contexts"""
+        await self.backend.clear()
+
+    def _remaining_ttl(self, entry: dict) -> int:
+        return max(1, int(self.ttl_seconds - (time.time() - entry["cached_at"])))
+
+    async def _get_entry(self, user_id: str) -> Optional[dict]:
+        try:
+            payload = await self.backend.get(user_id)
+            return json.loads(payload) if payload is not None else None
+        except Exception as e:
+            logger.warning(f"User context cache lookup failed for {user_id}: {e}")
+            return None
+
+    async def _set_entry(self, user_id: str, entry: dict, ttl_seconds: Optional[int] = None) -> None:
+        try:
+            await self.backend.set(user_id, json.dumps(entry, default=str), ttl_seconds or self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"User context cache store failed for {user_id}: {e}")
+
+
+def create_user_context_cache(settings: Settings) -> UserContextCache:
+    """
+    Create the user context cache configured in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Configured UserContextCache, falling back to the in-memory backend
+        when Redis is selected but not configured
+    """
+    # Imported here: user_context_manager imports this module
+    from .user_context_manager import CONTEXT_CONVERSATION_TURNS
+
+    backend: ResponseCacheBackend
+    shared = settings.user_context_cache_backend == "redis" and bool(settings.redis_url)
+    if shared:
+        from ..database.redis_client import get_redis_client
+        backend = RedisResponseCache(get_redis_client(settings.redis_url), key_prefix="edagent:user_context:")
+    else:
+        if settings.user_context_cache_backend == "redis":
+            logger.warning("User context cache backend set to redis but REDIS_URL is not configured, using memory")
+        backend = InMemoryResponseCache(max_entries=settings.user_context_cache_max_entries)
+
+    return UserContextCache(
+        backend=backend,
+        ttl_seconds=settings.user_context_cache_ttl_seconds,
+        history_messages=2 * CONTEXT_CONVERSATION_TURNS,
+        update_in_place=not shared,
+        enabled=settings.user_context_cache_enabled
+    )
+
+
+_user_context_cache: Optional[UserContextCache] = None
+
+
+def get_user_context_cache() -> UserContextCache:
+    """Get the process-wide user context cache, shared by every UserContextManager"""
+    global _user_context_cache
+    if _user_context_cache is None:
+        _user_context_cache = create_user_context_cache(get_settings())
+    return _user_context_cache
@@ -2,9 +2,12 @@
 User context management service implementation
 """
 
+import base64
 import logging
-from typing import Dict, Optional, List, Any
+import uuid
+from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..interfaces.user_context_interface import UserContextInterface
@@ -13,9 +16,36 @@ from ..models.conversation import Message, MessageType
 from ..database import DatabaseUtils
 from ..database.connection import db_manager
 from ..database.models import User as DBUser, UserSkill as DBUserSkill, Conversation as DBConversation
+from .conversation_archive import get_conversation_archive, record_to_conversation
+from .conversation_writer import get_conversation_writer
+from .user_context_cache import get_user_context_cache
 
 logger = logging.getLogger(__name__)
 
+# Conversations loaded into UserContext.conversation_history (two messages each)
+CONTEXT_CONVERSATION_TURNS = 5
+
+
+def encode_history_cursor(conversation: DBConversation) -> str:
+    """Encode a conversation's place in history as an opaque page cursor"""
+    key = f"{conversation.timestamp.isoformat()}|{conversation.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a page cursor into the (timestamp, id) key of a conversation
+    
+    Raises:
+        ValueError: If the cursor was not produced by encode_history_cursor
+    """
+    try:
+        key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, conversation_id = key.split("|")
+        return datetime.fromisoformat(timestamp), uuid.UUID(conversation_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid conversation history cursor: {cursor!r}") from e
+
 
 class UserContextManager(UserContextInterface):
     """
@@ -24,6 +54,8 @@ class UserContextManager(UserContextInterface):
     
     def __init__(self):
         self.db_utils = DatabaseUtils()
+        self.context_cache = get_user_context_cache()
+        self.conversation_writer = get_conversation_writer()
     
     async def get_user_context(self, user_id: str) -> Optional[UserContext]:
         """
@@ -36,8 +68,15 @@ class UserContextManager(UserContextInterface):
             User context if found, None otherwise
         """
         try:
+            cached_context = await self.context_cache.get(user_id)
+            if cached_context is not None:
+                return cached_context
+            
+            # The history must include turns still waiting to be saved
+            await self.conversation_writer.flush(user_id)
+            
             import uuid
-            async with db_manager.get_session() as session:
+            async with db_manager.get_session(readonly=True) as session:
                 # Convert string user_id to UUID if needed
                 try:
                     uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
@@ -45,14 +84,17 @@ class UserContextManager(UserContextInterface):
                     logger.warning(f"Invalid UUID format for user_id: {user_id}")
                     return None
                 
-                # Get user from database
-                db_user = await self.db_utils.get_user_by_id(session, uuid_user_id)
-                if not db_user:
+                # Load the profile, skills and recent conversations only
+                data = await self.db_utils.load_user_context(
+                    session, uuid_user_id, recent_conversations=CONTEXT_CONVERSATION_TURNS
+                )
+                if not data:
                     logger.info(f"User {user_id} not found in database")
                     return None
                 
                 # Convert database user to UserContext
-                user_context = await self._db_user_to_context(db_user)
+                user_context = await self._db_user_to_context(data["user"], data["recent_conversations"])
+                await self.context_cache.set(user_context)
                 logger.info(f"Retrieved user context for {user_id}")
                 return user_context
                 
@@ -127,6 +169,8 @@ class UserContextManager(UserContextInterface):
                 )
                 
                 logger.info(f"Updated {len(skills)} skills for user {user_id}")
+            
+            await self.context_cache.invalidate(user_id, "skills")
                 
         except Exception as e:
             logger.error(f"Error updating skills for user {user_id}: {e}")
@@ -158,6 +202,8 @@ class UserContextManager(UserContextInterface):
                     raise ValueError(f"User {user_id} not found")
                 
                 logger.info(f"Saved preferences for user {user_id}")
+            
+            await self.context_cache.invalidate(user_id, "preferences")
                 
         except Exception as e:
             logger.error(f"Error saving preferences for user {user_id}: {e}")
@@ -191,6 +237,8 @@ class UserContextManager(UserContextInterface):
                 )
                 
                 logger.info(f"Tracked progress for user {user_id}, milestone {milestone_id}")
+            
+            await self.context_cache.invalidate(user_id, "progress")
                 
         except Exception as e:
             logger.error(f"Error tracking progress for user {user_id}: {e}")
@@ -226,64 +274,194 @@ class UserContextManager(UserContextInterface):
                 
                 await session.commit()
                 logger.info(f"Saved assessment results for user {user_id}")
+            
+            await self.context_cache.invalidate(user_id, "assessment")
                 
         except Exception as e:
             logger.error(f"Error saving assessment results for user {user_id}: {e}")
             raise
     
-    async def get_conversation_history(self, user_id: str, limit: int = 50) -> List[Dict]:
+    async def get_conversation_history(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict]:
         """
         Get user's conversation history
         
         Args:
             user_id: Unique user identifier
             limit: Maximum number of messages to retrieve
+            offset: Number of most recent messages to skip; every skipped
+                message is still read, so page with get_conversation_page
             
         Returns:
-            List of conversation messages
+            List of conversation messages, most recent first
         """
         try:
-            import uuid
-            async with db_manager.get_session() as session:
+            await self.conversation_writer.flush(user_id)
+            
+            async with db_manager.get_session(readonly=True) as session:
                 # Convert string user_id to UUID if needed
                 uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
                 
-                # Get conversation history from database
+                # Each conversation holds two messages
                 conversations = await self.db_utils.get_conversation_history(
-                    session, uuid_user_id, limit
+                    session, uuid_user_id, (offset + limit + 1) // 2
                 )
                 
-                # Convert to message format
-                messages = []
-                for conv in conversations:
-                    # Add user message
-                    messages.append({
-                        "id": f"{conv.id}_user",
-                        "content": conv.message,
-                        "message_type": "user",
-                        "timestamp": conv.timestamp.isoformat(),
-                        "metadata": conv.context_data
-                    })
-                    
-                    # Add assistant response
-                    messages.append({
-                        "id": f"{conv.id}_assistant",
-                        "content": conv.response,
-                        "message_type": "assistant",
-                        "timestamp": conv.timestamp.isoformat(),
-                        "metadata": conv.context_data
-                    })
-                
-                # Sort by timestamp (most recent first)
-                messages.sort(key=lambda x: x["timestamp"], reverse=True)
-                
+                messages = self._conversation_messages(conversations)[offset:offset + limit]
                 logger.info(f"Retrieved {len(messages)} messages for user {user_id}")
-                return messages[:limit]
+                return messages
                 
         except Exception as e:
             logger.error(f"Error retrieving conversation history for user {user_id}: {e}")
             return []
     
+    async def count_conversation_messages(self, user_id: str) -> int:
+        """
+        Count the messages in a user's conversation history
+        
+        Args:
+            user_id: Unique user identifier
+            
+        Returns:
+            Number of messages, two per conversation
+        """
+        try:
+            await self.conversation_writer.flush(user_id)
+            
+            async with db_manager.get_session(readonly=True) as session:
+                uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+                return 2 * await self.db_utils.count_conversations(session, uuid_user_id)
+                
+        except Exception as e:
+            logger.error(f"Error counting conversation messages for user {user_id}: {e}")
+            return 0
+    
+    async def get_conversation_page(
+        self, 
+        user_id: str, 
+        turns: int = 25, 
+        before: Optional[str] = None, 
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a page of user's conversation history
+        
+        Args:
+            user_id: Unique user identifier
+            turns: Maximum number of conversations (two messages each) to retrieve
+            before: older_cursor of a previous page, to scroll back
+            after: newer_cursor of a previous page, to get newer messages
+            
+        Returns:
+            Dictionary with the page's messages (most recent first), the
+            older_cursor for the page before it (None at the start of the
+            history), the newer_cursor for messages after it and the
+            total_count of messages in the user's history
+            
+        Raises:
+            ValueError: If a cursor is invalid
+        """
+        before_key = decode_history_cursor(before) if before else None
+        after_key = decode_history_cursor(after) if after else None
+        turns = max(1, turns)
+        
+        try:
+            await self.conversation_writer.flush(user_id)
+            
+            async with db_manager.get_session(readonly=True) as session:
+                uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+                
+                # One extra conversation tells whether the history goes on
+                conversations = await self.db_utils.get_conversation_history(
+                    session, uuid_user_id, turns + 1, before=before_key, after=after_key
+                )
+                total_count = 2 * await self.db_utils.count_conversations(session, uuid_user_id)
+            
+            if after_key is not None:
+                # The extra one is on the newer side; the cursor's conversation is older
+                page = conversations[-turns:]
+                has_older = True
+            else:
+                page = conversations[:turns]
+                has_older = len(conversations) > turns
+            
+            return {
+                "messages": self._conversation_messages(page),
+                "older_cursor": encode_history_cursor(page[-1]) if page and has_older else None,
+                "newer_cursor": encode_history_cursor(page[0]) if page else after,
+                "total_count": total_count
+            }
+        
+        except Exception as e:
+            logger.error(f"Error retrieving conversation history page for user {user_id}: {e}")
+            return {"messages": [], "older_cursor": None, "newer_cursor": after, "total_count": 0}
+    
+    async def get_archived_conversation_page(
+        self,
+        user_id: str,
+        turns: int = 25,
+        before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a page of user's archived conversation history
+        
+        Archived conversations are older than the ones in the database, so
+        a client that reached the end of the history (older_cursor None)
+        goes on here; pages use the same cursors.
+        
+        Args:
+            user_id: Unique user identifier
+            turns: Maximum number of conversations (two messages each) to retrieve
+            before: older_cursor of a previous archived page, to scroll back
+        
+        Returns:
+            Dictionary with the page's messages (most recent first), the
+            older_cursor for the page before it (None at the start of the
+            archive) and the total_count of archived messages
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        before_key = decode_history_cursor(before) if before else None
+        turns = max(1, turns)
+        
+        archived = [
+            record_to_conversation(record)
+            for record in await get_conversation_archive().read_user(user_id)
+        ]
+        conversations = archived
+        if before_key is not None:
+            conversations = [conv for conv in conversations if (conv.timestamp, conv.id) < before_key]
+        page = conversations[:turns]
+        
+        return {
+            "messages": self._conversation_messages(page),
+            "older_cursor": encode_history_cursor(page[-1]) if len(conversations) > turns else None,
+            "total_count": 2 * len(archived)
+        }
+    
+    def _conversation_messages(self, conversations: List[DBConversation]) -> List[Dict]:
+        """Convert conversations to messages, keeping their order"""
+        messages = []
+        for conv in conversations:
+            # Add user message
+            messages.append({
+                "id": f"{conv.id}_user",
+                "content": conv.message,
+                "message_type": "user",
+                "timestamp": conv.timestamp.isoformat(),
+                "metadata": conv.context_data
+            })
+            
+            # Add assistant response
+            messages.append({
+                "id": f"{conv.id}_assistant",
+                "content": conv.response,
+                "message_type": "assistant",
+                "timestamp": conv.timestamp.isoformat(),
+                "metadata": conv.context_data
+            })
+        return messages
+    
     async def add_conversation(
         self, 
         user_id: str, 
@@ -302,25 +480,132 @@ class UserContextManager(UserContextInterface):
             message_type: Type of conversation (general, assessment, etc.)
             context_data: Additional context data
         """
+        try:
+            if self.conversation_writer.enabled:
+                # Saved in the background; readers flush the user's queued turns first
+                await self.conversation_writer.submit(
+                    user_id, user_message, assistant_response, message_type, context_data
+                )
+            else:
+                import uuid
+                async with db_manager.get_session() as session:
+                    # Convert string user_id to UUID if needed
+                    uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+                    
+                    await self.db_utils.add_conversation(
+                        session=session,
+                        user_id=uuid_user_id,
+                        message=user_message,
+                        response=assistant_response,
+                        message_type=message_type,
+                        context_data=context_data
+                    )
+            
+            logger.info(f"Added conversation entry for user {user_id}")
+            
+            await self.context_cache.record_conversation(user_id, user_message, assistant_response)
+                
+        except Exception as e:
+            logger.error(f"Error adding conversation for user {user_id}: {e}")
+            raise
+    
+    async def get_conversations_since(
+        self,
+        user_id: str,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+        exclude_newest: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Get conversation turns newer than a timestamp, oldest first
+        
+        Args:
+            user_id: Unique user identifier
+            since: Only return turns after this time (all turns if None)
+            limit: Maximum number of turns to retrieve
+            exclude_newest: Leave out the user's N most recent turns
+            
+        Returns:
+            List of turns with message, response and timestamp
+        """
+        await self.conversation_writer.flush(user_id)
+        
+        import uuid
+        async with db_manager.get_session(readonly=True) as session:
+            # Convert string user_id to UUID if needed
+            uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+            
+            conversations = await self.db_utils.get_conversations_since(
+                session, uuid_user_id, since, limit, exclude_newest
+            )
+            
+            return [
+                {
+                    "message": conv.message,
+                    "response": conv.response,
+                    "timestamp": conv.timestamp
+                }
+                for conv in conversations
+            ]
+    
+    async def get_conversation_summary(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the user's rolling conversation summary
+        
+        Args:
+            user_id: Unique user identifier
+            
+        Returns:
+            Dictionary with the summary text and the timestamp of the newest
+            summarized turn, or None if the user does not exist
+        """
+        import uuid
+        async with db_manager.get_session(readonly=True) as session:
+            # Convert string user_id to UUID if needed
+            uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+            
+            result = await session.execute(
+                select(DBUser.conversation_summary, DBUser.summarized_through)
+                .where(DBUser.id == uuid_user_id)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            
+            return {"summary": row.conversation_summary, "summarized_through": row.summarized_through}
+    
+    async def save_conversation_summary(
+        self, 
+        user_id: str, 
+        summary: str, 
+        summarized_through: datetime
+    ) -> None:
+        """
+        Save the user's rolling conversation summary
+        
+        Args:
+            user_id: Unique user identifier
+            summary: Updated summary text
+            summarized_through: Timestamp of the newest turn included in the summary
+        """
         try:
             import uuid
             async with db_manager.get_session() as session:
                 # Convert string user_id to UUID if needed
                 uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
                 
-                await self.db_utils.add_conversation(
-                    session=session,
-                    user_id=uuid_user_id,
-                    message=user_message,
-                    response=assistant_response,
-                    message_type=message_type,
-                    context_data=context_data
+                await session.execute(
+                    update(DBUser)
+                    .where(DBUser.id == uuid_user_id)
+                    .values(conversation_summary=summary, summarized_through=summarized_through)
                 )
                 
-                logger.info(f"Added conversation entry for user {user_id}")
+                logger.info(f"Saved conversation summary for user {user_id}")
+            
+            await self.context_cache.invalidate(user_id, "summary")
                 
         except Exception as e:
-            logger.error(f"Error adding conversation for user {user_id}: {e}")
+            logger.error(f"Error saving conversation summary for user {user_id}: {e}")
             raise
     
     async def get_user_skills(self, user_id: str) -> Dict[str, SkillLevel]:
@@ -335,7 +620,7 @@ class UserContextManager(UserContextInterface):
         """
         try:
             import uuid
-            async with db_manager.get_session() as session:
+            async with db_manager.get_session(readonly=True) as session:
                 # Convert string user_id to UUID if needed
                 uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
                 
@@ -425,7 +710,7 @@ class UserContextManager(UserContextInterface):
         """
         try:
             import uuid
-            async with db_manager.get_session() as session:
+            async with db_manager.get_session(readonly=True) as session:
                 # Convert string user_id to UUID if needed
                 uuid_user_id = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
                 
@@ -468,12 +753,13 @@ class UserContextManager(UserContextInterface):
             logger.error(f"Error retrieving learning paths for user {user_id}: {e}")
             return []
     
-    async def _db_user_to_context(self, db_user: DBUser) -> UserContext:
+    async def _db_user_to_context(self, db_user: DBUser, recent_conversations: List[Any]) -> UserContext:
         """
         Convert database user to UserContext object
         
         Args:
-            db_user: Database user object with relationships loaded
+            db_user: Database user object with skills loaded
+            recent_conversations: Most recent conversations, oldest first
             
         Returns:
             UserContext object
@@ -497,9 +783,8 @@ class UserContextManager(UserContextInterface):
             except Exception as e:
                 logger.warning(f"Could not parse preferences for user {db_user.id}: {e}")
         
-        # Get recent conversation history (last 10 messages)
+        # Recent conversation history, oldest first
         conversation_history = []
-        recent_conversations = sorted(db_user.conversations, key=lambda x: x.timestamp, reverse=True)[:5]
         for conv in recent_conversations:
             conversation_history.extend([conv.message, conv.response])
         
@@ -510,6 +795,7 @@ class UserContextManager(UserContextInterface):
             career_goals=[],  # TODO: Extract from preferences or conversations
             learning_preferences=preferences,
             conversation_history=conversation_history,
+            conversation_summary=db_user.conversation_summary,
             assessment_results=None,  # TODO: Extract from conversation metadata
             created_at=db_user.created_at,
             last_active=db_user.last_active or db_user.created_at
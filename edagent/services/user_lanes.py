@@ -0,0 +1,131 @@
+"""
+Per-user ordered execution of conversation turns
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..utils.metrics import safe_track
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UserLaneFullError(Exception):
+    """Raised when a user already has the maximum number of messages waiting"""
+
+    def __init__(self, user_id: str, queued: int):
+        self.user_id = user_id
+        self.queued = queued
+        super().__init__(f"User {user_id} already has {queued} messages waiting")
+
+
+class _Lane:
+    """One user's lock, the turns waiting for it and their shared tasks by message"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+        self.turns: Dict[str, "asyncio.Task[Any]"] = {}
+
+
+class UserMessageLanes:
+    """
+    Run each user's messages one at a time, in the order they arrived
+
+    Turns for different users run concurrently; turns for the same user wait
+    for the previous one to finish, so two sends (a double-click, or REST and
+    WebSocket at once) never interleave on the same conversation state.
+
+    At most max_queued turns may wait behind the running one; more raise
+    UserLaneFullError instead of piling up. With coalesce_duplicates, a
+    message identical to one of the user's turns still waiting or running
+    shares that turn's response rather than being handled (and sent to
+    Gemini) again. It is off by default: in a multi-step flow such as an
+    assessment, the same short answer sent twice ("yes", "yes") is two
+    answers, and coalescing would drop the second.
+
+    Each turn runs in its own task, so a caller that disconnects stops
+    waiting but the turn it submitted still completes in order.
+    """
+
+    def __init__(self, enabled: bool = True, max_queued: int = 4, coalesce_duplicates: bool = False):
+        self.enabled = enabled
+        self.max_queued = max(0, max_queued)
+        self.coalesce_duplicates = coalesce_duplicates
+        self._lanes: Dict[str, _Lane] = {}
+
+    async def run(self, user_id: str, message: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a user's turn after the turns submitted before it
+
+        Args:
+            user_id: Unique user identifier
+            message: The user's message, used to spot resubmits
+            func: Zero-argument coroutine function handling the message
+
+        Returns:
+            The turn's result, or the result of the identical turn it joined
+
+        Raises:
+            UserLaneFullError: If max_queued turns are already waiting
+        """
+        if not self.enabled:
+            return await func()
+
+        lane = self._lanes.get(user_id)
+        if lane is None:
+            lane = self._lanes[user_id] = _Lane()
+
+        key = message.strip()
+        turn = lane.turns.get(key) if self.coalesce_duplicates else None
+        if turn is not None:
+            logger.info(f"Coalesced duplicate message from user {user_id} into its pending turn")
+            safe_track("track_conversation_lane_message", "coalesced")
+            return await asyncio.shield(turn)
+
+        if lane.waiting >= self.max_queued and lane.lock.locked():
+            safe_track("track_conversation_lane_message", "rejected")
+            raise UserLaneFullError(user_id, lane.waiting)
+
+        lane.waiting += 1
+        turn = asyncio.ensure_future(self._run_turn(user_id, lane, func))
+        if self.coalesce_duplicates:
+            lane.turns[key] = turn
+        turn.add_done_callback(lambda done: self._on_done(user_id, lane, key, done))
+        return await asyncio.shield(turn)
+
+    def queued(self, user_id: str) -> int:
+        """Get the number of turns waiting behind the user's running turn"""
+        lane = self._lanes.get(user_id)
+        return lane.waiting if lane is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    async def _run_turn(self, user_id: str, lane: _Lane, func: Callable[[], Awaitable[T]]) -> T:
+        queued_at = time.perf_counter()
+        try:
+            await lane.lock.acquire()
+        finally:
+            lane.waiting -= 1
+        try:
+            safe_track("track_conversation_lane_wait", time.perf_counter() - queued_at)
+            safe_track("track_conversation_lane_message", "processed")
+            return await func()
+        finally:
+            lane.lock.release()
+
+    def _on_done(self, user_id: str, lane: _Lane, key: str, turn: "asyncio.Task[Any]") -> None:
+        """Forget a finished turn, and the lane once nothing uses it"""
+        if lane.turns.get(key) is turn:
+            del lane.turns[key]
+        if not lane.turns and lane.waiting == 0 and not lane.lock.locked() and self._lanes.get(user_id) is lane:
+            del self._lanes[user_id]
+
+        # Mark the exception as retrieved when every caller stopped waiting first
+        if not turn.cancelled():
+            turn.exception()
@@ -0,0 +1,28 @@
+"""
+Metrics recording helpers shared by the service and database layers
+"""
+
+import importlib
+import logging
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+def safe_track(name: str, *args: Any) -> None:
+    """
+    Call a recorder from edagent.api.metrics, swallowing any failure
+
+    The recorder is looked up by name on each call: the API package imports the
+    services and database packages on load, so they cannot import it up front.
+
+    Args:
+        name: Name of the recorder function in edagent.api.metrics
+        *args: Arguments passed to the recorder
+    """
+    try:
+        recorder = getattr(importlib.import_module("edagent.api.metrics"), name)
+        recorder(*args)
+    except Exception as e:
+        logger.debug(f"Could not record {name} metrics: {e}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Archive conversations older than the retention period and drop them from the database
+
+Run daily, e.g. from cron. On PostgreSQL it also creates the monthly
+partitions for the coming months:
+
+    python scripts/archive_conversations.py
+    python scripts/archive_conversations.py --retention-days 180
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edagent.config.settings import get_settings  # noqa: E402
+from edagent.database.connection import db_manager  # noqa: E402
+from edagent.services.conversation_archive import ConversationArchiver  # noqa: E402
+
+
+async def main(retention_days):
+    settings = get_settings()
+    if retention_days is not None:
+        settings.conversation_retention_days = retention_days
+
+    await db_manager.initialize()
+    try:
+        archiver = ConversationArchiver(settings)
+        for name in await archiver.create_partitions():
+            print(f"Created partition {name}")
+        archived = await archiver.archive_old_conversations()
+        print(
+            f"Archived to {settings.conversation_archive_dir}: "
+            f"{archived['partition']} conversations from dropped partitions, {archived['rows']} deleted as rows"
+        )
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--retention-days", type=int, default=None,
+        help="Keep conversations this many days (default: CONVERSATION_RETENTION_DAYS)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.retention_days))
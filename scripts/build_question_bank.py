@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Generate assessment questions for the question bank in batch
+
+Run offline (e.g. after deploying or when adding skill areas) so that
+assessments are served from the bank instead of waiting for Gemini:
+
+    python scripts/build_question_bank.py programming "web development" marketing
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edagent.database.connection import db_manager  # noqa: E402
+from edagent.services.ai_service import GeminiAIService  # noqa: E402
+from edagent.services.prompt_engineering import PromptTemplates  # noqa: E402
+from edagent.services.question_bank import QuestionBank, build_question_bank  # noqa: E402
+
+
+async def main(skill_areas, per_difficulty):
+    await db_manager.initialize()
+    try:
+        bank = QuestionBank()
+        await bank.load()
+        added = await build_question_bank(bank, GeminiAIService(), skill_areas, per_difficulty)
+        for skill_area in skill_areas:
+            if skill_area in added:
+                print(f"{skill_area}: {added[skill_area]} new questions, {bank.count(skill_area)} in the bank")
+            else:
+                print(f"{skill_area}: generation failed, see the log")
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "skill_areas", nargs="*",
+        help="Skill areas to generate questions for (default: the built-in assessment areas)"
+    )
+    parser.add_argument(
+        "--per-difficulty", type=int, default=None,
+        help="Questions per difficulty (default: QUESTION_BANK_QUESTIONS_PER_DIFFICULTY)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.skill_areas or list(PromptTemplates.SKILL_ASSESSMENT_QUESTIONS), args.per_difficulty))
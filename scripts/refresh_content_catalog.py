@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Seed or refresh the content recommendation cache from YouTube and course searches
+
+Content found before is refreshed in place (matched by URL) and new content
+is added, in batches of CONTENT_INGEST_BATCH_SIZE:
+
+    python scripts/refresh_content_catalog.py python "web development" "data analysis"
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edagent.config.settings import get_settings  # noqa: E402
+from edagent.database.connection import db_manager  # noqa: E402
+from edagent.models.user_context import SkillLevel, SkillLevelEnum  # noqa: E402
+from edagent.services.content_ingestion import ingest_content  # noqa: E402
+from edagent.services.content_recommender import ContentRecommender, YouTubeContentFilters  # noqa: E402
+
+
+async def crawl(recommender, skills, levels):
+    """Search every skill at every level, yielding content as each search returns"""
+    filters = YouTubeContentFilters(max_results=recommender.settings.youtube_max_results)
+    for skill in skills:
+        for level in levels:
+            searches = await asyncio.gather(
+                recommender.search_youtube_content(f"{skill} {level.value} tutorial", filters),
+                recommender.search_courses(skill, SkillLevel(skill, level, confidence_score=1.0)),
+                return_exceptions=True
+            )
+            for found in searches:
+                if isinstance(found, Exception):
+                    print(f"{skill} ({level.value}): search failed: {found}")
+                    continue
+                for content in found:
+                    yield content
+
+
+async def main(skills, levels, batch_size):
+    await db_manager.initialize()
+    try:
+        recommender = ContentRecommender(get_settings())
+        start = datetime.now()
+        count = await ingest_content(crawl(recommender, skills, levels), batch_size=batch_size)
+        print(f"Saved {count} content items in {(datetime.now() - start).total_seconds():.1f}s")
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("skills", nargs="+", help="Skills to search content for")
+    parser.add_argument(
+        "--levels", nargs="+", choices=[level.value for level in SkillLevelEnum],
+        default=[level.value for level in SkillLevelEnum],
+        help="Skill levels to search at (default: all)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Content items per upsert (default: CONTENT_INGEST_BATCH_SIZE)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.skills, [SkillLevelEnum(level) for level in args.levels], args.batch_size))
@@ -972,6 +972,53 @@ class EnhancedEdAgentAPI:
             return False
 
     # Learning Path methods
+    async def _wait_for_job(self, response: APIResponse, poll_interval: float = 1.0, timeout: float = 300.0) -> APIResponse:
+        """
+        Poll a background job until it finishes
+        
+        Endpoints that start long generations answer 202 Accepted with a job;
+        other responses are returned unchanged.
+        
+        Returns:
+            APIResponse whose data is the job's result once it succeeded
+        """
+        if not response.success or not isinstance(response.data, dict) or "job_id" not in response.data:
+            return response
+        
+        job_id = response.data["job_id"]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval)
+            response = await self._make_request("GET", f"/jobs/{job_id}")
+            if not response.success:
+                return response
+            
+            job = response.data
+            if job.get("status") == "succeeded":
+                return APIResponse(success=True, data=job.get("result") or {}, status_code=response.status_code)
+            if job.get("status") == "failed":
+                return APIResponse(
+                    success=False,
+                    data=job,
+                    error=APIError(
+                        error_type=APIErrorType.SERVER_ERROR,
+                        message=job.get("error") or "Job failed",
+                        details={"job_id": job_id}
+                    ),
+                    status_code=response.status_code
+                )
+        
+        return APIResponse(
+            success=False,
+            data=None,
+            error=APIError(
+                error_type=APIErrorType.TIMEOUT_ERROR,
+                message=f"Job {job_id} did not finish within {timeout:.0f} seconds",
+                details={"job_id": job_id},
+                is_retryable=True
+            )
+        )
+    
     async def create_learning_path(self, user_id: str, goal: str) -> Optional[LearningPath]:
         """Create a learning path"""
         try:
@@ -983,6 +1030,8 @@ class EnhancedEdAgentAPI:
                     "goal": goal
                 }
             )
+            # Learning paths are generated in the background
+            response = await self._wait_for_job(response)
             
             if response.success:
                 data = response.data
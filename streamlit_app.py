@@ -320,7 +320,25 @@ class EdAgentAPI:
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            if "job_id" not in data:
+                return data
+            
+            # The path is generated in the background; poll until it is ready
+            deadline = time.monotonic() + 300
+            while time.monotonic() < deadline:
+                time.sleep(1)
+                response = self.session.get(
+                    f"{self.base_url}/jobs/{data['job_id']}",
+                    headers=self._get_headers()
+                )
+                response.raise_for_status()
+                job = response.json()
+                if job["status"] == "succeeded":
+                    return job["result"]
+                if job["status"] == "failed":
+                    raise RuntimeError(job.get("error") or "learning path generation failed")
+            raise TimeoutError("learning path generation is taking too long")
         except Exception as e:
             st.error(f"Failed to create learning path: {str(e)}")
             return {}
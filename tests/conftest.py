@@ -0,0 +1,32 @@
+"""
+Shared pytest configuration for the EdAgent test suite
+
+Tests marked benchmark time one implementation against another on large
+generated datasets. They are slow and their numbers depend on the machine,
+so they are skipped unless --run-benchmarks is given.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False,
+        help="Run the tests marked benchmark"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing comparison, skipped unless --run-benchmarks is given"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="benchmark; run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
@@ -0,0 +1,214 @@
+"""
+Unit tests and benchmark for bulk ingestion of crawled content
+"""
+
+import pytest
+import pytest_asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.database.models import Base, ContentRecommendation as CachedContent, ContentSkillTag
+from edagent.database.utils import DatabaseUtils
+from edagent.models.content import ContentRecommendation, ContentType, DifficultyLevel, Platform
+from edagent.services.content_ingestion import content_to_row, ingest_content
+
+
+CATALOG_SIZE = 5_000
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema, committing like db_manager"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    yield get_session
+    await engine.dispose()
+
+
+def make_content(i, skills=("Python",), **fields):
+    return ContentRecommendation(
+        title=f"item {i}",
+        url=f"https://example.com/{i}",
+        platform=Platform.YOUTUBE,
+        content_type=ContentType.VIDEO,
+        skills_covered=list(skills),
+        **fields
+    )
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+async def cached(factory):
+    async with factory() as session:
+        return (await session.execute(select(CachedContent).order_by(CachedContent.url))).scalars().all()
+
+
+async def tags_of(factory, url):
+    async with factory() as session:
+        return (await session.execute(
+            select(ContentSkillTag.skill_tag)
+            .join(CachedContent)
+            .where(CachedContent.url == url)
+            .order_by(ContentSkillTag.skill_tag)
+        )).scalars().all()
+
+
+class TestContentToRow:
+    """Test cases for mapping crawled content to cache columns"""
+
+    def test_maps_enums_duration_and_skills(self):
+        """Test that enums become their values, duration whole minutes and skills the tags"""
+        content = make_content(
+            1, skills=["Python", "Flask"], duration=timedelta(minutes=12, seconds=50),
+            rating=4.5, difficulty_level=DifficultyLevel.INTERMEDIATE, tags=["tutorial"]
+        )
+
+        row = content_to_row(content)
+
+        assert row["platform"] == "youtube"
+        assert row["content_type"] == "video"
+        assert row["difficulty_level"] == "intermediate"
+        assert row["duration_minutes"] == 12
+        assert row["skill_tags"] == ["Python", "Flask"]
+        assert row["rating"] == 4.5
+
+    def test_unrated_content_has_no_rating(self):
+        """Test that the 0.0 default rating is stored as unrated"""
+        assert content_to_row(make_content(1))["rating"] is None
+
+
+class TestContentIngestion:
+    """Test cases for ingest_content and DatabaseUtils.upsert_content_recommendations"""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_batches(self, session_factory):
+        """Test that every item of the stream is saved, including a last partial batch"""
+        count = await ingest_content(
+            stream(make_content(i) for i in range(7)), batch_size=3, session_factory=session_factory
+        )
+
+        assert count == 7
+        assert len(await cached(session_factory)) == 7
+        assert await tags_of(session_factory, "https://example.com/6") == ["python"]
+
+    @pytest.mark.asyncio
+    async def test_recrawl_refreshes_instead_of_duplicating(self, session_factory):
+        """Test that content with a known URL keeps its id and gets the new values and tags"""
+        await ingest_content(stream([make_content(1, skills=["Python"])]), session_factory=session_factory)
+        before = (await cached(session_factory))[0]
+
+        await ingest_content(
+            stream([make_content(1, skills=["Python", "Django"], rating=4.0)]), session_factory=session_factory
+        )
+        after = await cached(session_factory)
+
+        assert len(after) == 1
+        assert after[0].id == before.id
+        assert after[0].rating == 4.0
+        assert after[0].last_verified > before.last_verified
+        assert await tags_of(session_factory, "https://example.com/1") == ["django", "python"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_urls_in_one_batch(self, session_factory):
+        """Test that the last copy of a URL within a batch wins"""
+        items = [make_content(1, rating=1.0), make_content(2), make_content(1, rating=3.0)]
+
+        count = await ingest_content(stream(items), session_factory=session_factory)
+
+        rows = await cached(session_factory)
+        assert count == 2
+        assert [row.rating for row in rows] == [3.0, None]
+
+    @pytest.mark.asyncio
+    async def test_verified_at(self, session_factory):
+        """Test that an explicit verification time is stored on insert and refresh"""
+        verified_at = datetime(2026, 1, 1, 12, 0)
+        async with session_factory() as session:
+            await DatabaseUtils.upsert_content_recommendations(
+                session, [content_to_row(make_content(1))], verified_at
+            )
+
+        assert (await cached(session_factory))[0].last_verified.replace(tzinfo=None) == verified_at
+
+    @pytest.mark.asyncio
+    async def test_empty_stream(self, session_factory):
+        """Test that an empty stream writes nothing"""
+        assert await ingest_content(stream([]), session_factory=session_factory) == 0
+
+    @pytest.mark.asyncio
+    async def test_single_cache_refreshes_by_url(self, session_factory):
+        """Test that cache_content_recommendation updates content already cached under the URL"""
+        for rating in (2.0, 4.0):
+            async with session_factory() as session:
+                await DatabaseUtils.cache_content_recommendation(
+                    session, title="python", url="https://example.com/1", platform="youtube",
+                    content_type="video", rating=rating, skill_tags=["Python", "SQL"]
+                )
+
+        rows = await cached(session_factory)
+        assert [row.rating for row in rows] == [4.0]
+        assert await tags_of(session_factory, "https://example.com/1") == ["python", "sql"]
+
+    @pytest.mark.asyncio
+    async def test_url_unique(self, session_factory):
+        """Test that the database refuses a second row for a URL"""
+        with pytest.raises(IntegrityError):
+            async with session_factory() as session:
+                for _ in range(2):
+                    session.add(CachedContent(
+                        title="item", url="https://example.com/1", platform="youtube", content_type="video"
+                    ))
+                    await session.flush()
+
+
+@pytest.mark.benchmark
+class TestContentIngestionSpeed:
+    """Benchmark bulk ingestion against caching one item at a time"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_against_one_at_a_time(self, session_factory):
+        """Measure streaming a crawl through ingest_content against per-item caching"""
+        items = [make_content(i, skills=["Python", f"skill {i % 50}"]) for i in range(CATALOG_SIZE)]
+
+        start = time.perf_counter()
+        await ingest_content(stream(items), session_factory=session_factory)
+        bulk_s = time.perf_counter() - start
+
+        # Refreshing the same catalog: every item is an update
+        start = time.perf_counter()
+        await ingest_content(stream(items), session_factory=session_factory)
+        refresh_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for content in items[:CATALOG_SIZE // 10]:
+            async with session_factory() as session:
+                row = content_to_row(content)
+                await DatabaseUtils.cache_content_recommendation(session, **row)
+        single_s = (time.perf_counter() - start) * 10
+
+        async with session_factory() as session:
+            total = (await session.execute(select(func.count()).select_from(CachedContent))).scalar()
+
+        print(
+            f"\n{CATALOG_SIZE} items: {bulk_s:.2f}s bulk insert, {refresh_s:.2f}s bulk refresh, "
+            f"~{single_s:.2f}s one at a time"
+        )
+        assert total == CATALOG_SIZE
@@ -0,0 +1,204 @@
+"""
+Unit tests and benchmark for the cached content skill tag index
+"""
+
+import pytest
+import pytest_asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.database.models import Base, ContentRecommendation, ContentSkillTag
+from edagent.database.utils import DatabaseUtils, normalize_skill_tags
+
+
+CATALOG_SIZE = 50_000
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def cache(session, title, skill_tags, rating=None, content_type="video", is_free=True):
+    return await DatabaseUtils.cache_content_recommendation(
+        session, title=title, url=f"https://example.com/{title}", platform="youtube",
+        content_type=content_type, rating=rating, is_free=is_free, skill_tags=skill_tags
+    )
+
+
+async def search_titles(factory, skill_tags, **filters):
+    async with factory() as session:
+        results = await DatabaseUtils.search_cached_content(session, skill_tags, **filters)
+        return [content.title for content in results]
+
+
+class TestNormalizeSkillTags:
+    """Test cases for normalize_skill_tags"""
+
+    def test_case_spacing_and_duplicates(self):
+        """Test that tags are lowercased, single-spaced and deduplicated in order"""
+        assert normalize_skill_tags(["Python", " web  Development ", "python", "", "SQL"]) == [
+            "python", "web development", "sql"
+        ]
+
+
+class TestContentSearch:
+    """Test cases for DatabaseUtils.search_cached_content"""
+
+    @pytest_asyncio.fixture
+    async def catalog(self, session_factory):
+        async with session_factory() as session:
+            await cache(session, "python basics", ["Python"], rating=4.0)
+            await cache(session, "python for the web", ["Python", "Web Development"], rating=3.5)
+            await cache(session, "full stack", ["python", "web development", "SQL"], rating=None)
+            await cache(session, "sql course", ["SQL"], rating=4.9, content_type="course", is_free=False)
+            await cache(session, "unrated python", ["Python"], rating=None)
+            await session.commit()
+        return session_factory
+
+    @pytest.mark.asyncio
+    async def test_tags_indexed_when_cached(self, catalog):
+        """Test that caching content writes one normalized index row per tag"""
+        async with catalog() as session:
+            rows = (await session.execute(
+                select(ContentSkillTag.skill_tag)
+                .join(ContentRecommendation)
+                .where(ContentRecommendation.title == "full stack")
+                .order_by(ContentSkillTag.skill_tag)
+            )).scalars().all()
+
+        assert rows == ["python", "sql", "web development"]
+
+    @pytest.mark.asyncio
+    async def test_ranked_by_matched_tags_then_rating(self, catalog):
+        """Test that content matching more tags ranks first, then higher rated, unrated last"""
+        titles = await search_titles(catalog, ["python", "Web Development"])
+
+        assert titles == ["python for the web", "full stack", "python basics", "unrated python"]
+
+    @pytest.mark.asyncio
+    async def test_match_all(self, catalog):
+        """Test that match_all keeps only content tagged with every tag"""
+        titles = await search_titles(catalog, ["Python", "SQL"], match_all=True)
+
+        assert titles == ["full stack"]
+
+    @pytest.mark.asyncio
+    async def test_filters_and_limit(self, catalog):
+        """Test that content type, price and limit apply after the tag match"""
+        assert await search_titles(catalog, ["sql"], content_type="course") == ["sql course"]
+        assert await search_titles(catalog, ["sql"], is_free=True) == ["full stack"]
+        assert await search_titles(catalog, ["python"], limit=2) == ["python basics", "python for the web"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_tag_finds_nothing(self, catalog):
+        """Test that a tag no content has returns no results"""
+        assert await search_titles(catalog, ["cobol"]) == []
+
+    @pytest.mark.asyncio
+    async def test_no_tags_ranks_all_content(self, catalog):
+        """Test that searching without tags returns content by rating"""
+        titles = await search_titles(catalog, [], limit=3)
+
+        assert titles == ["sql course", "python basics", "python for the web"]
+
+    @pytest.mark.asyncio
+    async def test_tag_rows_deleted_with_content(self, catalog):
+        """Test that deleting content removes its index rows"""
+        async with catalog() as session:
+            content = (await session.execute(
+                select(ContentRecommendation).where(ContentRecommendation.title == "full stack")
+            )).scalar_one()
+            await session.delete(content)
+            await session.commit()
+
+            remaining = (await session.execute(
+                select(ContentSkillTag).where(ContentSkillTag.content_id == content.id)
+            )).scalars().all()
+
+        assert remaining == []
+
+    def test_postgresql_query_uses_array_parameter(self):
+        """Test that PostgreSQL gets the tags as one array parameter and NULLS LAST"""
+        query = DatabaseUtils.build_content_search_query("postgresql", ["Python", "SQL"], match_all=True)
+        compiled = query.compile(dialect=postgresql.dialect())
+
+        assert "= ANY (" in str(compiled)
+        assert "NULLS LAST" in str(compiled)
+        assert compiled.params["skill_tags"] == ["python", "sql"]
+        assert "HAVING count(*) =" in str(compiled)
+
+
+async def seed_catalog(session, size):
+    """Cache size items, each tagged with 3 of 500 skills"""
+    rng = random.Random(7)
+    vocabulary = [f"skill {i}" for i in range(500)]
+    content_rows, tag_rows = [], []
+    for i in range(size):
+        content_id = uuid.uuid4()
+        tags = rng.sample(vocabulary, 3)
+        content_rows.append({
+            "id": content_id, "title": f"item {i}", "url": f"https://example.com/{i}",
+            "platform": "youtube", "content_type": "video", "rating": rng.uniform(1, 5),
+            "is_free": True, "skill_tags": tags
+        })
+        tag_rows.extend({"skill_tag": tag, "content_id": content_id} for tag in tags)
+
+    await session.execute(insert(ContentRecommendation), content_rows)
+    await session.execute(insert(ContentSkillTag), tag_rows)
+    await session.commit()
+
+
+class TestContentSearchIndex:
+    """Test cases for how tag search reads the tag index"""
+
+    @pytest.mark.asyncio
+    async def test_search_reads_index_not_catalog(self, session_factory):
+        """Test that tag lookups seek the tag index instead of scanning"""
+        async with session_factory() as session:
+            await seed_catalog(session, 2000)
+
+            plan = (await session.execute(
+                text("EXPLAIN QUERY PLAN SELECT content_id FROM content_skill_tags WHERE skill_tag IN ('skill 1')")
+            )).fetchall()
+            results = await DatabaseUtils.search_cached_content(session, ["skill 1", "skill 2"])
+
+        assert "SCAN" not in " ".join(row[-1] for row in plan)
+        assert len(results) == 10
+        assert all({"skill 1", "skill 2"} & set(item.skill_tags) for item in results)
+
+
+@pytest.mark.benchmark
+class TestContentSearchScaling:
+    """Benchmark tag search against a large cached catalog"""
+
+    @pytest.mark.asyncio
+    async def test_indexed_search_against_full_scan(self, session_factory):
+        """Measure tag search through the index against reading every row's tags"""
+        async with session_factory() as session:
+            await seed_catalog(session, CATALOG_SIZE)
+
+            start = time.perf_counter()
+            for i in range(20):
+                await DatabaseUtils.search_cached_content(session, [f"skill {i}", f"skill {i + 1}"])
+            indexed_ms = (time.perf_counter() - start) / 20 * 1000
+
+            # What the JSON search had to do: read every row's tags
+            start = time.perf_counter()
+            for i in range(3):
+                all_rows = (await session.execute(select(ContentRecommendation.skill_tags))).scalars().all()
+                [tags for tags in all_rows if f"skill {i}" in tags]
+            scan_ms = (time.perf_counter() - start) / 3 * 1000
+
+        print(f"\nTag search over {CATALOG_SIZE} items: {indexed_ms:.1f} ms indexed, {scan_ms:.1f} ms full scan")
@@ -0,0 +1,373 @@
+"""
+Unit tests and benchmark for conversation partitions, archiving and rehydration
+"""
+
+import asyncio
+import gzip
+import time
+import uuid
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.config.settings import get_settings
+from edagent.database.connection import DatabaseManager
+from edagent.database.models import Base, Conversation
+from edagent.database.partitions import MonthPartition, add_months, create_partitions, month_start
+from edagent.database.utils import DatabaseUtils
+from edagent.services import conversation_archive as archive_module
+from edagent.services.conversation_archive import ConversationArchive, ConversationArchiver
+from edagent.services.user_context_manager import UserContextManager
+
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def make_settings(**overrides):
+    settings = get_settings().model_copy()
+    settings.conversation_retention_days = 90
+    settings.conversation_archive_chunk_size = 3
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema, committing like db_manager"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session(readonly=False):
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    yield get_session
+    await engine.dispose()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ConversationArchive(str(tmp_path / "archive"))
+
+
+async def add_user(factory):
+    async with factory() as session:
+        user = await DatabaseUtils.create_user(session, f"{uuid.uuid4()}@example.com", "hash")
+        await session.flush()
+        return str(user.id)
+
+
+async def add_turns(factory, user_id, timestamps):
+    """Save one turn per timestamp, numbered in the order given"""
+    async with factory() as session:
+        await DatabaseUtils.add_conversations(session, [
+            {
+                "id": uuid.uuid4(),
+                "user_id": uuid.UUID(user_id),
+                "message": f"message {i}",
+                "response": f"response {i}",
+                "message_type": "general",
+                "context_data": {"turn": i},
+                "timestamp": timestamp
+            }
+            for i, timestamp in enumerate(timestamps)
+        ])
+
+
+async def database_messages(factory):
+    async with factory() as session:
+        result = await session.execute(select(Conversation.message).order_by(Conversation.timestamp))
+        return result.scalars().all()
+
+
+def days_ago(*days):
+    return [NOW - timedelta(days=day) for day in days]
+
+
+class TestMonths:
+    """Test cases for the month arithmetic behind partitions"""
+
+    def test_month_start_and_add_months(self):
+        """Test that months start at midnight UTC on the first and wrap across years"""
+        start = month_start(datetime(2026, 11, 30, 23, 59))
+
+        assert start == datetime(2026, 11, 1, tzinfo=timezone.utc)
+        assert add_months(start, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(start, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_partition_name_and_bounds(self):
+        """Test that a partition is named after its month and ends where the next begins"""
+        partition = MonthPartition(datetime(2026, 12, 1, tzinfo=timezone.utc))
+
+        assert partition.name == "conversations_p202612"
+        assert partition.end == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_no_partitions_on_sqlite(self, session_factory):
+        """Test that SQLite keeps the plain table"""
+        async with session_factory() as session:
+            assert await create_partitions(session, months_ahead=3) == []
+
+
+class TestConversationArchive:
+    """Test cases for the archive files"""
+
+    @pytest.mark.asyncio
+    async def test_read_user_newest_first(self, session_factory, archive):
+        """Test that a user's archived turns come back newest first, across months, without other users'"""
+        alice, bob = await add_user(session_factory), await add_user(session_factory)
+        await add_turns(session_factory, alice, days_ago(200, 150, 120))
+        await add_turns(session_factory, bob, days_ago(160))
+        async with session_factory() as session:
+            await archive.write(await DatabaseUtils.get_conversations_before(session, NOW, 100))
+
+        records = await archive.read_user(alice)
+
+        assert [record["message"] for record in records] == ["message 2", "message 1", "message 0"]
+        assert records[0]["context_data"] == {"turn": 2}
+        assert len(list((archive.directory).iterdir())) == 3
+
+    @pytest.mark.asyncio
+    async def test_rewritten_chunk_read_once(self, session_factory, archive):
+        """Test that archiving the same turns twice (a retried chunk) does not duplicate them"""
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, days_ago(200, 199))
+        async with session_factory() as session:
+            conversations = await DatabaseUtils.get_conversations_before(session, NOW, 100)
+        await archive.write(conversations)
+        await archive.write(conversations)
+
+        assert len(await archive.read_user(user_id)) == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_user(self, session_factory, archive):
+        """Test that deleting a user's archive leaves other users' turns"""
+        alice, bob = await add_user(session_factory), await add_user(session_factory)
+        await add_turns(session_factory, alice, days_ago(200, 120))
+        await add_turns(session_factory, bob, days_ago(200))
+        async with session_factory() as session:
+            await archive.write(await DatabaseUtils.get_conversations_before(session, NOW, 100))
+
+        assert await archive.delete_user(alice) == 2
+        assert await archive.read_user(alice) == []
+        assert len(await archive.read_user(bob)) == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_file_keeps_earlier_records(self, session_factory, archive):
+        """Test that a write cut short does not make the rest of the file unreadable"""
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, days_ago(200))
+        async with session_factory() as session:
+            await archive.write(await DatabaseUtils.get_conversations_before(session, NOW, 100))
+        path = next(archive.directory.glob("*/*.jsonl.gz"))
+        path.write_bytes(path.read_bytes() + gzip.compress(b'{"id": "x"}\n' * 100)[:20])
+
+        assert len(await archive.read_user(user_id)) == 1
+
+
+class TestConversationArchiver:
+    """Test cases for ConversationArchiver"""
+
+    @pytest.mark.asyncio
+    async def test_archives_rows_past_retention_in_chunks(self, session_factory, archive):
+        """Test that turns past retention move to the archive in chunks and newer turns stay"""
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, days_ago(400, 300, 200, 120, 100, 91, 89, 1))
+        archiver = ConversationArchiver(make_settings(), archive, session_factory)
+
+        archived = await archiver.archive_old_conversations(now=NOW)
+
+        assert archived == {"partition": 0, "rows": 6}
+        assert await database_messages(session_factory) == ["message 6", "message 7"]
+        assert [r["message"] for r in await archive.read_user(user_id)] == [f"message {i}" for i in range(5, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_archive(self, session_factory, archive):
+        """Test that an archive run without old turns changes nothing"""
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, days_ago(1))
+        archiver = ConversationArchiver(make_settings(), archive, session_factory)
+
+        assert await archiver.archive_old_conversations(now=NOW) == {"partition": 0, "rows": 0}
+        assert await database_messages(session_factory) == ["message 0"]
+
+    @pytest.mark.asyncio
+    async def test_partitions_archived_whole_and_dropped(self, session_factory, archive, monkeypatch):
+        """Test that months before the cutoff's month are archived whole and their partitions dropped"""
+        user_id = await add_user(session_factory)
+        # Cutoff is 2026-07-19, so June and earlier are dropped; July is kept until it is all past
+        await add_turns(session_factory, user_id, [
+            datetime(2026, 6, 1, tzinfo=timezone.utc) + timedelta(hours=i) for i in range(7)
+        ] + [datetime(2026, 7, 2, tzinfo=timezone.utc), datetime(2026, 8, 2, tzinfo=timezone.utc)])
+        months = [MonthPartition(datetime(2026, month, 1, tzinfo=timezone.utc)) for month in (6, 7, 8)]
+        dropped = []
+
+        async def list_partitions(session):
+            return months
+
+        async def drop_partition(session, partition):
+            # What dropping the partition does to the table
+            await session.execute(delete(Conversation).where(
+                Conversation.timestamp >= partition.start, Conversation.timestamp < partition.end
+            ))
+            dropped.append(partition.name)
+
+        monkeypatch.setattr(archive_module, "list_partitions", list_partitions)
+        monkeypatch.setattr(archive_module, "drop_partition", drop_partition)
+        archiver = ConversationArchiver(make_settings(), archive, session_factory)
+
+        archived = await archiver.archive_old_conversations(now=NOW)
+
+        assert archived == {"partition": 7, "rows": 0}
+        assert dropped == ["conversations_p202606"]
+        assert await database_messages(session_factory) == ["message 7", "message 8"]
+        assert len(await archive.read_user(user_id)) == 7
+
+    @pytest.mark.asyncio
+    async def test_cleanup_deletes_one_batch(self, session_factory):
+        """Test that cleanup_old_conversations deletes at most one batch, oldest first"""
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, [datetime.now(timezone.utc) - timedelta(days=d) for d in (50, 40, 35, 1)])
+
+        async with session_factory() as session:
+            assert await DatabaseUtils.cleanup_old_conversations(session, days_to_keep=30, batch_size=2) == 2
+        assert await database_messages(session_factory) == ["message 2", "message 3"]
+
+
+class TestArchivedHistory:
+    """Test cases for reading archived history back page by page"""
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_cursors(self, session_factory, archive, monkeypatch):
+        """Test that archived history pages newest first with the history cursors"""
+        monkeypatch.setattr("edagent.services.user_context_manager.get_conversation_archive", lambda: archive)
+        user_id = await add_user(session_factory)
+        await add_turns(session_factory, user_id, days_ago(300, 250, 200, 150, 100))
+        await ConversationArchiver(make_settings(), archive, session_factory).archive_old_conversations(now=NOW)
+        manager = UserContextManager()
+
+        first = await manager.get_archived_conversation_page(user_id, turns=2)
+        second = await manager.get_archived_conversation_page(user_id, turns=2, before=first["older_cursor"])
+        last = await manager.get_archived_conversation_page(user_id, turns=2, before=second["older_cursor"])
+
+        assert [m["content"] for m in first["messages"]] == ["message 4", "response 4", "message 3", "response 3"]
+        assert [m["content"] for m in second["messages"]][::2] == ["message 2", "message 1"]
+        assert [m["content"] for m in last["messages"]] == ["message 0", "response 0"]
+        assert last["older_cursor"] is None
+        assert first["total_count"] == last["total_count"] == 10
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, archive, monkeypatch):
+        """Test that a cursor that was not issued is refused"""
+        monkeypatch.setattr("edagent.services.user_context_manager.get_conversation_archive", lambda: archive)
+
+        with pytest.raises(ValueError):
+            await UserContextManager().get_archived_conversation_page(str(uuid.uuid4()), before="not-a-cursor")
+
+
+class TestArchivingAlongsideWrites:
+    """Test cases for archiving while new turns are being written"""
+
+    @pytest.mark.asyncio
+    async def test_writes_during_archiving(self, tmp_path):
+        """Test that chunked archiving removes every old row while writes keep landing"""
+        manager = DatabaseManager()
+        manager.settings = make_settings(database_url=f"sqlite:///{tmp_path / 'test.db'}", api_debug=False)
+        await manager.create_tables()
+        user_id = await add_user(manager.get_session)
+        await add_turns(manager.get_session, user_id, [NOW - timedelta(days=200, seconds=i) for i in range(300)])
+        archiver = ConversationArchiver(
+            make_settings(conversation_archive_chunk_size=50),
+            ConversationArchive(str(tmp_path / "archive")),
+            manager.get_session
+        )
+
+        async def write_until(task):
+            written = 0
+            while not task.done():
+                await add_turns(manager.get_session, user_id, [datetime.now(timezone.utc)])
+                written += 1
+                await asyncio.sleep(0)
+            return written
+
+        try:
+            task = asyncio.create_task(archiver.archive_old_conversations(now=NOW))
+            written = await write_until(task)
+            archived = await task
+
+            async with manager.get_session() as session:
+                remaining = (await session.execute(
+                    select(func.count()).select_from(Conversation).where(Conversation.timestamp < NOW - timedelta(days=90))
+                )).scalar()
+                kept = (await session.execute(select(func.count()).select_from(Conversation))).scalar()
+        finally:
+            await manager.close()
+
+        assert archived["rows"] == 300
+        assert remaining == 0
+        assert 0 < written == kept
+
+
+@pytest.mark.benchmark
+class TestRetentionWriteLatency:
+    """Benchmark write latency while old conversations are removed"""
+
+    @pytest.mark.asyncio
+    async def test_chunked_archiving_against_unbounded_delete(self, tmp_path):
+        """Measure how long writes wait during chunked archiving and during one unbounded delete"""
+        manager = DatabaseManager()
+        manager.settings = make_settings(database_url=f"sqlite:///{tmp_path / 'test.db'}", api_debug=False)
+        await manager.create_tables()
+        user_id = await add_user(manager.get_session)
+        old = NOW - timedelta(days=200)
+
+        async def seed():
+            for start in range(0, 150_000, 10_000):
+                await add_turns(manager.get_session, user_id, [old + timedelta(seconds=start + i) for i in range(10_000)])
+
+        async def max_write_latency(retention):
+            latencies = []
+            task = asyncio.create_task(retention())
+            while not task.done():
+                start = time.perf_counter()
+                await add_turns(manager.get_session, user_id, [datetime.now(timezone.utc)])
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+            await task
+            return max(latencies) * 1000
+
+        async def unbounded_delete():
+            async with manager.get_session() as session:
+                await session.execute(delete(Conversation).where(Conversation.timestamp < NOW - timedelta(days=90)))
+
+        archiver = ConversationArchiver(
+            make_settings(conversation_archive_chunk_size=1000),
+            ConversationArchive(str(tmp_path / "archive")),
+            manager.get_session
+        )
+        try:
+            await seed()
+            unbounded_ms = await max_write_latency(unbounded_delete)
+            await seed()
+            chunked_ms = await max_write_latency(lambda: archiver.archive_old_conversations(now=NOW))
+
+            async with manager.get_session() as session:
+                remaining = (await session.execute(
+                    select(func.count()).select_from(Conversation).where(Conversation.timestamp < old + timedelta(days=1))
+                )).scalar()
+        finally:
+            await manager.close()
+
+        print(f"\nLongest write during retention of 150000 turns: {unbounded_ms:.0f} ms unbounded delete, "
+              f"{chunked_ms:.0f} ms chunked archiving")
+        assert remaining == 0
@@ -0,0 +1,239 @@
+"""
+Unit tests and benchmark for keyset-paginated conversation history
+"""
+
+import pytest
+import pytest_asyncio
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.database.models import Base, Conversation, User
+from edagent.database.utils import DatabaseUtils
+from edagent.services.user_context_manager import (
+    UserContextManager,
+    decode_history_cursor,
+    encode_history_cursor
+)
+
+
+HISTORY_SIZE = 10_000
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def create_user_with_history(factory, conversation_count, turns_per_timestamp=1):
+    """Create a user whose conversation i asks "question i"; several may share a timestamp"""
+    user_id = uuid.uuid4()
+    start = datetime(2025, 1, 1)
+    async with factory() as session:
+        session.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x", preferences={}))
+        await session.flush()
+        await session.execute(insert(Conversation), [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "message": f"question {i}",
+                "response": f"answer {i}",
+                "timestamp": start + timedelta(minutes=i // turns_per_timestamp),
+                "message_type": "general",
+                "context_data": {}
+            }
+            for i in range(conversation_count)
+        ])
+        await session.commit()
+    return str(user_id)
+
+
+@pytest.fixture
+def user_context_manager(session_factory):
+    """Create a UserContextManager reading from the in-memory database"""
+    @asynccontextmanager
+    async def get_session(readonly=False):
+        async with session_factory() as session:
+            yield session
+
+    db_manager = Mock()
+    db_manager.get_session = get_session
+    with patch("edagent.services.user_context_manager.db_manager", db_manager):
+        yield UserContextManager()
+
+
+def questions(page):
+    return [message["content"] for message in page["messages"] if message["message_type"] == "user"]
+
+
+class TestConversationPages:
+    """Test cases for UserContextManager.get_conversation_page"""
+
+    @pytest.mark.asyncio
+    async def test_scroll_back_through_history(self, user_context_manager, session_factory):
+        """Test that pages cover the history newest first without gaps or repeats, across timestamp ties"""
+        user_id = await create_user_with_history(session_factory, 23, turns_per_timestamp=3)
+
+        seen = []
+        page = await user_context_manager.get_conversation_page(user_id, turns=5)
+        while True:
+            seen.extend(questions(page))
+            if page["older_cursor"] is None:
+                break
+            page = await user_context_manager.get_conversation_page(user_id, turns=5, before=page["older_cursor"])
+
+        # Turns sharing a timestamp come in id order, so compare as sets per minute
+        assert len(seen) == 23 and set(seen) == {f"question {i}" for i in range(23)}
+        minutes = [int(question.split()[1]) // 3 for question in seen]
+        assert minutes == sorted(minutes, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_page_keeps_turns_together(self, user_context_manager, session_factory):
+        """Test that each turn's question is followed by its answer"""
+        user_id = await create_user_with_history(session_factory, 3)
+
+        page = await user_context_manager.get_conversation_page(user_id, turns=2)
+
+        assert [message["content"] for message in page["messages"]] == [
+            "question 2", "answer 2", "question 1", "answer 1"
+        ]
+        assert page["older_cursor"] is not None
+        assert page["total_count"] == 6
+
+    @pytest.mark.asyncio
+    async def test_newer_messages_after_cursor(self, user_context_manager, session_factory):
+        """Test that after= returns the turns right after a page, newest first"""
+        user_id = await create_user_with_history(session_factory, 10)
+        first = await user_context_manager.get_conversation_page(user_id, turns=3)
+        older = await user_context_manager.get_conversation_page(user_id, turns=3, before=first["older_cursor"])
+
+        newer = await user_context_manager.get_conversation_page(user_id, turns=2, after=older["newer_cursor"])
+
+        assert questions(newer) == ["question 8", "question 7"]
+        assert newer["older_cursor"] is not None
+
+    @pytest.mark.asyncio
+    async def test_polling_with_no_new_messages(self, user_context_manager, session_factory):
+        """Test that polling past the newest turn returns nothing and keeps the cursor"""
+        user_id = await create_user_with_history(session_factory, 2)
+        first = await user_context_manager.get_conversation_page(user_id, turns=5)
+
+        newer = await user_context_manager.get_conversation_page(user_id, after=first["newer_cursor"])
+
+        assert newer["messages"] == []
+        assert newer["newer_cursor"] == first["newer_cursor"]
+        assert first["older_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, user_context_manager):
+        """Test that a made-up cursor is an error rather than an empty page"""
+        with pytest.raises(ValueError):
+            await user_context_manager.get_conversation_page(str(uuid.uuid4()), before="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_history_is_newest_first(self, user_context_manager, session_factory):
+        """Test that get_conversation_history returns the latest messages in order"""
+        user_id = await create_user_with_history(session_factory, 10)
+
+        history = await user_context_manager.get_conversation_history(user_id, limit=3)
+
+        assert [message["content"] for message in history] == ["question 9", "answer 9", "question 8"]
+
+    @pytest.mark.asyncio
+    async def test_history_offset_counts_messages(self, user_context_manager, session_factory):
+        """Test that the deprecated offset skips messages, even part of a turn"""
+        user_id = await create_user_with_history(session_factory, 10)
+
+        history = await user_context_manager.get_conversation_history(user_id, limit=3, offset=3)
+
+        assert [message["content"] for message in history] == ["answer 8", "question 7", "answer 7"]
+        assert await user_context_manager.count_conversation_messages(user_id) == 20
+
+    @pytest.mark.asyncio
+    async def test_history_query_uses_index(self, session_factory):
+        """Test that SQLite serves an older page from the composite index without sorting"""
+        user_id = uuid.UUID(await create_user_with_history(session_factory, 10))
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        async with session_factory() as session:
+            newest = (await DatabaseUtils.get_conversation_history(session, user_id, limit=1))[0]
+            engine = session.bind.sync_engine
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                await DatabaseUtils.get_conversation_history(
+                    session, user_id, limit=5, before=(newest.timestamp, newest.id)
+                )
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+            statement, parameters = statements[-1]
+            connection = await session.connection()
+            rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = " ".join(str(row) for row in rows)
+
+        # Seeks to the cursor rather than reading past the newer conversations
+        assert "idx_conversations_user_id_timestamp (user_id=? AND timestamp<?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_cursor_round_trip(self):
+        """Test that cursors decode to the conversation's key"""
+        conversation = Conversation(id=uuid.uuid4(), timestamp=datetime(2025, 1, 1, 12, 30))
+
+        assert decode_history_cursor(encode_history_cursor(conversation)) == (conversation.timestamp, conversation.id)
+
+
+@pytest.mark.benchmark
+class TestConversationPagingBenchmark:
+    """Compare page time at the start and deep into a long history"""
+
+    ROUNDS = 10
+
+    @pytest.mark.asyncio
+    async def test_deep_page_costs_the_same(self, user_context_manager, session_factory):
+        """Measure the newest page against one 9,000 turns back, and against OFFSET paging"""
+        user_id = await create_user_with_history(session_factory, HISTORY_SIZE)
+        deep = await user_context_manager.get_conversation_page(user_id, turns=9000)
+        deep_cursor = deep["older_cursor"]
+
+        async def offset_page():
+            # Paging by skipping rows, for comparison
+            async with session_factory() as session:
+                result = await session.execute(
+                    select(Conversation)
+                    .where(Conversation.user_id == uuid.UUID(user_id))
+                    .order_by(Conversation.timestamp.desc())
+                    .offset(9000)
+                    .limit(25)
+                )
+                return result.scalars().all()
+
+        async def timed(load):
+            samples = []
+            for _ in range(self.ROUNDS):
+                start = time.perf_counter()
+                await load()
+                samples.append(time.perf_counter() - start)
+            return statistics.median(samples)
+
+        first_page = await timed(lambda: user_context_manager.get_conversation_page(user_id, turns=25))
+        deep_page = await timed(lambda: user_context_manager.get_conversation_page(user_id, turns=25, before=deep_cursor))
+        offset = await timed(offset_page)
+
+        print(
+            f"\nHistory page of 25 turns in {HISTORY_SIZE} conversations: newest {first_page * 1000:.1f} ms, "
+            f"9000 back {deep_page * 1000:.1f} ms (OFFSET: {offset * 1000:.1f} ms)"
+        )
@@ -107,18 +107,20 @@ class TestConversationManager:
             last_active=datetime.now()
         )
     
-    def test_get_conversation_state(self, conversation_manager):
+    @pytest.mark.asyncio
+    async def test_get_conversation_state(self, conversation_manager):
         """Test conversation state management"""
         user_id = "test-user-123"
         
         # First call creates new state
-        state1 = conversation_manager._get_conversation_state(user_id)
+        state1 = await conversation_manager._get_conversation_state(user_id)
         assert isinstance(state1, ConversationState)
         assert state1.user_id == user_id
         assert state1.message_count == 1
+        await conversation_manager._save_conversation_state(state1)
         
         # Second call returns same state
-        state2 = conversation_manager._get_conversation_state(user_id)
+        state2 = await conversation_manager._get_conversation_state(user_id)
         assert state2 is state1
         assert state2.message_count == 2
     
@@ -236,7 +238,7 @@ class TestConversationManager:
         assert len(assessment.questions) > 0
         
         # Check conversation state
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assert state.active_assessment is assessment
         assert state.current_context == "assessment"
     
@@ -318,6 +320,17 @@ class TestConversationManager:
         assert messages[1].content == "Hi there!"
         assert messages[1].message_type == MessageType.ASSISTANT
     
+    @pytest.mark.asyncio
+    async def test_conversation_page_rejects_odd_limit(self, conversation_manager):
+        """Test that a page limit splitting a turn is an error rather than rounded"""
+        conversation_manager.user_context_manager.get_conversation_page = AsyncMock()
+        
+        for limit in (1, 25):
+            with pytest.raises(ValueError):
+                await conversation_manager.get_conversation_page("test-user-123", limit)
+        
+        conversation_manager.user_context_manager.get_conversation_page.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_handle_assessment_flow(self, conversation_manager, sample_user_context):
         """Test complete assessment flow"""
@@ -336,7 +349,7 @@ class TestConversationManager:
         assert "assess" in response.message.lower()
         
         # Check that assessment was started
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assert state.is_in_assessment()
         assert state.active_assessment is not None
     
@@ -486,7 +499,8 @@ class TestConversationManager:
         user_id = "test-user-123"
         
         # Create conversation state
-        state = conversation_manager._get_conversation_state(user_id)
+        state = await conversation_manager._get_conversation_state(user_id)
+        await conversation_manager._save_conversation_state(state)
         assert user_id in conversation_manager._conversation_states
         
         # Simulate assessment flow
@@ -0,0 +1,158 @@
+"""
+Unit tests for conversation state stores
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from edagent.config.settings import get_settings
+from edagent.models.conversation import AssessmentSession
+from edagent.models.user_context import UserContext
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.conversation_state_store import (
+    ConversationState,
+    InMemoryConversationStateStore,
+    RedisConversationStateStore,
+    create_conversation_state_store
+)
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis.asyncio calls the store uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def make_state(user_id, idle_seconds=0):
+    """Create a state last active idle_seconds ago"""
+    state = ConversationState(user_id)
+    state.last_activity = datetime.now() - timedelta(seconds=idle_seconds)
+    return state
+
+
+class TestInMemoryConversationStateStore:
+    """Test cases for InMemoryConversationStateStore"""
+
+    @pytest.mark.asyncio
+    async def test_idle_states_expire(self):
+        """Test that a state idle for longer than the TTL is dropped"""
+        store = InMemoryConversationStateStore(ttl_seconds=60)
+        await store.save(make_state("user-1"))
+        (await store.get("user-1")).last_activity -= timedelta(seconds=61)
+
+        assert await store.get("user-1") is None
+        assert "user-1" not in store
+
+    @pytest.mark.asyncio
+    async def test_least_recently_active_evicted(self):
+        """Test that the store holds at most max_entries states"""
+        store = InMemoryConversationStateStore(max_entries=2)
+        for user_id in ("user-1", "user-2", "user-3"):
+            await store.save(make_state(user_id))
+
+        assert len(store) == 2
+        assert "user-1" not in store
+
+    @pytest.mark.asyncio
+    async def test_saving_sweeps_expired_states(self):
+        """Test that idle states are removed without being looked up again"""
+        store = InMemoryConversationStateStore(ttl_seconds=60)
+        await store.save(make_state("idle-user", idle_seconds=120))
+        await store.save(make_state("active-user"))
+
+        assert "idle-user" not in store
+        assert len(store) == 1
+
+
+class TestRedisConversationStateStore:
+    """Test cases for RedisConversationStateStore"""
+
+    @pytest.mark.asyncio
+    async def test_assessment_round_trip(self):
+        """Test that an in-progress assessment survives serialization"""
+        redis = FakeRedis()
+        store = RedisConversationStateStore(redis, ttl_seconds=900, key_prefix="state:")
+        state = make_state("user-1")
+        state.current_context = "assessment"
+        state.active_assessment = AssessmentSession(user_id="user-1", skill_area="Python")
+        state.active_assessment.add_question("What have you built with Python?")
+        state.active_assessment.add_response("A small web scraper")
+
+        await store.save(state)
+        loaded = await store.get("user-1")
+
+        assert loaded is not state
+        assert loaded.is_in_assessment()
+        assert loaded.active_assessment.responses[0]["response"] == "A small web scraper"
+        assert loaded.active_assessment.current_question_index == 1
+        assert redis.ttls["state:user-1"] == 900
+
+    @pytest.mark.asyncio
+    async def test_learning_path_request_round_trip(self):
+        """Test that a pending learning path request survives serialization"""
+        store = RedisConversationStateStore(FakeRedis())
+        state = make_state("user-1")
+        state.current_context = "learning_path"
+        state.pending_learning_path = "pending"
+
+        await store.save(state)
+
+        assert (await store.get("user-1")).is_creating_learning_path()
+
+    @pytest.mark.asyncio
+    async def test_unreadable_state_discarded(self):
+        """Test that a corrupt entry reads as no state instead of failing the message"""
+        redis = FakeRedis()
+        redis.values["edagent:conversation_state:user-1"] = "{not json"
+
+        assert await RedisConversationStateStore(redis).get("user-1") is None
+
+    def test_redis_without_url_falls_back_to_memory(self):
+        """Test that the factory uses memory when Redis is selected but not configured"""
+        settings = get_settings().model_copy()
+        settings.conversation_state_backend = "redis"
+        settings.redis_url = None
+
+        assert isinstance(create_conversation_state_store(settings), InMemoryConversationStateStore)
+
+
+class TestSharedConversationState:
+    """Test cases for multi-turn flows across worker processes"""
+
+    def make_manager(self, store):
+        """Create a ConversationManager, as in one worker, using a shared store"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            manager = ConversationManager()
+        manager.user_context_manager.get_user_context = AsyncMock(return_value=UserContext(user_id="user-1"))
+        manager.user_context_manager.add_conversation = AsyncMock()
+        manager.summarizer.record_turn = lambda user_id: None
+        manager._conversation_states = store
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_assessment_continues_on_another_worker(self):
+        """Test that an assessment started on one worker is answered on another"""
+        store = RedisConversationStateStore(FakeRedis())
+        first_worker = self.make_manager(store)
+        second_worker = self.make_manager(store)
+
+        await first_worker.handle_message("user-1", "Can you assess my skills?")
+        response = await second_worker.handle_message("user-1", "I have been coding in Python for a year")
+
+        assert response.response_type == "assessment"
+        state = await store.get("user-1")
+        assert state.active_assessment.responses[0]["response"] == "I have been coding in Python for a year"
+        assert state.message_count == 2
@@ -0,0 +1,282 @@
+"""
+Unit tests for rolling conversation summaries
+"""
+
+import pytest
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from edagent.config.settings import get_settings
+from edagent.models.user_context import UserContext
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.conversation_summarizer import ConversationSummarizer, RECENT_HISTORY_TURNS
+from edagent.services.deadlines import deadline_scope, remaining_time
+from edagent.services.fake_gemini import render_fake_response
+from edagent.services.prompt_engineering import PromptBuilder
+from edagent.services.token_budget import PromptBudget, estimate_tokens
+
+
+def make_turns(count, start=None):
+    """Create stored conversation turns, oldest first"""
+    start = start or datetime(2026, 1, 1)
+    return [
+        {
+            "message": f"question {i} about SQL joins",
+            "response": f"answer {i} " + "explanation " * 20,
+            "timestamp": start + timedelta(minutes=i)
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def settings():
+    """Create settings with a short summary interval"""
+    settings = get_settings().model_copy()
+    settings.conversation_summary_enabled = True
+    settings.conversation_summary_interval_turns = 3
+    settings.conversation_summary_max_turns = 20
+    return settings
+
+
+@pytest.fixture
+def ai_service():
+    """Create an AI service mock with a real prompt builder"""
+    service = Mock()
+    service.prompt_builder = PromptBuilder(PromptBudget(summary_tokens=100))
+    service._make_api_call = AsyncMock(return_value="  The user is learning SQL joins.  ")
+    return service
+
+
+@pytest.fixture
+def user_context_manager():
+    """Create a user context manager mock with an empty summary"""
+    manager = Mock()
+    manager.get_conversation_summary = AsyncMock(return_value={"summary": None, "summarized_through": None})
+    manager.get_conversations_since = AsyncMock(return_value=make_turns(3))
+    manager.save_conversation_summary = AsyncMock()
+    return manager
+
+
+class TestConversationSummarizer:
+    """Test cases for ConversationSummarizer"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_runs_every_interval(self, settings, ai_service, user_context_manager):
+        """Test that a refresh starts only once enough turns are recorded"""
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        assert summarizer.record_turn("user-1") is None
+        assert summarizer.record_turn("user-1") is None
+        task = summarizer.record_turn("user-1")
+        assert task is not None
+        await task
+
+        user_context_manager.save_conversation_summary.assert_awaited_once_with(
+            "user-1", "The user is learning SQL joins.", make_turns(3)[-1]["timestamp"]
+        )
+        assert summarizer.record_turn("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_one_refresh_per_user_at_a_time(self, settings, ai_service, user_context_manager):
+        """Test that turns recorded during a refresh wait for the next one"""
+        release = asyncio.Event()
+
+        async def slow_call(*args, **kwargs):
+            await release.wait()
+            return "summary"
+
+        ai_service._make_api_call = slow_call
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        for _ in range(3):
+            task = summarizer.record_turn("user-1")
+        for _ in range(3):
+            assert summarizer.record_turn("user-1") is None
+
+        release.set()
+        await task
+        assert summarizer.record_turn("user-1") is not None
+
+    @pytest.mark.asyncio
+    async def test_turn_counts_are_bounded(self, settings, ai_service, user_context_manager):
+        """Test that counts are dropped once a refresh starts and kept for few users"""
+        settings.conversation_state_max_entries = 2
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        for _ in range(3):
+            task = summarizer.record_turn("user-1")
+        await task
+        assert "user-1" not in summarizer._pending_turns
+
+        for user_id in ("user-2", "user-3", "user-4"):
+            summarizer.record_turn(user_id)
+        assert list(summarizer._pending_turns) == ["user-3", "user-4"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_folds_in_previous_summary(self, settings, ai_service, user_context_manager):
+        """Test that only turns after the stored summary are summarized"""
+        summarized_through = datetime(2025, 12, 31)
+        user_context_manager.get_conversation_summary.return_value = {
+            "summary": "The user wants to become a data engineer.",
+            "summarized_through": summarized_through
+        }
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        await summarizer.refresh("user-1")
+
+        user_context_manager.get_conversations_since.assert_awaited_once_with(
+            "user-1", summarized_through, 20, exclude_newest=RECENT_HISTORY_TURNS
+        )
+        prompt = ai_service._make_api_call.call_args.args[1]
+        assert "The user wants to become a data engineer." in prompt
+        assert "User: question 0 about SQL joins" in prompt
+        assert ai_service._make_api_call.call_args.kwargs["operation"] == "conversation_summary"
+
+    @pytest.mark.asyncio
+    async def test_refresh_without_new_turns_skips_ai_call(self, settings, ai_service, user_context_manager):
+        """Test that an up-to-date summary is returned as-is"""
+        user_context_manager.get_conversation_summary.return_value = {
+            "summary": "Existing summary", "summarized_through": datetime(2026, 1, 1)
+        }
+        user_context_manager.get_conversations_since.return_value = []
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        assert await summarizer.refresh("user-1") == "Existing summary"
+        ai_service._make_api_call.assert_not_called()
+        user_context_manager.save_conversation_summary.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_summary_capped_to_budget(self, settings, ai_service, user_context_manager):
+        """Test that an overlong model response is cut to the summary budget"""
+        ai_service._make_api_call.return_value = "fact " * 1000
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        summary = await summarizer.refresh("user-1")
+
+        assert estimate_tokens(summary) <= 100
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_ignores_request_deadline(self, settings, ai_service, user_context_manager):
+        """Test that background refreshes do not inherit the request's deadline"""
+        seen = []
+
+        async def record_deadline(*args, **kwargs):
+            seen.append(remaining_time())
+            return "summary"
+
+        ai_service._make_api_call = record_deadline
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        with deadline_scope(5.0):
+            for _ in range(3):
+                task = summarizer.record_turn("user-1")
+        await task
+
+        assert seen == [None]
+
+    @pytest.mark.asyncio
+    async def test_background_failures_are_contained(self, settings, ai_service, user_context_manager):
+        """Test that a failed refresh is logged and counted, not raised"""
+        ai_service._make_api_call.side_effect = RuntimeError("boom")
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        with patch("edagent.api.metrics.track_conversation_summary_update") as mock_track:
+            for _ in range(3):
+                task = summarizer.record_turn("user-1")
+            await task
+
+        mock_track.assert_called_once_with("error")
+        user_context_manager.save_conversation_summary.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, settings, ai_service, user_context_manager):
+        """Test that no refresh runs when summaries are disabled"""
+        settings.conversation_summary_enabled = False
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+
+        assert all(summarizer.record_turn("user-1") is None for _ in range(10))
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_slow_refreshes(self, settings, ai_service, user_context_manager):
+        """Test that shutdown does not wait forever for a refresh"""
+        async def hang(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        ai_service._make_api_call = hang
+        summarizer = ConversationSummarizer(ai_service, user_context_manager, settings)
+        for _ in range(3):
+            task = summarizer.record_turn("user-1")
+
+        await summarizer.close(timeout=0.01)
+
+        assert task.cancelled()
+
+
+class TestConversationManagerSummaries:
+    """Test cases for summary refreshes driven by ConversationManager"""
+
+    @pytest.mark.asyncio
+    async def test_handled_turn_is_saved_and_counted(self):
+        """Test that every answered message is saved and reaches the summarizer"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            manager = ConversationManager()
+        context = UserContext(user_id="summary-user")
+        manager.user_context_manager.get_user_context = AsyncMock(return_value=context)
+        manager.user_context_manager.add_conversation = AsyncMock()
+        manager.ai_service.generate_response = AsyncMock(return_value="Happy to help!")
+        manager.summarizer.record_turn = Mock()
+
+        await manager.handle_message("summary-user", "Hello there")
+
+        manager.user_context_manager.add_conversation.assert_awaited_once()
+        assert manager.user_context_manager.add_conversation.call_args.kwargs["user_message"] == "Hello there"
+        manager.summarizer.record_turn.assert_called_once_with("summary-user")
+
+
+class TestSummaryPrompts:
+    """Test cases for summary handling in PromptBuilder"""
+
+    def test_conversation_prompt_includes_summary(self):
+        """Test that the summary is placed before the recent history"""
+        context = UserContext(
+            user_id="summary-user",
+            conversation_history=["How do joins work?", "Joins combine rows..."],
+            conversation_summary="The user is a beginner learning SQL."
+        )
+        prompt = PromptBuilder().build_conversation_prompt("What about indexes?", context)
+
+        assert "Summary of earlier conversation:\nThe user is a beginner learning SQL." in prompt
+        assert prompt.index("Summary of earlier conversation") < prompt.index("Recent conversation context")
+
+    def test_full_size_summary_is_kept(self):
+        """Test that a summary filling its budget is cut, not dropped, to make room for the header"""
+        context = UserContext(user_id="summary-user", conversation_summary="fact " * 80)
+        prompt = PromptBuilder(PromptBudget(summary_tokens=100)).build_conversation_prompt("hi", context)
+
+        assert "Summary of earlier conversation:\nfact fact" in prompt
+
+    def test_history_prompt_size_is_bounded(self):
+        """Test that prompts stay the same size however long the summary and history grow"""
+        budget = PromptBudget(summary_tokens=100, history_tokens=300)
+        sizes = []
+        for length in (10, 100, 1000):
+            context = UserContext(
+                user_id="summary-user",
+                conversation_history=["turn " * length] * 5,
+                conversation_summary="fact " * length
+            )
+            sizes.append(estimate_tokens(PromptBuilder(budget).build_conversation_prompt("hi", context)))
+
+        assert sizes[1] == pytest.approx(sizes[2], abs=5)
+
+    def test_summary_prompt_with_fake_backend(self):
+        """Test that the offline stand-in answers summary prompts within the word limit"""
+        builder = PromptBuilder(PromptBudget(summary_tokens=40))
+        prompt = builder.build_conversation_summary_prompt("The user wants a data job.", make_turns(3))
+
+        summary = render_fake_response(prompt)
+
+        assert "question 2 about SQL joins" in summary
+        assert len(summary.split()) <= 30
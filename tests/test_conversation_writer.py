@@ -0,0 +1,263 @@
+"""
+Unit tests for write-behind persistence of conversation turns
+"""
+
+import pytest
+import pytest_asyncio
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import Mock, patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.config.settings import get_settings
+from edagent.database.models import Base, Conversation, User
+from edagent.database.utils import DatabaseUtils
+from edagent.services.conversation_writer import ConversationWriter
+from edagent.services.response_cache import InMemoryResponseCache
+from edagent.services.user_context_cache import UserContextCache
+from edagent.services.user_context_manager import UserContextManager
+
+
+@pytest.fixture
+def settings():
+    """Create settings with small batches and fast retries"""
+    settings = get_settings().model_copy()
+    settings.conversation_write_behind_enabled = True
+    settings.conversation_write_batch_size = 3
+    settings.conversation_write_flush_interval_seconds = 0.05
+    settings.conversation_write_max_retries = 2
+    settings.conversation_write_retry_backoff_seconds = 0.0
+    return settings
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def get_session(session_factory):
+    """Create a session context manager that commits like db_manager.get_session"""
+    sessions = []
+
+    @asynccontextmanager
+    async def get_session(readonly=False):
+        sessions.append(1)
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    get_session.sessions = sessions
+    return get_session
+
+
+async def create_user(factory):
+    """Create a user without history"""
+    user_id = uuid.uuid4()
+    async with factory() as session:
+        session.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x", preferences={}))
+        await session.commit()
+    return str(user_id)
+
+
+async def saved_messages(factory, user_id):
+    """Get a user's saved messages, oldest first"""
+    async with factory() as session:
+        result = await session.execute(
+            select(Conversation.message)
+            .where(Conversation.user_id == uuid.UUID(user_id))
+            .order_by(Conversation.timestamp)
+        )
+        return list(result.scalars())
+
+
+class TestConversationWriter:
+    """Test cases for ConversationWriter"""
+
+    @pytest.mark.asyncio
+    async def test_turns_saved_in_batches(self, settings, session_factory, get_session):
+        """Test that queued turns are saved in order with one transaction per batch"""
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=get_session)
+
+        for i in range(3):
+            await writer.submit(user_id, f"question {i}", f"answer {i}")
+        await writer.flush()
+
+        assert await saved_messages(session_factory, user_id) == ["question 0", "question 1", "question 2"]
+        assert len(get_session.sessions) == 1
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_database(self, settings, session_factory):
+        """Test that submit returns while the insert is still in progress"""
+        release = asyncio.Event()
+
+        @asynccontextmanager
+        async def slow_session():
+            await release.wait()
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=slow_session)
+
+        await asyncio.wait_for(writer.submit(user_id, "question", "answer"), timeout=1)
+        assert await saved_messages(session_factory, user_id) == []
+
+        release.set()
+        await writer.flush(user_id)
+        assert await saved_messages(session_factory, user_id) == ["question"]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_waits_for_interval(self, settings, session_factory, get_session):
+        """Test that a lone turn is saved once the flush interval passes"""
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=get_session)
+
+        await writer.submit(user_id, "question", "answer")
+        await asyncio.sleep(0.2)
+
+        assert await saved_messages(session_factory, user_id) == ["question"]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self, settings, session_factory, get_session):
+        """Test that a transient failure is retried and counted"""
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=get_session)
+        real_insert = DatabaseUtils.add_conversations
+        calls = []
+
+        async def flaky_insert(session, rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise ConnectionError("database restarting")
+            await real_insert(session, rows)
+
+        with patch.object(DatabaseUtils, "add_conversations", flaky_insert), \
+             patch("edagent.api.metrics.track_conversation_write_batch") as mock_track:
+            await writer.submit(user_id, "question", "answer")
+            await writer.flush()
+
+        assert calls == [1, 1]
+        mock_track.assert_called_once_with(1, 1)
+        assert await saved_messages(session_factory, user_id) == ["question"]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_bad_row_is_dead_lettered(self, settings, session_factory, get_session):
+        """Test that a row that cannot be saved does not take the rest of its batch down"""
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=get_session)
+        real_insert = DatabaseUtils.add_conversations
+
+        async def reject_bad_rows(session, rows):
+            if any(row["message"] == "bad" for row in rows):
+                raise ValueError("constraint violated")
+            await real_insert(session, rows)
+
+        with patch.object(DatabaseUtils, "add_conversations", reject_bad_rows), \
+             patch("edagent.api.metrics.track_conversation_writes") as mock_track:
+            for message in ("good 1", "bad", "good 2"):
+                await writer.submit(user_id, message, "answer")
+            await writer.flush()
+
+        assert await saved_messages(session_factory, user_id) == ["good 1", "good 2"]
+        assert [row["message"] for row in writer.dead_letters] == ["bad"]
+        mock_track.assert_any_call("dead_lettered", 1)
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_close_drains_queue(self, settings, session_factory, get_session):
+        """Test that shutdown saves every queued turn"""
+        settings.conversation_write_flush_interval_seconds = 60
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=get_session)
+
+        for i in range(5):
+            await writer.submit(user_id, f"question {i}", "answer")
+        await writer.close()
+
+        assert len(await saved_messages(session_factory, user_id)) == 5
+        assert writer._worker is None
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self, settings, session_factory):
+        """Test that submit waits for room instead of dropping turns"""
+        settings.conversation_write_queue_size = 1
+        settings.conversation_write_batch_size = 1
+        release = asyncio.Event()
+
+        @asynccontextmanager
+        async def blocked_session():
+            await release.wait()
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        user_id = await create_user(session_factory)
+        writer = ConversationWriter(settings, session_factory=blocked_session)
+        await writer.submit(user_id, "question 0", "answer")
+        await asyncio.sleep(0.01)  # the worker takes turn 0 and blocks on the database
+        await writer.submit(user_id, "question 1", "answer")
+
+        third = asyncio.ensure_future(writer.submit(user_id, "question 2", "answer"))
+        await asyncio.sleep(0.05)
+        assert not third.done()
+
+        release.set()
+        await third
+        await writer.close()
+        assert len(await saved_messages(session_factory, user_id)) == 3
+
+
+class TestUserContextManagerWriteBehind:
+    """Test cases for conversation turns saved through UserContextManager"""
+
+    @pytest.fixture
+    def user_context_manager(self, settings, get_session):
+        """Create a UserContextManager saving turns through its own writer"""
+        db_manager = Mock()
+        db_manager.get_session = get_session
+        with patch("edagent.services.user_context_manager.db_manager", db_manager):
+            manager = UserContextManager()
+            manager.context_cache = UserContextCache(InMemoryResponseCache(), enabled=False)
+            manager.conversation_writer = ConversationWriter(settings, session_factory=get_session)
+            yield manager
+
+    @pytest.mark.asyncio
+    async def test_history_includes_queued_turns(self, user_context_manager, session_factory):
+        """Test that readers see a turn that was queued but not yet saved"""
+        user_context_manager.conversation_writer.flush_interval = 60
+        user_id = await create_user(session_factory)
+
+        await user_context_manager.add_conversation(user_id, "What is a join?", "A join combines tables.")
+
+        context = await user_context_manager.get_user_context(user_id)
+        assert context.conversation_history == ["What is a join?", "A join combines tables."]
+        history = await user_context_manager.get_conversation_history(user_id)
+        assert [message["content"] for message in history] == ["What is a join?", "A join combines tables."]
+        await user_context_manager.conversation_writer.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_saves_before_returning(self, settings, user_context_manager, session_factory):
+        """Test that with write-behind off turns are saved on the request path"""
+        settings.conversation_write_behind_enabled = False
+        user_context_manager.conversation_writer = ConversationWriter(settings)
+        user_id = await create_user(session_factory)
+
+        await user_context_manager.add_conversation(user_id, "question", "answer")
+
+        assert await saved_messages(session_factory, user_id) == ["question"]
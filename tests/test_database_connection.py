@@ -0,0 +1,278 @@
+"""
+Unit tests for DatabaseManager's SQLite configuration and read replica routing
+"""
+
+import asyncio
+import sqlite3
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from edagent.config.settings import get_settings
+from edagent.database.connection import DatabaseManager, get_database_info, mark_recent_write
+
+
+def make_manager(database_url, **overrides):
+    """Create a DatabaseManager with its own copy of the settings"""
+    manager = DatabaseManager()
+    manager.settings = get_settings().model_copy()
+    manager.settings.database_url = database_url
+    manager.settings.api_debug = False
+    for name, value in overrides.items():
+        setattr(manager.settings, name, value)
+    return manager
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    """Create a manager for a SQLite file database with a table to read and write"""
+    manager = make_manager(f"sqlite:///{tmp_path / 'test.db'}", sqlite_reader_pool_size=4)
+    async with manager.get_session() as session:
+        await session.execute(text("CREATE TABLE turns (id INTEGER PRIMARY KEY, message TEXT)"))
+    yield manager
+    await manager.close()
+
+
+async def pragma(session, name):
+    return (await session.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+class TestSQLiteFileDatabase:
+    """Test cases for WAL-mode SQLite file databases"""
+
+    @pytest.mark.asyncio
+    async def test_connections_tuned(self, manager):
+        """Test that writer and reader connections get the WAL pragmas"""
+        for readonly in (False, True):
+            async with manager.get_session(readonly=readonly) as session:
+                assert await pragma(session, "journal_mode") == "wal"
+                assert await pragma(session, "synchronous") == 1
+                assert await pragma(session, "foreign_keys") == 1
+                assert await pragma(session, "busy_timeout") == 30000
+                assert await pragma(session, "cache_size") == -64 * 1024
+                assert await pragma(session, "query_only") == int(readonly)
+
+    @pytest.mark.asyncio
+    async def test_readonly_session_refuses_writes(self, manager):
+        """Test that a read-only session cannot change the database"""
+        with pytest.raises(OperationalError):
+            async with manager.get_session(readonly=True) as session:
+                await session.execute(text("INSERT INTO turns (message) VALUES ('hello')"))
+
+    @pytest.mark.asyncio
+    async def test_reads_see_committed_writes(self, manager):
+        """Test that a read started after a commit sees it"""
+        async with manager.get_session() as session:
+            await session.execute(text("INSERT INTO turns (message) VALUES ('hello')"))
+
+        async with manager.get_session(readonly=True) as session:
+            assert (await session.execute(text("SELECT message FROM turns"))).scalar() == "hello"
+
+    @pytest.mark.asyncio
+    async def test_reads_run_alongside_a_write(self, manager):
+        """Test that readers are not blocked by an open write transaction or by each other"""
+        write_started = asyncio.Event()
+        all_reading = asyncio.Event()
+        reads_done = asyncio.Event()
+        reading = []
+
+        async def open_write():
+            async with manager.get_session() as session:
+                await session.execute(text("INSERT INTO turns (message) VALUES ('pending')"))
+                write_started.set()
+                # The write stays open until every reader is done, so blocked readers time out
+                await asyncio.wait_for(reads_done.wait(), timeout=5)
+
+        async def read():
+            await write_started.wait()
+            async with manager.get_session(readonly=True) as session:
+                count = (await session.execute(text("SELECT COUNT(*) FROM turns"))).scalar()
+                reading.append(count)
+                if len(reading) == 4:
+                    all_reading.set()
+                await asyncio.wait_for(all_reading.wait(), timeout=5)
+                return count
+
+        async def readers():
+            try:
+                return await asyncio.gather(*(read() for _ in range(4)))
+            finally:
+                reads_done.set()
+
+        _, counts = await asyncio.gather(open_write(), readers())
+
+        # Readers see the data from before the uncommitted write, without waiting for it
+        assert counts == [0, 0, 0, 0]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_all_saved(self, manager):
+        """Test that writes queue for the single writer connection instead of failing"""
+        async def write(i):
+            async with manager.get_session() as session:
+                await session.execute(text("SELECT COUNT(*) FROM turns"))
+                await session.execute(text("INSERT INTO turns (message) VALUES (:m)"), {"m": f"turn {i}"})
+
+        await asyncio.gather(*(write(i) for i in range(50)))
+
+        async with manager.get_session(readonly=True) as session:
+            assert (await session.execute(text("SELECT COUNT(*) FROM turns"))).scalar() == 50
+
+    @pytest.mark.asyncio
+    async def test_failed_write_rolled_back(self, manager):
+        """Test that an exception rolls back the writer's transaction and frees the connection"""
+        with pytest.raises(RuntimeError):
+            async with manager.get_session() as session:
+                await session.execute(text("INSERT INTO turns (message) VALUES ('lost')"))
+                raise RuntimeError("request failed")
+
+        async with manager.get_session() as session:
+            assert (await session.execute(text("SELECT COUNT(*) FROM turns"))).scalar() == 0
+
+
+class TestSQLiteFallbacks:
+    """Test cases for SQLite databases without a read pool"""
+
+    @pytest.mark.asyncio
+    async def test_memory_database_shares_one_connection(self):
+        """Test that readonly sessions on an in-memory database see the writer's tables"""
+        manager = make_manager("sqlite:///:memory:")
+        try:
+            async with manager.get_session() as session:
+                await session.execute(text("CREATE TABLE turns (id INTEGER PRIMARY KEY)"))
+                await session.execute(text("INSERT INTO turns DEFAULT VALUES"))
+
+            async with manager.get_session(readonly=True) as session:
+                assert (await session.execute(text("SELECT COUNT(*) FROM turns"))).scalar() == 1
+                assert await pragma(session, "foreign_keys") == 1
+            assert list(manager.pool_info()) == ["primary"]
+        finally:
+            await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_wal_can_be_disabled(self, tmp_path):
+        """Test that SQLITE_WAL_ENABLED=false keeps the single shared connection"""
+        manager = make_manager(f"sqlite:///{tmp_path / 'test.db'}", sqlite_wal_enabled=False)
+        try:
+            async with manager.get_session(readonly=True) as session:
+                assert await pragma(session, "journal_mode") == "delete"
+            assert list(manager.pool_info()) == ["primary"]
+        finally:
+            await manager.close()
+
+
+def make_database(path, message):
+    """Create a SQLite file holding one turn, standing in for a primary or a replica"""
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE turns (id INTEGER PRIMARY KEY, message TEXT)")
+    connection.execute("INSERT INTO turns (message) VALUES (?)", (message,))
+    connection.commit()
+    connection.close()
+
+
+async def read_message(manager):
+    """Read the newest turn in a read-only session"""
+    async with manager.get_session(readonly=True) as session:
+        return (await session.execute(text("SELECT message FROM turns ORDER BY id DESC"))).scalar()
+
+
+@pytest_asyncio.fixture
+async def replicated(tmp_path):
+    """Create a manager with a primary and two replicas, each file telling which one was read"""
+    urls = []
+    for name in ("primary", "replica-1", "replica-2"):
+        make_database(tmp_path / f"{name}.db", name)
+        urls.append(f"sqlite:///{tmp_path / f'{name}.db'}")
+
+    manager = make_manager(
+        urls[0],
+        database_replica_urls=",".join(urls[1:]),
+        database_read_your_writes_seconds=0.2
+    )
+    yield manager
+    await manager.close()
+
+
+class TestReadReplicas:
+    """Test cases for routing read-only sessions to read replicas"""
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replicas_in_turn(self, replicated):
+        """Test that read-only sessions alternate between the replicas and writes use the primary"""
+        reads = [await read_message(replicated) for _ in range(4)]
+
+        assert reads == ["replica-1", "replica-2", "replica-1", "replica-2"]
+        async with replicated.get_session() as session:
+            assert (await session.execute(text("SELECT message FROM turns"))).scalar() == "primary"
+
+    @pytest.mark.asyncio
+    async def test_reads_follow_own_write_to_primary(self, replicated):
+        """Test that reads after a write go to the primary until the window passes"""
+        async with replicated.get_session() as session:
+            await session.execute(text("INSERT INTO turns (message) VALUES ('new turn')"))
+
+        assert await read_message(replicated) == "new turn"
+
+        await asyncio.sleep(0.25)
+        assert await read_message(replicated) == "replica-1"
+
+    @pytest.mark.asyncio
+    async def test_other_requests_keep_using_replicas(self, replicated):
+        """Test that one request's write does not send other requests' reads to the primary"""
+        async def write():
+            async with replicated.get_session() as session:
+                await session.execute(text("INSERT INTO turns (message) VALUES ('new turn')"))
+
+        await asyncio.create_task(write())
+
+        assert await read_message(replicated) == "replica-1"
+
+    @pytest.mark.asyncio
+    async def test_reads_without_writes_use_replicas(self, replicated):
+        """Test that a read-only use of a primary session does not count as a write"""
+        async with replicated.get_session() as session:
+            await session.execute(text("SELECT COUNT(*) FROM turns"))
+
+        assert await read_message(replicated) == "replica-1"
+
+    @pytest.mark.asyncio
+    async def test_marked_write_reads_from_primary(self, replicated):
+        """Test that mark_recent_write sends reads to the primary, e.g. after a background write"""
+        await replicated.initialize()
+        mark_recent_write()
+
+        assert await read_message(replicated) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes_can_be_disabled(self, replicated):
+        """Test that a zero window sends every read to the replicas"""
+        replicated.settings.database_read_your_writes_seconds = 0
+        async with replicated.get_session() as session:
+            await session.execute(text("INSERT INTO turns (message) VALUES ('new turn')"))
+
+        assert await read_message(replicated) == "replica-1"
+
+    @pytest.mark.asyncio
+    async def test_replicas_replace_local_read_pool(self, replicated):
+        """Test that pool info lists the primary and each replica with its session count"""
+        for _ in range(3):
+            await read_message(replicated)
+
+        pools = replicated.pool_info()
+        assert list(pools) == ["primary", "replica-1", "replica-2"]
+        assert pools["replica-1"]["sessions"] == 2
+        assert pools["replica-2"]["sessions"] == 1
+        assert pools["replica-1"]["pool_size"] == replicated.settings.sqlite_reader_pool_size
+
+    @pytest.mark.asyncio
+    async def test_database_info_reports_every_pool(self, replicated, monkeypatch):
+        """Test that get_database_info includes per-pool counts"""
+        monkeypatch.setattr("edagent.database.connection.db_manager", replicated)
+        await read_message(replicated)
+
+        info = await get_database_info()
+
+        assert info["status"] == "connected"
+        assert info["pool_size"] == 1
+        assert set(info["pools"]) == {"primary", "replica-1", "replica-2"}
+        assert info["pools"]["replica-1"]["sessions"] == 1
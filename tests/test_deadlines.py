@@ -0,0 +1,228 @@
+"""
+Unit tests for request deadlines, hedged requests and model fallback
+"""
+
+import pytest
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+from tenacity import RetryError
+
+from edagent.services.ai_service import GeminiAIService, DeadlineExceededError
+from edagent.services.deadlines import deadline_scope, current_deadline, remaining_time
+from edagent.services.hedging import LatencyTracker, run_hedged
+
+
+class TestDeadlineScope:
+    """Test cases for deadline propagation"""
+
+    def test_no_deadline_by_default(self):
+        """Test that code outside a scope has no deadline"""
+        assert current_deadline() is None
+        assert remaining_time() is None
+
+    def test_scope_sets_and_restores_deadline(self):
+        """Test that the deadline is visible inside the scope only"""
+        with deadline_scope(5.0):
+            assert 4.9 < remaining_time() <= 5.0
+        assert current_deadline() is None
+
+    def test_tighter_outer_deadline_wins(self):
+        """Test that a nested scope cannot extend its parent's deadline"""
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(10.0) as inner:
+                assert inner is outer
+            with deadline_scope(0.5):
+                assert remaining_time() <= 0.5
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_deadline(self):
+        """Test that tasks created inside the scope see the same deadline"""
+        with deadline_scope(3.0) as deadline:
+            child = await asyncio.create_task(self._read_deadline())
+        assert child is deadline
+
+    async def _read_deadline(self):
+        return current_deadline()
+
+
+class TestLatencyTracker:
+    """Test cases for rolling latency percentiles"""
+
+    def test_percentile_needs_min_samples(self):
+        """Test that no percentile is reported before enough samples"""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.observe("model", 1.0)
+        assert tracker.percentile("model", 95) is None
+
+    def test_p95(self):
+        """Test the 95th percentile over the window"""
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for value in range(100):
+            tracker.observe("model", value / 100)
+        assert tracker.percentile("model", 95) == 0.95
+
+
+class TestRunHedged:
+    """Test cases for hedged execution"""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self):
+        """Test that no second attempt is sent when the first is fast"""
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "primary"
+
+        assert await run_hedged(call, hedge_delay=0.5) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """Test that a slow primary is overtaken and cancelled"""
+        delays = iter([1.0, 0.01])
+        cancelled = asyncio.Event()
+        winners = []
+
+        async def call():
+            delay = next(delays)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return delay
+
+        result = await run_hedged(call, hedge_delay=0.02, on_complete=winners.append)
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert result == 0.01
+        assert winners == [True]
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_falls_back_to_other(self):
+        """Test that one failing attempt does not fail the request"""
+        attempts = iter(["slow-fail", "ok"])
+
+        async def call():
+            kind = next(attempts)
+            if kind == "slow-fail":
+                await asyncio.sleep(0.05)
+                raise ConnectionError("reset")
+            await asyncio.sleep(0.1)
+            return kind
+
+        assert await run_hedged(call, hedge_delay=0.01) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_both_attempts_fail(self):
+        """Test that the first error is raised when every attempt fails"""
+        async def call():
+            await asyncio.sleep(0.02)
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            await run_hedged(call, hedge_delay=0.01)
+
+
+class TestGeminiAIServiceDeadlines:
+    """Test cases for deadline handling in GeminiAIService"""
+
+    @pytest.fixture
+    def ai_service(self):
+        """Create AI service instance with the response cache disabled"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            service = GeminiAIService()
+        service.response_cache.enabled = False
+        return service
+
+    def _model(self, name, text="ok"):
+        model = Mock()
+        model.model_name = f"models/{name}"
+        model.generate_content.return_value = Mock(text=text)
+        return model
+
+    @pytest.mark.asyncio
+    async def test_reasoning_falls_back_to_chat_near_deadline(self, ai_service):
+        """Test that a short remaining budget routes reasoning calls to the chat model"""
+        reasoning = self._model(ai_service.settings.gemini_model_reasoning, "slow answer")
+        chat = self._model(ai_service.settings.gemini_model_chat, "fast answer")
+
+        with patch.object(ai_service, '_get_model', return_value=chat):
+            with deadline_scope(ai_service.settings.gemini_reasoning_min_budget_seconds - 1):
+                result = await ai_service._make_api_call(reasoning, "Create a learning path", {})
+
+        assert result == "fast answer"
+        reasoning.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reasoning_kept_with_enough_budget(self, ai_service):
+        """Test that the reasoning model is used when the deadline allows it"""
+        reasoning = self._model(ai_service.settings.gemini_model_reasoning, "thorough answer")
+
+        with deadline_scope(ai_service.settings.gemini_reasoning_min_budget_seconds * 2):
+            result = await ai_service._make_api_call(reasoning, "Create a learning path", {})
+
+        assert result == "thorough answer"
+
+    @pytest.mark.asyncio
+    async def test_sdk_timeout_capped_by_deadline(self, ai_service):
+        """Test that each attempt's timeout never exceeds the remaining budget"""
+        chat = self._model(ai_service.settings.gemini_model_chat)
+
+        with deadline_scope(2.0):
+            await ai_service._make_api_call(chat, "prompt", {})
+
+        assert chat.generate_content.call_args.kwargs["request_options"]["timeout"] <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_call(self, ai_service):
+        """Test that no call is made once the deadline has passed"""
+        chat = self._model(ai_service.settings.gemini_model_chat)
+
+        with deadline_scope(0.0):
+            with pytest.raises(DeadlineExceededError):
+                await ai_service._make_api_call(chat, "prompt", {})
+        chat.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_retry_sleep_past_deadline(self, ai_service):
+        """Test that retries stop instead of sleeping beyond the deadline"""
+        chat = self._model(ai_service.settings.gemini_model_chat)
+        chat.generate_content.side_effect = Exception("rate limit exceeded")
+
+        start = time.monotonic()
+        with deadline_scope(2.0):
+            with pytest.raises(RetryError):
+                await ai_service._make_api_call(chat, "prompt", {})
+
+        assert time.monotonic() - start < 2.0
+        assert chat.generate_content.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hedging_sends_second_attempt(self, ai_service):
+        """Test that a slow call is hedged when hedging is enabled"""
+        ai_service.settings = ai_service.settings.model_copy(update={
+            "gemini_hedging_enabled": True,
+            "gemini_hedge_delay_seconds": 0.05
+        })
+        chat = self._model(ai_service.settings.gemini_model_chat)
+        delays = iter([0.5, 0.0])
+
+        def generate_content(prompt, generation_config, request_options=None):
+            time.sleep(next(delays))
+            return Mock(text="answer")
+
+        chat.generate_content.side_effect = generate_content
+
+        with patch("edagent.api.metrics.track_gemini_hedged_request") as mock_track:
+            start = time.monotonic()
+            result = await ai_service._make_api_call(chat, "prompt", {})
+
+        assert result == "answer"
+        assert time.monotonic() - start < 0.5
+        assert chat.generate_content.call_count == 2
+        mock_track.assert_called_once_with(ai_service.settings.gemini_model_chat, True)
@@ -0,0 +1,170 @@
+"""
+Unit tests and concurrency benchmark for the offline Gemini stand-in
+"""
+
+import pytest
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+from google.api_core import exceptions as google_exceptions
+
+from edagent.config.settings import get_settings
+from edagent.models.user_context import UserContext
+from edagent.services.ai_service import GeminiAIService, FALLBACK_CONVERSATION_RESPONSE, RateLimitError
+from edagent.services.fake_gemini import FakeGeminiModel, FakeGeminiProfile, render_fake_response
+from edagent.services.model_registry import GeminiModelRegistry
+from edagent.services.prompt_engineering import PromptBuilder
+from edagent.services.response_processing import StructuredResponseHandler
+
+
+class TestFakeGeminiProfile:
+    """Test cases for latency and failure sampling"""
+
+    def test_latency_matches_configured_median(self):
+        """Test that sampled latencies follow the configured distribution"""
+        profile = FakeGeminiProfile(latency_median_ms=200, latency_p95_ms=600, seed=42)
+        samples = sorted(profile.sample_latency() for _ in range(4000))
+
+        assert statistics.median(samples) == pytest.approx(0.2, rel=0.1)
+        assert samples[int(len(samples) * 0.95)] == pytest.approx(0.6, rel=0.15)
+
+    def test_seed_makes_samples_reproducible(self):
+        """Test that the same seed yields the same sequence"""
+        first = FakeGeminiProfile(seed=7)
+        second = FakeGeminiProfile(seed=7)
+        assert [first.sample_latency() for _ in range(5)] == [second.sample_latency() for _ in range(5)]
+
+    def test_zero_latency(self):
+        """Test that a zero median disables latency"""
+        assert FakeGeminiProfile(latency_median_ms=0).sample_latency() == 0.0
+
+    def test_failure_kinds(self):
+        """Test that rate-limit and server errors are raised at the configured rates"""
+        assert isinstance(FakeGeminiProfile(rate_limit_rate=1.0).sample_failure(), google_exceptions.ResourceExhausted)
+        assert isinstance(FakeGeminiProfile(error_rate=1.0).sample_failure(), google_exceptions.ServiceUnavailable)
+        assert FakeGeminiProfile().sample_failure() is None
+
+
+class TestFakeGeminiResponses:
+    """Test cases for response shapes"""
+
+    @pytest.fixture
+    def handler(self):
+        """Create the structured response handler"""
+        return StructuredResponseHandler()
+
+    def test_skill_assessment_shape(self, handler):
+        """Test that assessment prompts get a parseable assessment"""
+        prompt = PromptBuilder().build_skill_assessment_prompt("Python", ["I build Flask apps"])
+        assessment = handler.process_skill_assessment_response(render_fake_response(prompt), "user-1")
+
+        assert assessment.skill_area == "Python"
+        assert assessment.strengths[0] == "Practical experience with Python"
+
+    def test_learning_path_shape(self, handler):
+        """Test that learning path prompts get a parseable learning path"""
+        prompt = PromptBuilder().build_learning_path_prompt("become a data analyst", {})
+        learning_path = handler.process_learning_path_response(render_fake_response(prompt), "become a data analyst")
+
+        assert learning_path.title == "Learning Path: become a data analyst"
+        assert len(learning_path.milestones) == 4
+
+    @pytest.mark.asyncio
+    async def test_streamed_chunks_join_to_full_response(self):
+        """Test that streaming yields the same text in several chunks"""
+        model = FakeGeminiModel("gemini-1.5-flash", FakeGeminiProfile(latency_median_ms=0))
+        stream = await model.generate_content_async("User message: hi\n", stream=True)
+        chunks = [chunk.text async for chunk in stream]
+
+        assert len(chunks) > 1
+        assert "".join(chunks).strip() == render_fake_response("User message: hi\n")
+
+    def test_rate_limit_error_maps_to_rate_limit_error(self):
+        """Test that fake 429s are classified like real ones"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            service = GeminiAIService()
+        model = FakeGeminiModel("gemini-1.5-flash", FakeGeminiProfile(latency_median_ms=0, rate_limit_rate=1.0))
+
+        with pytest.raises(google_exceptions.ResourceExhausted) as exc_info:
+            model.generate_content("prompt")
+        assert isinstance(service._classify_error(exc_info.value), RateLimitError)
+
+
+class TestFakeBackendSelection:
+    """Test cases for AI_SERVICE_BACKEND=fake"""
+
+    def test_registry_builds_fake_models(self):
+        """Test that the fake backend replaces GenerativeModel"""
+        settings = get_settings().model_copy(update={"ai_service_backend": "fake"})
+        registry = GeminiModelRegistry(settings)
+
+        model = registry.get_model("reasoning")
+        assert isinstance(model, FakeGeminiModel)
+        assert model.model_name == f"models/{settings.gemini_model_reasoning}"
+        assert registry.get_model("chat").profile is model.profile
+
+
+@pytest.fixture
+def fake_ai_service():
+    """Create an AI service using the fake backend with short latencies"""
+    settings = get_settings().model_copy(update={
+        "ai_service_backend": "fake",
+        "fake_ai_latency_median_ms": 20.0,
+        "fake_ai_latency_p95_ms": 60.0,
+        "fake_ai_seed": 1,
+        "ai_cache_enabled": False,
+        "rate_limit_requests_per_minute": 60000,
+        "rate_limit_burst_size": 1000
+    })
+    with patch('edagent.services.ai_service.get_settings', return_value=settings), \
+         patch('edagent.services.ai_service.genai.configure'):
+        service = GeminiAIService()
+    service.model_registry = GeminiModelRegistry(settings)
+    return service
+
+
+class TestFakeBackendConcurrency:
+    """Test GeminiAIService under concurrent load against the fake backend"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_conversations_succeed(self, fake_ai_service):
+        """Test that a burst of distinct conversations is answered without fallbacks"""
+        context = UserContext(user_id="load-test-user")
+
+        responses = await asyncio.gather(*[
+            fake_ai_service.generate_response(f"Question number {i} about careers", context)
+            for i in range(20)
+        ])
+
+        assert all(response != FALLBACK_CONVERSATION_RESPONSE for response in responses)
+
+
+@pytest.mark.benchmark
+class TestFakeBackendBenchmark:
+    """Drive GeminiAIService at realistic concurrency against the fake backend"""
+
+    CONCURRENT_REQUESTS = 50
+
+    @pytest.mark.asyncio
+    async def test_concurrent_conversations(self, fake_ai_service):
+        """Measure latency and throughput for a burst of distinct conversations"""
+        context = UserContext(user_id="load-test-user")
+        latencies = []
+
+        async def one_request(index):
+            start = time.perf_counter()
+            await fake_ai_service.generate_response(f"Question number {index} about careers", context)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one_request(i) for i in range(self.CONCURRENT_REQUESTS)])
+        wall_time = time.perf_counter() - start
+
+        latencies.sort()
+        # Requests overlap, so wall time stays close to one request's latency rather than their sum
+        print(f"\n{self.CONCURRENT_REQUESTS} concurrent requests in {wall_time:.2f}s "
+              f"({self.CONCURRENT_REQUESTS / wall_time:.0f} req/s, summed latency {sum(latencies):.2f}s), "
+              f"p50 {statistics.median(latencies) * 1000:.0f}ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f}ms")
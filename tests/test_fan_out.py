@@ -0,0 +1,131 @@
+"""
+Unit tests for structured fan-out of independent request steps
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from edagent.models.user_context import UserContext
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.deadlines import current_deadline, deadline_scope
+from edagent.services.fan_out import branch_timings, fan_out
+
+
+async def sleep_then(seconds, result):
+    await asyncio.sleep(seconds)
+    return result
+
+
+class TestFanOut:
+    """Test cases for fan_out"""
+
+    @pytest.mark.asyncio
+    async def test_branches_run_concurrently(self):
+        """Test that independent branches overlap and results keep their names"""
+        started = {"a": asyncio.Event(), "b": asyncio.Event()}
+
+        async def meet(name, other, result):
+            # Each branch waits for the other, so running them one after another times out
+            started[name].set()
+            await asyncio.wait_for(started[other].wait(), timeout=1)
+            return result
+
+        results = await fan_out({"a": meet("a", "b", 1), "b": meet("b", "a", 2)})
+
+        assert results == {"a": 1, "b": 2}
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_siblings(self):
+        """Test that the first failure is raised and the other branches do not keep running"""
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(1)
+            finished.append("slow")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("lookup failed")
+
+        with pytest.raises(ValueError, match="lookup failed"):
+            await fan_out({"slow": slow(), "failing": failing()})
+        await asyncio.sleep(0)
+
+        assert finished == []
+
+    @pytest.mark.asyncio
+    async def test_branch_timeout(self):
+        """Test that a branch over its own timeout fails the fan-out"""
+        with pytest.raises(asyncio.TimeoutError):
+            await fan_out({"fast": sleep_then(0, 1), "slow": sleep_then(1, 2)}, timeouts={"slow": 0.02})
+
+    @pytest.mark.asyncio
+    async def test_cancelling_caller_cancels_branches(self):
+        """Test that no branch outlives a cancelled caller"""
+        started = asyncio.Event()
+        cancelled = []
+
+        async def branch():
+            started.set()
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        caller = asyncio.ensure_future(fan_out({"branch": branch()}))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        assert cancelled == [True]
+
+    @pytest.mark.asyncio
+    async def test_branches_inherit_deadline(self):
+        """Test that AI calls in a branch see the request deadline"""
+        async def read_deadline():
+            return current_deadline()
+
+        with deadline_scope(5) as deadline:
+            results = await fan_out({"branch": read_deadline()})
+
+        assert results["branch"] is deadline
+
+    @pytest.mark.asyncio
+    async def test_timings_recorded(self):
+        """Test that branch durations are collected inside a timing scope"""
+        with branch_timings() as timings:
+            await fan_out({"a": sleep_then(0.02, 1), "b": sleep_then(0, 2)})
+
+        assert set(timings) == {"a", "b"}
+        assert timings["a"] >= 20
+
+
+class TestConversationBranchTimings:
+    """Test cases for branch timings in conversation responses"""
+
+    def make_manager(self, debug):
+        with patch('edagent.services.ai_service.genai.configure'):
+            manager = ConversationManager()
+        manager._report_timings = debug
+        manager.user_context_manager.get_user_context = AsyncMock(return_value=UserContext(user_id="user-1"))
+        manager.user_context_manager.add_conversation = AsyncMock()
+        manager.summarizer.record_turn = lambda user_id: None
+        manager.ai_service.generate_response = AsyncMock(return_value="Happy to help!")
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_timings_in_metadata_when_debugging(self):
+        """Test that per-branch timings are reported with API_DEBUG on"""
+        response = await self.make_manager(debug=True).handle_message("user-1", "Hello there")
+
+        assert set(response.metadata["branch_timings_ms"]) >= {"conversation_state", "user_context"}
+
+    @pytest.mark.asyncio
+    async def test_no_timings_by_default(self):
+        """Test that timings stay out of responses otherwise"""
+        response = await self.make_manager(debug=False).handle_message("user-1", "Hello there")
+
+        assert "branch_timings_ms" not in response.metadata
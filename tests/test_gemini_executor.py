@@ -0,0 +1,118 @@
+"""
+Unit tests for the dedicated Gemini executor
+"""
+
+import pytest
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+from edagent.services.ai_service import GeminiAIService
+from edagent.services import gemini_executor
+from edagent.services.gemini_executor import (
+    GeminiExecutor,
+    get_gemini_executor,
+    shutdown_gemini_executor
+)
+
+
+@pytest.fixture
+def executor():
+    """Create a small executor and shut it down after the test"""
+    executor = GeminiExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+class TestGeminiExecutor:
+    """Test cases for GeminiExecutor"""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_threads(self, executor):
+        """Test that calls run on gemini-named worker threads"""
+        thread_name = await executor.run(lambda: threading.current_thread().name, "gemini-1.5-flash")
+        assert thread_name.startswith("gemini")
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self, executor):
+        """Test that errors raised by the call reach the caller"""
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await executor.run(fail, "gemini-1.5-flash")
+        assert executor.active_calls("gemini-1.5-flash") == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_saturation(self, executor):
+        """Test per-model queue depth while the pool is busy"""
+        release = threading.Event()
+
+        running = asyncio.create_task(executor.run(release.wait, "models/gemini-1.5-pro"))
+        queued = asyncio.create_task(executor.run(lambda: "done", "models/gemini-1.5-pro"))
+        await asyncio.sleep(0.05)
+
+        assert executor.active_calls("gemini-1.5-pro") == 1
+        assert executor.queue_depth("gemini-1.5-pro") == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert executor.active_calls("gemini-1.5-pro") == 0
+        assert executor.queue_depth("gemini-1.5-pro") == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_queued_call(self, executor):
+        """Test that a call timing out in the queue never runs"""
+        release = threading.Event()
+        queued_call = Mock()
+
+        running = asyncio.create_task(executor.run(release.wait, "gemini-1.5-flash"))
+        await asyncio.sleep(0.01)
+
+        with patch("edagent.api.metrics.track_gemini_call_timeout") as mock_track:
+            with pytest.raises(TimeoutError):
+                await executor.run(queued_call, "gemini-1.5-flash", timeout=0.05)
+
+        release.set()
+        await running
+        await asyncio.sleep(0.01)
+
+        queued_call.assert_not_called()
+        mock_track.assert_called_once_with("gemini-1.5-flash")
+        assert executor.queue_depth("gemini-1.5-flash") == 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_rejects_new_calls(self):
+        """Test that a shut down executor refuses work"""
+        executor = GeminiExecutor(max_workers=1)
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            await executor.run(lambda: None)
+
+    def test_shared_executor_is_recreated_after_shutdown(self):
+        """Test the process-wide executor lifecycle used by the app lifespan"""
+        first = get_gemini_executor()
+        assert get_gemini_executor() is first
+
+        shutdown_gemini_executor()
+        assert gemini_executor._gemini_executor is None
+        assert get_gemini_executor() is not first
+
+
+class TestGeminiAIServiceExecutor:
+    """Test cases for executor use in GeminiAIService"""
+
+    @pytest.mark.asyncio
+    async def test_api_call_passes_sdk_timeout(self):
+        """Test that the SDK request timeout matches the executor timeout"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            ai_service = GeminiAIService()
+        ai_service.response_cache.enabled = False
+
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+        model.generate_content.return_value = Mock(text="ok")
+
+        assert await ai_service._make_api_call(model, "prompt", {}) == "ok"
+        request_options = model.generate_content.call_args.kwargs["request_options"]
+        assert request_options == {"timeout": ai_service.settings.gemini_request_timeout_seconds}
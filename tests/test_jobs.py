@@ -0,0 +1,398 @@
+"""
+Unit tests for background jobs and the job endpoints
+"""
+
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+import httpx
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+
+from edagent.api.endpoints.jobs import router as jobs_router
+from edagent.api.endpoints.learning import router as learning_router
+from edagent.api.exceptions import setup_exception_handlers
+from edagent.api.dependencies import get_conversation_manager, get_user_context_manager
+from edagent.api.websocket import ConnectionManager
+from edagent.config.settings import get_settings
+from edagent.models.learning import DifficultyLevel, LearningPath
+from edagent.services.deadlines import deadline_scope, remaining_time
+from edagent.services.jobs import (
+    InMemoryJobStore,
+    Job,
+    JobQueueFullError,
+    JobRunner,
+    JobStatus,
+    RedisJobStore,
+    create_job_store,
+    get_job_runner
+)
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis.asyncio calls the store uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+
+@pytest.fixture
+def settings():
+    """Create settings with a small pool and queue"""
+    settings = get_settings().model_copy()
+    settings.job_store_backend = "memory"
+    settings.job_workers = 2
+    settings.job_queue_size = 3
+    settings.job_timeout_seconds = 1.0
+    return settings
+
+
+def returning(result, delay=0.0):
+    """Create a job function that returns result after delay seconds"""
+    async def func():
+        await asyncio.sleep(delay)
+        return result
+    return func
+
+
+class TestJobStores:
+    """Test cases for job stores"""
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        """Test that finished jobs are dropped after the TTL but running ones are kept"""
+        store = InMemoryJobStore(ttl_seconds=60)
+        finished = Job(kind="test", user_id="user-1", status=JobStatus.SUCCEEDED)
+        finished.finished_at = datetime.now() - timedelta(seconds=61)
+        running = Job(kind="test", user_id="user-1", status=JobStatus.RUNNING)
+        await store.save(finished)
+        await store.save(running)
+
+        assert await store.get(finished.id) is None
+        assert await store.get(running.id) is running
+
+    @pytest.mark.asyncio
+    async def test_oldest_jobs_evicted(self):
+        """Test that the oldest jobs are evicted beyond max_entries"""
+        store = InMemoryJobStore(max_entries=2)
+        jobs = [Job(kind="test", user_id="user-1") for _ in range(3)]
+        for job in jobs:
+            await store.save(job)
+
+        assert len(store) == 2
+        assert await store.get(jobs[0].id) is None
+        assert await store.get(jobs[2].id) is jobs[2]
+
+    @pytest.mark.asyncio
+    async def test_redis_store_round_trip(self):
+        """Test that the Redis store saves jobs as JSON with a TTL"""
+        redis = FakeRedis()
+        store = RedisJobStore(redis, ttl_seconds=120)
+        job = Job(kind="learning_path", user_id="user-1", status=JobStatus.SUCCEEDED)
+        job.finished_at = datetime.now()
+        job.result = {"title": "Python"}
+        await store.save(job)
+
+        key = f"edagent:job:{job.id}"
+        assert json.loads(redis.values[key])["status"] == "succeeded"
+        assert redis.ttls[key] == 120
+
+        loaded = await store.get(job.id)
+        assert loaded.status == JobStatus.SUCCEEDED
+        assert loaded.result == {"title": "Python"}
+        assert loaded.finished_at == job.finished_at
+
+    @pytest.mark.asyncio
+    async def test_redis_store_discards_unreadable_jobs(self):
+        """Test that an unreadable payload is treated as missing"""
+        redis = FakeRedis()
+        redis.values["edagent:job:bad"] = "not json"
+
+        assert await RedisJobStore(redis).get("bad") is None
+
+    def test_redis_backend_falls_back_to_memory(self, settings):
+        """Test that the memory store is used when Redis is not configured"""
+        settings.job_store_backend = "redis"
+        settings.redis_url = None
+
+        assert isinstance(create_job_store(settings), InMemoryJobStore)
+
+
+class TestJobRunner:
+    """Test cases for JobRunner"""
+
+    @pytest.mark.asyncio
+    async def test_job_succeeds(self, settings):
+        """Test that a submitted job is queued, then runs and keeps its result"""
+        runner = JobRunner(settings)
+        job = await runner.submit("test", "user-1", returning({"answer": 42}, delay=0.01))
+
+        assert job.status == JobStatus.QUEUED
+        finished = await asyncio.wait_for(runner.wait(job.id), 1)
+
+        assert finished.status == JobStatus.SUCCEEDED
+        assert finished.result == {"answer": 42}
+        assert finished.started_at is not None and finished.finished_at >= finished.started_at
+        assert (await runner.get(job.id)).status == JobStatus.SUCCEEDED
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_job_failure_recorded(self, settings):
+        """Test that an exception marks the job failed with its message"""
+        runner = JobRunner(settings)
+
+        async def fail():
+            raise ValueError("no goal given")
+
+        job = await runner.submit("test", "user-1", fail)
+        finished = await asyncio.wait_for(runner.wait(job.id), 1)
+
+        assert finished.status == JobStatus.FAILED
+        assert finished.error == "no goal given"
+        assert finished.result is None
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_job_timeout(self, settings):
+        """Test that a job running past the job timeout is marked failed"""
+        settings.job_timeout_seconds = 0.05
+        runner = JobRunner(settings)
+        job = await runner.submit("test", "user-1", returning({}, delay=1))
+        finished = await asyncio.wait_for(runner.wait(job.id), 1)
+
+        assert finished.status == JobStatus.FAILED
+        assert "did not finish" in finished.error
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_job_uses_job_deadline_not_request_deadline(self, settings):
+        """Test that a job does not inherit the deadline of the request that submitted it"""
+        settings.job_timeout_seconds = 30
+        runner = JobRunner(settings)
+
+        async def report_deadline():
+            return {"remaining": remaining_time()}
+
+        with deadline_scope(0.5):
+            job = await runner.submit("test", "user-1", report_deadline)
+        finished = await asyncio.wait_for(runner.wait(job.id), 1)
+
+        assert finished.result["remaining"] > 20
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_workers_run_jobs_concurrently(self, settings):
+        """Test that jobs run side by side up to the worker count"""
+        runner = JobRunner(settings)
+        start = asyncio.get_running_loop().time()
+        jobs = [await runner.submit("test", "user-1", returning({}, delay=0.1)) for _ in range(2)]
+        await asyncio.gather(*(runner.wait(job.id) for job in jobs))
+
+        assert asyncio.get_running_loop().time() - start < 0.18
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_jobs(self, settings):
+        """Test that submit raises once queue_size jobs are waiting"""
+        runner = JobRunner(settings)
+        blocker = asyncio.Event()
+
+        async def blocked():
+            await blocker.wait()
+            return {}
+
+        # Two jobs occupy the workers, three more fill the queue
+        for _ in range(2):
+            await runner.submit("test", "user-1", blocked)
+        await asyncio.sleep(0)
+        for _ in range(3):
+            await runner.submit("test", "user-1", blocked)
+
+        with pytest.raises(JobQueueFullError):
+            await runner.submit("test", "user-1", blocked)
+
+        blocker.set()
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_listeners_notified_when_jobs_finish(self, settings):
+        """Test that listeners get each finished job, and a failing listener does not stop others"""
+        runner = JobRunner(settings)
+        notified = []
+
+        async def broken(job):
+            raise RuntimeError("listener failed")
+
+        async def record(job):
+            notified.append((job.id, job.status))
+
+        runner.add_listener(broken)
+        runner.add_listener(record)
+        runner.add_listener(record)
+        job = await runner.submit("test", "user-1", returning({}))
+        await asyncio.wait_for(runner.wait(job.id), 1)
+
+        assert notified == [(job.id, JobStatus.SUCCEEDED)]
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_close_fails_waiting_jobs_and_cancels_running_ones(self, settings):
+        """Test that close marks unstarted and overrunning jobs failed"""
+        settings.job_workers = 1
+        runner = JobRunner(settings)
+        running = await runner.submit("test", "user-1", returning({}, delay=5))
+        await asyncio.sleep(0)
+        waiting = await runner.submit("test", "user-1", returning({}))
+
+        await runner.close(timeout=0.05)
+
+        running_job = await runner.get(running.id)
+        waiting_job = await runner.get(waiting.id)
+        assert running_job.status == JobStatus.FAILED
+        assert "before the job finished" in running_job.error
+        assert waiting_job.status == JobStatus.FAILED
+        assert "before the job started" in waiting_job.error
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_running_jobs(self, settings):
+        """Test that close lets running jobs finish within the timeout"""
+        runner = JobRunner(settings)
+        job = await runner.submit("test", "user-1", returning({"done": True}, delay=0.05))
+        await asyncio.sleep(0)
+
+        await runner.close(timeout=1)
+
+        assert (await runner.get(job.id)).result == {"done": True}
+
+    def test_get_job_runner_returns_singleton(self):
+        """Test that the process-wide runner is shared"""
+        assert get_job_runner() is get_job_runner()
+
+
+class TestJobNotifications:
+    """Test cases for job_finished WebSocket messages"""
+
+    @pytest.mark.asyncio
+    async def test_connected_user_notified(self):
+        """Test that a connected user gets a job_finished message"""
+        manager = ConnectionManager()
+        websocket = MagicMock()
+        websocket.send_json = AsyncMock()
+        manager.active_connections["user-1"] = websocket
+        job = Job(kind="learning_path", user_id="user-1", status=JobStatus.SUCCEEDED)
+
+        assert await manager.send_job_finished(job)
+
+        message = websocket.send_json.call_args.args[0]
+        assert message["type"] == "job_finished"
+        assert message["job_id"] == job.id
+        assert message["status"] == "succeeded"
+        assert message["status_url"] == f"/api/v1/jobs/{job.id}"
+
+    @pytest.mark.asyncio
+    async def test_disconnected_user_skipped(self):
+        """Test that nothing is sent to a user without a connection"""
+        job = Job(kind="learning_path", user_id="user-1", status=JobStatus.SUCCEEDED)
+
+        assert not await ConnectionManager().send_job_finished(job)
+
+
+class TestLearningPathJobEndpoints:
+    """Test cases for creating learning paths as background jobs"""
+
+    @pytest.fixture
+    def runner(self, settings):
+        return JobRunner(settings)
+
+    @pytest.fixture
+    def conversation_manager(self):
+        manager = MagicMock()
+
+        async def generate_learning_path(user_id, goal):
+            await asyncio.sleep(0.05)
+            now = datetime.now()
+            return LearningPath(
+                id="path-1",
+                title="Python for web development",
+                description="From basics to a deployed app",
+                goal=goal,
+                difficulty_level=DifficultyLevel.BEGINNER,
+                created_at=now,
+                updated_at=now
+            )
+
+        manager.generate_learning_path = AsyncMock(side_effect=generate_learning_path)
+        return manager
+
+    @pytest.fixture
+    def app(self, runner, conversation_manager):
+        app = FastAPI()
+        setup_exception_handlers(app)
+        app.include_router(learning_router, prefix="/api/v1/learning")
+        app.include_router(jobs_router, prefix="/api/v1/jobs")
+
+        user_context_manager = MagicMock()
+        user_context_manager.get_user_context = AsyncMock(return_value=MagicMock())
+        app.dependency_overrides[get_conversation_manager] = lambda: conversation_manager
+        app.dependency_overrides[get_user_context_manager] = lambda: user_context_manager
+        app.dependency_overrides[get_job_runner] = lambda: runner
+        return app
+
+    @pytest_asyncio.fixture
+    async def client(self, app, runner):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+        await runner.close()
+
+    @pytest.mark.asyncio
+    async def test_create_returns_job_and_poll_returns_path(self, client, runner):
+        """Test that creation answers 202 at once and the path is polled from the job"""
+        response = await client.post(
+            "/api/v1/learning/paths",
+            json={"user_id": "user-1", "goal": "Learn Python"}
+        )
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "queued"
+        assert body["kind"] == "learning_path"
+        assert response.headers["location"] == body["status_url"] == f"/api/v1/jobs/{body['job_id']}"
+
+        await asyncio.wait_for(runner.wait(body["job_id"]), 1)
+        response = await client.get(body["status_url"])
+
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] == "succeeded"
+        assert job["result"]["id"] == "path-1"
+        assert job["result"]["goal"] == "Learn Python"
+        assert job["result"]["difficulty_level"] == "beginner"
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_not_found(self, client):
+        """Test that polling an unknown job answers 404"""
+        response = await client.get("/api/v1/jobs/missing")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_full_queue_answers_503(self, client, runner):
+        """Test that a full job queue is reported as service unavailable"""
+        runner.submit = AsyncMock(side_effect=JobQueueFullError(3))
+        response = await client.post(
+            "/api/v1/learning/paths",
+            json={"user_id": "user-1", "goal": "Learn Python"}
+        )
+
+        assert response.status_code == 503
@@ -0,0 +1,184 @@
+"""
+Unit tests and benchmark for compiled keyword matching
+"""
+
+import pytest
+import random
+import statistics
+import time
+from unittest.mock import patch
+
+from edagent.config.settings import get_settings
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.keyword_matching import KeywordMatch, KeywordMatcher
+
+
+CATEGORIES = {
+    "resume": ["resume", "cv", "curriculum vitae"],
+    "interview": ["interview", "interview tips", "mock interview"],
+    "learning": ["learning path", "curriculum", "study plan"]
+}
+
+# Messages users send, taken from the conversation tests, padded out with ordinary chat
+CORPUS = [
+    "Can you assess my skills?",
+    "I want to test my programming knowledge",
+    "How good am I at Python?",
+    "Create a learning path for me",
+    "I want to become a data scientist",
+    "What's the study plan for machine learning?",
+    "Recommend some Python courses",
+    "Find me tutorials on React",
+    "Can you help me improve my resume?",
+    "What should I include in my resume skills section?",
+    "I have an interview at a fintech startup next week, can we do a mock interview?",
+    "Hello, how are you?",
+    "What can you help me with?",
+    "I'm feeling confused about my career",
+    "Tell me about yourself",
+    "I need some motivation",
+    "I have been coding in Python for a year and mostly built small web scrapers and scripts",
+    "My manager says I should focus on communication before asking for a promotion, thoughts?",
+    "Thanks, that was really helpful! I'll get back to you after the weekend.",
+    "Honestly I am not sure whether to stay in my current role or move to a bigger company"
+]
+
+
+def substring_categories(categories, text):
+    """What the matcher replaces: one substring check per keyword"""
+    text = text.lower()
+    return {name for name, keywords in categories.items() if any(keyword in text for keyword in keywords)}
+
+
+class TestKeywordMatcher:
+    """Test cases for KeywordMatcher"""
+
+    def test_same_categories_as_substring_checks(self):
+        """Test that overlapping and nested keywords give the substring answer"""
+        matcher = KeywordMatcher(CATEGORIES)
+        words = [keyword for keywords in CATEGORIES.values() for keyword in keywords] + ["my", "vitae", "s", " "]
+        rng = random.Random(7)
+
+        for _ in range(2000):
+            text = "".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            assert matcher.categories(text) == substring_categories(CATEGORIES, text), text
+
+    def test_find_all_positions(self):
+        """Test that every occurrence is reported, including keywords inside longer ones"""
+        matcher = KeywordMatcher(CATEGORIES)
+
+        matches = matcher.find_all("Need Interview tips for my CV")
+
+        assert matches == [
+            KeywordMatch("interview", "interview tips", 5, 19),
+            KeywordMatch("interview", "interview", 5, 14),
+            KeywordMatch("resume", "cv", 27, 29)
+        ]
+
+    def test_keyword_shared_by_categories(self):
+        """Test that one keyword counts for every category listing it"""
+        matcher = KeywordMatcher({"a": ["plan"], "b": ["plan", "roadmap"]})
+
+        assert matcher.categories("make a plan") == {"a", "b"}
+
+    def test_priority_decides_first(self):
+        """Test that configured priority overrides definition order"""
+        text = "Interview tips for my resume"
+
+        assert KeywordMatcher(CATEGORIES).first(text) == "resume"
+        assert KeywordMatcher(CATEGORIES, priority=["interview"]).first(text) == "interview"
+
+    def test_first_default(self):
+        """Test that first() falls back when nothing matches"""
+        matcher = KeywordMatcher(CATEGORIES)
+
+        assert matcher.first("hello there", default="general") == "general"
+        assert not matcher.matches("hello there")
+
+    def test_unknown_priority_rejected(self):
+        """Test that a misspelled priority entry fails at build time"""
+        with pytest.raises(ValueError, match="intervew"):
+            KeywordMatcher(CATEGORIES, priority=["intervew"])
+
+
+class TestIntentPriority:
+    """Test cases for configurable intent priority in ConversationManager"""
+
+    def test_priority_from_settings(self):
+        """Test that INTENT_PRIORITY changes which intent wins"""
+        settings = get_settings().model_copy()
+        settings.intent_priority = "interview_preparation,resume_analysis"
+
+        with patch('edagent.config.get_settings', return_value=settings), \
+             patch('edagent.services.ai_service.genai.configure'):
+            manager = ConversationManager()
+
+        assert manager._detect_intent("Can you assess my interview skills?") == "interview_preparation"
+        assert manager._detect_intent("Evaluate my skill level") == "assessment"
+
+
+def make_manager():
+    with patch('edagent.services.ai_service.genai.configure'):
+        return ConversationManager()
+
+
+def keyword_loop_detector(manager):
+    """The previous _detect_intent: each keyword of each intent checked in turn"""
+    intents = {
+        "assessment": manager._assessment_keywords,
+        "learning_path": manager._learning_path_keywords,
+        "content_recommendation": manager._content_keywords,
+        "resume_analysis": manager._resume_keywords,
+        "interview_preparation": manager._interview_keywords
+    }
+
+    def keyword_loops(message):
+        message_lower = message.lower()
+        for intent, keywords in intents.items():
+            if any(keyword in message_lower for keyword in keywords):
+                return intent
+        return "general"
+
+    return keyword_loops
+
+
+class TestDetectIntent:
+    """Test cases for ConversationManager._detect_intent"""
+
+    def test_same_intents_as_keyword_loops(self):
+        """Test that the compiled matcher detects what the keyword loops did"""
+        manager = make_manager()
+        keyword_loops = keyword_loop_detector(manager)
+
+        assert [manager._detect_intent(m) for m in CORPUS] == [keyword_loops(m) for m in CORPUS]
+
+
+@pytest.mark.benchmark
+class TestKeywordMatchingBenchmark:
+    """Compare intent detection against checking each keyword of each intent in turn"""
+
+    ROUNDS = 7
+    REPEAT = 200
+
+    def test_detect_intent(self):
+        """Measure intent detection over a corpus of user messages"""
+        manager = make_manager()
+        keyword_loops = keyword_loop_detector(manager)
+
+        def timed(detect):
+            samples = []
+            for _ in range(self.ROUNDS):
+                start = time.perf_counter()
+                for _ in range(self.REPEAT):
+                    for message in CORPUS:
+                        detect(message)
+                samples.append(time.perf_counter() - start)
+            return statistics.median(samples) / (self.REPEAT * len(CORPUS))
+
+        loops = timed(keyword_loops)
+        compiled = timed(manager._detect_intent)
+
+        print(
+            f"\nIntent detection over {len(CORPUS)} messages: "
+            f"{compiled * 1e6:.2f} us/message (keyword loops: {loops * 1e6:.2f} us/message)"
+        )
@@ -552,6 +552,90 @@ class TestAPILoadTesting:
         assert total_increase < 150, f"Possible memory leak detected: {total_increase:.1f}MB increase"
 
 
+class TestFakeBackendLoad:
+    """Load tests through the real app with Gemini replaced by the offline stand-in"""
+    
+    @pytest.fixture
+    def fake_backend_client(self, tmp_path):
+        """Run the full app (lifespan, middleware, services, database) against AI_SERVICE_BACKEND=fake"""
+        from edagent.api import dependencies
+        from edagent.api.middleware import AuthenticationMiddleware
+        from edagent.config.settings import get_settings
+        from edagent.database.connection import db_manager
+        from edagent.database.utils import DatabaseUtils
+        from edagent.models.auth import TokenValidationResult
+        from edagent.services.model_registry import get_model_registry
+        
+        settings = get_settings()
+        overrides = {
+            "ai_service_backend": "fake",
+            "fake_ai_latency_median_ms": 50.0,
+            "fake_ai_latency_p95_ms": 150.0,
+            "fake_ai_error_rate": 0.0,
+            "fake_ai_rate_limit_rate": 0.0,
+            "fake_ai_seed": 1,
+            # Every request is its own turn, so identical messages must not be answered together
+            "user_lane_coalesce_duplicates": False,
+            "database_url": f"sqlite:///{tmp_path / 'load.db'}",
+        }
+        original = {name: getattr(settings, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        get_model_registry().reload()
+        
+        def reset_dependencies():
+            for getter in (
+                dependencies.get_ai_service, dependencies.get_user_context_manager,
+                dependencies.get_conversation_manager, dependencies.get_learning_path_generator
+            ):
+                getter.cache_clear()
+        
+        async def create_user():
+            async with db_manager.get_session() as session:
+                user = await DatabaseUtils.create_user(session, "load@example.com", "not-a-real-hash")
+                return str(user.id)
+        
+        reset_dependencies()
+        authenticated = AsyncMock(return_value=TokenValidationResult(is_valid=True, user_id="fake_load_user"))
+        
+        try:
+            with patch.object(AuthenticationMiddleware, "_validate_authentication", authenticated):
+                with TestClient(create_app()) as client:
+                    client.portal.call(db_manager.create_tables)
+                    client.user_id = client.portal.call(create_user)
+                    yield client
+        finally:
+            for name, value in original.items():
+                setattr(settings, name, value)
+            get_model_registry().reload()
+            reset_dependencies()
+    
+    def test_conversation_endpoint_with_fake_backend(self, fake_backend_client):
+        """Test the conversation endpoint end to end with simulated Gemini latency"""
+        runner = LoadTestRunner(fake_backend_client)
+        
+        metrics = runner.run_constant_load_test(
+            endpoint="/api/v1/conversations/message",
+            method="POST",
+            payload={"user_id": fake_backend_client.user_id, "message": "How should I start learning SQL?"},
+            concurrent_users=4,
+            requests_per_user=2
+        )
+        
+        summary = metrics.get_summary()
+        assert summary["success_rate"] == 1.0, f"Fake backend requests failed: {metrics.errors}"
+        
+        # Every turn is saved: the writer connection no longer shares a connection with readers
+        history = fake_backend_client.get(
+            f"/api/v1/conversations/{fake_backend_client.user_id}/history", params={"limit": 100}
+        )
+        assert history.status_code == 200
+        assert history.json()["total_count"] == 2 * summary["total_requests"]
+        
+        print(f"✅ Fake backend load test: {summary['success_rate']:.2%} success, "
+              f"{summary['response_times']['average']:.2f}s avg, {summary['requests_per_second']:.1f} req/s")
+
+
 if __name__ == "__main__":
     # Run load tests
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Unit tests for the shared metrics recording helper
+"""
+
+from unittest.mock import patch
+
+from edagent.utils.metrics import safe_track
+
+
+class TestSafeTrack:
+    """Test cases for safe_track"""
+
+    def test_calls_named_recorder(self):
+        """Test that the recorder is looked up by name when called"""
+        with patch("edagent.api.metrics.track_conversation_lane_message") as mock_track:
+            safe_track("track_conversation_lane_message", "processed")
+
+        mock_track.assert_called_once_with("processed")
+
+    def test_recorder_failure_is_swallowed(self):
+        """Test that a failing recorder does not reach the caller"""
+        with patch("edagent.api.metrics.track_conversation_lane_message", side_effect=RuntimeError("down")):
+            safe_track("track_conversation_lane_message", "processed")
+
+    def test_unknown_recorder_is_swallowed(self):
+        """Test that a missing recorder does not reach the caller"""
+        safe_track("track_nothing_at_all", 1)
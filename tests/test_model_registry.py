@@ -0,0 +1,147 @@
+"""
+Unit tests and microbenchmark for the Gemini model registry
+"""
+
+import pytest
+import time
+import threading
+from unittest.mock import Mock, patch
+
+import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+from edagent.config.settings import get_settings
+from edagent.services.model_registry import GeminiModelRegistry, SAFETY_PROFILES, get_model_registry
+
+
+@pytest.fixture
+def registry():
+    """Create a registry with its own cache"""
+    return GeminiModelRegistry(get_settings())
+
+
+class TestGeminiModelRegistry:
+    """Test cases for GeminiModelRegistry"""
+
+    def test_model_is_built_once(self, registry):
+        """Test that repeated lookups reuse the same model instance"""
+        with patch('edagent.services.model_registry.genai.GenerativeModel') as mock_model_class:
+            first = registry.get_model("chat")
+            second = registry.get_model("chat")
+
+        assert first is second
+        mock_model_class.assert_called_once_with(
+            model_name=registry.settings.gemini_model_chat,
+            safety_settings=SAFETY_PROFILES["educational"]
+        )
+
+    def test_models_are_keyed_by_name(self, registry):
+        """Test that chat and reasoning models are cached separately"""
+        with patch('edagent.services.model_registry.genai.GenerativeModel', side_effect=lambda **kw: Mock(**kw)):
+            chat = registry.get_model("chat")
+            reasoning = registry.get_model("reasoning")
+
+        assert chat is not reasoning
+        assert reasoning.model_name == registry.settings.gemini_model_reasoning
+
+    def test_unknown_safety_profile(self, registry):
+        """Test that an unknown safety profile is rejected"""
+        with pytest.raises(ValueError):
+            registry.get_model("chat", safety_profile="unknown")
+
+    def test_generation_config_is_shared(self, registry):
+        """Test that generation configs are built once per model type"""
+        config = registry.get_generation_config("reasoning")
+        assert registry.get_generation_config("reasoning") is config
+        assert config["temperature"] == registry.settings.gemini_temperature_reasoning
+        assert registry.get_generation_config("chat")["top_p"] == 0.9
+
+    def test_warmup_builds_all_models(self, registry):
+        """Test that warmup leaves nothing to build on the request path"""
+        with patch('edagent.services.model_registry.genai.GenerativeModel') as mock_model_class:
+            registry.warmup()
+            registry.get_model("chat")
+            registry.get_model("reasoning")
+
+        assert mock_model_class.call_count == 2
+
+    def test_reload_picks_up_new_settings(self, registry):
+        """Test that reload rebuilds models and configs from new settings"""
+        registry.get_generation_config("chat")
+        new_settings = registry.settings.model_copy(update={
+            "gemini_model_chat": "gemini-2.0-flash",
+            "gemini_temperature_chat": 0.1
+        })
+
+        with patch('edagent.services.model_registry.genai.GenerativeModel') as mock_model_class:
+            registry.reload(new_settings)
+            registry.get_model("chat")
+
+        assert mock_model_class.call_args.kwargs["model_name"] == "gemini-2.0-flash"
+        assert registry.get_generation_config("chat")["temperature"] == 0.1
+
+    def test_concurrent_first_use_builds_once(self, registry):
+        """Test that threads racing on first use share one model"""
+        results = []
+
+        def slow_model(**kwargs):
+            time.sleep(0.01)
+            return Mock(**kwargs)
+
+        with patch('edagent.services.model_registry.genai.GenerativeModel', side_effect=slow_model) as mock_model_class:
+            threads = [threading.Thread(target=lambda: results.append(registry.get_model("chat"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_model_class.call_count == 1
+        assert all(model is results[0] for model in results)
+
+    def test_shared_registry(self):
+        """Test that the process-wide registry is a singleton"""
+        assert get_model_registry() is get_model_registry()
+
+
+@pytest.mark.benchmark
+class TestModelRegistryBenchmark:
+    """Microbenchmark of per-call model setup overhead"""
+
+    ITERATIONS = 2000
+
+    def _build_per_call(self, settings):
+        """The per-request setup GeminiAIService performed before the registry"""
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        }
+        model = genai.GenerativeModel(model_name=settings.gemini_model_chat, safety_settings=safety_settings)
+        config = {
+            "temperature": settings.gemini_temperature_chat,
+            "max_output_tokens": settings.gemini_max_tokens_response,
+            "top_p": 0.9,
+            "top_k": 40
+        }
+        return model, config
+
+    def test_registry_lookup_is_cheaper_than_rebuilding(self, registry):
+        """Compare per-call setup cost before and after the registry"""
+        settings = registry.settings
+        registry.warmup()
+
+        start = time.perf_counter()
+        for _ in range(self.ITERATIONS):
+            self._build_per_call(settings)
+        per_call_build = (time.perf_counter() - start) / self.ITERATIONS
+
+        start = time.perf_counter()
+        for _ in range(self.ITERATIONS):
+            registry.get_model("chat")
+            registry.get_generation_config("chat")
+        per_call_lookup = (time.perf_counter() - start) / self.ITERATIONS
+
+        print(f"\nModel setup per call: rebuild {per_call_build * 1e6:.1f}us, "
+              f"registry {per_call_lookup * 1e6:.1f}us "
+              f"({per_call_build / per_call_lookup:.0f}x faster)")
@@ -0,0 +1,346 @@
+"""
+Unit tests and benchmark for the assessment question bank
+"""
+
+import pytest
+import pytest_asyncio
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.database.models import Base
+from edagent.database.utils import DatabaseUtils
+from edagent.models.conversation import AssessmentSession
+from edagent.models.user_context import UserContext
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.question_bank import (
+    QuestionBank,
+    build_question_bank,
+    infer_difficulty,
+    normalize_skill_area,
+    parse_question_batch
+)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema, committing like db_manager"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    yield get_session
+    await engine.dispose()
+
+
+def make_bank(**kwargs):
+    bank = QuestionBank(seed_templates=False, **kwargs)
+    bank.add("Data Science", "beginner", ["Have you used a spreadsheet?", "Have you made a chart?"])
+    bank.add("Data Science", "intermediate", ["Which pandas operations do you use most?"])
+    bank.add("Data Science", "advanced", ["How do you validate a model in production?"])
+    return bank
+
+
+class TestQuestionSelection:
+    """Test cases for QuestionBank.select"""
+
+    def test_prefers_requested_difficulty(self):
+        """Test that questions at the user's level come first, then the nearest levels"""
+        bank = make_bank()
+
+        questions = bank.select("data science", "intermediate", 2)
+
+        assert questions[0] == "Which pandas operations do you use most?"
+        assert len(questions) == 2
+
+    def test_excludes_questions_already_asked(self):
+        """Test that an assessment does not repeat a question"""
+        bank = make_bank()
+
+        questions = bank.select("Data Science", "beginner", 4, exclude=["have you used a spreadsheet?"])
+
+        assert "Have you used a spreadsheet?" not in questions
+        assert len(questions) == 3
+
+    def test_rotates_by_usage(self):
+        """Test that the least asked questions at a level are served first"""
+        bank = make_bank()
+
+        first = bank.select("Data Science", "beginner", 1)
+        second = bank.select("Data Science", "beginner", 1)
+
+        assert first != second
+
+    def test_poorly_answered_questions_served_last(self):
+        """Test that questions users tend to skip drop behind the others"""
+        bank = make_bank()
+        for _ in range(20):
+            bank.select("Data Science", "beginner", 1, exclude=["Have you made a chart?"])
+        bank.record_answered("Have you used a spreadsheet?")
+
+        assert bank.select("Data Science", "beginner", 1) == ["Have you made a chart?"]
+        assert bank.select("Data Science", "beginner", 1) == ["Have you made a chart?"]
+
+    def test_unknown_skill_area(self):
+        """Test that a skill area not in the bank gets no questions"""
+        with patch("edagent.api.metrics.track_assessment_question_lookup") as mock_track:
+            assert make_bank().select("Quantum Computing", "beginner", 3) == []
+        mock_track.assert_called_once_with("miss")
+
+    def test_templates_seed_the_bank(self):
+        """Test that the built-in assessment questions are available without loading"""
+        bank = QuestionBank()
+
+        assert bank.has_skill_area("Web Development")
+        assert bank.count("web_development", "beginner") == 5
+
+    def test_duplicates_not_added(self):
+        """Test that adding a banked question again is a no-op"""
+        bank = make_bank()
+
+        assert bank.add("data_science", "beginner", ["have you used a spreadsheet?", "New one?"]) == 1
+
+    def test_normalize_skill_area(self):
+        """Test that display names and keys map to the same skill area"""
+        assert normalize_skill_area(" Web  Development ") == normalize_skill_area("web_development")
+
+
+class TestDifficultyAndParsing:
+    """Test cases for difficulty inference and batch parsing"""
+
+    @pytest.mark.parametrize("responses, expected", [
+        (["I'm new to this and have never coded"], "beginner"),
+        (["I built a side project with Flask", "I'm comfortable with SQL"], "intermediate"),
+        (["I have 6 years of experience and deployed services in production"], "advanced"),
+        (["I like computers"], "beginner"),
+    ])
+    def test_infer_difficulty(self, responses, expected):
+        """Test that answers map to a question difficulty"""
+        assert infer_difficulty(responses) == expected
+
+    def test_parse_question_batch(self):
+        """Test that labelled lines are grouped by level and other lines skipped"""
+        text = (
+            "Here are your questions:\n"
+            "beginner: Have you written any code?\n"
+            "- Intermediate: What have you built?\n"
+            "**advanced**: How do you review code?\n"
+            "intermediate: not a question\n"
+        )
+
+        assert parse_question_batch(text) == {
+            "beginner": ["Have you written any code?"],
+            "intermediate": ["What have you built?"],
+            "advanced": ["How do you review code?"]
+        }
+
+
+class TestQuestionBankPersistence:
+    """Test cases for loading and saving the question bank"""
+
+    @pytest.mark.asyncio
+    async def test_flush_and_load(self, session_factory):
+        """Test that new questions and usage counts survive into a new bank"""
+        bank = make_bank(session_factory=session_factory)
+        served = bank.select("Data Science", "advanced", 1)
+        bank.record_answered(served[0])
+        await bank.flush()
+
+        loaded = QuestionBank(session_factory=session_factory, seed_templates=False)
+        assert await loaded.load() == 4
+        question = loaded._by_text[loaded._key("data_science", served[0])]
+        assert (question.times_served, question.times_answered) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_usage_from_workers_adds_up(self, session_factory):
+        """Test that two banks flushing counts for the same question do not overwrite each other"""
+        first = make_bank(session_factory=session_factory)
+        await first.flush()
+        second = QuestionBank(session_factory=session_factory, seed_templates=False)
+        await second.load()
+
+        first.select("Data Science", "advanced", 1)
+        second.select("Data Science", "advanced", 1)
+        await first.flush()
+        await second.flush()
+
+        async with session_factory() as session:
+            rows = await DatabaseUtils.get_assessment_questions(session)
+        assert [row.times_served for row in rows if row.difficulty == "advanced"] == [2]
+
+    @pytest.mark.asyncio
+    async def test_seeded_questions_saved_once(self, session_factory):
+        """Test that template questions loaded back are not inserted again"""
+        await QuestionBank(session_factory=session_factory).flush()
+        bank = QuestionBank(session_factory=session_factory)
+        await bank.load()
+
+        assert bank._unsaved == []
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_kept_for_next_time(self):
+        """Test that a database error does not lose counts"""
+        @asynccontextmanager
+        async def broken_session():
+            raise RuntimeError("database down")
+            yield
+
+        bank = make_bank(session_factory=broken_session)
+        bank.select("Data Science", "beginner", 1)
+        await bank.flush()
+
+        assert len(bank._unsaved) == 4
+        assert sum(served for served, _ in bank._usage.values()) == 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_background_after_enough_changes(self, session_factory):
+        """Test that usage is saved without an explicit flush"""
+        with patch("edagent.services.question_bank.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(question_bank_enabled=True, question_bank_flush_every=2)
+            bank = make_bank(session_factory=session_factory)
+        await asyncio.sleep(0.05)
+
+        async with session_factory() as session:
+            assert len(await DatabaseUtils.get_assessment_questions(session)) == 4
+
+
+class TestBuildQuestionBank:
+    """Test cases for offline batch generation"""
+
+    @pytest.mark.asyncio
+    async def test_one_call_per_skill_area(self, session_factory):
+        """Test that each skill area is generated with a single Gemini call covering every level"""
+        ai_service = MagicMock()
+
+        async def generate(model, prompt, config, operation):
+            if "Marketing" in prompt:
+                raise RuntimeError("quota exceeded")
+            return "beginner: Q1?\nintermediate: Q2?\nadvanced: Q3?\nadvanced: Q4?"
+
+        ai_service._make_api_call = AsyncMock(side_effect=generate)
+        bank = QuestionBank(session_factory=session_factory, seed_templates=False)
+
+        added = await build_question_bank(bank, ai_service, ["Cloud Computing", "Marketing"], per_difficulty=1)
+
+        assert added == {"Cloud Computing": 3}
+        assert ai_service._make_api_call.await_count == 2
+        assert not bank.has_skill_area("Marketing")
+        async with session_factory() as session:
+            assert len(await DatabaseUtils.get_assessment_questions(session)) == 3
+
+
+def make_manager(bank):
+    with patch('edagent.services.ai_service.genai.configure'):
+        manager = ConversationManager()
+    manager.question_bank = bank
+    manager.ai_service._get_model = MagicMock()
+    manager.ai_service._get_generation_config = MagicMock()
+    manager.ai_service._make_api_call = AsyncMock(
+        return_value="What have you built with it?\nWhat was hardest?\nWhat would you build next?"
+    )
+    manager.response_handler.parse_assessment_questions = MagicMock(return_value=[
+        "What have you built with it?", "What was hardest?", "What would you build next?"
+    ])
+    return manager
+
+
+def make_assessment(*responses):
+    assessment = AssessmentSession(user_id="user-1", skill_area="General")
+    for question in ["Q1?", "Q2?", "Q3?", "Q4?", "Q5?"]:
+        assessment.add_question(question)
+    for response in responses:
+        assessment.add_response(response)
+    return assessment
+
+
+class TestAdaptiveQuestionsFromBank:
+    """Test cases for adaptive assessment questions in ConversationManager"""
+
+    @pytest.mark.asyncio
+    async def test_banked_skill_area_skips_gemini(self):
+        """Test that a known skill area is served from the bank"""
+        manager = make_manager(QuestionBank())
+        assessment = make_assessment("I write Python code", "Some coding", "Software development")
+
+        await manager._generate_adaptive_questions(assessment, UserContext(user_id="user-1"))
+
+        assert len(assessment.questions) == 7
+        manager.ai_service._make_api_call.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_novel_skill_area_generated_once(self):
+        """Test that Gemini is called for a new skill area and the next assessment uses the bank"""
+        manager = make_manager(QuestionBank(seed_templates=False))
+        manager.ai_service._infer_skill_area = MagicMock(return_value="Marketing")
+
+        for _ in range(2):
+            assessment = make_assessment("I run social media", "Some campaigns", "SEO")
+            await manager._generate_adaptive_questions(assessment, UserContext(user_id="user-1"))
+            assert assessment.questions[5]["question"] == "What have you built with it?"
+
+        assert manager.ai_service._make_api_call.await_count == 1
+        assert manager.question_bank.count("marketing") == 3
+
+    @pytest.mark.asyncio
+    async def test_bank_disabled_calls_gemini(self):
+        """Test that QUESTION_BANK_ENABLED=false keeps live generation"""
+        bank = QuestionBank()
+        bank.enabled = False
+        manager = make_manager(bank)
+
+        await manager._get_skill_specific_questions("Programming", ["I write code"])
+
+        manager.ai_service._make_api_call.assert_awaited_once()
+
+
+@pytest.mark.benchmark
+class TestQuestionBankBenchmark:
+    """Compare getting adaptive questions from the bank with a Gemini round-trip"""
+
+    ROUNDS = 50
+    GEMINI_LATENCY = 0.05
+
+    @pytest.mark.asyncio
+    async def test_banked_questions_against_live(self):
+        """Measure the adaptive question step for a banked and a novel skill area"""
+        bank = QuestionBank()
+        for difficulty in ("beginner", "intermediate", "advanced"):
+            bank.add("programming", difficulty, [f"{difficulty} question {i}?" for i in range(50)])
+        manager = make_manager(bank)
+
+        async def slow_gemini(*args, **kwargs):
+            await asyncio.sleep(self.GEMINI_LATENCY)
+            return ""
+
+        manager.ai_service._make_api_call = AsyncMock(side_effect=slow_gemini)
+        responses = ["I built a project in Python", "Comfortable with classes"]
+
+        async def timed(skill_area):
+            samples = []
+            for _ in range(self.ROUNDS):
+                start = time.perf_counter()
+                await manager._get_skill_specific_questions(skill_area, responses, ["Q1?", "Q2?"])
+                samples.append(time.perf_counter() - start)
+            return statistics.median(samples)
+
+        manager.question_bank.enabled = False
+        live = await timed("Programming")
+        manager.question_bank.enabled = True
+        banked = await timed("Programming")
+
+        print(
+            f"\nAdaptive questions: question bank {banked * 1000:.3f} ms, "
+            f"live with {self.GEMINI_LATENCY * 1000:.0f} ms Gemini latency {live * 1000:.1f} ms"
+        )
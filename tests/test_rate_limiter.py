@@ -0,0 +1,222 @@
+"""
+Unit tests for Gemini rate limiting and concurrency control
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, patch, AsyncMock
+
+from edagent.services.ai_service import GeminiAIService
+from edagent.services.rate_limiter import (
+    GeminiRateLimiter,
+    LocalTokenBucket,
+    RedisTokenBucket,
+    create_rate_limiter
+)
+
+
+class TestLocalTokenBucket:
+    """Test cases for the in-process token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_granted_immediately(self):
+        """Test that reservations within capacity do not wait"""
+        bucket = LocalTokenBucket(rate_per_second=1.0, capacity=3)
+        waits = [await bucket.reserve() for _ in range(3)]
+        assert waits == [0.0, 0.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_waits_are_spread_over_refill_rate(self):
+        """Test that queued reservations are released one refill interval apart"""
+        with patch("edagent.services.rate_limiter.time.monotonic", return_value=100.0):
+            bucket = LocalTokenBucket(rate_per_second=2.0, capacity=1)
+            waits = [await bucket.reserve() for _ in range(4)]
+
+        assert waits == [0.0, 0.5, 1.0, 1.5]
+
+    @pytest.mark.asyncio
+    async def test_refill_is_capped_at_capacity(self):
+        """Test that idle time does not accumulate more than capacity"""
+        with patch("edagent.services.rate_limiter.time.monotonic", return_value=100.0):
+            bucket = LocalTokenBucket(rate_per_second=1.0, capacity=2)
+            await bucket.reserve()
+        with patch("edagent.services.rate_limiter.time.monotonic", return_value=1000.0):
+            assert bucket.available_tokens == 2
+
+    @pytest.mark.asyncio
+    async def test_refund_returns_tokens(self):
+        """Test that refunded tokens shorten the wait of later reservations"""
+        with patch("edagent.services.rate_limiter.time.monotonic", return_value=100.0):
+            bucket = LocalTokenBucket(rate_per_second=1.0, capacity=1)
+            await bucket.reserve()
+            await bucket.reserve()
+            await bucket.refund()
+            assert await bucket.reserve() == 1.0
+
+    def test_rate_must_be_positive(self):
+        """Test that a zero refill rate is rejected"""
+        with pytest.raises(ValueError):
+            LocalTokenBucket(rate_per_second=0, capacity=1)
+
+
+class TestRedisTokenBucket:
+    """Test cases for the Redis-shared token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_reserve_uses_script_result(self):
+        """Test that the wait time computed in Redis is returned"""
+        redis_client = AsyncMock()
+        redis_client.eval.return_value = "0.25"
+        bucket = RedisTokenBucket(redis_client, rate_per_second=1.0, capacity=5)
+
+        assert await bucket.reserve() == 0.25
+        args = redis_client.eval.await_args[0]
+        assert args[1:3] == (1, "edagent:rate_limit:gemini")
+
+    @pytest.mark.asyncio
+    async def test_reserve_uses_redis_clock(self):
+        """Test that the worker's clock is not sent to Redis"""
+        redis_client = AsyncMock()
+        redis_client.eval.return_value = "0"
+        bucket = RedisTokenBucket(redis_client, rate_per_second=1.0, capacity=5)
+
+        with patch("edagent.services.rate_limiter.time.time") as mock_time:
+            await bucket.reserve()
+
+        mock_time.assert_not_called()
+        script = redis_client.eval.await_args[0][0]
+        assert "redis.call('TIME')" in script
+
+    @pytest.mark.asyncio
+    async def test_refund_is_atomic_and_capped(self):
+        """Test that refunds run in a script that caps the bucket at capacity"""
+        redis_client = AsyncMock()
+        bucket = RedisTokenBucket(redis_client, rate_per_second=1.0, capacity=5)
+
+        await bucket.refund(2)
+
+        redis_client.hincrbyfloat.assert_not_called()
+        script, numkeys, key, rate, capacity, tokens = redis_client.eval.await_args[0][:6]
+        assert "math.min(capacity, tokens + tonumber(ARGV[3]))" in script
+        assert (numkeys, key, capacity, tokens) == (1, "edagent:rate_limit:gemini", 5, 2)
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_local_bucket(self):
+        """Test that a Redis outage degrades to per-process limiting"""
+        redis_client = AsyncMock()
+        redis_client.eval.side_effect = ConnectionError("redis down")
+        bucket = RedisTokenBucket(redis_client, rate_per_second=1.0, capacity=1)
+
+        assert await bucket.reserve() == 0.0
+        assert await bucket.reserve() > 0.0
+
+
+class TestGeminiRateLimiter:
+    """Test cases for the combined limiter"""
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_order(self):
+        """Test FIFO ordering of callers waiting for tokens"""
+        limiter = GeminiRateLimiter(LocalTokenBucket(rate_per_second=100.0, capacity=1))
+        order = []
+
+        async def call(index):
+            await limiter.acquire("gemini-1.5-flash")
+            order.append(index)
+
+        await asyncio.gather(*[call(i) for i in range(5)])
+        assert order == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_refunds_token(self):
+        """Test that a caller cancelled while waiting gives its token back"""
+        bucket = LocalTokenBucket(rate_per_second=0.1, capacity=1)
+        limiter = GeminiRateLimiter(bucket)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert bucket.available_tokens > -0.5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped_per_model(self):
+        """Test that at most max_concurrency calls per model run at once"""
+        limiter = GeminiRateLimiter(LocalTokenBucket(1000.0, 1000), max_concurrency_per_model=2)
+        peak = 0
+        release = asyncio.Event()
+
+        async def call(model_name):
+            nonlocal peak
+            async with limiter.slot(model_name):
+                peak = max(peak, limiter.in_flight("gemini-1.5-pro"))
+                await release.wait()
+
+        tasks = [asyncio.create_task(call("models/gemini-1.5-pro")) for _ in range(5)]
+        other = asyncio.create_task(call("gemini-1.5-flash"))
+        await asyncio.sleep(0.01)
+
+        assert limiter.in_flight("gemini-1.5-pro") == 2
+        assert limiter.in_flight("gemini-1.5-flash") == 1
+
+        release.set()
+        await asyncio.gather(*tasks, other)
+        assert peak == 2
+        assert limiter.in_flight("gemini-1.5-pro") == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_times_are_reported(self):
+        """Test that token and concurrency waits feed the histogram"""
+        limiter = GeminiRateLimiter(LocalTokenBucket(1.0, 1))
+
+        with patch("edagent.api.metrics.track_gemini_rate_limit_wait") as mock_track:
+            await limiter.acquire("models/gemini-1.5-flash")
+            async with limiter.slot("models/gemini-1.5-flash"):
+                pass
+
+        stages = [call[0][:2] for call in mock_track.call_args_list]
+        assert stages == [("gemini-1.5-flash", "token"), ("gemini-1.5-flash", "concurrency")]
+
+    def test_create_rate_limiter_from_settings(self):
+        """Test limiter parameters and the memory fallback for the redis backend"""
+        settings = Mock(
+            rate_limit_requests_per_minute=120,
+            rate_limit_burst_size=5,
+            rate_limit_backend="redis",
+            redis_url=None,
+            gemini_max_concurrent_requests=3
+        )
+        limiter = create_rate_limiter(settings)
+
+        assert isinstance(limiter.bucket, LocalTokenBucket)
+        assert limiter.bucket.rate_per_second == 2.0
+        assert limiter.bucket.capacity == 5
+        assert limiter.max_concurrency_per_model == 3
+
+
+class TestGeminiAIServiceRateLimiting:
+    """Test cases for limiter integration in GeminiAIService"""
+
+    @pytest.mark.asyncio
+    async def test_api_call_holds_a_slot(self):
+        """Test that a Gemini call runs inside a concurrency slot"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            ai_service = GeminiAIService()
+        ai_service.response_cache.enabled = False
+        seen_in_flight = []
+
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+
+        def generate_content(prompt, generation_config, request_options=None):
+            seen_in_flight.append(ai_service.rate_limiter.in_flight(model.model_name))
+            return Mock(text="ok")
+
+        model.generate_content.side_effect = generate_content
+
+        assert await ai_service._make_api_call(model, "prompt", {}) == "ok"
+        assert seen_in_flight == [1]
+        assert ai_service.rate_limiter.in_flight(model.model_name) == 0
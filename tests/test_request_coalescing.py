@@ -0,0 +1,343 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, patch
+
+from edagent.services.ai_service import GeminiAIService, QuotaExceededError
+from edagent.services.deadlines import deadline_scope, remaining_time
+from edagent.services.request_coalescing import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key share one call"""
+        flight = SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def slow_call():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flight.do("key", slow_call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.coalesced_count == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys run independently"""
+        flight = SingleFlight("test")
+        calls = []
+
+        async def call(value):
+            calls.append(value)
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: call("a")),
+            flight.do("b", lambda: call("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+        assert flight.coalesced_count == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_fan_out_to_all_waiters(self):
+        """Test that every waiter receives the shared call's exception"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def failing_call():
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.create_task(flight.do("key", failing_call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test that cancelling the first caller leaves the call running for the rest"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flight.do("key", slow_call))
+        follower = asyncio.create_task(flight.do("key", slow_call))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_call_cancelled_when_all_waiters_leave(self):
+        """Test that the underlying call is cancelled once nobody is waiting"""
+        flight = SingleFlight("test")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_call():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flight.do("key", slow_call))
+        await started.wait()
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_caller_after_cancel_starts_fresh_call(self):
+        """Test that a call being cancelled is never handed to a new caller"""
+        flight = SingleFlight("test")
+        started = asyncio.Event()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(10 if calls == 1 else 0)
+            return calls
+
+        waiter = asyncio.create_task(flight.do("key", call))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The cancelled task's done callback has not run yet
+        assert flight.in_flight() == 0
+        assert await flight.do("key", call) == 2
+
+    @pytest.mark.asyncio
+    async def test_new_call_after_completion(self):
+        """Test that a finished call is not reused for later requests"""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", call) == 1
+        assert await flight.do("key", call) == 2
+
+    @pytest.mark.asyncio
+    async def test_coalesced_callers_are_reported(self):
+        """Test that coalesced callers are reported to metrics"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "result"
+
+        with patch("edagent.api.metrics.track_gemini_request_coalesced") as mock_track:
+            waiters = [
+                asyncio.create_task(flight.do("key", slow_call, metric_label="gemini-1.5-flash"))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*waiters)
+
+        assert mock_track.call_count == 2
+        mock_track.assert_called_with("gemini-1.5-flash")
+
+    @pytest.mark.asyncio
+    async def test_coalesced_metric_label_drops_models_prefix(self):
+        """Test that coalescing metrics use the same model label as other Gemini metrics"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "result"
+
+        with patch("edagent.api.metrics.track_gemini_request_coalesced") as mock_track:
+            waiters = [
+                asyncio.create_task(flight.do("key", slow_call, metric_label="models/gemini-1.5-flash"))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*waiters)
+
+        mock_track.assert_called_once_with("gemini-1.5-flash")
+
+
+class TestSingleFlightDeadlines:
+    """Test cases for coalesced calls made under request deadlines"""
+
+    @pytest.mark.asyncio
+    async def test_shared_call_gets_most_generous_deadline(self):
+        """Test that a later caller with a longer deadline extends the shared call's deadline"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        seen = []
+
+        async def call():
+            await release.wait()
+            seen.append(remaining_time())
+            return "result"
+
+        async def caller(seconds):
+            with deadline_scope(seconds):
+                return await flight.do("key", call)
+
+        short = asyncio.create_task(caller(0.5))
+        await asyncio.sleep(0)
+        long = asyncio.create_task(caller(30.0))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(short, long) == ["result", "result"]
+        assert seen[0] > 29
+
+    @pytest.mark.asyncio
+    async def test_caller_without_deadline_lifts_shared_deadline(self):
+        """Test that a caller without a deadline removes the limit on the shared call"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        seen = []
+
+        async def call():
+            await release.wait()
+            seen.append(remaining_time())
+            return "result"
+
+        async def caller():
+            with deadline_scope(0.5):
+                return await flight.do("key", call)
+
+        first = asyncio.create_task(caller())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert seen == [float("inf")]
+
+    @pytest.mark.asyncio
+    async def test_short_deadline_caller_stops_waiting(self):
+        """Test that a caller gives up at its own deadline while others keep waiting"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        async def caller(seconds):
+            with deadline_scope(seconds):
+                return await flight.do("key", call)
+
+        long = asyncio.create_task(caller(30.0))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await caller(0.05)
+
+        release.set()
+        assert await long == "result"
+
+    @pytest.mark.asyncio
+    async def test_extension_does_not_change_callers_deadline(self):
+        """Test that extending the shared call's deadline leaves the first caller's deadline alone"""
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        async def caller(seconds):
+            with deadline_scope(seconds):
+                return await flight.do("key", call)
+
+        first = asyncio.create_task(caller(0.1))
+        await asyncio.sleep(0)
+        extended = asyncio.create_task(caller(30.0))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(first, timeout=1)
+        release.set()
+        assert await extended == "result"
+
+class TestGeminiAIServiceCoalescing:
+    """Test cases for coalescing in GeminiAIService"""
+
+    @pytest.fixture
+    def ai_service(self):
+        """Create AI service instance with the response cache disabled"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            service = GeminiAIService()
+        service.response_cache.enabled = False
+        return service
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_prompts_make_one_call(self, ai_service):
+        """Test that a burst of identical prompts reaches Gemini once"""
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+        model.generate_content.return_value = Mock(text="Start with Python basics")
+
+        with patch.object(ai_service, '_check_rate_limit'):
+            results = await asyncio.gather(*[
+                ai_service._make_api_call(model, "How do I start learning Python?", {"temperature": 0.7})
+                for _ in range(10)
+            ])
+
+        assert results == ["Start with Python basics"] * 10
+        assert model.generate_content.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_error_reaches_every_caller(self, ai_service):
+        """Test that a failed shared call raises for every coalesced caller"""
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+        model.generate_content.side_effect = Exception("quota exceeded")
+
+        with patch.object(ai_service, '_check_rate_limit'):
+            results = await asyncio.gather(*[
+                ai_service._make_api_call(model, "prompt", {})
+                for _ in range(3)
+            ], return_exceptions=True)
+
+        assert all(isinstance(result, QuotaExceededError) for result in results)
@@ -0,0 +1,239 @@
+"""
+Unit tests for the Gemini response cache
+"""
+
+import pytest
+from unittest.mock import Mock, patch, AsyncMock
+
+from edagent.models.user_context import UserContext
+from edagent.services.ai_service import GeminiAIService
+from edagent.services.response_cache import (
+    AIResponseCache,
+    InMemoryResponseCache,
+    RedisResponseCache,
+    create_response_cache
+)
+
+
+class TestAIResponseCacheKeys:
+    """Test cases for cache key construction"""
+
+    def test_normalize_prompt_collapses_whitespace(self):
+        """Test that formatting-only differences normalize to the same prompt"""
+        assert AIResponseCache.normalize_prompt("  Become a\n\nData   Scientist ") == "Become a Data Scientist"
+
+    def test_normalize_prompt_applies_nfkc(self):
+        """Test that Unicode compatibility forms normalize to the same prompt"""
+        assert AIResponseCache.normalize_prompt("ﬁle\u00a0Ｐython") == "file Python"
+
+    def test_equivalent_prompts_share_key(self):
+        """Test that prompts differing only in whitespace share a cache key"""
+        config = {"temperature": 0.7, "top_k": 40}
+        key1 = AIResponseCache.build_key("gemini-1.5-flash", config, "Learn Python from scratch")
+        key2 = AIResponseCache.build_key("gemini-1.5-flash", config, "Learn  Python\nfrom scratch ")
+        assert key1 == key2
+
+    def test_case_is_significant(self):
+        """Test that prompts differing in case, e.g. identifiers in code, do not share a key"""
+        config = {"temperature": 0.7}
+        key1 = AIResponseCache.build_key("gemini-1.5-flash", config, "What does userId do?")
+        key2 = AIResponseCache.build_key("gemini-1.5-flash", config, "What does userid do?")
+        assert key1 != key2
+
+    def test_key_depends_on_model_and_config(self):
+        """Test that model name and generation config are part of the key"""
+        prompt = "Learn Python from scratch"
+        base = AIResponseCache.build_key("gemini-1.5-flash", {"temperature": 0.7}, prompt)
+        assert base != AIResponseCache.build_key("gemini-1.5-pro", {"temperature": 0.7}, prompt)
+        assert base != AIResponseCache.build_key("gemini-1.5-flash", {"temperature": 0.3}, prompt)
+
+    def test_key_ignores_config_ordering(self):
+        """Test that generation config key order does not change the cache key"""
+        prompt = "Learn Python"
+        key1 = AIResponseCache.build_key("m", {"temperature": 0.7, "top_p": 0.9}, prompt)
+        key2 = AIResponseCache.build_key("m", {"top_p": 0.9, "temperature": 0.7}, prompt)
+        assert key1 == key2
+
+
+class TestInMemoryResponseCache:
+    """Test cases for the in-process LRU backend"""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self):
+        """Test storing and retrieving a response"""
+        backend = InMemoryResponseCache(max_entries=10)
+        await backend.set("key", "value", ttl_seconds=60)
+        assert await backend.get("key") == "value"
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self):
+        """Test that entries past their TTL are not returned"""
+        backend = InMemoryResponseCache(max_entries=10)
+        with patch("edagent.services.response_cache.time.monotonic", return_value=1000.0):
+            await backend.set("key", "value", ttl_seconds=60)
+        with patch("edagent.services.response_cache.time.monotonic", return_value=1061.0):
+            assert await backend.get("key") is None
+        assert len(backend) == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        backend = InMemoryResponseCache(max_entries=2)
+        await backend.set("a", "1", ttl_seconds=60)
+        await backend.set("b", "2", ttl_seconds=60)
+        await backend.get("a")  # "b" is now least recently used
+        await backend.set("c", "3", ttl_seconds=60)
+
+        assert await backend.get("a") == "1"
+        assert await backend.get("b") is None
+        assert await backend.get("c") == "3"
+
+
+class TestRedisResponseCache:
+    """Test cases for the Redis backend"""
+
+    @pytest.mark.asyncio
+    async def test_set_uses_prefix_and_ttl(self):
+        """Test that keys are namespaced and stored with an expiry"""
+        redis_client = AsyncMock()
+        backend = RedisResponseCache(redis_client)
+        await backend.set("key", "value", ttl_seconds=120)
+        redis_client.set.assert_awaited_once_with("edagent:ai_cache:key", "value", ex=120)
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_treated_as_misses(self):
+        """Test that a failing backend does not break lookups"""
+        redis_client = AsyncMock()
+        redis_client.get.side_effect = ConnectionError("redis down")
+        cache = AIResponseCache(RedisResponseCache(redis_client), {"chat": 60})
+        assert await cache.get("key", "gemini-1.5-flash") is None
+
+
+class TestAIResponseCache:
+    """Test cases for TTL selection and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_ttl_per_model_type(self):
+        """Test that the TTL configured for the model type is used"""
+        backend = AsyncMock()
+        cache = AIResponseCache(backend, {"chat": 60, "reasoning": 3600})
+        await cache.set("key", "value", model_type="reasoning")
+        backend.set.assert_awaited_once_with("key", "value", 3600)
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_storage(self):
+        """Test that a zero TTL skips caching for that model type"""
+        backend = AsyncMock()
+        cache = AIResponseCache(backend, {"chat": 0})
+        await cache.set("key", "value", model_type="chat")
+        backend.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_skips_backend(self):
+        """Test that a disabled cache never touches the backend"""
+        backend = AsyncMock()
+        cache = AIResponseCache(backend, {"chat": 60}, enabled=False)
+        assert await cache.get("key", "model") is None
+        await cache.set("key", "value")
+        backend.get.assert_not_awaited()
+        backend.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_lookup_records_hit_and_miss(self):
+        """Test that lookups are reported to the hit/miss counters"""
+        cache = AIResponseCache(InMemoryResponseCache(), {"chat": 60})
+        await cache.set("key", "value")
+
+        with patch("edagent.api.metrics.track_gemini_cache_lookup") as mock_track:
+            await cache.get("key", "gemini-1.5-flash")
+            await cache.get("missing", "gemini-1.5-flash")
+
+        mock_track.assert_any_call("gemini-1.5-flash", True)
+        mock_track.assert_any_call("gemini-1.5-flash", False)
+
+    @pytest.mark.asyncio
+    async def test_lookup_metrics_strip_models_prefix(self):
+        """Test that cache metrics use the same model label as the other Gemini metrics"""
+        cache = AIResponseCache(InMemoryResponseCache(), {"chat": 60})
+
+        with patch("edagent.api.metrics.track_gemini_cache_lookup") as mock_track:
+            await cache.get("missing", "models/gemini-1.5-flash")
+
+        mock_track.assert_called_once_with("gemini-1.5-flash", False)
+
+    def test_create_response_cache_falls_back_to_memory(self):
+        """Test that the redis backend falls back to memory without REDIS_URL"""
+        settings = Mock(
+            ai_cache_backend="redis",
+            redis_url=None,
+            ai_cache_max_entries=10,
+            ai_cache_ttl_chat_seconds=60,
+            ai_cache_ttl_reasoning_seconds=600,
+            ai_cache_enabled=True
+        )
+        cache = create_response_cache(settings)
+        assert isinstance(cache.backend, InMemoryResponseCache)
+        assert cache.ttl_by_model_type == {"chat": 60, "reasoning": 600}
+
+
+class TestGeminiAIServiceCaching:
+    """Test cases for cache integration in GeminiAIService"""
+
+    @pytest.fixture
+    def ai_service(self):
+        """Create AI service instance for testing"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            return GeminiAIService()
+
+    @pytest.fixture
+    def mock_model(self):
+        """Create mock Gemini model"""
+        model = Mock()
+        model.model_name = "models/gemini-1.5-pro"
+        model.generate_content.return_value = Mock(text="Cached learning path")
+        return model
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_served_from_cache(self, ai_service, mock_model):
+        """Test that an equivalent prompt does not reach Gemini twice"""
+        with patch.object(ai_service, '_check_rate_limit'):
+            config = ai_service._get_generation_config("reasoning")
+            first = await ai_service._make_api_call(mock_model, "Become a data scientist", config)
+            second = await ai_service._make_api_call(mock_model, "Become a  data\nscientist ", config)
+
+        assert first == second == "Cached learning path"
+        assert mock_model.generate_content.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_prompt_skips_cache(self, ai_service, mock_model):
+        """Test that per-user prompts are neither looked up nor stored"""
+        with patch.object(ai_service, '_check_rate_limit'):
+            await ai_service._make_api_call(mock_model, "User ID: user-1", {}, cacheable=False)
+            await ai_service._make_api_call(mock_model, "User ID: user-1", {}, cacheable=False)
+
+        assert mock_model.generate_content.call_count == 2
+        assert len(ai_service.response_cache.backend) == 0
+
+    @pytest.mark.asyncio
+    async def test_conversation_responses_are_not_cached(self, ai_service):
+        """Test that generate_response marks its per-user prompt uncacheable"""
+        with patch.object(ai_service, '_make_api_call', AsyncMock(return_value="Hi")) as make_api_call:
+            await ai_service.generate_response("Hello", UserContext(user_id="user-1"))
+
+        assert make_api_call.call_args.kwargs["cacheable"] is False
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, ai_service, mock_model):
+        """Test that failed calls are retried on the next request"""
+        mock_model.generate_content.side_effect = [Exception("quota exceeded"), Mock(text="ok")]
+
+        with patch.object(ai_service, '_check_rate_limit'):
+            with pytest.raises(Exception):
+                await ai_service._make_api_call(mock_model, "prompt", {})
+            assert await ai_service._make_api_call(mock_model, "prompt", {}) == "ok"
+
+    def test_model_type_from_model_name(self, ai_service):
+        """Test mapping model names back to the TTL model type"""
+        reasoning_model = ai_service.settings.gemini_model_reasoning
+        assert ai_service._get_model_type(f"models/{reasoning_model}") == "reasoning"
+        assert ai_service._get_model_type(ai_service.settings.gemini_model_chat) == "chat"
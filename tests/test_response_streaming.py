@@ -0,0 +1,244 @@
+"""
+Unit tests for token-streaming responses
+"""
+
+import pytest
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+from edagent.api.websocket import websocket_endpoint
+from edagent.models.conversation import ConversationResponse
+from edagent.models.user_context import UserContext, SkillLevel, SkillLevelEnum
+from edagent.services.ai_service import GeminiAIService, GeminiAPIError, FALLBACK_CONVERSATION_RESPONSE
+from edagent.services.conversation_manager import ConversationManager
+
+
+class _ChunkStream:
+    """Async iterable standing in for a streamed Gemini response"""
+
+    def __init__(self, texts, error=None):
+        self.texts = texts
+        self.error = error
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for text in self.texts:
+            yield Mock(text=text)
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def user_context():
+    """Create sample user context"""
+    return UserContext(
+        user_id="test-user-123",
+        current_skills={
+            "python": SkillLevel(
+                skill_name="python",
+                level=SkillLevelEnum.BEGINNER,
+                confidence_score=0.6,
+                last_updated=datetime.now()
+            )
+        },
+        career_goals=["become a software developer"],
+        created_at=datetime.now(),
+        last_active=datetime.now()
+    )
+
+
+class TestGeminiAIServiceStreaming:
+    """Test cases for GeminiAIService.generate_response_stream"""
+
+    @pytest.fixture
+    def ai_service(self):
+        """Create AI service instance with a mocked chat model"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            service = GeminiAIService()
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+        service._get_model = Mock(return_value=model)
+        return service
+
+    async def _collect(self, ai_service, prompt, context):
+        with patch.object(ai_service, '_check_rate_limit'):
+            return [chunk async for chunk in ai_service.generate_response_stream(prompt, context)]
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_yielded_in_order(self, ai_service, user_context):
+        """Test that Gemini chunks are forwarded as they arrive"""
+        model = ai_service._get_model("chat")
+        model.generate_content_async = AsyncMock(return_value=_ChunkStream(["Start ", "with ", "Python."]))
+
+        chunks = await self._collect(ai_service, "How do I start?", user_context)
+
+        assert chunks == ["Start ", "with ", "Python."]
+        assert model.generate_content_async.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_streamed_responses_are_not_cached(self, ai_service, user_context):
+        """Test that a repeated per-user prompt is streamed from Gemini again"""
+        model = ai_service._get_model("chat")
+        model.generate_content_async = AsyncMock(
+            side_effect=lambda *args, **kwargs: _ChunkStream(["Start ", "with Python."])
+        )
+
+        await self._collect(ai_service, "How do I start?", user_context)
+        chunks = await self._collect(ai_service, "How do I start?", user_context)
+
+        assert chunks == ["Start ", "with Python."]
+        assert model.generate_content_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_before_first_chunk_yields_fallback(self, ai_service, user_context):
+        """Test that a failed stream still produces a response"""
+        model = ai_service._get_model("chat")
+        model.generate_content_async = AsyncMock(side_effect=Exception("connection reset"))
+
+        chunks = await self._collect(ai_service, "How do I start?", user_context)
+
+        assert chunks == [FALLBACK_CONVERSATION_RESPONSE]
+
+    @pytest.mark.asyncio
+    async def test_error_mid_stream_is_raised_after_partial_output(self, ai_service, user_context):
+        """Test that a failure after some chunks is raised and nothing is cached"""
+        model = ai_service._get_model("chat")
+        model.generate_content_async = AsyncMock(
+            return_value=_ChunkStream(["Start "], error=Exception("stream aborted"))
+        )
+
+        chunks = []
+        with pytest.raises(GeminiAPIError):
+            async for chunk in ai_service.generate_response_stream("How do I start?", user_context):
+                chunks.append(chunk)
+
+        assert chunks == ["Start "]
+        assert len(ai_service.response_cache.backend) == 0
+
+
+class TestConversationManagerStreaming:
+    """Test cases for ConversationManager.handle_message_stream"""
+
+    @pytest.fixture
+    def conversation_manager(self):
+        """Create ConversationManager instance with mocked dependencies"""
+        with patch('edagent.services.conversation_manager.GeminiAIService') as mock_ai, \
+             patch('edagent.services.conversation_manager.UserContextManager') as mock_ucm, \
+             patch('edagent.services.conversation_manager.ContentRecommender') as mock_cr:
+
+            manager = ConversationManager()
+            manager.ai_service = mock_ai.return_value
+            manager.user_context_manager = mock_ucm.return_value
+            manager.content_recommender = mock_cr.return_value
+
+            return manager
+
+    @pytest.mark.asyncio
+    async def test_general_conversation_streams_chunks(self, conversation_manager, user_context):
+        """Test that chunks reach the callback and the final response holds the full text"""
+        async def fake_stream(message, context):
+            for chunk in ["Hello! ", "Let's plan ", "your learning."]:
+                yield chunk
+
+        conversation_manager.user_context_manager.get_user_context = AsyncMock(return_value=user_context)
+        conversation_manager.user_context_manager.add_conversation = AsyncMock()
+        conversation_manager.ai_service.generate_response_stream = fake_stream
+
+        received = []
+
+        async def on_chunk(chunk):
+            received.append(chunk)
+
+        response = await conversation_manager.handle_message_stream("test-user-123", "Hello there", on_chunk)
+
+        assert received == ["Hello! ", "Let's plan ", "your learning."]
+        assert isinstance(response, ConversationResponse)
+        assert "Let's plan your learning." in response.message
+        assert response.metadata["streamed"] is True
+        assert response.metadata["chunk_count"] == 3
+        assert "truncated" not in response.metadata
+
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_is_marked_truncated(self, conversation_manager, user_context):
+        """Test that a stream failing mid-way ends with the partial text marked as truncated"""
+        async def failing_stream(message, context):
+            yield "Start with "
+            raise GeminiAPIError("connection reset")
+
+        conversation_manager.user_context_manager.get_user_context = AsyncMock(return_value=user_context)
+        conversation_manager.user_context_manager.add_conversation = AsyncMock()
+        conversation_manager.ai_service.generate_response_stream = failing_stream
+
+        response = await conversation_manager.handle_message_stream("test-user-123", "Hello there", AsyncMock())
+
+        assert response.message == "Start with"
+        assert response.metadata["truncated"] is True
+        assert response.metadata["chunk_count"] == 1
+        assert response.confidence_score < 0.9
+
+    @pytest.mark.asyncio
+    async def test_non_general_intents_do_not_stream(self, conversation_manager, user_context):
+        """Test that structured flows are handled the same way as handle_message"""
+        conversation_manager.user_context_manager.get_user_context = AsyncMock(return_value=user_context)
+        conversation_manager.ai_service.generate_response_stream = Mock()
+        expected = ConversationResponse(message="Assessment started", response_type="assessment")
+
+        on_chunk = AsyncMock()
+        with patch.object(conversation_manager, '_initiate_skill_assessment', AsyncMock(return_value=expected)):
+            response = await conversation_manager.handle_message_stream(
+                "test-user-123", "Can you assess my skills?", on_chunk
+            )
+
+        assert response is expected
+        on_chunk.assert_not_awaited()
+        conversation_manager.ai_service.generate_response_stream.assert_not_called()
+
+
+class TestWebSocketStreaming:
+    """Test cases for streamed responses over the WebSocket endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_stream_flag_sends_chunks_then_end_message(self, user_context):
+        """Test the chunk/end message sequence for a streamed request"""
+        from tests.test_websocket_integration import MockWebSocket
+
+        websocket = MockWebSocket()
+        websocket.add_received_message({"message": "Hello EdAgent", "stream": True})
+
+        async def handle_message_stream(user_id, message, on_chunk):
+            await on_chunk("Hello")
+            await on_chunk(" there")
+            return ConversationResponse(message="Hello there", response_type="text", confidence_score=0.9)
+
+        conversation_manager = AsyncMock()
+        conversation_manager.handle_message_stream = handle_message_stream
+        user_context_manager = AsyncMock()
+        user_context_manager.get_user_context.return_value = user_context
+
+        task = asyncio.create_task(
+            websocket_endpoint(websocket, "stream-user", conversation_manager, user_context_manager)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        types = [msg["type"] for msg in websocket.messages_sent]
+        start = types.index("ai_response_chunk")
+        assert types[start - 1:start + 3] == [
+            "typing_indicator", "ai_response_chunk", "ai_response_chunk", "ai_response_end"
+        ]
+        assert websocket.messages_sent[start - 1]["is_typing"] is False
+        assert types.count("typing_indicator") == 2
+
+        chunks = [msg for msg in websocket.messages_sent if msg["type"] == "ai_response_chunk"]
+        assert [(msg["message"], msg["chunk_index"]) for msg in chunks] == [("Hello", 0), (" there", 1)]
+
+        end = websocket.messages_sent[start + 2]
+        assert end["message"] == "Hello there"
+        assert end["confidence_score"] == 0.9
@@ -0,0 +1,34 @@
+"""
+Unit tests for environment variable handling in Settings
+"""
+
+import pytest
+
+from edagent.config.settings import Settings
+
+
+class TestSettingsEnvironment:
+    """Test that documented environment variable names are honoured"""
+
+    @pytest.mark.parametrize("env_name, field_name, value, expected", [
+        ("AI_CACHE_TTL_CHAT", "ai_cache_ttl_chat_seconds", "120", 120),
+        ("AI_CACHE_TTL_REASONING", "ai_cache_ttl_reasoning_seconds", "600", 600),
+        ("PROMPT_MAX_TOKENS", "prompt_max_tokens", "3000", 3000),
+        ("PROMPT_HISTORY_TOKENS", "prompt_history_tokens", "800", 800),
+        ("RATE_LIMIT_RPM", "rate_limit_requests_per_minute", "7", 7),
+        ("RATE_LIMIT_BURST", "rate_limit_burst_size", "3", 3),
+        ("GEMINI_MAX_CONCURRENCY", "gemini_max_concurrent_requests", "3", 3),
+        ("GEMINI_REQUEST_TIMEOUT", "gemini_request_timeout_seconds", "12.5", 12.5),
+        ("GEMINI_EXECUTOR_WORKERS", "gemini_executor_max_workers", "4", 4),
+        ("AI_REQUEST_DEADLINE", "ai_request_deadline_seconds", "9", 9.0),
+        ("GEMINI_REASONING_MIN_BUDGET", "gemini_reasoning_min_budget_seconds", "5", 5.0),
+        ("GEMINI_HEDGE_DELAY", "gemini_hedge_delay_seconds", "1.5", 1.5),
+    ])
+    def test_documented_env_name(self, monkeypatch, env_name, field_name, value, expected):
+        """Test that each documented variable sets its field"""
+        monkeypatch.setenv(env_name, value)
+        assert getattr(Settings(), field_name) == expected
+
+    def test_field_name_still_accepted(self):
+        """Test that settings can still be built with field names"""
+        assert Settings(ai_cache_ttl_chat_seconds=42).ai_cache_ttl_chat_seconds == 42
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import asyncio
 
 from edagent.services.conversation_manager import ConversationManager, ConversationState
+from edagent.services.question_bank import QuestionBank
 from edagent.models.conversation import (
     ConversationResponse, AssessmentSession, Message, MessageType, ConversationStatus
 )
@@ -33,6 +34,7 @@ class TestSkillAssessmentWorkflow:
             manager.content_recommender = mock_cr.return_value
             manager.prompt_builder = mock_pb.return_value
             manager.response_handler = mock_rh.return_value
+            manager.question_bank = QuestionBank()
             
             return manager
     
@@ -97,7 +99,7 @@ class TestSkillAssessmentWorkflow:
         assert "assess" in response.message.lower()
         
         # Check conversation state
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assert state.is_in_assessment()
         assert state.active_assessment is not None
         assert state.active_assessment.skill_area == "General"
@@ -116,7 +118,7 @@ class TestSkillAssessmentWorkflow:
         await conversation_manager.handle_message(user_id, "Assess my skills")
         
         # Get conversation state
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assessment = state.active_assessment
         
         # Simulate answering questions
@@ -148,6 +150,8 @@ class TestSkillAssessmentWorkflow:
         conversation_manager.user_context_manager.get_user_context = AsyncMock(return_value=sample_user_context)
         conversation_manager.user_context_manager.add_conversation = AsyncMock()
         conversation_manager.ai_service._infer_skill_area = MagicMock(return_value="Programming")
+        # No banked questions, so they are generated live
+        conversation_manager.question_bank = QuestionBank(seed_templates=False)
         conversation_manager.ai_service._get_model = MagicMock()
         conversation_manager.ai_service._get_generation_config = MagicMock()
         conversation_manager.ai_service._make_api_call = AsyncMock(return_value="What programming languages interest you most?\nHave you tried any coding tutorials before?\nWhat type of applications would you like to build?")
@@ -173,7 +177,7 @@ class TestSkillAssessmentWorkflow:
             await conversation_manager.handle_message(user_id, response_text)
         
         # Check that adaptive questions were added
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assessment = state.active_assessment
         
         # Should have original 5 + 2 adaptive questions
@@ -200,7 +204,7 @@ class TestSkillAssessmentWorkflow:
         await conversation_manager.handle_message(user_id, "Assess my skills")
         
         # Get assessment and manually complete all questions
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assessment = state.active_assessment
         
         # Answer all questions (5 initial + 2 adaptive)
@@ -272,7 +276,7 @@ class TestSkillAssessmentWorkflow:
         assert final_response.confidence_score <= 0.5
         
         # State should be reset
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assert not state.is_in_assessment()
     
     @pytest.mark.asyncio
@@ -363,7 +367,7 @@ class TestSkillAssessmentWorkflow:
             await conversation_manager.handle_message(user_id, response_text)
         
         # Check that skill area was inferred and updated
-        state = conversation_manager._conversation_states[user_id]
+        state = await conversation_manager._conversation_states.get(user_id)
         assessment = state.active_assessment
         
         # Should be called with user responses
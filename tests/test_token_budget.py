@@ -0,0 +1,208 @@
+"""
+Unit tests for token estimation and prompt budget enforcement
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from edagent.models.user_context import UserContext, SkillLevel, SkillLevelEnum
+from edagent.services.ai_service import GeminiAIService
+from edagent.services.prompt_engineering import PromptBuilder
+from edagent.services.token_budget import (
+    PromptBudget,
+    PromptSection,
+    allocate_budget,
+    estimate_tokens,
+    truncate_to_tokens,
+    TRUNCATION_MARKER
+)
+
+
+class TestEstimateTokens:
+    """Test cases for the token estimator"""
+
+    def test_empty_text(self):
+        """Test that empty text has no tokens"""
+        assert estimate_tokens("") == 0
+
+    def test_prose_uses_character_ratio(self):
+        """Test that long words are counted by characters"""
+        assert estimate_tokens("internationalization " * 10) == 53
+
+    def test_symbol_heavy_text_not_underestimated(self):
+        """Test that punctuation-dense text is counted per symbol"""
+        text = '{"a": [1, 2, 3]}'
+        assert estimate_tokens(text) >= 12
+
+
+class TestTruncateToTokens:
+    """Test cases for budget-aware truncation"""
+
+    def test_text_within_budget_is_unchanged(self):
+        """Test that short text is returned as-is"""
+        assert truncate_to_tokens("hello world", 10) == "hello world"
+
+    def test_keeps_whole_lines_from_head(self):
+        """Test that truncation drops trailing lines first"""
+        text = "\n".join(f"line number {i}" for i in range(20))
+        result = truncate_to_tokens(text, 12)
+
+        assert result.startswith("line number 0")
+        assert estimate_tokens(result) <= 12
+        assert "line number 19" not in result
+
+    def test_keeps_whole_lines_from_tail(self):
+        """Test that tail truncation keeps the newest lines"""
+        text = "\n".join(f"line number {i}" for i in range(20))
+        result = truncate_to_tokens(text, 12, keep="tail")
+
+        assert result.endswith("line number 19")
+        assert "line number 0\n" not in result
+
+    def test_cuts_single_long_line(self):
+        """Test that an oversized line is cut and marked"""
+        result = truncate_to_tokens("word " * 500, 20)
+
+        assert result.endswith(TRUNCATION_MARKER)
+        assert estimate_tokens(result) <= 20
+
+    def test_zero_budget(self):
+        """Test that a zero budget removes the text"""
+        assert truncate_to_tokens("some text", 0) == ""
+
+
+class TestAllocateBudget:
+    """Test cases for the section budget allocator"""
+
+    def test_section_caps_apply(self):
+        """Test that each section is held to its own cap"""
+        sections = [PromptSection("history", "word " * 400, priority=1, max_tokens=100)]
+        assert allocate_budget(sections, 10000) == {"history": 100}
+
+    def test_lowest_priority_trimmed_first(self):
+        """Test that overflow is taken from low-priority sections"""
+        sections = [
+            PromptSection("system", "a " * 100, priority=3),
+            PromptSection("profile", "b " * 100, priority=2),
+            PromptSection("history", "c " * 100, priority=1),
+        ]
+        allowance = allocate_budget(sections, 250)
+
+        assert allowance["system"] == 100
+        assert allowance["profile"] == 100
+        assert allowance["history"] == 50
+
+    def test_overflow_spills_into_next_priority(self):
+        """Test that higher priorities are trimmed once lower ones are empty"""
+        sections = [
+            PromptSection("user_message", "a " * 100, priority=2),
+            PromptSection("history", "c " * 100, priority=1),
+        ]
+        assert allocate_budget(sections, 60) == {"user_message": 60, "history": 0}
+
+
+class TestPromptBuilderBudget:
+    """Test cases for budget enforcement in PromptBuilder"""
+
+    @pytest.fixture
+    def long_history_context(self):
+        """Create a user context with long conversation history"""
+        return UserContext(
+            user_id="budget-user",
+            career_goals=["become a data engineer"],
+            conversation_history=[f"message {i}: " + "details " * 200 for i in range(5)]
+        )
+
+    def test_unconstrained_prompt_keeps_all_sections(self, long_history_context):
+        """Test that a generous budget changes nothing"""
+        prompt = PromptBuilder(PromptBudget(total_tokens=100000, history_tokens=100000)).build_conversation_prompt(
+            "How do I learn SQL?", long_history_context
+        )
+
+        assert "1. message 0" in prompt
+        assert "5. message 4" in prompt
+        assert "Career goals: become a data engineer" in prompt
+
+    def test_history_drops_oldest_messages(self, long_history_context):
+        """Test that history is trimmed from the oldest message"""
+        prompt = PromptBuilder(PromptBudget(history_tokens=900)).build_conversation_prompt(
+            "How do I learn SQL?", long_history_context
+        )
+
+        assert "message 0" not in prompt
+        assert "message 4" in prompt
+        assert prompt.endswith("User message: How do I learn SQL?\n\nResponse:")
+
+    def test_total_budget_caps_prompt(self, long_history_context):
+        """Test that the whole prompt stays within the total budget"""
+        budget = PromptBudget(total_tokens=1200)
+        prompt = PromptBuilder(budget).build_conversation_prompt("word " * 2000, long_history_context)
+
+        assert estimate_tokens(prompt) <= budget.total_tokens
+        assert "You are EdAgent" in prompt
+        assert "User message: word" in prompt
+
+    def test_learning_path_schema_never_trimmed(self):
+        """Test that only user-supplied sections are trimmed in learning path prompts"""
+        skills = {
+            f"skill_{i}": SkillLevel(skill_name=f"skill_{i}", level=SkillLevelEnum.BEGINNER, confidence_score=0.5)
+            for i in range(300)
+        }
+        prompt = PromptBuilder(PromptBudget(total_tokens=2000)).build_learning_path_prompt("learn SQL", skills)
+
+        assert "Goal: learn SQL" in prompt
+        assert '"milestones": [' in prompt
+        assert "skill_299" not in prompt
+        assert estimate_tokens(prompt) <= 2000
+
+    def test_section_metrics_recorded(self, long_history_context):
+        """Test that section sizes and trimmed tokens are reported"""
+        with patch("edagent.api.metrics.track_prompt_section_tokens") as mock_track:
+            PromptBuilder(PromptBudget(history_tokens=100)).build_conversation_prompt("hi", long_history_context)
+
+        recorded = {call.args[1]: call.args for call in mock_track.call_args_list}
+        assert recorded["history"][2] <= 100
+        assert recorded["history"][3] > 0
+        assert recorded["user_message"][3] == 0
+
+
+class TestTokenUsageMetrics:
+    """Test cases for Gemini token usage metrics"""
+
+    @pytest.fixture
+    def ai_service(self):
+        """Create AI service instance with the response cache disabled"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            service = GeminiAIService()
+        service.response_cache.enabled = False
+        return service
+
+    @pytest.mark.asyncio
+    async def test_usage_metadata_preferred(self, ai_service):
+        """Test that Gemini's own token counts are recorded when present"""
+        model = Mock()
+        model.model_name = "models/gemini-1.5-flash"
+        model.generate_content.return_value = Mock(
+            text="answer",
+            usage_metadata=Mock(prompt_token_count=321, candidates_token_count=45)
+        )
+
+        with patch("edagent.api.metrics.track_gemini_token_usage") as mock_track:
+            await ai_service._make_api_call(model, "prompt", {}, operation="conversation")
+
+        mock_track.assert_called_once_with("conversation", "gemini-1.5-flash", 321, 45)
+
+    @pytest.mark.asyncio
+    async def test_estimates_used_without_metadata(self, ai_service):
+        """Test that token counts fall back to estimates"""
+        model = Mock()
+        model.model_name = "models/gemini-1.5-pro"
+        model.generate_content.return_value = Mock(text="a short answer", usage_metadata=None)
+
+        with patch("edagent.api.metrics.track_gemini_token_usage") as mock_track:
+            await ai_service._make_api_call(model, "a prompt of some length", {}, operation="learning_path")
+
+        mock_track.assert_called_once_with(
+            "learning_path", "gemini-1.5-pro",
+            estimate_tokens("a prompt of some length"), estimate_tokens("a short answer")
+        )
@@ -0,0 +1,226 @@
+"""
+Unit tests for the UserContext cache
+"""
+
+import pytest
+import pytest_asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.config.settings import get_settings
+from edagent.database.models import Base, User
+from edagent.models.user_context import UserContext, SkillLevel, SkillLevelEnum
+from edagent.services.conversation_writer import ConversationWriter
+from edagent.services.response_cache import InMemoryResponseCache, RedisResponseCache
+from edagent.services.user_context_cache import UserContextCache, create_user_context_cache
+from edagent.services.user_context_manager import UserContextManager
+
+
+@pytest.fixture
+def cache():
+    """Create an in-memory user context cache"""
+    return UserContextCache(InMemoryResponseCache(max_entries=10), ttl_seconds=60, history_messages=4)
+
+
+class TestUserContextCache:
+    """Test cases for UserContextCache"""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, cache):
+        """Test that a stored context is served back with hit and miss metrics recorded"""
+        skill = SkillLevel("python", SkillLevelEnum.BEGINNER, 0.5)
+        context = UserContext(user_id="user-1", current_skills={"python": skill})
+
+        with patch("edagent.api.metrics.track_user_context_cache_lookup") as mock_track:
+            assert await cache.get("user-1") is None
+            await cache.set(context)
+            cached = await cache.get("user-1")
+
+        assert cached.current_skills["python"].level == SkillLevelEnum.BEGINNER
+        assert mock_track.call_args_list[0].args == (False, None)
+        hit, age = mock_track.call_args_list[1].args
+        assert hit is True and 0 <= age < 1
+
+    @pytest.mark.asyncio
+    async def test_callers_get_their_own_copy(self, cache):
+        """Test that mutating a served context does not change the cached entry"""
+        await cache.set(UserContext(user_id="user-1"))
+
+        (await cache.get("user-1")).conversation_history.append("leaked")
+
+        assert (await cache.get("user-1")).conversation_history == []
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, cache):
+        """Test that entries are not served after their TTL"""
+        await cache.set(UserContext(user_id="user-1"))
+
+        with patch("edagent.services.response_cache.time.monotonic", return_value=10**9):
+            assert await cache.get("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        """Test that the cache holds at most max_entries contexts"""
+        cache = UserContextCache(InMemoryResponseCache(max_entries=2))
+        for user_id in ("user-1", "user-2"):
+            await cache.set(UserContext(user_id=user_id))
+        await cache.get("user-1")
+        await cache.set(UserContext(user_id="user-3"))
+
+        assert await cache.get("user-1") is not None
+        assert await cache.get("user-2") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, cache):
+        """Test that invalidation drops the entry and is counted by reason"""
+        await cache.set(UserContext(user_id="user-1"))
+
+        with patch("edagent.api.metrics.track_user_context_cache_invalidation") as mock_track:
+            await cache.invalidate("user-1", "skills")
+
+        assert await cache.get("user-1") is None
+        mock_track.assert_called_once_with("skills")
+
+    @pytest.mark.asyncio
+    async def test_record_conversation_appends_recent_history(self, cache):
+        """Test that new turns are appended and history is trimmed to the configured size"""
+        await cache.set(UserContext(user_id="user-1", conversation_history=["q0", "a0", "q1", "a1"]))
+
+        await cache.record_conversation("user-1", "q2", "a2")
+
+        assert (await cache.get("user-1")).conversation_history == ["q1", "a1", "q2", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_record_conversation_without_entry_is_noop(self, cache):
+        """Test that a turn for an uncached user does not create a partial entry"""
+        await cache.record_conversation("user-1", "q", "a")
+
+        assert await cache.get("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_invalidates_on_conversation(self):
+        """Test that with a shared backend new turns invalidate instead of read-modify-write"""
+        redis = Mock()
+        redis.get = AsyncMock(return_value=None)
+        redis.delete = AsyncMock()
+        cache = UserContextCache(RedisResponseCache(redis, key_prefix="ctx:"), update_in_place=False)
+
+        await cache.record_conversation("user-1", "q", "a")
+
+        redis.delete.assert_awaited_once_with("ctx:user-1")
+        redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_backend_failures_are_misses(self):
+        """Test that an unavailable backend degrades to reading the database"""
+        redis = Mock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = UserContextCache(RedisResponseCache(redis))
+
+        await cache.set(UserContext(user_id="user-1"))
+        assert await cache.get("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test that a disabled cache stores nothing"""
+        cache = UserContextCache(InMemoryResponseCache(), enabled=False)
+        await cache.set(UserContext(user_id="user-1"))
+
+        assert await cache.get("user-1") is None
+
+    def test_redis_without_url_falls_back_to_memory(self):
+        """Test that the factory uses memory when Redis is selected but not configured"""
+        settings = get_settings().model_copy()
+        settings.user_context_cache_backend = "redis"
+        settings.redis_url = None
+
+        cache = create_user_context_cache(settings)
+
+        assert isinstance(cache.backend, InMemoryResponseCache)
+        assert cache.update_in_place is True
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def user_context_manager(session_factory, cache):
+    """Create a UserContextManager with its own cache, reading from the in-memory database"""
+    @asynccontextmanager
+    async def get_session(readonly=False):
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    db_manager = Mock()
+    db_manager.get_session = get_session
+    with patch("edagent.services.user_context_manager.db_manager", db_manager):
+        manager = UserContextManager()
+        manager.context_cache = cache
+        manager.conversation_writer = ConversationWriter(session_factory=get_session)
+        yield manager
+
+
+async def create_user(factory):
+    """Create a user without history"""
+    user_id = uuid.uuid4()
+    async with factory() as session:
+        session.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x", preferences={}))
+        await session.commit()
+    return str(user_id)
+
+
+class TestUserContextManagerCaching:
+    """Test cases for the cache in front of UserContextManager"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_reads_skip_database(self, user_context_manager, session_factory):
+        """Test that only the first read of a context queries the database"""
+        user_id = await create_user(session_factory)
+        load = AsyncMock(wraps=user_context_manager.db_utils.load_user_context)
+        user_context_manager.db_utils.load_user_context = load
+
+        await user_context_manager.get_user_context(user_id)
+        await user_context_manager.get_user_context(user_id)
+
+        assert load.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_skill_update_is_visible(self, user_context_manager, session_factory):
+        """Test that a skill update invalidates the cached context"""
+        user_id = await create_user(session_factory)
+        await user_context_manager.get_user_context(user_id)
+
+        await user_context_manager.update_skills(user_id, {
+            "sql": SkillLevel("sql", SkillLevelEnum.INTERMEDIATE, 0.7)
+        })
+
+        context = await user_context_manager.get_user_context(user_id)
+        assert context.current_skills["sql"].level == SkillLevelEnum.INTERMEDIATE
+
+    @pytest.mark.asyncio
+    async def test_new_turn_matches_database(self, user_context_manager, session_factory):
+        """Test that a cached context after a new turn matches a fresh database load"""
+        user_id = await create_user(session_factory)
+        await user_context_manager.get_user_context(user_id)
+
+        await user_context_manager.add_conversation(user_id, "What is a join?", "A join combines tables.")
+
+        cached = await user_context_manager.get_user_context(user_id)
+        await user_context_manager.context_cache.clear()
+        fresh = await user_context_manager.get_user_context(user_id)
+        assert cached.conversation_history == fresh.conversation_history == [
+            "What is a join?", "A join combines tables."
+        ]
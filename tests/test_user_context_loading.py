@@ -0,0 +1,172 @@
+"""
+Unit tests and benchmark for loading UserContext from the database
+"""
+
+import pytest
+import pytest_asyncio
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from edagent.database.models import Base, Conversation, User, UserSkill
+from edagent.database.utils import DatabaseUtils
+from edagent.services.response_cache import InMemoryResponseCache
+from edagent.services.user_context_cache import UserContextCache
+from edagent.services.user_context_manager import UserContextManager, CONTEXT_CONVERSATION_TURNS
+
+
+HISTORY_SIZE = 10_000
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def create_user_with_history(factory, conversation_count):
+    """Create a user with skills and a long conversation history"""
+    user_id = uuid.uuid4()
+    start = datetime(2025, 1, 1)
+    async with factory() as session:
+        session.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x", preferences={}))
+        session.add(UserSkill(user_id=user_id, skill_name="python", level="beginner", confidence_score=0.6))
+        await session.flush()
+        await session.execute(insert(Conversation), [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "message": f"question {i}",
+                "response": f"answer {i} " + "detail " * 50,
+                "timestamp": start + timedelta(minutes=i),
+                "message_type": "general",
+                "context_data": {}
+            }
+            for i in range(conversation_count)
+        ])
+        await session.commit()
+    return user_id
+
+
+@pytest.fixture
+def user_context_manager(session_factory):
+    """Create a UserContextManager reading from the in-memory database"""
+    @asynccontextmanager
+    async def get_session(readonly=False):
+        async with session_factory() as session:
+            yield session
+
+    db_manager = Mock()
+    db_manager.get_session = get_session
+    with patch("edagent.services.user_context_manager.db_manager", db_manager):
+        yield UserContextManager()
+
+
+class TestLoadUserContext:
+    """Test cases for DatabaseUtils.load_user_context"""
+
+    @pytest.mark.asyncio
+    async def test_recent_conversations_oldest_first(self, session_factory):
+        """Test that only the most recent conversations are loaded, oldest first"""
+        user_id = await create_user_with_history(session_factory, 20)
+
+        async with session_factory() as session:
+            data = await DatabaseUtils.load_user_context(session, user_id, recent_conversations=3)
+
+        assert [row.message for row in data["recent_conversations"]] == ["question 17", "question 18", "question 19"]
+        assert [skill.skill_name for skill in data["user"].skills] == ["python"]
+
+    @pytest.mark.asyncio
+    async def test_conversations_relationship_not_loaded(self, session_factory):
+        """Test that the user's conversations collection is left unloaded"""
+        user_id = await create_user_with_history(session_factory, 20)
+
+        async with session_factory() as session:
+            data = await DatabaseUtils.load_user_context(session, user_id)
+
+        assert "conversations" not in data["user"].__dict__
+        assert "learning_paths" not in data["user"].__dict__
+
+    @pytest.mark.asyncio
+    async def test_missing_user(self, session_factory):
+        """Test that an unknown user yields None"""
+        async with session_factory() as session:
+            assert await DatabaseUtils.load_user_context(session, uuid.uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_get_user_by_id_loads_only_requested_relationships(self, session_factory):
+        """Test that relationships are loaded only when asked for"""
+        user_id = await create_user_with_history(session_factory, 3)
+
+        async with session_factory() as session:
+            plain = await DatabaseUtils.get_user_by_id(session, user_id)
+            assert "conversations" not in plain.__dict__
+
+        async with session_factory() as session:
+            full = await DatabaseUtils.get_user_by_id(session, user_id, relationships=("skills", "conversations"))
+            assert len(full.conversations) == 3
+
+        async with session_factory() as session:
+            with pytest.raises(ValueError):
+                await DatabaseUtils.get_user_by_id(session, user_id, relationships=("friends",))
+
+    @pytest.mark.asyncio
+    async def test_user_context_history(self, user_context_manager, session_factory):
+        """Test that UserContext holds the most recent turns, oldest first"""
+        user_id = await create_user_with_history(session_factory, 12)
+
+        context = await user_context_manager.get_user_context(str(user_id))
+
+        assert len(context.conversation_history) == 2 * CONTEXT_CONVERSATION_TURNS
+        assert context.conversation_history[0] == "question 7"
+        assert context.conversation_history[-2] == "question 11"
+        assert "python" in context.current_skills
+
+
+@pytest.mark.benchmark
+class TestUserContextLoadingBenchmark:
+    """Compare context loading for a user with a long history against loading every relationship"""
+
+    ROUNDS = 10
+
+    @pytest.mark.asyncio
+    async def test_long_history_user(self, user_context_manager, session_factory):
+        """Measure per-message context loading for a user with 10k+ conversations"""
+        user_id = await create_user_with_history(session_factory, HISTORY_SIZE)
+        # Measure the database path, not the context cache
+        user_context_manager.context_cache = UserContextCache(InMemoryResponseCache(), enabled=False)
+
+        async def load_everything():
+            # What building a context used to cost: every relationship, sorted in Python
+            async with session_factory() as session:
+                user = await DatabaseUtils.get_user_by_id(
+                    session, user_id, relationships=("skills", "conversations", "learning_paths")
+                )
+                return sorted(user.conversations, key=lambda c: c.timestamp, reverse=True)[:CONTEXT_CONVERSATION_TURNS]
+
+        async def timed(load):
+            samples = []
+            for _ in range(self.ROUNDS):
+                start = time.perf_counter()
+                await load()
+                samples.append(time.perf_counter() - start)
+            return statistics.median(samples)
+
+        full_load = await timed(load_everything)
+        context_load = await timed(lambda: user_context_manager.get_user_context(str(user_id)))
+
+        print(
+            f"\nUserContext load with {HISTORY_SIZE} conversations: "
+            f"{context_load * 1000:.1f} ms (all relationships: {full_load * 1000:.1f} ms)"
+        )
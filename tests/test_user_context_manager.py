@@ -168,7 +168,9 @@ class TestUserContextManager:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
-            user_context_manager.db_utils.get_user_by_id = AsyncMock(return_value=sample_db_user)
+            user_context_manager.db_utils.load_user_context = AsyncMock(
+                return_value={"user": sample_db_user, "recent_conversations": sample_db_user.conversations}
+            )
             
             result = await user_context_manager.get_user_context("test-user-123")
             
@@ -187,7 +189,7 @@ class TestUserContextManager:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
-            user_context_manager.db_utils.get_user_by_id = AsyncMock(return_value=None)
+            user_context_manager.db_utils.load_user_context = AsyncMock(return_value=None)
             
             result = await user_context_manager.get_user_context("nonexistent-user")
             
@@ -472,7 +474,7 @@ class TestUserContextManager:
     def test_db_user_to_context_conversion(self, user_context_manager, sample_db_user):
         """Test conversion from database user to UserContext"""
         # This is a private method, but we can test it directly for thoroughness
-        result = asyncio.run(user_context_manager._db_user_to_context(sample_db_user))
+        result = asyncio.run(user_context_manager._db_user_to_context(sample_db_user, sample_db_user.conversations))
         
         assert isinstance(result, UserContext)
         assert result.user_id == "test-user-123"
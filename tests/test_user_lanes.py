@@ -0,0 +1,178 @@
+"""
+Unit tests for per-user message lanes
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from edagent.models.user_context import UserContext
+from edagent.services.conversation_manager import ConversationManager
+from edagent.services.conversation_state_store import RedisConversationStateStore
+from edagent.services.user_lanes import UserLaneFullError, UserMessageLanes
+from tests.test_conversation_state_store import FakeRedis
+
+
+class Turns:
+    """Turn handlers that record their order and finish when released"""
+
+    def __init__(self):
+        self.log = []
+        self.release = asyncio.Event()
+
+    def handler(self, name):
+        async def handle():
+            self.log.append(f"start {name}")
+            await self.release.wait()
+            self.log.append(f"end {name}")
+            return name
+        return handle
+
+
+class TestUserMessageLanes:
+    """Test cases for UserMessageLanes"""
+
+    @pytest.mark.asyncio
+    async def test_same_user_turns_run_in_order(self):
+        """Test that a user's second message waits for the first to finish"""
+        lanes = UserMessageLanes()
+        turns = Turns()
+
+        first = asyncio.ensure_future(lanes.run("user-1", "first", turns.handler("first")))
+        second = asyncio.ensure_future(lanes.run("user-1", "second", turns.handler("second")))
+        await asyncio.sleep(0.01)
+        assert turns.log == ["start first"]
+        assert lanes.queued("user-1") == 1
+
+        turns.release.set()
+        assert await asyncio.gather(first, second) == ["first", "second"]
+        assert turns.log == ["start first", "end first", "start second", "end second"]
+        assert len(lanes) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_users_run_concurrently(self):
+        """Test that one user's slow turn does not hold up another user"""
+        lanes = UserMessageLanes()
+        turns = Turns()
+
+        first = asyncio.ensure_future(lanes.run("user-1", "hello", turns.handler("user-1")))
+        second = asyncio.ensure_future(lanes.run("user-2", "hello", turns.handler("user-2")))
+        await asyncio.sleep(0.01)
+
+        assert turns.log == ["start user-1", "start user-2"]
+        turns.release.set()
+        await asyncio.gather(first, second)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_message_shares_response(self):
+        """Test that a resubmitted message is answered once when coalescing is on"""
+        lanes = UserMessageLanes(coalesce_duplicates=True)
+        turns = Turns()
+
+        with patch("edagent.api.metrics.track_conversation_lane_message") as mock_track:
+            first = asyncio.ensure_future(lanes.run("user-1", "Recommend a course", turns.handler("first")))
+            again = asyncio.ensure_future(lanes.run("user-1", "Recommend a course ", turns.handler("again")))
+            await asyncio.sleep(0.01)
+            turns.release.set()
+
+            assert await asyncio.gather(first, again) == ["first", "first"]
+        assert turns.log == ["start first", "end first"]
+        mock_track.assert_any_call("coalesced")
+
+    @pytest.mark.asyncio
+    async def test_duplicates_run_twice_without_coalescing(self):
+        """Test that identical messages are separate turns by default"""
+        lanes = UserMessageLanes()
+        turns = Turns()
+        turns.release.set()
+
+        results = await asyncio.gather(
+            lanes.run("user-1", "hi", turns.handler("first")),
+            lanes.run("user-1", "hi", turns.handler("second"))
+        )
+
+        assert results == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_excess_messages_rejected(self):
+        """Test that messages beyond max_queued are rejected, not queued"""
+        lanes = UserMessageLanes(max_queued=1)
+        turns = Turns()
+
+        running = asyncio.ensure_future(lanes.run("user-1", "one", turns.handler("one")))
+        waiting = asyncio.ensure_future(lanes.run("user-1", "two", turns.handler("two")))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(UserLaneFullError) as exc_info:
+            await lanes.run("user-1", "three", turns.handler("three"))
+        assert exc_info.value.queued == 1
+
+        turns.release.set()
+        await asyncio.gather(running, waiting)
+        assert "start three" not in turns.log
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_turn_still_completes(self):
+        """Test that a caller going away does not drop its turn or unblock the next one early"""
+        lanes = UserMessageLanes()
+        turns = Turns()
+
+        first = asyncio.ensure_future(lanes.run("user-1", "first", turns.handler("first")))
+        second = asyncio.ensure_future(lanes.run("user-1", "second", turns.handler("second")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert turns.log == ["start first"]
+
+        turns.release.set()
+        assert await second == "second"
+        assert turns.log == ["start first", "end first", "start second", "end second"]
+
+    @pytest.mark.asyncio
+    async def test_wait_time_recorded(self):
+        """Test that time spent behind an earlier turn is measured"""
+        lanes = UserMessageLanes()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        with patch("edagent.api.metrics.track_conversation_lane_wait") as mock_track:
+            await asyncio.gather(lanes.run("user-1", "a", slow), lanes.run("user-1", "b", slow))
+
+        waits = sorted(call.args[0] for call in mock_track.call_args_list)
+        assert waits[0] < 0.05 <= waits[1]
+
+
+class TestConcurrentAssessmentMessages:
+    """Test cases for concurrent messages in one user's assessment"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_answers_both_recorded(self):
+        """Test that two answers sent at once are both recorded, in order"""
+        with patch('edagent.services.ai_service.genai.configure'):
+            manager = ConversationManager()
+        manager.user_context_manager.get_user_context = AsyncMock(return_value=UserContext(user_id="user-1"))
+        manager.user_context_manager.add_conversation = AsyncMock()
+        manager.summarizer.record_turn = lambda user_id: None
+        # Each read is a copy, so interleaved turns would overwrite each other's answers
+        store = manager._conversation_states = RedisConversationStateStore(FakeRedis())
+
+        await manager.handle_message("user-1", "Can you assess my skills?")
+        original_get = store.get
+
+        async def slow_get(user_id):
+            state = await original_get(user_id)
+            await asyncio.sleep(0.01)
+            return state
+
+        store.get = slow_get
+        await asyncio.gather(
+            manager.handle_message("user-1", "I mostly write Python scripts"),
+            manager.handle_message("user-1", "I also know some SQL")
+        )
+
+        state = await original_get("user-1")
+        assert [r["response"] for r in state.active_assessment.responses] == [
+            "I mostly write Python scripts", "I also know some SQL"
+        ]
+        assert state.message_count == 3